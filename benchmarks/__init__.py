@@ -0,0 +1,6 @@
+"""
+Benchmarks Package
+
+Offline benchmarks that run the application services against local fake
+Microsoft Graph and Salesforce servers.
+"""
@@ -0,0 +1,431 @@
+"""
+Fake Microsoft Graph Module
+
+This module provides an in-memory stand-in for the subset of the Microsoft
+Graph drive API used by SharePointStorageProvider:
+
+    GET  /v1.0/drives/{drive}/root:/{path}                 item metadata
+    GET  /v1.0/drives/{drive}/root:/{path}:/children       folder listing
+    POST /v1.0/drives/{drive}/root:/{parent}:/children     create folder
+    PUT  /v1.0/drives/{drive}/root:/{path}:/content        simple upload
+    POST /v1.0/drives/{drive}/root:/{path}:/createUploadSession  upload session
+    PUT  /upload/{session}                                  upload session chunk (Content-Range)
+    DELETE /upload/{session}                                cancel upload session
+    GET  /v1.0/drives/{drive}/items/{id}                   item metadata
+    GET  /v1.0/drives/{drive}/items/{id}/children          folder listing
+    POST /v1.0/drives/{drive}/items/{id}/children          create folder
+    PUT  /v1.0/drives/{drive}/items/{id}:/{name}:/content  upload into folder
+    POST /v1.0/drives/{drive}/items/{id}/copy              server-side copy (202 + monitor)
+    GET  /monitor/{id}                                      copy status
+    GET  /v1.0/drives/{drive}/root/delta                   change tracking
+    POST /v1.0/$batch                                       JSON batching (up to 20 requests)
+
+Semantics follow the real service where the provider depends on them:
+paths are case-insensitive, creating a folder under a missing parent
+returns 404, ``conflictBehavior: fail`` returns 409 for existing names and
+uploads create missing intermediate folders. File contents are not kept,
+only their sizes.
+
+Usage:
+    python -m benchmarks.fake_graph --port 8081 --latency-ms 40
+"""
+
+import argparse
+import itertools
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from benchmarks.fake_server import (
+    FakeRequestHandler, FakeServer, FaultConfig,
+    add_fault_arguments, faults_from_args
+)
+
+_ROOT_ROUTE = re.compile(
+    r"^/v1\.0/drives/(?P<drive>[^/]+)/root(?::/(?P<path>.*?))?(?P<action>:?/children|:/content|:/createUploadSession|:)?$"
+)
+
+_DELTA_ROUTE = re.compile(r"^/v1\.0/drives/(?P<drive>[^/]+)/root/delta$")
+_ITEM_ROUTE = re.compile(
+    r"^/v1\.0/drives/(?P<drive>[^/]+)/items/(?P<id>[^/:]+)"
+    r"(?::/(?P<name>[^/]+):/content|(?P<action>/children|/copy))?$"
+)
+_MONITOR_ROUTE = re.compile(r"^/monitor/(?P<id>[^/]+)$")
+_UPLOAD_ROUTE = re.compile(r"^/upload/(?P<id>[^/]+)$")
+_CONTENT_RANGE = re.compile(r"^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<total>\d+)$")
+
+# Graph JSON batching limit
+MAX_BATCH_REQUESTS = 20
+
+# Default and maximum page size of folder listings
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 999
+
+
+@dataclass
+class DriveItem:
+    """A file or folder in the fake drive."""
+    id: str
+    name: str
+    path: str                     # Full path from the drive root, without leading slash
+    parent_id: Optional[str]
+    is_folder: bool
+    size: int = 0
+    version: int = 1
+    modified: float = field(default_factory=time.time)
+    children: Dict[str, "DriveItem"] = field(default_factory=dict)  # casefolded name -> item
+    
+    @property
+    def etag(self) -> str:
+        return f'"{{{self.id}}},{self.version}"'
+    
+    def to_json(self, drive_id: str) -> dict:
+        """Serialize like a Graph driveItem resource."""
+        parent_path = self.path.rsplit("/", 1)[0] if "/" in self.path else ""
+        payload = {
+            "id": self.id,
+            "name": self.name,
+            "eTag": self.etag,
+            "size": self.size,
+            "lastModifiedDateTime": datetime.fromtimestamp(self.modified, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "parentReference": {
+                "driveId": drive_id,
+                "id": self.parent_id,
+                "path": f"/drives/{drive_id}/root:/{parent_path}" if parent_path else f"/drives/{drive_id}/root:",
+            },
+        }
+        if self.parent_id is None:
+            payload["root"] = {}
+            del payload["parentReference"]
+        if self.is_folder:
+            payload["folder"] = {"childCount": len(self.children)}
+        else:
+            payload["file"] = {"mimeType": "application/octet-stream"}
+        return payload
+
+
+class FakeDrive:
+    """Thread-safe in-memory drive tree."""
+    
+    def __init__(self, drive_id: str = "fake-drive"):
+        self.drive_id = drive_id
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self.root = DriveItem(id=self._new_id(), name="root", path="", parent_id=None, is_folder=True)
+        self.items: Dict[str, DriveItem] = {self.root.id: self.root}
+        self.bytes_uploaded = 0
+        self.changes: List[str] = [self.root.id]  # Item IDs in change order (delta log)
+        self.upload_sessions: Dict[str, Dict] = {}  # Session ID -> {"path", "received"}
+    
+    def _new_id(self) -> str:
+        return f"01FAKE{next(self._ids):010d}"
+    
+    @staticmethod
+    def _parts(path: str) -> List[str]:
+        return [part for part in path.strip("/").split("/") if part and part != "."]
+    
+    def lookup(self, path: str) -> Optional[DriveItem]:
+        """Find an item by path (case-insensitive)."""
+        with self._lock:
+            item = self.root
+            for part in self._parts(path):
+                item = item.children.get(part.casefold())
+                if item is None:
+                    return None
+            return item
+    
+    def _add_child(self, parent: DriveItem, name: str, is_folder: bool) -> DriveItem:
+        path = f"{parent.path}/{name}".lstrip("/")
+        child = DriveItem(id=self._new_id(), name=name, path=path, parent_id=parent.id, is_folder=is_folder)
+        parent.children[name.casefold()] = child
+        parent.version += 1
+        self.items[child.id] = child
+        self.changes.append(child.id)
+        return child
+    
+    def create_folder(self, parent: DriveItem, name: str) -> Optional[DriveItem]:
+        """
+        Create a folder under a parent.
+        
+        Returns:
+            The new folder, or None if an item with that name already exists.
+        """
+        with self._lock:
+            if name.casefold() in parent.children:
+                return None
+            return self._add_child(parent, name, is_folder=True)
+    
+    def mkdirs(self, path: str) -> DriveItem:
+        """Create a folder path, including missing parents (seeding helper)."""
+        with self._lock:
+            item = self.root
+            for part in self._parts(path):
+                existing = item.children.get(part.casefold())
+                item = existing if existing is not None else self._add_child(item, part, is_folder=True)
+            return item
+    
+    def put_file(self, path: str, size: int, uploaded: bool = True) -> DriveItem:
+        """Create or replace a file, creating missing parent folders."""
+        with self._lock:
+            parts = self._parts(path)
+            parent = self.mkdirs("/".join(parts[:-1]))
+            item = parent.children.get(parts[-1].casefold())
+            if item is None:
+                item = self._add_child(parent, parts[-1], is_folder=False)
+            else:
+                item.version += 1
+                self.changes.append(item.id)
+            item.size = size
+            item.modified = time.time()
+            if uploaded:
+                self.bytes_uploaded += size
+            return item
+    
+    def changes_since(self, token: int, end: int) -> List[DriveItem]:
+        """Items changed between two delta tokens, latest state once each."""
+        with self._lock:
+            seen = set()
+            changed = []
+            for item_id in self.changes[token:end]:
+                if item_id not in seen:
+                    seen.add(item_id)
+                    changed.append(self.items[item_id])
+            return changed
+    
+    def count(self) -> Dict[str, int]:
+        """Number of folders and files in the drive (root excluded)."""
+        with self._lock:
+            folders = sum(1 for item in self.items.values() if item.is_folder) - 1
+            return {"folders": folders, "files": len(self.items) - 1 - folders}
+
+
+class FakeGraphHandler(FakeRequestHandler):
+    """Routes Graph drive requests to the server's FakeDrive."""
+    
+    def route(self, method, path, query):
+        drive: FakeDrive = self.server.owner.drive
+        
+        if method == "POST" and path == "/v1.0/$batch":
+            return self._batch()
+        
+        match = _ROOT_ROUTE.match(path)
+        if match and match.group("drive") == drive.drive_id:
+            item_path = match.group("path") or ""
+            action = match.group("action") or ""
+            if method == "PUT" and action == ":/content":
+                return self._upload(drive, item_path)
+            if method == "POST" and action == ":/createUploadSession":
+                return self._create_upload_session(drive, item_path)
+            return self._dispatch_item(method, drive, drive.lookup(item_path), action, query)
+        
+        match = _DELTA_ROUTE.match(path)
+        if method == "GET" and match and match.group("drive") == drive.drive_id:
+            return self._delta(drive, query)
+        
+        match = _ITEM_ROUTE.match(path)
+        if match and match.group("drive") == drive.drive_id:
+            item = drive.items.get(match.group("id"))
+            if match.group("name"):
+                if method != "PUT" or item is None or not item.is_folder:
+                    self.read_body()
+                    return self._error(404, "itemNotFound", "The resource could not be found.")
+                return self._upload(drive, f"{item.path}/{match.group('name')}")
+            return self._dispatch_item(method, drive, item, match.group("action") or "", query)
+        
+        match = _UPLOAD_ROUTE.match(path)
+        if match and method in ("PUT", "DELETE"):
+            return self._upload_chunk(drive, method, match.group("id"))
+        
+        match = _MONITOR_ROUTE.match(path)
+        if method == "GET" and match:
+            # Copies complete immediately; the monitor only reports the result
+            return self.send_json(200, {"status": "completed", "resourceId": match.group("id")})
+        
+        self.read_body()
+        self._error(404, "itemNotFound", f"Unknown resource: {path}")
+    
+    def _batch(self):
+        requests = self.read_json().get("requests", [])
+        if len(requests) > MAX_BATCH_REQUESTS:
+            return self._error(400, "invalidRequest", f"Batch exceeds {MAX_BATCH_REQUESTS} requests")
+        self.send_json(200, {"responses": [self._run_subrequest(request) for request in requests]})
+    
+    def _run_subrequest(self, request):
+        """Route one batch entry, capturing its response instead of writing it."""
+        captured = {}
+        body = request.get("body")
+        
+        def send_json(status, payload, headers=None):
+            captured.update(status=status, body=payload, headers=headers or {})
+        
+        # Instance attributes shadow the methods for the duration of the sub-request
+        self.send_json = send_json
+        self.read_body = lambda: json.dumps(body).encode("utf-8") if body is not None else b""
+        try:
+            parts = urlsplit(request["url"])
+            query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            self.route(request["method"], f"/v1.0{unquote(parts.path)}", query)
+        finally:
+            del self.send_json, self.read_body
+        
+        return {"id": request["id"], "status": captured["status"],
+                "headers": captured["headers"], "body": captured["body"]}
+    
+    def _dispatch_item(self, method, drive, item, action, query):
+        if method == "GET" and action in ("", ":"):
+            return self._get_item(drive, item)
+        if method == "GET" and action.endswith("/children"):
+            return self._list_children(drive, item, query)
+        if method == "POST" and action.endswith("/children"):
+            return self._create_child(drive, item)
+        if method == "POST" and action == "/copy":
+            return self._copy(drive, item, query)
+        
+        self.read_body()
+        self._error(405, "invalidRequest", f"{method} not supported")
+    
+    def _error(self, status, code, message):
+        self.send_json(status, {"error": {"code": code, "message": message}})
+    
+    def _get_item(self, drive, item):
+        if item is None:
+            return self._error(404, "itemNotFound", "The resource could not be found.")
+        self.send_json(200, item.to_json(drive.drive_id))
+    
+    def _list_children(self, drive, folder, query):
+        if folder is None or not folder.is_folder:
+            return self._error(404, "itemNotFound", "The resource could not be found.")
+        
+        with drive._lock:
+            children = sorted(folder.children.values(), key=lambda child: child.name.casefold())
+        top = min(int(query.get("$top", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        offset = int(query.get("$skiptoken", 0))
+        page = children[offset:offset + top]
+        
+        select = [field for field in query.get("$select", "").split(",") if field]
+        values = []
+        for child in page:
+            value = child.to_json(drive.drive_id)
+            if select:
+                value = {key: item for key, item in value.items() if key in select}
+            values.append(value)
+        
+        payload = {"value": values}
+        if offset + top < len(children):
+            payload["@odata.nextLink"] = (
+                f"{self.server.owner.url}{self.path.split('?', 1)[0]}"
+                f"?$top={top}&$skiptoken={offset + top}&$select={','.join(select)}"
+            )
+        self.send_json(200, payload)
+    
+    def _delta(self, drive, query):
+        token = int(query.get("token", 0))
+        # Continuation pages keep the end of the change log seen by the first page
+        end = int(query.get("end", len(drive.changes)))
+        changed = drive.changes_since(token, end)
+        offset = int(query.get("$skiptoken", 0))
+        page = changed[offset:offset + DEFAULT_PAGE_SIZE]
+        
+        base = f"{self.server.owner.url}{self.path.split('?', 1)[0]}"
+        payload = {"value": [item.to_json(drive.drive_id) for item in page]}
+        if offset + DEFAULT_PAGE_SIZE < len(changed):
+            payload["@odata.nextLink"] = (
+                f"{base}?token={token}&end={end}&$skiptoken={offset + DEFAULT_PAGE_SIZE}"
+            )
+        else:
+            payload["@odata.deltaLink"] = f"{base}?token={end}"
+        self.send_json(200, payload)
+    
+    def _create_child(self, drive, parent):
+        payload = self.read_json()
+        if parent is None or not parent.is_folder:
+            return self._error(404, "itemNotFound", "The resource could not be found.")
+        
+        name = payload.get("name", "")
+        item = drive.create_folder(parent, name)
+        if item is None:
+            behavior = payload.get("@microsoft.graph.conflictBehavior", "fail")
+            if behavior == "fail":
+                return self._error(409, "nameAlreadyExists", "The specified item name already exists.")
+            item = parent.children[name.casefold()]
+        self.send_json(201, item.to_json(drive.drive_id))
+    
+    def _copy(self, drive, source, query):
+        payload = self.read_json()
+        parent = drive.items.get(payload.get("parentReference", {}).get("id", ""))
+        if source is None or source.is_folder or parent is None or not parent.is_folder:
+            return self._error(404, "itemNotFound", "The resource could not be found.")
+        
+        name = payload.get("name") or source.name
+        if name.casefold() in parent.children and query.get("@microsoft.graph.conflictBehavior", "fail") == "fail":
+            return self._error(409, "nameAlreadyExists", "The specified item name already exists.")
+        item = drive.put_file(f"{parent.path}/{name}", source.size, uploaded=False)
+        self.send_json(202, None, {"Location": f"{self.server.owner.url}/monitor/{item.id}"})
+    
+    def _create_upload_session(self, drive, item_path):
+        self.read_body()
+        session_id = f"session{next(drive._ids)}"
+        with drive._lock:
+            drive.upload_sessions[session_id] = {"path": item_path, "received": 0}
+        self.send_json(200, {
+            "uploadUrl": f"{self.server.owner.url}/upload/{session_id}",
+            "expirationDateTime": "2099-01-01T00:00:00Z"
+        })
+    
+    def _upload_chunk(self, drive, method, session_id):
+        body = self.read_body()
+        with drive._lock:
+            session = drive.upload_sessions.get(session_id)
+            if session is None:
+                return self._error(404, "itemNotFound", "Upload session not found")
+            if method == "DELETE":
+                del drive.upload_sessions[session_id]
+                return self.send_json(204, None)
+            
+            match = _CONTENT_RANGE.match(self.headers.get("Content-Range", ""))
+            if not match or int(match.group("start")) != session["received"] \
+                    or int(match.group("end")) - int(match.group("start")) + 1 != len(body):
+                return self._error(416, "invalidRange", "Unexpected Content-Range")
+            session["received"] += len(body)
+            total = int(match.group("total"))
+            if session["received"] < total:
+                return self.send_json(202, {"nextExpectedRanges": [f"{session['received']}-"]})
+            del drive.upload_sessions[session_id]
+        
+        item = drive.put_file(session["path"], total)
+        self.send_json(201 if item.version == 1 else 200, item.to_json(drive.drive_id))
+    
+    def _upload(self, drive, item_path):
+        size = len(self.read_body())
+        item = drive.put_file(item_path, size)
+        self.send_json(201 if item.version == 1 else 200, item.to_json(drive.drive_id))
+
+
+class FakeGraphServer(FakeServer):
+    """Fake Microsoft Graph service backed by a FakeDrive."""
+    
+    handler_class = FakeGraphHandler
+    
+    def __init__(self, faults: Optional[FaultConfig] = None, drive_id: str = "fake-drive", **kwargs):
+        super().__init__(faults, **kwargs)
+        self.drive = FakeDrive(drive_id)
+
+
+def main():
+    """Run the fake Graph server in the foreground."""
+    parser = argparse.ArgumentParser(description="Fake Microsoft Graph drive API")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--drive-id", default="fake-drive")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    
+    FakeGraphServer(faults_from_args(args), drive_id=args.drive_id, port=args.port).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Fake Salesforce Module
+
+This module provides an in-memory stand-in for the Salesforce REST endpoints
+used by SalesforceService:
+
+    POST /services/oauth2/token                              password grant
+    GET  /services/data/v{version}/query/?q=...              SOQL (Account only)
+    GET  /services/data/v{version}/query/{locator}-{offset}  next page
+    POST /services/data/v{version}/sobjects/{object}/        create record
+    POST /services/data/v{version}/composite/sobjects        create up to 200 records
+
+simple_salesforce always builds ``https://{instance}/...`` URLs, so clients
+talk to this server through ``HostRewriteAdapter``, which redirects a
+fake instance host to the local HTTP server.
+
+Usage:
+    python -m benchmarks.fake_salesforce --port 8082 --latency-ms 120
+"""
+
+import argparse
+import itertools
+import re
+import threading
+from typing import Dict, List, Optional
+
+from benchmarks.fake_server import (
+    FakeRequestHandler, FakeServer, FaultConfig,
+    add_fault_arguments, faults_from_args
+)
+
+_QUERY_ROUTE = re.compile(r"^/services/data/v[\d.]+/query/?(?:(?P<locator>[^/]+)-(?P<offset>\d+))?$")
+_SOBJECT_ROUTE = re.compile(r"^/services/data/v[\d.]+/sobjects/(?P<object>\w+)/?$")
+_COLLECTION_ROUTE = re.compile(r"^/services/data/v[\d.]+/composite/sobjects/?$")
+
+# Records accepted per sObject Collections request
+_COLLECTION_LIMIT = 200
+
+# Object key prefixes used for generated record IDs
+_KEY_PREFIXES = {"Account": "001", "Opportunity": "006"}
+
+
+class FakeSalesforceHandler(FakeRequestHandler):
+    """Routes Salesforce REST requests to the server's record store."""
+    
+    def route(self, method, path, query):
+        owner: FakeSalesforceServer = self.server.owner
+        
+        if method == "POST" and path == "/services/oauth2/token":
+            self.read_body()
+            return self.send_json(200, {
+                "access_token": "fake-session",
+                "instance_url": owner.url,
+                "token_type": "Bearer",
+            })
+        
+        match = _QUERY_ROUTE.match(path)
+        if method == "GET" and match:
+            offset = int(match.group("offset") or 0)
+            return self.send_json(200, owner.query_page(match.group("locator"), offset, query.get("q", "")))
+        
+        match = _SOBJECT_ROUTE.match(path)
+        if method == "POST" and match:
+            record = self.read_json()
+            record_id = owner.insert(match.group("object"), record)
+            return self.send_json(201, {"id": record_id, "success": True, "errors": []})
+        
+        if method == "POST" and _COLLECTION_ROUTE.match(path):
+            payload = self.read_json()
+            records = payload.get("records", [])
+            if len(records) > _COLLECTION_LIMIT:
+                return self.send_json(400, [{
+                    "errorCode": "EXCEEDED_ID_LIMIT",
+                    "message": f"Record limit is {_COLLECTION_LIMIT}"
+                }])
+            return self.send_json(200, owner.insert_collection(records, payload.get("allOrNone", False)))
+        
+        self.read_body()
+        self.send_json(404, [{"errorCode": "NOT_FOUND", "message": f"Unknown resource: {path}"}])
+
+
+class FakeSalesforceServer(FakeServer):
+    """Fake Salesforce org holding records in memory."""
+    
+    handler_class = FakeSalesforceHandler
+    
+    def __init__(
+        self,
+        faults: Optional[FaultConfig] = None,
+        account_count: int = 500,
+        page_size: int = 2000,
+        **kwargs
+    ):
+        """
+        Initialize the fake org.
+        
+        Args:
+            faults: Latency/error injection settings.
+            account_count: Number of Account records to seed.
+            page_size: Records per query page (Salesforce default is 2000).
+        """
+        super().__init__(faults, **kwargs)
+        self.page_size = page_size
+        self.records: Dict[str, List[dict]] = {}
+        self._record_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        for index in range(account_count):
+            self.insert("Account", {"Name": f"Customer {index:04d}"})
+    
+    def insert(self, sobject: str, fields: dict) -> str:
+        """Store a record and return its generated 18-character ID."""
+        prefix = _KEY_PREFIXES.get(sobject, "a00")
+        with self._record_lock:
+            record_id = f"{prefix}FAKE{next(self._ids):011d}"
+            self.records.setdefault(sobject, []).append({"Id": record_id, **fields})
+        return record_id
+    
+    def insert_collection(self, records: List[dict], all_or_none: bool = False) -> List[dict]:
+        """
+        Store records of an sObject Collections request.
+        
+        Records without a Name fail with REQUIRED_FIELD_MISSING; with
+        ``all_or_none`` one failure rolls back every record of the request.
+        """
+        valid = [bool(record.get("Name")) for record in records]
+        results = []
+        for record, ok in zip(records, valid):
+            if not ok:
+                results.append({"success": False, "errors": [{
+                    "statusCode": "REQUIRED_FIELD_MISSING", "message": "Required fields are missing: [Name]", "fields": ["Name"]
+                }]})
+            elif all_or_none and not all(valid):
+                results.append({"success": False, "errors": [{
+                    "statusCode": "ALL_OR_NONE_OPERATION_ROLLED_BACK", "message": "Record rolled back", "fields": []
+                }]})
+            else:
+                fields = {key: value for key, value in record.items() if key != "attributes"}
+                record_id = self.insert(record.get("attributes", {}).get("type", "Opportunity"), fields)
+                results.append({"id": record_id, "success": True, "errors": []})
+        return results
+    
+    def query_page(self, locator: Optional[str], offset: int, soql: str) -> dict:
+        """
+        Answer a query with Account records, paginated like the real API.
+        
+        Only ``SELECT Id, Name FROM Account`` style queries are supported; the
+        SOQL text is not parsed beyond that.
+        """
+        with self._record_lock:
+            accounts = list(self.records.get("Account", []))
+        accounts.sort(key=lambda record: record["Name"])
+        
+        page = accounts[offset:offset + self.page_size]
+        next_offset = offset + len(page)
+        payload = {
+            "totalSize": len(accounts),
+            "done": next_offset >= len(accounts),
+            "records": [
+                {"attributes": {"type": "Account"}, "Id": r["Id"], "Name": r["Name"]}
+                for r in page
+            ],
+        }
+        if not payload["done"]:
+            payload["nextRecordsUrl"] = f"/services/data/v59.0/query/{locator or 'fakeQuery'}-{next_offset}"
+        return payload
+    
+    def count(self, sobject: str) -> int:
+        """Number of stored records of an object type."""
+        with self._record_lock:
+            return len(self.records.get(sobject, []))
+
+
+def make_session(server_url: str, instance_host: str = "fake.my.salesforce.com"):
+    """
+    Create a requests session that sends ``https://{instance_host}`` to a fake server.
+    
+    Args:
+        server_url: Base URL of the running FakeSalesforceServer.
+        instance_host: Host name given to simple_salesforce as the instance.
+    
+    Returns:
+        requests.Session with the rewrite adapter mounted.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    class HostRewriteAdapter(HTTPAdapter):
+        """Rewrite the fake instance URL to the local fake server."""
+        
+        def send(self, request, **kwargs):
+            request.url = request.url.replace(f"https://{instance_host}", server_url, 1)
+            return super().send(request, **kwargs)
+    
+    session = requests.Session()
+    session.mount(f"https://{instance_host}", HostRewriteAdapter())
+    return session
+
+
+def main():
+    """Run the fake Salesforce server in the foreground."""
+    parser = argparse.ArgumentParser(description="Fake Salesforce REST API")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--accounts", type=int, default=500, help="Accounts to seed")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    
+    FakeSalesforceServer(faults_from_args(args), account_count=args.accounts, port=args.port).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Fake Server Base Module
+
+This module provides the shared plumbing for the local stand-ins of
+Microsoft Graph and Salesforce used by the offline benchmarks: a threaded
+HTTP server with configurable latency and error injection.
+"""
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, unquote, parse_qs
+
+
+@dataclass
+class FaultConfig:
+    """Latency and error injection settings for a fake server."""
+    latency_ms: float = 0.0      # Base latency added to every request
+    jitter_ms: float = 0.0       # Uniform random extra latency (0..jitter_ms)
+    error_rate: float = 0.0      # Probability (0..1) of answering with error_status
+    error_status: int = 503      # Status code used for injected errors
+    retry_after: Optional[float] = None  # Retry-After seconds sent with injected errors
+    throttle_rps: float = 0.0    # Answer 429 above this many requests per second (0 disables)
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Base request handler with JSON helpers and fault injection.
+    
+    Subclasses implement ``route(method, path, query)`` and use the
+    ``send_json`` / ``read_body`` helpers.
+    """
+    
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real services
+    server: "FakeHTTPServer"
+    
+    def _dispatch(self, method: str) -> None:
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        
+        self.server.owner.count_request(method)
+        fault = self.server.owner.inject_fault()
+        if fault is not None:
+            # Drain the body so the connection can be reused
+            self.read_body()
+            status, headers = fault
+            self.send_json(status, {"error": {"code": "injectedFault", "message": "Injected fault"}}, headers)
+            return
+        
+        try:
+            self.route(method, path, query)
+        except Exception as e:
+            self.send_json(500, {"error": {"code": "fakeServerError", "message": str(e)}})
+    
+    def do_GET(self):
+        self._dispatch("GET")
+    
+    def do_POST(self):
+        self._dispatch("POST")
+    
+    def do_PUT(self):
+        self._dispatch("PUT")
+    
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+    
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+    
+    def route(self, method: str, path: str, query: Dict[str, str]) -> None:
+        """Handle a request (implemented by subclasses)."""
+        self.send_json(404, {"error": {"code": "notFound", "message": path}})
+    
+    def read_body(self) -> bytes:
+        """Read the request body according to Content-Length."""
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+    
+    def read_json(self):
+        """Read and decode a JSON request body."""
+        body = self.read_body()
+        return json.loads(body) if body else {}
+    
+    def send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a JSON response."""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Request logs would dominate benchmark output
+        pass
+
+
+class FakeHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that knows the FakeServer owning it."""
+    
+    daemon_threads = True
+    request_queue_size = 128
+    owner: "FakeServer"
+
+
+class FakeServer:
+    """
+    Threaded fake HTTP service with fault injection.
+    
+    Usage:
+        with FakeGraphServer(FaultConfig(latency_ms=50)) as graph:
+            provider.graph_url = graph.url + "/v1.0"
+    """
+    
+    handler_class = FakeRequestHandler
+    
+    def __init__(self, faults: Optional[FaultConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the fake server (not started yet).
+        
+        Args:
+            faults: Latency/error injection settings.
+            host: Address to bind.
+            port: Port to bind (0 picks a free port).
+        """
+        self.faults = faults or FaultConfig()
+        self.host = host
+        self.port = port
+        self.request_counts: Dict[str, int] = {}
+        self.injected_errors = 0
+        self.throttled_requests = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._httpd: Optional[FakeHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def total_requests(self) -> int:
+        """Number of requests received."""
+        return sum(self.request_counts.values())
+    
+    def count_request(self, method: str) -> None:
+        """Count a received request."""
+        with self._lock:
+            self.request_counts[method] = self.request_counts.get(method, 0) + 1
+    
+    def inject_fault(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        """
+        Apply latency and decide whether to fail the current request.
+        
+        Returns:
+            (status, headers) of an injected error, or None to proceed.
+        """
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency_ms + self._random.uniform(0, faults.jitter_ms)
+            fail = faults.error_rate > 0 and self._random.random() < faults.error_rate
+            if fail:
+                self.injected_errors += 1
+            throttled = faults.throttle_rps > 0 and self._over_rate(faults.throttle_rps)
+        
+        if throttled:
+            # Like SharePoint: reject immediately and say when to come back
+            self.throttled_requests += 1
+            return 429, {
+                "Retry-After": "1",
+                "RateLimit-Limit": f"{faults.throttle_rps:g}",
+                "RateLimit-Remaining": "0",
+                "RateLimit-Reset": "1",
+            }
+        
+        if delay > 0:
+            time.sleep(delay / 1000)
+        
+        if not fail:
+            return None
+        headers = {}
+        if faults.retry_after is not None:
+            headers["Retry-After"] = f"{faults.retry_after:g}"
+        return faults.error_status, headers
+    
+    def _over_rate(self, rps: float) -> bool:
+        """Count a request in the current one-second window (caller holds the lock)."""
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count > rps
+    
+    def start(self) -> "FakeServer":
+        """Start serving in a daemon thread."""
+        self._httpd = FakeHTTPServer((self.host, self.port), self.handler_class)
+        self._httpd.owner = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name=f"{type(self).__name__}",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def serve_forever(self) -> None:
+        """Run in the foreground (used by the standalone CLIs)."""
+        self.start()
+        print(f"{type(self).__name__} listening on {self.url}")
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+    
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def add_fault_arguments(parser, prefix: str = "", defaults: Optional[FaultConfig] = None) -> None:
+    """
+    Add the fault injection options to an argparse parser.
+    
+    Args:
+        parser: argparse parser (or argument group).
+        prefix: Option prefix, e.g. "graph-" gives --graph-latency-ms.
+        defaults: Default values (FaultConfig() if omitted).
+    """
+    defaults = defaults or FaultConfig()
+    label = f"{prefix.rstrip('-')} " if prefix else ""
+    parser.add_argument(f"--{prefix}latency-ms", type=float, default=defaults.latency_ms,
+                        help=f"Base {label}latency per request")
+    parser.add_argument(f"--{prefix}jitter-ms", type=float, default=defaults.jitter_ms,
+                        help=f"Random extra {label}latency per request")
+    parser.add_argument(f"--{prefix}error-rate", type=float, default=defaults.error_rate,
+                        help=f"Probability of an injected {label}error (0..1)")
+    parser.add_argument(f"--{prefix}error-status", type=int, default=defaults.error_status,
+                        help=f"Status code of injected {label}errors")
+    parser.add_argument(f"--{prefix}retry-after", type=float, default=defaults.retry_after,
+                        help=f"Retry-After seconds on injected {label}errors")
+    parser.add_argument(f"--{prefix}throttle-rps", type=float, default=defaults.throttle_rps,
+                        help=f"Answer {label}429 above this many requests per second (0 disables)")
+
+
+def faults_from_args(args, prefix: str = "") -> FaultConfig:
+    """Build a FaultConfig from fault arguments added with the same prefix."""
+    dest = prefix.replace("-", "_")
+    return FaultConfig(
+        latency_ms=getattr(args, f"{dest}latency_ms"),
+        jitter_ms=getattr(args, f"{dest}jitter_ms"),
+        error_rate=getattr(args, f"{dest}error_rate"),
+        error_status=getattr(args, f"{dest}error_status"),
+        retry_after=getattr(args, f"{dest}retry_after"),
+        throttle_rps=getattr(args, f"{dest}throttle_rps")
+    )
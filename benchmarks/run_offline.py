@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Offline Storage and Salesforce Benchmark
+
+This script benchmarks the real StorageService and SalesforceService code
+against local fake Microsoft Graph and Salesforce servers, so that
+throughput and latency can be measured without credentials or network
+access, and with controlled latency and error rates.
+
+Scenarios (each run at every concurrency level):
+    create_project_folder    project folder + full template copy
+    upload_assessment_files  customer files into the project folder
+    save_assessment_html     HTML report into the project folder
+    create_opportunity       Opportunity record creation
+
+For each scenario and level the script reports throughput, p50/p95/p99
+latency, error count, fake-server requests per operation and peak memory.
+Results can be saved as JSON and compared against a previous run.
+
+Usage:
+    python benchmarks/run_offline.py
+    python benchmarks/run_offline.py --concurrency 1,4,16 --graph-latency-ms 60
+    python benchmarks/run_offline.py --graph-error-rate 0.05 --scenarios create_opportunity
+    python benchmarks/run_offline.py --async-graph --scenarios create_project_folder,upload_assessment_files
+    python benchmarks/run_offline.py --json after.json --baseline before.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_server import FaultConfig, add_fault_arguments, faults_from_args
+from benchmarks.fake_graph import FakeGraphServer
+from benchmarks.fake_salesforce import FakeSalesforceServer, make_session
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+SCENARIOS = [
+    "create_project_folder",
+    "upload_assessment_files",
+    "save_assessment_html",
+    "create_opportunity",
+]
+
+# Fake tenant layout
+DRIVE_ID = "bench-drive"
+BASE_PATH = "Bench_2025"
+PROJECTS_FOLDER = "1_ICT"
+COUNTRY = "Mexico"
+CUSTOMER = "Bench Customer"
+SF_INSTANCE = "bench.my.salesforce.com"
+
+
+@dataclass
+class LevelResult:
+    """Measurements for one scenario at one concurrency level."""
+    scenario: str
+    concurrency: int
+    ops: int
+    errors: int
+    wall_s: float
+    throughput_ops_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    requests_per_op: float
+    peak_rss_mb: Optional[float]
+    tracemalloc_peak_mb: Optional[float]
+
+
+class NamedBytesIO(BytesIO):
+    """In-memory file with a ``name``, like Streamlit's UploadedFile."""
+    
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def install_settings(storage_root: Path) -> None:
+    """Install in-memory settings so services never read secrets or .env."""
+    import config.settings as settings_module
+    from config.settings import (
+        Settings, SalesforceConfig, StorageConfig, AuthConfig, AzureConfig, SharePointConfig
+    )
+    
+    templates = PROJECT_ROOT / "TEMPLATES"
+    settings_module._settings = Settings(
+        salesforce=SalesforceConfig(
+            username="bench@example.com",
+            password="bench",
+            security_token="bench",
+            consumer_key="bench",
+            consumer_secret="bench",
+            token_url=f"https://{SF_INSTANCE}/services/oauth2/token",
+            timeout=30
+        ),
+        storage=StorageConfig(
+            base_path=storage_root,
+            sharepoint_path="https://bench.sharepoint.com/sites/Bench/Shared Documents",
+            template_ict=templates / "TEMPLATE_ICT",
+            template_fct=templates / "TEMPLATE_FCT",
+            template_iat=templates / "TEMPLATE_IAT",
+            provider="sharepoint"
+        ),
+        auth=AuthConfig(password_hash=""),
+        azure=AzureConfig(tenant_id="bench", client_id="bench", client_secret="bench"),
+        sharepoint=SharePointConfig(site_id="bench-site", drive_id=DRIVE_ID, base_path=BASE_PATH)
+    )
+
+
+def build_storage_service(graph: FakeGraphServer, async_graph: bool = False):
+    """Create a StorageService whose SharePoint provider talks to the fake Graph server."""
+    from services.storage_service import StorageService
+    from storage import SharePointStorageProvider
+    
+    provider_class = SharePointStorageProvider
+    if async_graph:
+        from storage.async_sharepoint_storage import AsyncSharePointStorageProvider
+        provider_class = AsyncSharePointStorageProvider
+    
+    provider = provider_class(
+        tenant_id="bench",
+        client_id="bench",
+        client_secret="bench",
+        site_id="bench-site",
+        drive_id=DRIVE_ID,
+        base_path=BASE_PATH
+    )
+    provider.graph_url = f"{graph.url}/v1.0"
+    provider._access_token = "fake-token"  # Skip MSAL
+    return StorageService(storage_provider=provider)
+
+
+def build_salesforce_service(salesforce: FakeSalesforceServer):
+    """Create a SalesforceService with a client bound to the fake org."""
+    from simple_salesforce import Salesforce
+    from services.salesforce_service import SalesforceService
+    
+    service = SalesforceService()
+    service._sf_client = Salesforce(
+        instance=SF_INSTANCE,
+        session_id="fake-session",
+        session=make_session(salesforce.url, SF_INSTANCE)
+    )
+    return service
+
+
+def make_scenarios(args, graph: FakeGraphServer, salesforce: FakeSalesforceServer) -> Dict[str, Callable[[int], None]]:
+    """
+    Build one callable per scenario; each takes a unique operation number.
+    
+    Args:
+        args: Parsed command line arguments.
+        graph: Running fake Graph server.
+        salesforce: Running fake Salesforce server.
+    
+    Returns:
+        Mapping of scenario name to operation callable.
+    """
+    from pages.utils.constants import COUNTRIES_DICT
+    
+    storage = build_storage_service(graph, args.async_graph)
+    sf_service = build_salesforce_service(salesforce)
+    run_id = time.strftime("%H%M%S")
+    
+    # Customer folder must exist: project folders are created as its children
+    customer_path = storage.provider.get_full_path(
+        PROJECTS_FOLDER, COUNTRIES_DICT.get(COUNTRY, "OTHER"), CUSTOMER
+    )
+    graph.drive.mkdirs(customer_path)
+    shared_project = f"{customer_path}/Shared-{run_id}"
+    graph.drive.mkdirs(shared_project)
+    
+    payload = bytes(range(256)) * (args.file_size_kb * 4)
+    html = "<html><body>" + "<p>Assessment</p>" * (args.html_size_kb * 64) + "</body></html>"
+    
+    def create_project_folder(op: int) -> None:
+        storage.create_project_folder(
+            args.assessment_type, PROJECTS_FOLDER, CUSTOMER, f"Bench-{run_id}-{op:05d}", COUNTRY
+        )
+    
+    def file_content(op: int, n: int) -> bytes:
+        # Distinct content per file unless dedup is being exercised
+        return payload if args.duplicate_files else f"{run_id}-{op}-{n}".encode("ascii") + payload
+    
+    def upload_assessment_files(op: int) -> None:
+        files = [NamedBytesIO(file_content(op, n), f"spec_{op:05d}_{n}.bin") for n in range(args.files)]
+        storage.upload_assessment_files(shared_project, args.assessment_type, files)
+    
+    def save_assessment_html(op: int) -> None:
+        storage.save_assessment_html(shared_project, args.assessment_type, html)
+    
+    def create_opportunity(op: int) -> None:
+        result = sf_service.create_opportunity(
+            name=f"Bench Opportunity {run_id}-{op:05d}",
+            stage_name="Assessment",
+            close_date="2025-12-31",
+            assessment_date="2025-06-30",
+            path=shared_project,
+            bu=args.assessment_type,
+            account_id=None
+        )
+        if not result.get("success"):
+            raise RuntimeError(f"Opportunity not created: {result.get('errors')}")
+    
+    return {
+        "create_project_folder": create_project_folder,
+        "upload_assessment_files": upload_assessment_files,
+        "save_assessment_html": save_assessment_html,
+        "create_opportunity": create_opportunity,
+    }
+
+
+def run_level(
+    scenario: str,
+    operation: Callable[[int], None],
+    concurrency: int,
+    ops: int,
+    server,
+    first_op: int,
+    trace_memory: bool
+) -> LevelResult:
+    """
+    Run ``ops`` operations with ``concurrency`` worker threads.
+    
+    Args:
+        scenario: Scenario name.
+        operation: Callable executing one operation.
+        concurrency: Number of worker threads.
+        ops: Total operations to run.
+        server: Fake server the scenario talks to (for request counts).
+        first_op: Operation number of the first operation (keeps names unique).
+        trace_memory: Measure Python allocations with tracemalloc.
+    
+    Returns:
+        LevelResult for this run.
+    """
+    from core.instrumentation import _percentile
+    
+    def timed_operation(op: int):
+        started = time.perf_counter()
+        try:
+            operation(op)
+            return (time.perf_counter() - started) * 1000, True
+        except Exception:
+            return (time.perf_counter() - started) * 1000, False
+    
+    if trace_memory:
+        tracemalloc.start()
+    requests_before = server.total_requests
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed_operation, range(first_op, first_op + ops)))
+    wall_s = time.perf_counter() - started
+    
+    tracemalloc_peak = None
+    if trace_memory:
+        tracemalloc_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    
+    latencies = sorted(latency for latency, _ in outcomes)
+    return LevelResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        ops=ops,
+        errors=sum(1 for _, ok in outcomes if not ok),
+        wall_s=wall_s,
+        throughput_ops_s=ops / wall_s if wall_s > 0 else 0.0,
+        p50_ms=_percentile(latencies, 50),
+        p95_ms=_percentile(latencies, 95),
+        p99_ms=_percentile(latencies, 99),
+        requests_per_op=(server.total_requests - requests_before) / ops,
+        peak_rss_mb=peak_rss_mb(),
+        tracemalloc_peak_mb=tracemalloc_peak
+    )
+
+
+def compare_with_baseline(results: List[LevelResult], baseline_path: Path, tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline JSON file.
+    
+    A level regresses when its p95 latency grows, or its throughput drops,
+    by more than ``tolerance`` (a fraction) relative to the baseline.
+    
+    Returns:
+        Human-readable regression messages (empty if none).
+    """
+    baseline = {
+        (entry["scenario"], entry["concurrency"]): entry
+        for entry in json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    }
+    
+    regressions = []
+    for result in results:
+        base = baseline.get((result.scenario, result.concurrency))
+        if base is None:
+            continue
+        if result.p95_ms > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.scenario} x{result.concurrency}: p95 {result.p95_ms:.1f} ms "
+                f"vs {base['p95_ms']:.1f} ms"
+            )
+        if result.throughput_ops_s < base["throughput_ops_s"] * (1 - tolerance):
+            regressions.append(
+                f"{result.scenario} x{result.concurrency}: throughput {result.throughput_ops_s:.2f} ops/s "
+                f"vs {base['throughput_ops_s']:.2f} ops/s"
+            )
+    return regressions
+
+
+def print_result(result: LevelResult) -> None:
+    """Print one result row."""
+    memory = f"{result.peak_rss_mb:7.1f}" if result.peak_rss_mb is not None else "      -"
+    print(
+        f"   x{result.concurrency:<3} {result.ops:5d} ops  {result.throughput_ops_s:8.2f} ops/s  "
+        f"p50 {result.p50_ms:8.1f}  p95 {result.p95_ms:8.1f}  p99 {result.p99_ms:8.1f} ms  "
+        f"req/op {result.requests_per_op:6.1f}  rss {memory} MB  errors {result.errors}"
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark storage and Salesforce operations offline")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", default="1,2,4,8,16",
+                        help="Comma-separated concurrency levels (default: 1,2,4,8,16)")
+    parser.add_argument("--ops-per-worker", type=int, default=4,
+                        help="Operations per worker thread at each level (default: 4)")
+    parser.add_argument("--assessment-type", default="ICT", choices=["ICT", "FCT", "IAT"],
+                        help="Template and destination layout to use (default: ICT)")
+    parser.add_argument("--files", type=int, default=3, help="Files per upload operation (default: 3)")
+    parser.add_argument("--file-size-kb", type=int, default=256, help="Size of each uploaded file (default: 256)")
+    parser.add_argument("--html-size-kb", type=int, default=64, help="Size of the HTML report (default: 64)")
+    parser.add_argument("--duplicate-files", action="store_true",
+                        help="Upload the same content every time, to exercise upload dedup")
+    parser.add_argument("--async-graph", action="store_true",
+                        help="Use the asyncio SharePoint provider (requires aiohttp)")
+    add_fault_arguments(parser, "graph-", FaultConfig(latency_ms=20, jitter_ms=10))
+    add_fault_arguments(parser, "sf-", FaultConfig(latency_ms=80, jitter_ms=40))
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also report tracemalloc peaks (slows the run)")
+    parser.add_argument("--log-level", default="CRITICAL", help="Application log level (default: CRITICAL)")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to a JSON file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare with a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression against the baseline (default: 0.2)")
+    args = parser.parse_args()
+    
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+    
+    from core.logging_config import setup_logging
+    setup_logging(log_level=args.log_level, use_queue=False)
+    
+    print("=" * 70)
+    print("OFFLINE BENCHMARK")
+    print("=" * 70)
+    
+    graph_faults = faults_from_args(args, "graph-")
+    sf_faults = faults_from_args(args, "sf-")
+    print(f"Graph faults:      {graph_faults}")
+    print(f"Salesforce faults: {sf_faults}")
+    
+    results: List[LevelResult] = []
+    with tempfile.TemporaryDirectory() as storage_root, \
+            FakeGraphServer(graph_faults, drive_id=DRIVE_ID) as graph, \
+            FakeSalesforceServer(sf_faults) as salesforce:
+        install_settings(Path(storage_root))
+        # Fresh project index per run: a saved delta link would point at an old fake server
+        os.environ["PROJECT_INDEX_DB_PATH"] = str(Path(storage_root) / "project_index.db")
+        os.environ["BLOB_INDEX_DB_PATH"] = str(Path(storage_root) / "blob_index.db")
+        operations = make_scenarios(args, graph, salesforce)
+        
+        next_op = 0
+        for scenario in scenarios:
+            server = salesforce if scenario == "create_opportunity" else graph
+            print(f"\n📊 {scenario}")
+            for concurrency in levels:
+                ops = concurrency * args.ops_per_worker
+                result = run_level(
+                    scenario, operations[scenario], concurrency, ops, server, next_op, args.trace_memory
+                )
+                next_op += ops
+                results.append(result)
+                print_result(result)
+        
+        totals = graph.drive.count()
+        print(f"\n🗂️  Fake drive: {totals['folders']} folders, {totals['files']} files, "
+              f"{graph.drive.bytes_uploaded / 1024 / 1024:.1f} MB uploaded")
+        print(f"☁️  Fake org: {salesforce.count('Opportunity')} opportunities")
+        print(f"🚦 Graph: {graph.throttled_requests} throttled, {graph.injected_errors} injected errors; "
+              f"Salesforce: {salesforce.throttled_requests} throttled, {salesforce.injected_errors} injected errors")
+    
+    if args.json:
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "graph_faults": asdict(graph_faults),
+            "salesforce_faults": asdict(sf_faults),
+            "results": [asdict(result) for result in results],
+        }
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n💾 Results written to {args.json}")
+    
+    failed = False
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+        print(f"\n📈 Compared with {args.baseline} (tolerance {args.tolerance:.0%})")
+        for message in regressions:
+            print(f"   ❌ {message}")
+        failed = bool(regressions)
+    
+    print("\n" + "=" * 70)
+    print("❌ Regressions against baseline" if failed else "✅ Benchmark complete")
+    print("=" * 70)
+    
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
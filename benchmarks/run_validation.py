@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Validation Throughput Benchmark
+
+This script measures how fast assessment records are validated, for bulk
+imports and headless submissions:
+
+    substring   previous implementation: required-field loop plus a substring
+                search of every INVALID_EMAILS domain per email
+    form        validate_fields()/validate_fields_iat() on each record, as the
+                form pages validate
+    schema      ValidationSchema.validate_batch() on the whole list, as bulk
+                imports and headless submissions validate
+
+Synthetic records of every assessment type are generated with a share of
+invalid ones (missing fields, empty fields, personal emails). The script
+checks that the schemas report the same errors as the form validators for
+the rules the form validators apply (required fields and corporate emails;
+the customer check the ICT/FCT/FIX schemas add is left out) and prints
+records per second for each mode.
+
+Usage:
+    python benchmarks/run_validation.py
+    python benchmarks/run_validation.py --records 50000 --invalid-rate 0.2 --runs 5
+    python benchmarks/run_validation.py --json validation.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pages.utils.constants import INVALID_EMAILS
+from pages.utils.validation_schemas import ASSESSMENT_SCHEMAS, ValidationSchema, error_messages
+from pages.utils.validations import validate_fields, validate_fields_iat
+
+MODES = ["substring", "form", "schema"]
+
+# Form validator of each assessment type, as called by its page
+FORM_VALIDATORS: Dict[str, Callable[[Dict[str, str]], List[str]]] = {
+    "ICT": validate_fields,
+    "FCT": validate_fields,
+    "IAT": validate_fields_iat,
+    "FIX": validate_fields,
+}
+
+
+@dataclass
+class ModeResult:
+    """Measurements for one mode and assessment type."""
+    mode: str
+    assessment_type: str
+    records: int
+    best_s: float
+    median_s: float
+    records_per_s: float
+
+
+def make_records(schema: ValidationSchema, count: int, invalid_rate: float, seed: int) -> List[Dict[str, str]]:
+    """
+    Generate form data records for a schema.
+    
+    Args:
+        schema: Schema whose required fields are filled.
+        count: Number of records.
+        invalid_rate: Share of records with one error.
+        seed: Random seed (same records on every run).
+    
+    Returns:
+        List of records.
+    """
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        record = {field: f"{field} {index}" for field in schema.required}
+        record["contact_email"] = f"user{index}@company{index % 50}.com"
+        record["customer_name"] = f"Customer {index % 200}"
+        record["country"] = "Mexico"
+        record["additional_comments"] = "Generated by the validation benchmark"
+        
+        if rng.random() < invalid_rate:
+            fault = rng.choice(["missing", "empty", "personal"])
+            field = rng.choice(schema.required)
+            if fault == "missing":
+                del record[field]
+            elif fault == "empty":
+                record[field] = ""
+            else:
+                record["contact_email"] = f"user{index}{rng.choice(INVALID_EMAILS)}"
+        records.append(record)
+    return records
+
+
+def substring_validate(required: List[str], record: Dict[str, str]) -> List[str]:
+    """The previous validate_required_fields()/validate_email() algorithm, for comparison."""
+    errors = []
+    for field in required:
+        if field not in record:
+            errors.append(f"The field {field} is required.")
+            continue
+        if field == "contact_email":
+            if not record[field]:
+                errors.append("The email field is required.")
+            elif any(domain in record[field] for domain in INVALID_EMAILS):
+                errors.append("Invalid email, only corporate emails accepted")
+        elif not record[field]:
+            errors.append(f"The field {field} is required.")
+    return errors
+
+
+def mode_function(mode: str, schema: ValidationSchema) -> Callable[[List[Dict[str, str]]], object]:
+    """Function validating a list of records in the given mode."""
+    if mode == "substring":
+        required = list(schema.required)
+        return lambda records: [substring_validate(required, record) for record in records]
+    if mode == "form":
+        validate = FORM_VALIDATORS[schema.name]
+        return lambda records: [validate(record) for record in records]
+    return schema.validate_batch
+
+
+def check_consistency(schema: ValidationSchema, records: List[Dict[str, str]]) -> int:
+    """
+    Number of records for which the schema and the form validator disagree.
+    
+    Only the schema's required-field rules are compared: its customer check
+    (``any_of``) has no counterpart in the form validators.
+    """
+    validate_form = FORM_VALIDATORS[schema.name]
+    by_schema = error_messages([error for error in schema.validate_batch(records) if error.field in schema.required])
+    return sum(1 for row, record in enumerate(records) if validate_form(record) != by_schema.get(row, []))
+
+
+def measure(mode: str, schema: ValidationSchema, records: List[Dict[str, str]], runs: int) -> ModeResult:
+    """Time one mode over all records, keeping the best and median run."""
+    validate = mode_function(mode, schema)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        validate(records)
+        timings.append(time.perf_counter() - start)
+    
+    best = min(timings)
+    return ModeResult(
+        mode=mode,
+        assessment_type=schema.name,
+        records=len(records),
+        best_s=best,
+        median_s=statistics.median(timings),
+        records_per_s=len(records) / best if best > 0 else 0.0
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark assessment validation throughput")
+    parser.add_argument("--records", type=int, default=10000, help="Records per assessment type (default: 10000)")
+    parser.add_argument("--invalid-rate", type=float, default=0.1, help="Share of invalid records (default: 0.1)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per mode; the best is reported (default: 3)")
+    parser.add_argument("--types", default=",".join(ASSESSMENT_SCHEMAS), help="Assessment types (default: all)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to a JSON file")
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("VALIDATION BENCHMARK")
+    print("=" * 70)
+    print(f"Records per type: {args.records}, invalid rate: {args.invalid_rate:.0%}, runs: {args.runs}")
+    
+    results: List[ModeResult] = []
+    mismatches = 0
+    for assessment_type in args.types.split(","):
+        schema = ASSESSMENT_SCHEMAS[assessment_type.strip().upper()]
+        records = make_records(schema, args.records, args.invalid_rate, args.seed)
+        invalid = len(error_messages(schema.validate_batch(records)))
+        mismatched = check_consistency(schema, records)
+        mismatches += mismatched
+        
+        print(f"\n📊 {schema.name}: {invalid} invalid records, {mismatched} schema/form mismatches")
+        print(f"{'mode':<12}{'best ms':>10}{'median ms':>12}{'records/s':>14}{'speedup':>10}")
+        baseline = None
+        for mode in MODES:
+            result = measure(mode, schema, records, args.runs)
+            results.append(result)
+            baseline = baseline or result.records_per_s
+            print(f"{mode:<12}{result.best_s * 1000:>10.1f}{result.median_s * 1000:>12.1f}"
+                  f"{result.records_per_s:>14,.0f}{result.records_per_s / baseline:>9.1f}x")
+    
+    if args.json:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=2))
+        print(f"\nResults written to {args.json}")
+    
+    if mismatches:
+        print(f"\n❌ {mismatches} records validated differently by the schemas and the form validators")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
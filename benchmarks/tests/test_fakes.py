@@ -0,0 +1,94 @@
+"""Tests for the fake Graph and Salesforce servers used by benchmarks and unit tests."""
+
+import requests
+
+from benchmarks.fake_graph import FakeGraphServer
+from benchmarks.fake_salesforce import FakeSalesforceServer
+from benchmarks.fake_server import FaultConfig
+
+
+def drive_url(graph, path=""):
+    return f"{graph.url}/v1.0/drives/{graph.drive.drive_id}/root" + (f":/{path}" if path else "")
+
+
+def test_paths_are_case_insensitive(fake_graph):
+    fake_graph.drive.mkdirs("Projects/ICT")
+    response = requests.get(drive_url(fake_graph, "projects/ict"))
+    assert response.status_code == 200
+    assert response.json()["name"] == "ICT"
+    assert requests.get(drive_url(fake_graph, "projects/fct")).status_code == 404
+
+
+def test_folder_creation_conflicts_and_missing_parents(fake_graph):
+    fake_graph.drive.mkdirs("Projects")
+    body = {"name": "ICT", "folder": {}, "@microsoft.graph.conflictBehavior": "fail"}
+    
+    assert requests.post(drive_url(fake_graph, "Projects") + ":/children", json=body).status_code == 201
+    assert requests.post(drive_url(fake_graph, "Projects") + ":/children", json=body).status_code == 409
+    assert requests.post(drive_url(fake_graph, "Missing") + ":/children", json=body).status_code == 404
+
+
+def test_uploads_create_parents_and_count_bytes(fake_graph):
+    response = requests.put(drive_url(fake_graph, "A/B/report.html") + ":/content", data=b"x" * 10)
+    assert response.status_code == 201
+    assert fake_graph.drive.lookup("a/b/REPORT.html").size == 10
+    assert fake_graph.drive.bytes_uploaded == 10
+    assert fake_graph.drive.count() == {"folders": 2, "files": 1}
+
+
+def test_batch_runs_subrequests_and_enforces_the_limit(fake_graph):
+    fake_graph.drive.mkdirs("Projects")
+    batch = {"requests": [
+        {"id": "1", "method": "GET", "url": f"/drives/{fake_graph.drive.drive_id}/root:/Projects"},
+        {"id": "2", "method": "GET", "url": f"/drives/{fake_graph.drive.drive_id}/root:/Missing"},
+    ]}
+    responses = requests.post(f"{fake_graph.url}/v1.0/$batch", json=batch).json()["responses"]
+    assert [(r["id"], r["status"]) for r in responses] == [("1", 200), ("2", 404)]
+    
+    too_many = {"requests": [dict(batch["requests"][0], id=str(i)) for i in range(21)]}
+    assert requests.post(f"{fake_graph.url}/v1.0/$batch", json=too_many).status_code == 400
+
+
+def test_injected_errors_carry_retry_after():
+    with FakeGraphServer(FaultConfig(error_rate=1.0, error_status=503, retry_after=2)) as graph:
+        response = requests.get(drive_url(graph))
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert graph.injected_errors == 1
+
+
+def test_throttling_answers_429_above_the_rate():
+    with FakeGraphServer(FaultConfig(throttle_rps=2)) as graph:
+        statuses = [requests.get(drive_url(graph)).status_code for _ in range(4)]
+    assert statuses[:2] == [200, 200]
+    assert 429 in statuses[2:]
+    assert graph.throttled_requests >= 1
+
+
+def test_salesforce_collections_honour_all_or_none():
+    with FakeSalesforceServer(account_count=0) as salesforce:
+        url = f"{salesforce.url}/services/data/v59.0/composite/sobjects"
+        records = [
+            {"attributes": {"type": "Opportunity"}, "Name": "A"},
+            {"attributes": {"type": "Opportunity"}},
+        ]
+        partial = requests.post(url, json={"records": records}).json()
+        assert [result["success"] for result in partial] == [True, False]
+        
+        rolled_back = requests.post(url, json={"records": records, "allOrNone": True}).json()
+        assert [result["success"] for result in rolled_back] == [False, False]
+        assert salesforce.count("Opportunity") == 1
+        
+        too_many = {"records": [{"attributes": {"type": "Opportunity"}, "Name": "x"}] * 201}
+        assert requests.post(url, json=too_many).status_code == 400
+
+
+def test_salesforce_queries_are_paginated():
+    with FakeSalesforceServer(account_count=5, page_size=2) as salesforce:
+        url = f"{salesforce.url}/services/data/v59.0/query/"
+        names = []
+        while url:
+            page = requests.get(url, params={"q": "SELECT Id, Name FROM Account"}).json()
+            names += [record["Name"] for record in page["records"]]
+            url = salesforce.url + page["nextRecordsUrl"] if not page["done"] else None
+    assert names == [f"Customer {index:04d}" for index in range(5)]
@@ -0,0 +1,18 @@
+"""Tests for the schema/form consistency check of benchmarks.run_validation."""
+
+from benchmarks import run_validation
+from benchmarks.run_validation import check_consistency, make_records
+from pages.utils.validation_schemas import ASSESSMENT_SCHEMAS, error_messages
+
+
+def test_schemas_agree_with_the_form_validators():
+    for schema in ASSESSMENT_SCHEMAS.values():
+        assert check_consistency(schema, make_records(schema, 500, 0.5, seed=3)) == 0
+
+
+def test_a_diverging_form_validator_is_reported(monkeypatch):
+    schema = ASSESSMENT_SCHEMAS["ICT"]
+    records = make_records(schema, 200, 0.5, seed=3)
+    monkeypatch.setitem(run_validation.FORM_VALIDATORS, "ICT", lambda record: [])
+    
+    assert check_consistency(schema, records) == len(error_messages(schema.validate_batch(records)))
@@ -0,0 +1,91 @@
+"""
+Shared pytest fixtures.
+
+Unit tests run against the in-process fake Microsoft Graph and Salesforce
+servers of the offline benchmarks, with settings installed in memory, so
+they need no credentials, .env file or network access. Process-wide caches
+and SQLite stores are redirected to a temporary folder.
+"""
+
+import pytest
+
+from benchmarks.fake_graph import FakeGraphServer
+from benchmarks.fake_salesforce import FakeSalesforceServer
+from benchmarks.fake_server import FaultConfig
+from benchmarks.run_offline import DRIVE_ID, build_salesforce_service, build_storage_service, install_settings
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_environment(tmp_path_factory):
+    """Keep SQLite stores out of the repository and background services off."""
+    root = tmp_path_factory.mktemp("state")
+    patch = pytest.MonkeyPatch()
+    patch.setenv("METRICS_DB_PATH", str(root / "stage_metrics.db"))
+    patch.setenv("SUBMISSION_QUEUE_DB_PATH", str(root / "submission_queue.db"))
+    patch.setenv("PROJECT_INDEX_DB_PATH", str(root / "project_index.db"))
+    patch.setenv("BLOB_INDEX_DB_PATH", str(root / "blob_index.db"))
+    patch.setenv("METRICS_PORT", "0")
+    patch.setenv("STARTUP_WARMUP", "false")
+    yield root
+    patch.undo()
+
+
+@pytest.fixture(autouse=True)
+def graph_throttle(monkeypatch):
+    """Fresh process-wide Graph throttle, so throttling in one test does not slow the next."""
+    from storage import graph_throttle as throttle_module
+    
+    monkeypatch.setattr(throttle_module, "_graph_throttle", None)
+    return throttle_module.get_graph_throttle()
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """In-memory settings pointing at the fake tenant."""
+    import config.settings as settings_module
+    
+    monkeypatch.setattr(settings_module, "_settings", None)
+    install_settings(tmp_path / "storage")
+    return settings_module._settings
+
+
+@pytest.fixture
+def fake_graph():
+    """Running fake Graph server without latency or faults."""
+    with FakeGraphServer(FaultConfig(), drive_id=DRIVE_ID) as graph:
+        yield graph
+
+
+@pytest.fixture
+def fake_salesforce():
+    """Running fake Salesforce org seeded with five accounts."""
+    with FakeSalesforceServer(FaultConfig(), account_count=5) as salesforce:
+        yield salesforce
+
+
+@pytest.fixture
+def storage_service(settings, fake_graph):
+    """StorageService whose SharePoint provider talks to ``fake_graph``."""
+    return build_storage_service(fake_graph)
+
+
+@pytest.fixture
+def salesforce_service(settings, fake_salesforce):
+    """SalesforceService whose client talks to ``fake_salesforce``."""
+    return build_salesforce_service(fake_salesforce)
+
+
+@pytest.fixture
+def graph_calls(monkeypatch):
+    """(method, URL) of every Graph request the sync provider sends."""
+    import requests
+    
+    calls = []
+    real_request = requests.request
+    
+    def request(method, url, **kwargs):
+        calls.append((method, url))
+        return real_request(method, url, **kwargs)
+    
+    monkeypatch.setattr(requests, "request", request)
+    return calls
@@ -12,7 +12,7 @@ from .exceptions import (
     SalesforceError,
     StorageError
 )
-from .logging_config import setup_logging, get_logger
+from .logging_config import setup_logging, get_logger, correlation_context, get_correlation_id
 
 __all__ = [
     'AuthService',
@@ -23,5 +23,7 @@ __all__ = [
     'SalesforceError',
     'StorageError',
     'setup_logging',
-    'get_logger'
+    'get_logger',
+    'correlation_context',
+    'get_correlation_id'
 ]
@@ -56,3 +56,8 @@ class StorageError(IBTestError):
 class ConfigurationError(IBTestError):
     """Exception raised for configuration errors."""
     pass
+
+
+class WorkerUnavailableError(IBTestError):
+    """Exception raised when no submission worker pool is running to take a queued job."""
+    pass
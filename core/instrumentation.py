@@ -0,0 +1,421 @@
+"""
+Instrumentation Module
+
+This module provides lightweight timing spans for the submission pipeline.
+
+A submission is wrapped in ``submission_trace()``; each stage inside it is
+wrapped in ``span()``. Spans record their duration, the bytes moved and the
+number of HTTP calls made while they were open. When the trace finishes,
+all spans are written to a local SQLite metrics store, which can report
+percentiles per stage over a rolling time window.
+
+Usage:
+    with submission_trace("ICT"):
+        with span("validation"):
+            validate()
+        with span("upload", filename=name) as s:
+            s.add_bytes(len(data))
+            upload(data)
+
+Deep code (storage providers, Salesforce session hooks) reports activity
+with ``record_http_call()`` and ``record_bytes()``; both are no-ops when no
+span is open.
+"""
+
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.logging_config import get_logger, get_correlation_id
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "submission_stage_duration_seconds",
+    "Duration of submission pipeline stages",
+    ["stage"]
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "submission_stage_errors_total",
+    "Submission pipeline stages that raised",
+    ["stage"]
+)
+
+# Default location of the metrics database (override with METRICS_DB_PATH)
+DEFAULT_METRICS_DB = Path(__file__).parent.parent / ".metrics" / "stage_metrics.db"
+
+# Spans older than this are deleted (override with METRICS_RETENTION_HOURS)
+DEFAULT_RETENTION_HOURS = 168
+
+# Prune once every N recorded submissions
+PRUNE_EVERY_TRACES = 100
+
+# Percentiles use at most this many of the most recent spans per stage
+MAX_PERCENTILE_SAMPLES = 10000
+
+
+@dataclass
+class Span:
+    """Timing record for one pipeline stage."""
+    name: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    started_at: float = 0.0
+    duration_ms: float = 0.0
+    bytes: int = 0
+    http_calls: int = 0
+    ok: bool = True
+    
+    def add_bytes(self, count: int) -> None:
+        """Add transferred bytes to this span."""
+        self.bytes += count
+
+
+@dataclass
+class SubmissionTrace:
+    """All spans recorded for a single submission."""
+    assessment_type: str
+    correlation_id: str
+    started_at: float = field(default_factory=time.time)
+    spans: List[Span] = field(default_factory=list)
+    
+    @property
+    def total_ms(self) -> float:
+        """Wall time of the submission so far, in milliseconds."""
+        return (time.time() - self.started_at) * 1000
+    
+    def summary(self) -> str:
+        """One-line summary of stage durations for logging."""
+        return ", ".join(f"{s.name}={s.duration_ms:.0f}ms" for s in self.spans)
+
+
+# Trace of the submission running in the current thread/task
+_current_trace: contextvars.ContextVar[Optional[SubmissionTrace]] = contextvars.ContextVar(
+    "submission_trace", default=None
+)
+
+# Stack of open spans; HTTP calls and bytes are attributed to all of them
+_open_spans: contextvars.ContextVar[Tuple[Span, ...]] = contextvars.ContextVar(
+    "open_spans", default=()
+)
+
+
+def get_current_trace() -> Optional[SubmissionTrace]:
+    """
+    Get the submission trace bound to the current context.
+    
+    Returns:
+        Active SubmissionTrace, or None outside of a submission.
+    """
+    return _current_trace.get()
+
+
+def record_http_call(count: int = 1) -> None:
+    """
+    Count HTTP requests against every open span.
+    
+    Args:
+        count: Number of requests made.
+    """
+    for open_span in _open_spans.get():
+        open_span.http_calls += count
+
+
+def record_bytes(count: int) -> None:
+    """
+    Count transferred bytes against every open span.
+    
+    Args:
+        count: Number of bytes sent or received.
+    """
+    for open_span in _open_spans.get():
+        open_span.bytes += count
+
+
+@contextmanager
+def span(name: str, **attributes: str) -> Iterator[Span]:
+    """
+    Time a pipeline stage.
+    
+    Nested spans are allowed; a nested span's HTTP calls and bytes are also
+    counted by its parents. The span is attached to the active submission
+    trace if there is one.
+    
+    Args:
+        name: Stage name (e.g. "copy_template").
+        attributes: Optional string attributes (e.g. filename).
+    
+    Yields:
+        The Span being recorded.
+    """
+    current = Span(name=name, attributes=attributes, started_at=time.time())
+    token = _open_spans.set(_open_spans.get() + (current,))
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        current.ok = False
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - start) * 1000
+        _open_spans.reset(token)
+        
+        STAGE_SECONDS.labels(stage=name).observe(current.duration_ms / 1000)
+        if not current.ok:
+            STAGE_ERRORS.labels(stage=name).inc()
+        
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.spans.append(current)
+
+
+@contextmanager
+def submission_trace(assessment_type: str) -> Iterator[SubmissionTrace]:
+    """
+    Collect the spans of one submission and persist them when it ends.
+    
+    Args:
+        assessment_type: Type of assessment (ICT, FCT, IAT).
+    
+    Yields:
+        The SubmissionTrace being recorded.
+    """
+    trace = SubmissionTrace(
+        assessment_type=assessment_type,
+        correlation_id=get_correlation_id()
+    )
+    token = _current_trace.set(trace)
+    try:
+        with span("submission"):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        logger.info("Submission timings (%s): %s", assessment_type, trace.summary())
+        try:
+            get_metrics_store().record_trace(trace)
+        except Exception as e:
+            # Metrics must never break a submission
+            logger.warning("Failed to store submission metrics: %s", e)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Linear-interpolated percentile of an already sorted list.
+    
+    Args:
+        sorted_values: Values in ascending order (non-empty).
+        q: Percentile between 0 and 100.
+    
+    Returns:
+        Percentile value.
+    """
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class MetricsStore:
+    """
+    Local SQLite store for per-stage submission metrics.
+    
+    Each finished span is one row. Queries aggregate rows inside a rolling
+    time window. Rows older than the retention are pruned when the store is
+    opened and every ``prune_every`` recorded submissions.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path,
+        retention_seconds: Optional[float] = DEFAULT_RETENTION_HOURS * 3600,
+        prune_every: int = PRUNE_EVERY_TRACES
+    ):
+        """
+        Initialize the metrics store.
+        
+        Args:
+            db_path: Path to the SQLite database file (created if missing).
+            retention_seconds: Age after which spans are deleted (None keeps
+                               them forever).
+            prune_every: Prune after this many record_trace() calls.
+        """
+        self.db_path = Path(db_path)
+        self.retention_seconds = retention_seconds
+        self.prune_every = max(1, prune_every)
+        self._traces_since_prune = 0
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS spans (
+                    ts REAL NOT NULL,
+                    correlation_id TEXT,
+                    assessment_type TEXT,
+                    stage TEXT NOT NULL,
+                    duration_ms REAL NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    http_calls INTEGER NOT NULL,
+                    ok INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_spans_stage_ts ON spans (stage, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_spans_ts ON spans (ts)")
+        
+        if self.retention_seconds is not None:
+            self.prune(self.retention_seconds)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe to use from any thread)."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:  # Commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+    
+    def record_trace(self, trace: SubmissionTrace) -> None:
+        """
+        Persist all spans of a finished submission.
+        
+        Args:
+            trace: Completed submission trace.
+        """
+        rows = [
+            (
+                s.started_at,
+                trace.correlation_id,
+                trace.assessment_type,
+                s.name,
+                s.duration_ms,
+                s.bytes,
+                s.http_calls,
+                int(s.ok)
+            )
+            for s in trace.spans
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._traces_since_prune += 1
+            due = self._traces_since_prune >= self.prune_every
+            if due:
+                self._traces_since_prune = 0
+        
+        if due and self.retention_seconds is not None:
+            self.prune(self.retention_seconds)
+    
+    def percentiles(
+        self,
+        window_seconds: float = 3600,
+        quantiles: Tuple[float, ...] = (50, 90, 95, 99),
+        max_samples: int = MAX_PERCENTILE_SAMPLES
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compute per-stage statistics over a rolling window.
+        
+        Counts and averages are aggregated by SQLite over the whole window;
+        percentiles use the ``max_samples`` most recent spans of each stage,
+        so memory stays bounded however busy the window was.
+        
+        Args:
+            window_seconds: Only spans started within this many seconds.
+            quantiles: Percentiles to compute.
+            max_samples: Maximum spans per stage loaded for percentiles.
+        
+        Returns:
+            Mapping of stage name to a dict with count, error count, average
+            bytes/HTTP calls and ``p<q>`` duration percentiles in ms.
+        """
+        since = time.time() - window_seconds
+        with self._connect() as conn:
+            totals = conn.execute(
+                """
+                SELECT stage, COUNT(*), SUM(ok = 0), AVG(bytes), AVG(http_calls)
+                FROM spans WHERE ts >= ? GROUP BY stage
+                """,
+                (since,)
+            ).fetchall()
+            samples = conn.execute(
+                """
+                SELECT stage, duration_ms FROM (
+                    SELECT stage, duration_ms,
+                           ROW_NUMBER() OVER (PARTITION BY stage ORDER BY ts DESC) AS recent
+                    FROM spans WHERE ts >= ?
+                ) WHERE recent <= ?
+                """,
+                (since, max_samples)
+            ).fetchall()
+        
+        durations: Dict[str, List[float]] = {}
+        for stage, duration_ms in samples:
+            durations.setdefault(stage, []).append(duration_ms)
+        
+        stats = {}
+        for stage, count, errors, avg_bytes, avg_http_calls in totals:
+            stage_durations = sorted(durations[stage])
+            stage_stats = {
+                "count": count,
+                "errors": errors,
+                "avg_bytes": avg_bytes,
+                "avg_http_calls": avg_http_calls,
+            }
+            for q in quantiles:
+                stage_stats[f"p{q:g}"] = _percentile(stage_durations, q)
+            stats[stage] = stage_stats
+        
+        return stats
+    
+    def prune(self, older_than_seconds: float) -> int:
+        """
+        Delete spans older than the given age.
+        
+        Args:
+            older_than_seconds: Maximum age of rows to keep.
+        
+        Returns:
+            Number of rows deleted.
+        """
+        cutoff = time.time() - older_than_seconds
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM spans WHERE ts < ?", (cutoff,))
+            return cursor.rowcount
+
+
+# Singleton instance
+_metrics_store: Optional[MetricsStore] = None
+_metrics_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """
+    Get the metrics store singleton.
+    
+    The database path is read from METRICS_DB_PATH, defaulting to
+    ``.metrics/stage_metrics.db`` in the project root. Spans are kept for
+    METRICS_RETENTION_HOURS (default 168; 0 keeps them forever).
+    
+    Returns:
+        MetricsStore instance.
+    """
+    global _metrics_store
+    if _metrics_store is None:
+        with _metrics_store_lock:
+            if _metrics_store is None:
+                db_path = Path(os.getenv("METRICS_DB_PATH", str(DEFAULT_METRICS_DB)))
+                retention_hours = float(os.getenv("METRICS_RETENTION_HOURS", str(DEFAULT_RETENTION_HOURS)))
+                _metrics_store = MetricsStore(
+                    db_path,
+                    retention_seconds=retention_hours * 3600 if retention_hours > 0 else None
+                )
+    return _metrics_store
@@ -7,14 +7,32 @@ It sets up structured logging with appropriate formatters and handlers.
 Environment-aware logging:
 - Development (local): INFO level - Detailed logs
 - Production (Streamlit Cloud): WARNING level - Only important messages
+
+Non-blocking pipeline:
+- The root logger only has a QueueHandler, so the calling (request) thread
+  just enqueues the record. Formatting and stdout/file I/O happen in a
+  QueueListener background thread.
+- Every record carries a ``correlation_id`` (one per form submission) that
+  is set with ``correlation_context()``.
+- ``LOG_FORMAT=json`` switches the output to one JSON object per line.
 """
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Iterator, Optional
+from datetime import datetime, timezone
 
 # Try to import streamlit to detect cloud environment
 try:
@@ -42,10 +60,136 @@ def _is_production() -> bool:
     return False
 
 
+# Correlation ID of the submission being processed by the current thread/task
+_correlation_id: contextvars.ContextVar[str] = contextvars.ContextVar("correlation_id", default="-")
+
+# Background listener draining the log queue (one per process)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# Resolved settings of the last setup_logging() call, to skip identical reruns
+_logging_settings: Optional[tuple] = None
+_logging_lock = threading.Lock()
+
+
+def new_correlation_id() -> str:
+    """
+    Generate a new short correlation ID.
+    
+    Returns:
+        12-character hexadecimal identifier.
+    """
+    return uuid.uuid4().hex[:12]
+
+
+def get_correlation_id() -> str:
+    """
+    Get the correlation ID bound to the current context.
+    
+    Returns:
+        Correlation ID, or "-" if none is set.
+    """
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_context(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Bind a correlation ID to every log record emitted inside the block.
+    
+    Usage:
+        with correlation_context() as cid:
+            logger.info("Processing submission")  # carries cid
+    
+    Args:
+        correlation_id: ID to bind. If None, a new one is generated.
+        
+    Yields:
+        The bound correlation ID.
+    """
+    correlation_id = correlation_id or new_correlation_id()
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Attach the current correlation ID to each log record."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = _correlation_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+            "location": f"{record.filename}:{record.lineno}",
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting and I/O to the listener thread.
+    
+    Like the stock QueueHandler.prepare(), ``msg % args`` is merged in the
+    calling thread, so mutable arguments are rendered as they were when the
+    call was made. Unlike it, the record is not run through a formatter and
+    keeps its ``exc_info``: our queue is in-process, so the listener's
+    formatters (text or JSON) render the rest.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+def get_log_queue_depth() -> int:
+    """
+    Get the number of log records waiting for the listener thread.
+    
+    Returns:
+        Queue size, or 0 when logging is not queue-based.
+    """
+    if _queue_listener is None:
+        return 0
+    return _queue_listener.queue.qsize()
+
+
+def _stop_queue_listener() -> None:
+    """Flush and stop the background log listener, if running."""
+    global _queue_listener, _logging_settings
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+    _logging_settings = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def setup_logging(
     log_level: Optional[str] = None,
     log_file: Optional[Path] = None,
-    log_format: Optional[str] = None
+    log_format: Optional[str] = None,
+    json_format: Optional[bool] = None,
+    use_queue: bool = True
 ) -> None:
     """
     Set up logging configuration for the application.
@@ -54,42 +198,94 @@ def setup_logging(
     - Development (local): INFO level - Detailed logs for debugging
     - Production (Streamlit Cloud): WARNING level - Only important messages
     
+    Idempotent per process: calling it again with the same settings (e.g. on
+    every Streamlit rerun) keeps the running listener and handlers. Calling
+    it with different settings stops the previous listener and replaces it.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
-                   If None, automatically determined based on environment.
-        log_file: Optional path to log file. If None, logs only to console.
-        log_format: Optional custom log format string.
+                   If None, read from LOG_LEVEL (default INFO).
+        log_file: Optional path to log file. If None, read from LOG_FILE;
+                  if unset, logs only to console.
+        log_format: Optional custom log format string (text output only).
+        json_format: Emit JSON lines. If None, enabled when LOG_FORMAT=json.
+        use_queue: Route records through a QueueHandler/QueueListener so the
+                   calling thread never blocks on formatting or I/O.
     """
+    global _logging_settings
+    
     # Auto-detect log level based on environment if not specified
     if log_level is None:
-        log_level = "INFO"  # Always INFO - logging overhead is negligible
+        log_level = os.getenv("LOG_LEVEL", "INFO")
+    if log_file is None and os.getenv("LOG_FILE"):
+        log_file = Path(os.getenv("LOG_FILE"))
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
     if log_format is None:
         log_format = (
-            '%(asctime)s - %(name)s - %(levelname)s - '
+            '%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] - '
             '%(filename)s:%(lineno)d - %(message)s'
         )
     
+    settings = (log_level.upper(), str(log_file) if log_file else None, log_format, json_format, use_queue)
+    with _logging_lock:
+        if settings == _logging_settings:
+            return
+        _configure_logging(log_level, log_file, log_format, json_format, use_queue)
+        _logging_settings = settings
+
+
+def _configure_logging(
+    log_level: str,
+    log_file: Optional[Path],
+    log_format: str,
+    json_format: bool,
+    use_queue: bool
+) -> None:
+    """Install the handlers (and listener) described by setup_logging()."""
+    global _queue_listener
+    
     # Create formatter
-    formatter = logging.Formatter(log_format)
+    formatter = JsonFormatter() if json_format else logging.Formatter(log_format)
+    correlation_filter = CorrelationIdFilter()
     
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
     
-    # Remove existing handlers
+    # Remove existing handlers (and the listener feeding them)
+    _stop_queue_listener()
     root_logger.handlers = []
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler (if log_file is provided)
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(logging.FileHandler(log_file))
+    
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.addFilter(correlation_filter)
+    
+    if not use_queue:
+        for handler in handlers:
+            root_logger.addHandler(handler)
+        return
+    
+    # The filter runs on the QueueHandler so the correlation ID is captured
+    # in the emitting thread, before the record crosses to the listener.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(correlation_filter)
+    root_logger.addHandler(queue_handler)
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -119,3 +315,63 @@ class LoggerMixin:
     def logger(self) -> logging.Logger:
         """Get logger for this class."""
         return get_logger(self.__class__.__name__)
+
+
+class SampledLogger:
+    """
+    Rate-limited logger for per-item messages inside hot loops.
+    
+    Emits the first call, then at most one call every ``every`` calls and
+    no more often than ``min_interval`` seconds. Skipped calls are counted
+    and reported with the next emitted message. When the level is disabled
+    the call returns immediately without touching the arguments.
+    
+    Usage:
+        sampled = SampledLogger(logger, every=25)
+        for item in items:
+            sampled.debug("Uploaded %s", item)
+    """
+    
+    def __init__(self, logger: logging.Logger, every: int = 10, min_interval: float = 1.0):
+        """
+        Initialize the sampled logger.
+        
+        Args:
+            logger: Logger to emit through.
+            every: Emit at most one of every N calls.
+            min_interval: Minimum seconds between emitted messages.
+        """
+        self.logger = logger
+        self.every = max(1, every)
+        self.min_interval = min_interval
+        self._calls = 0
+        self._suppressed = 0
+        self._last_emit = 0.0
+    
+    def log(self, level: int, msg: str, *args, stacklevel: int = 2) -> None:
+        """Log a message if the sampling window allows it."""
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        self._calls += 1
+        now = time.monotonic()
+        first = self._calls == 1
+        if not first and (self._calls % self.every or now - self._last_emit < self.min_interval):
+            self._suppressed += 1
+            return
+        
+        if self._suppressed:
+            msg = f"{msg} (+%d similar suppressed)"
+            args = args + (self._suppressed,)
+            self._suppressed = 0
+        
+        self._last_emit = now
+        self.logger.log(level, msg, *args, stacklevel=stacklevel)
+    
+    def debug(self, msg: str, *args) -> None:
+        """Log a sampled DEBUG message."""
+        self.log(logging.DEBUG, msg, *args, stacklevel=3)
+    
+    def info(self, msg: str, *args) -> None:
+        """Log a sampled INFO message."""
+        self.log(logging.INFO, msg, *args, stacklevel=3)
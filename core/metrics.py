@@ -0,0 +1,505 @@
+"""
+Metrics Module
+
+This module provides a small in-process metrics registry (counters, gauges
+and histograms) and exports it in the Prometheus text exposition format.
+
+The registry has no external dependencies. A side HTTP server thread,
+started from main.py with ``start_metrics_server()``, serves ``/metrics``
+so each replica can be scraped locally, and ``/ready`` for readiness
+probes (see ``set_readiness_check()``).
+
+Usage:
+    from core.metrics import REGISTRY
+    
+    requests_total = REGISTRY.counter(
+        "graph_requests_total", "Graph API requests", ["operation", "status"]
+    )
+    requests_total.labels(operation="upload", status="201").inc()
+    
+    latency = REGISTRY.histogram("graph_request_duration_seconds", "Graph latency", ["operation"])
+    with latency.labels(operation="upload").time():
+        upload()
+"""
+
+import functools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default latency buckets in seconds (network calls range from ms to tens of s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a label set as ``{a="1",b="2"}``."""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+    
+    type_name = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+        
+        Args:
+            name: Metric name (snake_case, with unit suffix).
+            documentation: Help text.
+            labelnames: Names of the labels this metric is partitioned by.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+    
+    def labels(self, **labels: str):
+        """
+        Get the child metric for a label set.
+        
+        Args:
+            labels: Value for every label name.
+        
+        Returns:
+            Child metric bound to the label values.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    def _default(self):
+        """Child for metrics without labels."""
+        return self.labels()
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def samples(self) -> Iterator[str]:
+        """Yield the exposition lines of all children."""
+        raise NotImplementedError
+    
+    def render(self) -> str:
+        """Render HELP/TYPE headers and samples."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    """Single counter time series."""
+    
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter (amount must be non-negative)."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+    
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+    
+    type_name = "counter"
+    
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self._default().inc(amount)
+    
+    def samples(self) -> Iterator[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    """Single gauge time series."""
+    
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+    
+    def set(self, value: float) -> None:
+        """Set the gauge to a value."""
+        with self._lock:
+            self._value = value
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+    
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self._value -= amount
+    
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the gauge value at scrape time."""
+        self._function = function
+    
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        """Increase the gauge while the block runs."""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+    
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. queue depth)."""
+    
+    type_name = "gauge"
+    
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+    
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self._default().set(value)
+    
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the unlabelled gauge at scrape time."""
+        self._default().set_function(function)
+    
+    def track_inprogress(self):
+        """Increase the unlabelled gauge while the block runs."""
+        return self._default().track_inprogress()
+    
+    def samples(self) -> Iterator[str]:
+        for key, child in list(self._children.items()):
+            value = child.value
+            if not math.isnan(value):
+                yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    """Single histogram time series."""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self._counts = [0] * len(buckets)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    self._counts[i] += 1
+                    break
+    
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+    
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """Cumulative bucket counts, sum and count."""
+        with self._lock:
+            cumulative, running = [], 0
+            for count in self._counts:
+                running += count
+                cumulative.append(running)
+            return cumulative, self._sum, self._count
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        Initialize the histogram.
+        
+        Args:
+            name: Metric name.
+            documentation: Help text.
+            labelnames: Label names.
+            buckets: Upper bounds of the buckets (+Inf is added automatically).
+        """
+        super().__init__(name, documentation, labelnames)
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds or not math.isinf(bounds[-1]):
+            bounds.append(math.inf)
+        self.buckets = tuple(bounds)
+    
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabelled histogram."""
+        self._default().observe(value)
+    
+    def time(self):
+        """Time a block on the unlabelled histogram."""
+        return self._default().time()
+    
+    def samples(self) -> Iterator[str]:
+        for key, child in list(self._children.items()):
+            cumulative, total, count = child.snapshot()
+            for upper, bucket_count in zip(self.buckets, cumulative):
+                le = f'le="{_format_value(upper)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {bucket_count}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """
+    Collection of named metrics.
+    
+    Metrics are created on first request and shared afterwards, so modules
+    can declare them at import time without coordinating.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' already registered as {metric.type_name}")
+            return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+    
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        
+        Returns:
+            Exposition text ending with a newline.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Process-wide registry
+REGISTRY = MetricsRegistry()
+
+
+def timed(histogram: Histogram, errors: Optional[Counter] = None, **labels: str) -> Callable:
+    """
+    Decorator that observes a function's duration on a histogram.
+    
+    Args:
+        histogram: Histogram to observe (seconds).
+        errors: Optional counter incremented (with the same labels) when the
+                function raises.
+        labels: Label values for both metrics.
+    
+    Returns:
+        Decorated function.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                if errors is not None:
+                    errors.labels(**labels).inc()
+                raise
+            finally:
+                histogram.labels(**labels).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# Returns (ready, details) for /ready; None means ready as soon as the server runs
+_readiness_check: Optional[Callable[[], Tuple[bool, str]]] = None
+
+
+def set_readiness_check(check: Optional[Callable[[], Tuple[bool, str]]]) -> None:
+    """
+    Set the function answering readiness probes on /ready.
+    
+    Args:
+        check: Returns (ready, details); /ready answers 200 when ready and
+               503 otherwise, with the details as body. None resets it.
+    """
+    global _readiness_check
+    _readiness_check = check
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the registry on /metrics and readiness on /ready."""
+    
+    registry: MetricsRegistry = REGISTRY
+    
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/ready":
+            self._send_readiness()
+            return
+        if path not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        self._send(200, self.registry.render())
+    
+    def _send_readiness(self) -> None:
+        check = _readiness_check
+        try:
+            ready, details = check() if check is not None else (True, "ready")
+        except Exception as e:
+            ready, details = False, f"readiness check failed: {e}"
+        self._send(200 if ready else 503, details + "\n")
+    
+    def _send(self, status: int, text: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the application log
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, addr: Optional[str] = None) -> Optional[int]:
+    """
+    Start the metrics HTTP server in a daemon thread (once per process).
+    
+    Safe to call on every Streamlit rerun. If the port is already taken
+    (e.g. another replica on the same host) a warning is logged and the
+    app keeps running without the endpoint.
+    
+    Args:
+        port: Port to listen on. If None, read from METRICS_PORT (default
+              9464). A value of 0 disables the server.
+        addr: Address to bind. If None, read from METRICS_ADDR (default
+              127.0.0.1, i.e. local scraping only).
+    
+    Returns:
+        The port being served, or None if the server is disabled/failed.
+    """
+    global _server
+    
+    if port is None:
+        port = int(os.getenv("METRICS_PORT", "9464"))
+    if addr is None:
+        addr = os.getenv("METRICS_ADDR", "127.0.0.1")
+    if port == 0:
+        return None
+    
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        
+        try:
+            _server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+        except OSError as e:
+            logger.warning("Metrics server not started on %s:%s: %s", addr, port, e)
+            return None
+        
+        _server.daemon_threads = True
+        thread = threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True)
+        thread.start()
+        logger.info("Metrics endpoint listening on http://%s:%s/metrics", addr, port)
+        return port
@@ -0,0 +1,294 @@
+"""
+Progress Module
+
+This module reports the progress of long storage operations (project
+template copies, customer file uploads) while they run: bytes sent, files
+done, throughput and an ETA.
+
+StorageService opens a tracker with ``track_progress()`` around an
+operation; storage providers report from wherever the bytes are sent with
+``report_progress()``, which is a no-op when no tracker is open. Like the
+instrumentation spans, the tracker lives in a context variable, so it
+follows the operation into the async Graph loop and worker threads that
+run with a copied context.
+
+Each tracked operation also feeds two throughput histograms:
+
+- ``wire``: bytes divided by the time spent in byte-carrying requests,
+  i.e. the uplink speed. Low values point at a slow connection.
+- ``effective``: bytes divided by the operation's wall time. A large gap
+  to ``wire`` points at per-request latency or throttling on SharePoint.
+
+Usage:
+    def on_progress(update: ProgressUpdate) -> None:
+        bar.progress(update.fraction or 0.0, text=update.describe())
+    
+    with track_progress("upload", on_progress, total_bytes=size, total_files=3):
+        provider.upload_many(items)
+    
+    # Deep in a provider
+    report_progress(bytes_sent=len(chunk), seconds=elapsed)
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+TRANSFER_THROUGHPUT = REGISTRY.histogram(
+    "storage_transfer_throughput_bytes_per_second",
+    "Throughput of tracked storage operations (wire: while sending; effective: wall time)",
+    ["operation", "kind"],
+    buckets=(64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2, 256 * 1024 ** 2)
+)
+TRANSFER_BYTES = REGISTRY.counter(
+    "storage_transfer_bytes_total",
+    "Bytes sent by tracked storage operations",
+    ["operation"]
+)
+
+# Minimum seconds between two callback invocations (the final update is always sent)
+MIN_CALLBACK_INTERVAL = 0.2
+
+
+@dataclass(frozen=True)
+class ProgressUpdate:
+    """Snapshot of a tracked operation's progress."""
+    operation: str
+    bytes_done: int
+    bytes_total: Optional[int]
+    files_done: int
+    files_total: Optional[int]
+    elapsed: float
+    finished: bool = False
+    
+    @property
+    def rate(self) -> float:
+        """Average bytes per second so far."""
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """Completed fraction (0..1), by bytes when known, else by files."""
+        if self.finished:
+            return 1.0
+        if self.bytes_total:
+            return min(self.bytes_done / self.bytes_total, 1.0)
+        if self.files_total:
+            return min(self.files_done / self.files_total, 1.0)
+        return None
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds remaining, or None if unknown."""
+        if self.finished:
+            return 0.0
+        if not self.bytes_total or self.rate <= 0:
+            return None
+        return max(self.bytes_total - self.bytes_done, 0) / self.rate
+    
+    def describe(self) -> str:
+        """Human-readable progress line, e.g. "3/12 files · 4.1/9.8 MB · 1.2 MB/s · ~5s left"."""
+        parts = []
+        if self.files_total:
+            parts.append(f"{self.files_done}/{self.files_total} files")
+        if self.bytes_total:
+            parts.append(f"{self.bytes_done / 1024 ** 2:.1f}/{self.bytes_total / 1024 ** 2:.1f} MB")
+        elif self.bytes_done:
+            parts.append(f"{self.bytes_done / 1024 ** 2:.1f} MB")
+        if self.rate > 0:
+            parts.append(f"{self.rate / 1024 ** 2:.1f} MB/s")
+        if self.eta is not None and not self.finished:
+            parts.append(f"~{self.eta:.0f}s left")
+        return " · ".join(parts)
+
+
+ProgressCallback = Callable[[ProgressUpdate], None]
+
+
+class ProgressTracker:
+    """Thread-safe progress accumulator for one operation."""
+    
+    def __init__(
+        self,
+        operation: str,
+        callback: Optional[ProgressCallback] = None,
+        total_bytes: Optional[int] = None,
+        total_files: Optional[int] = None
+    ):
+        """
+        Initialize the tracker.
+        
+        Args:
+            operation: Operation name for metrics (e.g. "upload_files").
+            callback: Called with a ProgressUpdate as progress is reported.
+            total_bytes: Expected bytes, if known.
+            total_files: Expected files, if known.
+        """
+        self.operation = operation
+        self.callback = callback
+        self.total_bytes = total_bytes
+        self.total_files = total_files
+        self.bytes_done = 0
+        self.files_done = 0
+        self.wire_seconds = 0.0
+        self._started = time.perf_counter()
+        self._last_callback = 0.0
+        self._lock = threading.Lock()
+        self._callback_lock = threading.Lock()
+    
+    def add(self, bytes_sent: int = 0, files_done: int = 0, seconds: float = 0.0) -> None:
+        """
+        Record progress and notify the callback (rate-limited).
+        
+        Args:
+            bytes_sent: Bytes sent since the last report.
+            files_done: Files completed since the last report.
+            seconds: Time spent sending ``bytes_sent``.
+        """
+        with self._lock:
+            self.bytes_done += bytes_sent
+            self.files_done += files_done
+            self.wire_seconds += seconds
+            due = self._callback_due()
+        if due:
+            self._notify(finished=False)
+    
+    def skip(self, bytes_skipped: int = 0, files_done: int = 0) -> None:
+        """
+        Record files completed without sending their bytes (e.g. server-side copies).
+        
+        The callback is rate-limited like ``add``.
+        
+        Args:
+            bytes_skipped: Expected bytes that will not be sent.
+            files_done: Files completed.
+        """
+        with self._lock:
+            if self.total_bytes is not None:
+                self.total_bytes = max(self.total_bytes - bytes_skipped, 0)
+            self.files_done += files_done
+            due = self._callback_due()
+        if due:
+            self._notify(finished=False)
+    
+    def _callback_due(self) -> bool:
+        """Whether MIN_CALLBACK_INTERVAL has passed since the last callback (caller holds the lock)."""
+        now = time.perf_counter()
+        if now - self._last_callback < MIN_CALLBACK_INTERVAL:
+            return False
+        self._last_callback = now
+        return True
+    
+    def snapshot(self, finished: bool = False) -> ProgressUpdate:
+        """Current progress as a ProgressUpdate."""
+        with self._lock:
+            return ProgressUpdate(
+                operation=self.operation,
+                bytes_done=self.bytes_done,
+                bytes_total=self.total_bytes,
+                files_done=self.files_done,
+                files_total=self.total_files,
+                elapsed=time.perf_counter() - self._started,
+                finished=finished
+            )
+    
+    def _notify(self, finished: bool) -> None:
+        if self.callback is None:
+            return
+        update = self.snapshot(finished)
+        try:
+            # Reports may come from several threads; the UI sees one at a time
+            with self._callback_lock:
+                self.callback(update)
+        except Exception as e:
+            # Progress display must never break the operation
+            logger.debug("Progress callback failed: %s", e)
+    
+    def finish(self) -> ProgressUpdate:
+        """Send the final update and record throughput metrics."""
+        update = self.snapshot(finished=True)
+        self._notify(finished=True)
+        if update.bytes_done:
+            TRANSFER_BYTES.labels(operation=self.operation).inc(update.bytes_done)
+            if update.elapsed > 0:
+                TRANSFER_THROUGHPUT.labels(operation=self.operation, kind="effective").observe(update.rate)
+            if self.wire_seconds > 0:
+                TRANSFER_THROUGHPUT.labels(operation=self.operation, kind="wire").observe(
+                    update.bytes_done / self.wire_seconds
+                )
+        return update
+
+
+# Tracker of the operation running in the current thread/task
+_current_tracker: contextvars.ContextVar[Optional[ProgressTracker]] = contextvars.ContextVar(
+    "progress_tracker", default=None
+)
+
+
+@contextmanager
+def track_progress(
+    operation: str,
+    callback: Optional[ProgressCallback] = None,
+    total_bytes: Optional[int] = None,
+    total_files: Optional[int] = None
+) -> Iterator[ProgressTracker]:
+    """
+    Track the progress of an operation.
+    
+    Args:
+        operation: Operation name for metrics.
+        callback: Called with ProgressUpdate snapshots (optional).
+        total_bytes: Expected bytes, if known.
+        total_files: Expected files, if known.
+    
+    Yields:
+        The ProgressTracker receiving reports.
+    """
+    tracker = ProgressTracker(operation, callback, total_bytes, total_files)
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+        update = tracker.finish()
+        if update.bytes_done:
+            logger.info(
+                "%s: %s files, %.1f MB in %.1fs (%.1f MB/s)",
+                operation, update.files_done, update.bytes_done / 1024 ** 2,
+                update.elapsed, update.rate / 1024 ** 2
+            )
+
+
+def report_progress(bytes_sent: int = 0, files_done: int = 0, seconds: float = 0.0) -> None:
+    """
+    Report progress to the tracker of the current operation, if any.
+    
+    Args:
+        bytes_sent: Bytes sent since the last report.
+        files_done: Files completed since the last report.
+        seconds: Time spent sending ``bytes_sent`` (feeds wire throughput).
+    """
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.add(bytes_sent, files_done, seconds)
+
+
+def skip_progress(bytes_skipped: int = 0, files_done: int = 0) -> None:
+    """
+    Report files completed without sending their bytes, if a tracker is open.
+    
+    Args:
+        bytes_skipped: Expected bytes that will not be sent.
+        files_done: Files completed.
+    """
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.skip(bytes_skipped, files_done)
@@ -0,0 +1,109 @@
+"""Tests for core.instrumentation."""
+
+import time
+
+import pytest
+
+from core import instrumentation
+from core.instrumentation import (
+    MetricsStore,
+    Span,
+    SubmissionTrace,
+    get_current_trace,
+    record_bytes,
+    record_http_call,
+    span,
+    submission_trace,
+)
+
+
+def make_trace(*durations, stage="upload_files", started_at=None, ok=True):
+    trace = SubmissionTrace(assessment_type="ICT", correlation_id="cid")
+    for duration in durations:
+        trace.spans.append(Span(
+            name=stage, started_at=started_at or time.time(), duration_ms=duration, bytes=10, http_calls=2, ok=ok
+        ))
+    return trace
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MetricsStore(tmp_path / "metrics.db")
+
+
+def test_nested_spans_count_calls_and_bytes_on_every_parent():
+    with span("outer") as outer:
+        record_http_call()
+        with span("inner", filename="a.pdf") as inner:
+            record_http_call(2)
+            record_bytes(100)
+    
+    assert (outer.http_calls, outer.bytes) == (3, 100)
+    assert (inner.http_calls, inner.bytes) == (2, 100)
+    assert inner.attributes == {"filename": "a.pdf"}
+    assert outer.duration_ms >= inner.duration_ms >= 0
+
+
+def test_span_records_failures():
+    with pytest.raises(RuntimeError):
+        with span("failing") as failing:
+            raise RuntimeError("boom")
+    assert not failing.ok
+
+
+def test_submission_trace_collects_spans_and_stores_them(monkeypatch, store):
+    monkeypatch.setattr(instrumentation, "_metrics_store", store)
+    
+    with submission_trace("FCT") as trace:
+        assert get_current_trace() is trace
+        with span("validation"):
+            pass
+    assert get_current_trace() is None
+    
+    assert [s.name for s in trace.spans] == ["validation", "submission"]
+    assert set(store.percentiles()) == {"validation", "submission"}
+
+
+def test_percentiles_aggregate_the_window(store):
+    store.record_trace(make_trace(10, 20, 30, 40))
+    store.record_trace(make_trace(100, ok=False))
+    store.record_trace(make_trace(1000, started_at=time.time() - 7200))
+    
+    stats = store.percentiles(window_seconds=3600, quantiles=(50, 100))["upload_files"]
+    assert stats["count"] == 5
+    assert stats["errors"] == 1
+    assert stats["avg_bytes"] == 10
+    assert stats["avg_http_calls"] == 2
+    assert stats["p50"] == 30
+    assert stats["p100"] == 100
+
+
+def test_percentiles_use_the_most_recent_samples(store):
+    now = time.time()
+    trace = SubmissionTrace(assessment_type="ICT", correlation_id="cid")
+    for offset, duration in enumerate([500, 500, 1, 2, 3]):
+        trace.spans.append(Span(name="stage", started_at=now - 100 + offset, duration_ms=duration))
+    store.record_trace(trace)
+    
+    stats = store.percentiles(quantiles=(100,), max_samples=3)["stage"]
+    assert stats["count"] == 5
+    assert stats["p100"] == 3
+
+
+def test_old_spans_are_pruned_on_open_and_while_recording(tmp_path):
+    old = time.time() - 7200
+    MetricsStore(tmp_path / "metrics.db", retention_seconds=None).record_trace(make_trace(5, started_at=old))
+    
+    reopened = MetricsStore(tmp_path / "metrics.db", retention_seconds=3600, prune_every=2)
+    assert reopened.percentiles(window_seconds=10 ** 6) == {}
+    
+    reopened.record_trace(make_trace(5, started_at=old))
+    assert reopened.percentiles(window_seconds=10 ** 6)["upload_files"]["count"] == 1
+    reopened.record_trace(make_trace(5))
+    assert reopened.percentiles(window_seconds=10 ** 6)["upload_files"]["count"] == 1
+
+
+def test_prune_returns_deleted_rows(store):
+    store.record_trace(make_trace(1, 2, started_at=time.time() - 60))
+    assert store.prune(30) == 2
+    assert store.prune(30) == 0
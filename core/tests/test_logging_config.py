@@ -0,0 +1,110 @@
+"""Tests for core.logging_config."""
+
+import json
+import logging
+
+import pytest
+
+from core import logging_config
+from core.logging_config import SampledLogger, correlation_context, get_correlation_id, setup_logging
+
+
+@pytest.fixture
+def root_logger():
+    """Root logger, restored (and the listener stopped) after the test."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    logging_config._stop_queue_listener()
+    root.handlers = handlers
+    root.setLevel(level)
+
+
+def read_json_lines(path):
+    logging_config._stop_queue_listener()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_json_lines_carry_message_and_correlation_id(root_logger, tmp_path):
+    log_file = tmp_path / "app.log"
+    setup_logging("INFO", log_file=log_file, json_format=True)
+    
+    with correlation_context("abc123") as correlation_id:
+        assert get_correlation_id() == correlation_id == "abc123"
+        logging.getLogger("tests").info("Uploaded %s files", 3)
+    logging.getLogger("tests").warning("Outside")
+    
+    first, second = read_json_lines(log_file)
+    assert first["message"] == "Uploaded 3 files"
+    assert first["correlation_id"] == "abc123"
+    assert first["level"] == "INFO"
+    assert second["correlation_id"] == "-"
+
+
+def test_arguments_are_rendered_when_logged(root_logger, tmp_path):
+    log_file = tmp_path / "app.log"
+    setup_logging("INFO", log_file=log_file, json_format=True)
+    
+    files = ["a.pdf"]
+    logging.getLogger("tests").info("Files: %s", files)
+    files.append("b.pdf")
+    
+    assert read_json_lines(log_file)[0]["message"] == "Files: ['a.pdf']"
+
+
+def test_exceptions_are_formatted_by_the_listener(root_logger, tmp_path):
+    log_file = tmp_path / "app.log"
+    setup_logging("INFO", log_file=log_file, json_format=True)
+    
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("tests").exception("Failed")
+    
+    record = read_json_lines(log_file)[0]
+    assert "ValueError: boom" in record["exception"]
+
+
+def test_setup_logging_is_idempotent(root_logger, tmp_path):
+    setup_logging("INFO", log_file=tmp_path / "app.log", json_format=True)
+    handlers = root_logger.handlers[:]
+    listener = logging_config._queue_listener
+    
+    setup_logging("INFO", log_file=tmp_path / "app.log", json_format=True)
+    assert root_logger.handlers == handlers
+    assert logging_config._queue_listener is listener
+    
+    setup_logging("DEBUG", log_file=tmp_path / "app.log", json_format=True)
+    assert root_logger.handlers != handlers
+    assert logging_config._queue_listener is not listener
+    assert root_logger.level == logging.DEBUG
+
+
+def test_without_queue_handlers_are_attached_directly(root_logger, tmp_path):
+    setup_logging("INFO", log_file=tmp_path / "app.log", use_queue=False)
+    assert logging_config._queue_listener is None
+    assert logging_config.get_log_queue_depth() == 0
+    assert any(isinstance(handler, logging.FileHandler) for handler in root_logger.handlers)
+
+
+def test_sampled_logger_reports_suppressed_calls(caplog):
+    logger = logging.getLogger("tests.sampled")
+    sampled = SampledLogger(logger, every=3, min_interval=0)
+    
+    with caplog.at_level(logging.INFO, logger="tests.sampled"):
+        for item in range(7):
+            sampled.info("Item %s", item)
+    
+    assert [record.getMessage() for record in caplog.records] == [
+        "Item 0",
+        "Item 2 (+1 similar suppressed)",
+        "Item 5 (+2 similar suppressed)",
+    ]
+
+
+def test_sampled_logger_skips_disabled_levels(caplog):
+    sampled = SampledLogger(logging.getLogger("tests.quiet"), every=1, min_interval=0)
+    with caplog.at_level(logging.INFO, logger="tests.quiet"):
+        sampled.debug("Hidden %s", 1)
+    assert caplog.records == []
+    assert sampled._calls == 0
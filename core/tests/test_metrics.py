@@ -0,0 +1,116 @@
+"""Tests for core.metrics."""
+
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from core import metrics
+from core.metrics import MetricsRegistry, set_readiness_check, timed
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def endpoint(registry):
+    """Base URL of a metrics server serving ``registry``."""
+    handler = type("Handler", (metrics._MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    set_readiness_check(None)
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def test_counter_and_gauge_render_with_labels(registry):
+    counter = registry.counter("uploads_total", "Uploads", ["result"])
+    counter.labels(result="ok").inc()
+    counter.labels(result="ok").inc(2)
+    counter.labels(result='say "hi"').inc()
+    registry.gauge("queue_depth", "Depth").set_function(lambda: 7)
+    
+    text = registry.render()
+    assert "# TYPE uploads_total counter" in text
+    assert 'uploads_total{result="ok"} 3' in text
+    assert 'uploads_total{result="say \\"hi\\""} 1' in text
+    assert "queue_depth 7" in text
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value)
+    
+    text = registry.render()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+    assert "latency_seconds_sum 6.05" in text
+
+
+def test_registry_shares_metrics_by_name(registry):
+    assert registry.counter("calls", "Calls") is registry.counter("calls", "Calls")
+    with pytest.raises(ValueError):
+        registry.gauge("calls", "Calls")
+
+
+def test_gauge_tracks_in_progress(registry):
+    gauge = registry.gauge("in_progress", "In progress")
+    with gauge.track_inprogress():
+        assert gauge._default().value == 1
+    assert gauge._default().value == 0
+
+
+def test_timed_counts_errors(registry):
+    histogram = registry.histogram("call_seconds", "Calls", ["op"])
+    errors = registry.counter("call_errors_total", "Errors", ["op"])
+    
+    @timed(histogram, errors, op="save")
+    def save(fail):
+        if fail:
+            raise RuntimeError("boom")
+        return "saved"
+    
+    assert save(False) == "saved"
+    with pytest.raises(RuntimeError):
+        save(True)
+    text = registry.render()
+    assert 'call_seconds_count{op="save"} 2' in text
+    assert 'call_errors_total{op="save"} 1' in text
+
+
+def test_endpoint_serves_metrics_and_readiness(registry, endpoint):
+    registry.counter("hits_total", "Hits").inc()
+    
+    status, body = fetch(f"{endpoint}/metrics")
+    assert status == 200
+    assert "hits_total 1" in body
+    assert fetch(f"{endpoint}/other")[0] == 404
+    assert fetch(f"{endpoint}/ready") == (200, "ready\n")
+    
+    set_readiness_check(lambda: (False, "warming up"))
+    assert fetch(f"{endpoint}/ready") == (503, "warming up\n")
+    
+    set_readiness_check(lambda: 1 / 0)
+    status, body = fetch(f"{endpoint}/ready")
+    assert status == 503
+    assert body.startswith("readiness check failed")
+
+
+def test_metrics_server_can_be_disabled():
+    assert metrics.start_metrics_server(port=0) is None
@@ -0,0 +1,105 @@
+"""Tests for core.progress."""
+
+import contextvars
+import threading
+import time
+
+import pytest
+
+from core.progress import (
+    TRANSFER_BYTES,
+    ProgressTracker,
+    ProgressUpdate,
+    report_progress,
+    skip_progress,
+    track_progress,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+    return now
+
+
+def update(**overrides):
+    values = dict(operation="upload", bytes_done=0, bytes_total=None, files_done=0, files_total=None, elapsed=0.0)
+    values.update(overrides)
+    return ProgressUpdate(**values)
+
+
+def test_update_derives_rate_fraction_and_eta():
+    halfway = update(bytes_done=4 * 1024 ** 2, bytes_total=8 * 1024 ** 2, files_done=1, files_total=3, elapsed=2.0)
+    assert halfway.rate == 2 * 1024 ** 2
+    assert halfway.fraction == 0.5
+    assert halfway.eta == pytest.approx(2.0)
+    assert halfway.describe() == "1/3 files · 4.0/8.0 MB · 2.0 MB/s · ~2s left"
+    
+    by_files = update(files_done=1, files_total=4)
+    assert (by_files.fraction, by_files.eta, by_files.rate) == (0.25, None, 0.0)
+    assert update().fraction is None
+    assert update(bytes_done=10, bytes_total=100, finished=True).fraction == 1.0
+
+
+def test_callbacks_are_rate_limited(clock):
+    updates = []
+    tracker = ProgressTracker("upload", updates.append, total_bytes=100, total_files=2)
+    
+    tracker.add(10)
+    tracker.add(10)
+    clock[0] += 0.25
+    tracker.add(10, files_done=1)
+    
+    assert [u.bytes_done for u in updates] == [10, 30]
+    final = tracker.finish()
+    assert final.finished and updates[-1].finished
+    assert (final.bytes_done, final.files_done) == (30, 1)
+
+
+def test_skip_shrinks_the_expected_bytes_and_is_rate_limited(clock):
+    updates = []
+    tracker = ProgressTracker("upload", updates.append, total_bytes=100, total_files=2)
+    tracker.add(10)
+    
+    tracker.skip(60, files_done=1)
+    assert len(updates) == 1
+    clock[0] += 0.25
+    tracker.skip(0)
+    
+    assert (updates[-1].bytes_total, updates[-1].files_done) == (40, 1)
+    tracker.skip(500)
+    assert tracker.total_bytes == 0
+
+
+def test_callback_errors_do_not_break_the_operation():
+    def broken(update):
+        raise RuntimeError("display gone")
+    
+    tracker = ProgressTracker("upload", broken)
+    tracker.add(10)
+    assert tracker.finish().bytes_done == 10
+
+
+def test_reports_reach_the_open_tracker_in_copied_contexts():
+    report_progress(100)  # No tracker open: ignored
+    skip_progress(100)
+    updates = []
+    sent = TRANSFER_BYTES.labels(operation="test_upload").value
+    
+    with track_progress("test_upload", updates.append, total_bytes=300, total_files=3) as tracker:
+        workers = [
+            threading.Thread(target=contextvars.copy_context().run, args=(report_progress, 100, 1, 0.1))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    
+    assert (tracker.bytes_done, tracker.files_done) == (300, 3)
+    assert tracker.wire_seconds == pytest.approx(0.3)
+    assert updates[-1].finished
+    assert TRANSFER_BYTES.labels(operation="test_upload").value == sent + 300
+    report_progress(100)
+    assert tracker.bytes_done == 300
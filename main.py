@@ -12,11 +12,13 @@ Refactored to use new architecture with:
 
 import streamlit as st
 from core.auth import AuthService
-from core.logging_config import setup_logging, get_logger
+from core.logging_config import get_logger
+from pages.utils.app_bootstrap import bootstrap_app
 from pages.utils.global_styles import set_global_styles
 
-# Setup logging
-setup_logging(log_level="INFO")
+# Logging, /metrics and /ready, and the background warm-up (once per process;
+# the assessment pages do the same in case a session opens them directly)
+bootstrap_app()
 logger = get_logger(__name__)
 
 # TEMPORARY: Clear cache button for debugging
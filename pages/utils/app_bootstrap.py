@@ -0,0 +1,46 @@
+"""
+Application Bootstrap Module
+
+This module starts the process-wide services of the Streamlit app: logging,
+the /metrics and /ready endpoint and the startup warm-up.
+
+It runs from main.py and from every assessment page, so a session that
+opens a page directly (or a server restart while users sit on a page)
+still starts them. Every step is once per process, so calling it on each
+rerun is cheap.
+
+Usage:
+    from pages.utils.app_bootstrap import bootstrap_app
+    bootstrap_app()
+"""
+
+from core.logging_config import get_log_queue_depth, get_logger, setup_logging
+from core.metrics import REGISTRY, start_metrics_server
+from services.warmup import start_warmup
+
+logger = get_logger(__name__)
+
+
+def bootstrap_app() -> None:
+    """
+    Start logging, the metrics endpoint and the warm-up (once per process).
+    
+    Logging settings come from LOG_LEVEL, LOG_FORMAT and LOG_FILE, the
+    endpoint from METRICS_PORT/METRICS_ADDR and the warm-up from
+    STARTUP_WARMUP.
+    """
+    setup_logging()
+    
+    # Expose /metrics for local scraping
+    REGISTRY.gauge(
+        "log_queue_depth",
+        "Log records waiting for the background log writer"
+    ).set_function(get_log_queue_depth)
+    start_metrics_server()
+    
+    # Prepare Salesforce, storage and caches in the background, so the first
+    # submission does not pay for them; readiness is served on /ready
+    try:
+        start_warmup()
+    except Exception as e:
+        logger.warning("Could not start warm-up: %s", e)
@@ -13,6 +13,7 @@ import streamlit as st
 from decouple import config
 
 from pages.utils.salesforce_access import connect_to_salesforce, get_unique_account_dict
+from pages.utils.app_bootstrap import bootstrap_app
 from pages.utils.dates_info import get_last_weekday_of_next_month, get_date_after_next_working_days
 from pages.utils.global_styles import set_global_styles, load_ibtest_logo, subtitle_h3
 from pages.utils.validations import validate_email, validate_fields
@@ -35,6 +36,9 @@ class BaseAssessment:
             title (str): The title of the assessment
             projects_folder (str): The folder name for projects
         """
+        # A session may open this page without going through main.py
+        bootstrap_app()
+        
         self.assessment_type = assessment_type
         self.title = title
         self.projects_folder = projects_folder
@@ -12,22 +12,77 @@ Key improvements:
 - Cleaner separation of concerns
 """
 
+import os
+import threading
+import time
 from datetime import datetime
 from typing import Callable, Dict, List, Optional
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from services.salesforce_service import get_salesforce_service, get_unique_account_dict
 from services.storage_service import get_storage_service
-from pages.utils.dates_info import get_last_weekday_of_next_month, get_date_after_next_working_days
+from services.submission_queue import DONE, QUEUED, get_submission_queue, submission_workers_enabled
+from services.submission_service import Submission, SubmissionService, converter_reference, prepare_customer_data
+from pages.utils.app_bootstrap import bootstrap_app
+from pages.utils.dates_info import get_date_after_next_working_days
 from pages.utils.global_styles import set_global_styles, load_ibtest_logo, subtitle_h3
 from pages.utils.validations import validate_email, validate_fields
 from pages.utils.constants import COUNTRIES_DICT, YES_NO
 from core.exceptions import ValidationError, SalesforceError, StorageError
-from core.logging_config import get_logger
+from core.logging_config import get_logger, correlation_context
+from core.instrumentation import span, submission_trace
+from core.progress import ProgressCallback, ProgressUpdate
+from core.metrics import REGISTRY
 from config import get_settings
 
 logger = get_logger(__name__)
 
+SUBMISSIONS_IN_PROGRESS = REGISTRY.gauge(
+    "submissions_in_progress",
+    "Form submissions currently being processed"
+)
+SUBMISSIONS = REGISTRY.counter(
+    "submissions_total",
+    "Processed form submissions",
+    ["assessment_type", "result"]
+)
+
+# Seconds a page waits for a queued submission before letting it finish in the background
+# (override with SUBMISSION_WAIT_TIMEOUT)
+DEFAULT_WAIT_TIMEOUT = 600.0
+
+# Seconds between two polls of a queued submission
+QUEUE_POLL_INTERVAL = 0.5
+
+
+def _progress_bar(label: str) -> ProgressCallback:
+    """
+    Create a progress bar and a callback that updates it.
+    
+    Storage providers report progress from worker threads and the async
+    Graph loop; the callback attaches the script run context to those
+    threads so Streamlit accepts the updates. The Graph loop thread is
+    shared by every session, so the context is re-attached whenever the
+    thread last drew for another session.
+    
+    Args:
+        label: Text shown before the progress details.
+    
+    Returns:
+        Progress callback for StorageService operations.
+    """
+    bar = st.progress(0.0, text=label)
+    ctx = get_script_run_ctx()
+    
+    def update(progress: ProgressUpdate) -> None:
+        if ctx is not None and get_script_run_ctx(suppress_warning=True) is not ctx:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        details = progress.describe()
+        bar.progress(progress.fraction or 0.0, text=f"{label}: {details}" if details else label)
+    
+    return update
+
 
 class BaseAssessment:
     """
@@ -46,6 +101,9 @@ class BaseAssessment:
             title: The title of the assessment
             projects_folder: The folder name for projects
         """
+        # A session may open this page without going through main.py
+        bootstrap_app()
+        
         self.assessment_type = assessment_type
         self.title = title
         self.projects_folder = projects_folder
@@ -56,6 +114,9 @@ class BaseAssessment:
         self.settings = get_settings()
         self.salesforce_service = get_salesforce_service()  # Cached connection
         self.storage_service = get_storage_service()  # Cached connection
+        self.submission_service = SubmissionService(
+            self.storage_service, self.salesforce_service, self.settings
+        )
         
         logger.info(f"Initialized {assessment_type} assessment")
     
@@ -153,6 +214,34 @@ class BaseAssessment:
                 horizontal=True
             )
     
+    def render_existing_projects_lookup(self) -> None:
+        """
+        Show the existing projects of a customer to help avoid duplicates.
+        
+        Rendered outside the form so the list updates as soon as a customer
+        is picked.
+        """
+        with st.expander("🔎 Existing projects for a customer"):
+            all_accounts = get_unique_account_dict()
+            customer_name = st.selectbox(
+                "Company name",
+                options=sorted(set(all_accounts.values())),
+                index=None,
+                placeholder="Select from list",
+                key=f"{self.assessment_type.lower()}_projects_lookup"
+            )
+            if not customer_name:
+                return
+            
+            projects = self.storage_service.list_customer_projects(customer_name, self.projects_folder)
+            if projects is None:
+                st.info("The project list is still loading. Please try again in a moment.")
+            elif not projects:
+                st.write(f"No existing {self.assessment_type} projects for {customer_name}.")
+            else:
+                st.write(f"{len(projects)} existing {self.assessment_type} project(s) for {customer_name}:")
+                st.markdown("\n".join(f"- **{p['project']}** ({p['country']})" for p in projects))
+    
     def _validate_form_data(self) -> None:
         """
         Validate form data.
@@ -179,19 +268,11 @@ class BaseAssessment:
         Returns:
             Dictionary with prepared customer data.
         """
-        customer_data = {
-            "country": self.info.get("country", "Mexico"),
-            "customer_in_list": True
-        }
-        
-        # Handle customer name
-        if self.info["customer_name"] is None or self.info["customer_name"] == "Other":
-            customer_data["customer_name"] = self.info["customer_name2"]
-            customer_data["customer_in_list"] = False
-        else:
-            customer_data["customer_name"] = self.info["customer_name"]
-        
-        return customer_data
+        return prepare_customer_data(self.info)
+        
+    def _submission(self, customer_data: Dict) -> Submission:
+        """The current form data as a Submission."""
+        return Submission(self.assessment_type, self.projects_folder, self.info, customer_data)
     
     def _create_project_structure(
         self,
@@ -211,25 +292,19 @@ class BaseAssessment:
         Raises:
             StorageError: If folder creation or file upload fails.
         """
-        # Create project folder
-        project_path = self.storage_service.create_project_folder(
-            assessment_type=self.assessment_type,
-            projects_folder=self.projects_folder,
-            customer_name=customer_data["customer_name"],
-            project_name=self.info["project_name"],
-            country=customer_data["country"]
-        )
-        
-        logger.info(f"Created project structure at: {project_path}")
-        
-        # Upload files if any
-        if uploaded_files:
-            self.storage_service.upload_assessment_files(
-                project_path=project_path,
-                assessment_type=self.assessment_type,
-                files=uploaded_files
-            )
-            logger.info(f"Uploaded {len(uploaded_files)} files")
+        # Progress is shown while the template is copied and the files are uploaded
+        with st.status("Creating project folder...", expanded=True) as status:
+            try:
+                project_path = self.submission_service.create_project_structure(
+                    self._submission(customer_data),
+                    uploaded_files,
+                    folder_progress=_progress_bar("Copying template"),
+                    upload_progress=_progress_bar("Uploading files") if uploaded_files else None
+                )
+            except Exception:
+                status.update(label="Project folder creation failed", state="error")
+                raise
+            status.update(label="Project folder ready", state="complete", expanded=False)
         
         return project_path
     
@@ -248,15 +323,9 @@ class BaseAssessment:
         Raises:
             StorageError: If save fails.
         """
-        html_data = html_converter(self.info)
-        
-        if html_data:
-            self.storage_service.save_assessment_html(
-                project_path=project_path,
-                assessment_type=self.assessment_type,
-                html_content=html_data
-            )
-            logger.info("Saved HTML report")
+        self.submission_service.save_html_report(
+            self._submission(self._prepare_customer_data()), project_path, html_converter
+        )
     
     def _get_sharepoint_url(self, project_path: str) -> str:
         """
@@ -269,23 +338,7 @@ class BaseAssessment:
         Returns:
             Full SharePoint URL to the project folder.
         """
-        # Get base SharePoint URL from settings
-        base_url = self.settings.storage.sharepoint_path
-        
-        # Clean the project path (it already includes base_path from StorageService)
-        from pathlib import Path
-        project_relative = str(Path(project_path)).replace("\\", "/").lstrip("/")
-        
-        # Construct full SharePoint URL
-        # Note: project_relative already includes SHAREPOINT_BASE_PATH (e.g., "01_2025/1_ICT/...")
-        # because SharePointStorageProvider.get_full_path() adds it
-        if base_url.endswith("/"):
-            sharepoint_url = f"{base_url}{project_relative}"
-        else:
-            sharepoint_url = f"{base_url}/{project_relative}"
-        
-        logger.info(f"Generated SharePoint URL: {sharepoint_url}")
-        return sharepoint_url
+        return self.submission_service.get_sharepoint_url(project_path)
     
     def _create_salesforce_opportunity(
         self,
@@ -305,32 +358,112 @@ class BaseAssessment:
         Raises:
             SalesforceError: If creation fails.
         """
-        # Prepare opportunity data
-        opportunity_name = self.info["project_name"]
-        stage_name = "New Request"
+        return self.submission_service.create_salesforce_opportunity(
+            self._submission(customer_data), project_path
+        )
         
-        # Get account ID if customer is in list
-        account_id = None
-        if customer_data["customer_in_list"]:
-            all_accounts = get_unique_account_dict()
-            accounts_by_name = {name: id for id, name in all_accounts.items()}
-            account_id = accounts_by_name.get(customer_data["customer_name"])
-        
-        # Generate SharePoint URL for this specific project
-        sharepoint_url = self._get_sharepoint_url(project_path)
-        
-        # Create opportunity
-        result = self.salesforce_service.create_opportunity(
-            name=opportunity_name,
-            stage_name=stage_name,
-            close_date=get_last_weekday_of_next_month().strftime("%Y-%m-%d"),
-            assessment_date=datetime.now().strftime("%Y-%m-%d"),
-            path=sharepoint_url,
-            bu=self.assessment_type,
-            account_id=account_id
+    def _run_inline_submission(
+        self,
+        customer_data: Dict,
+        uploaded_files: List,
+        html_converter: Callable
+    ) -> Dict:
+        """
+        Run the storage and Salesforce steps in this session.
+        
+        Args:
+            customer_data: Prepared customer data.
+            uploaded_files: List of uploaded files.
+            html_converter: Function to convert info to HTML.
+        
+        Returns:
+            Result dictionary from Salesforce.
+        """
+        # Create project structure and upload files
+        project_path = self._create_project_structure(
+            customer_data,
+            uploaded_files
         )
         
-        return result
+        # Save HTML report
+        self._save_html_report(project_path, html_converter)
+        
+        # Create Salesforce opportunity with project-specific path
+        return self._create_salesforce_opportunity(customer_data, project_path)
+    
+    def _run_queued_submission(
+        self,
+        customer_data: Dict,
+        uploaded_files: List,
+        html_converter: Callable
+    ) -> Optional[Dict]:
+        """
+        Hand the submission to the worker pool and wait for its outcome.
+        
+        Without a live pool (no heartbeat within SUBMISSION_WORKER_TIMEOUT)
+        the submission runs in this session instead, also when the pool
+        goes away before a worker claimed the job.
+        
+        Args:
+            customer_data: Prepared customer data.
+            uploaded_files: List of uploaded files.
+            html_converter: Function to convert info to HTML.
+        
+        Returns:
+            Result dictionary from Salesforce, or None if the submission
+            did not finish within SUBMISSION_WAIT_TIMEOUT (it keeps running).
+        
+        Raises:
+            StorageError: If a storage step failed in the worker.
+            SalesforceError: If opportunity creation failed in the worker.
+        """
+        queue = get_submission_queue()
+        if not queue.workers_alive():
+            logger.warning("No submission worker pool is running, processing the submission in this session")
+            return self._run_inline_submission(customer_data, uploaded_files, html_converter)
+        
+        with span("enqueue_submission"):
+            job_id = queue.enqueue(
+                self._submission(customer_data), uploaded_files or [], converter_reference(html_converter)
+            )
+        
+        timeout = float(os.getenv("SUBMISSION_WAIT_TIMEOUT", DEFAULT_WAIT_TIMEOUT))
+        deadline = time.monotonic() + timeout
+        with st.status("Waiting for a submission worker...", expanded=True) as status:
+            while True:
+                job = queue.get(job_id)
+                if job.finished:
+                    break
+                if not queue.workers_alive():
+                    if job.status == QUEUED and queue.withdraw(job_id, "No submission worker available"):
+                        logger.warning("Submission worker pool stopped, processing job %s in this session", job_id)
+                        status.update(label="Processing the submission", state="running")
+                        result = self._run_inline_submission(customer_data, uploaded_files, html_converter)
+                        status.update(label="Project folder ready", state="complete", expanded=False)
+                        return result
+                    # A claimed job fails once its lease expires instead of being waited on
+                    queue.fail_lost_jobs()
+                if job.stage:
+                    status.update(label=job.stage)
+                if time.monotonic() > deadline:
+                    status.update(label="Still processing in the background", state="running", expanded=False)
+                    st.warning(
+                        f"Your submission is taking longer than usual and will finish in the background "
+                        f"(reference {job_id})."
+                    )
+                    return None
+                time.sleep(QUEUE_POLL_INTERVAL)
+            
+            if job.status == DONE:
+                status.update(label="Project folder ready", state="complete", expanded=False)
+                return job.result
+            status.update(label="Submission failed", state="error")
+        
+        if job.error_kind == "storage":
+            raise StorageError(job.error)
+        if job.error_kind == "salesforce":
+            raise SalesforceError(job.error)
+        raise RuntimeError(job.error)
     
     def process_form_submission(
         self,
@@ -340,6 +473,33 @@ class BaseAssessment:
         """
         Process the form submission.
         
+        Args:
+            uploaded_files: List of uploaded files
+            html_converter: Function to convert info to HTML
+            
+        Returns:
+            True if submission was successful, False otherwise.
+        """
+        # Tag every log record of this submission with the same correlation ID
+        # and record per-stage timings for the metrics store
+        with correlation_context(), submission_trace(self.assessment_type), \
+                SUBMISSIONS_IN_PROGRESS.track_inprogress():
+            success = self._process_form_submission(uploaded_files, html_converter)
+        
+        SUBMISSIONS.labels(
+            assessment_type=self.assessment_type,
+            result="success" if success else "failure"
+        ).inc()
+        return success
+    
+    def _process_form_submission(
+        self,
+        uploaded_files: List,
+        html_converter: Callable
+    ) -> bool:
+        """
+        Run the submission pipeline and report the outcome in the UI.
+        
         Args:
             uploaded_files: List of uploaded files
             html_converter: Function to convert info to HTML
@@ -351,22 +511,20 @@ class BaseAssessment:
             logger.info(f"Processing {self.assessment_type} assessment submission")
             
             # Validate form data
-            self._validate_form_data()
+            with span("validation"):
+                self._validate_form_data()
             
             # Prepare customer data
             customer_data = self._prepare_customer_data()
             
-            # Create project structure and upload files
-            project_path = self._create_project_structure(
-                customer_data,
-                uploaded_files
-            )
-            
-            # Save HTML report
-            self._save_html_report(project_path, html_converter)
+            if submission_workers_enabled():
+                # Storage and Salesforce steps run in the worker pool
+                result = self._run_queued_submission(customer_data, uploaded_files, html_converter)
+                if result is None:
+                    return False
+            else:
+                result = self._run_inline_submission(customer_data, uploaded_files, html_converter)
             
-            # Create Salesforce opportunity with project-specific path
-            result = self._create_salesforce_opportunity(customer_data, project_path)
             if result.get('success'):
                 st.success("✅ Opportunity created successfully!")
                 logger.info(f"Successfully created opportunity: {result.get('id')}")
@@ -417,6 +575,7 @@ class BaseAssessment:
             additional_sections: Optional function to render additional form sections
         """
         self.setup_page()
+        self.render_existing_projects_lookup()
         
         with st.form(key=f'{self.assessment_type.lower()}_assessment'):
             # Create customer info section
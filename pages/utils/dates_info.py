@@ -69,8 +69,9 @@ def get_formatted_date(date_obj=None, format_str="%Y-%m-%d"):
     
     return date_obj.strftime(format_str)
 
-# Example usage
-last_weekday = get_last_weekday_of_next_month()
+if __name__ == "__main__":
+    # Example usage
+    last_weekday = get_last_weekday_of_next_month()
 
-future_day = get_date_after_next_working_days(6)
-print(future_day)
\ No newline at end of file
+    future_day = get_date_after_next_working_days(6)
+    print(future_day)
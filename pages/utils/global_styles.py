@@ -5,7 +5,6 @@ This module provides functions for setting global styles and loading the iBtest
 """
 
 import streamlit as st
-from PIL import Image
 
 def set_global_styles():
     """
@@ -57,6 +56,9 @@ def load_ibtest_logo():
     Load and display the iBtest logo.
     """
     try:
+        # PIL is only needed here, so keep it off the page import path
+        from PIL import Image
+        
         logo = Image.open("logo_ibtest.png")
         st.image(logo, width=150)
     except Exception as e:
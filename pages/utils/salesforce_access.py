@@ -6,11 +6,9 @@ It handles authentication, connection, and data retrieval operations.
 """
 
 import os
-import requests
 import functools
 import streamlit as st
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
 
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), "../..", ".env"), override=True)
@@ -24,6 +22,9 @@ def connect_to_salesforce():
         Salesforce: Authenticated Salesforce instance or None if connection fails
     """
     try:
+        import requests
+        from simple_salesforce import Salesforce
+        
         # Get credentials from environment variables
         sf_credentials = {
             "username": os.getenv('SALESFORCE_USERNAME'),
@@ -0,0 +1,25 @@
+"""Tests for pages.utils.app_bootstrap."""
+
+from pages.utils import app_bootstrap
+
+
+def test_bootstrap_starts_every_service(monkeypatch):
+    calls = []
+    monkeypatch.setattr(app_bootstrap, "setup_logging", lambda: calls.append("logging"))
+    monkeypatch.setattr(app_bootstrap, "start_metrics_server", lambda: calls.append("metrics"))
+    monkeypatch.setattr(app_bootstrap, "start_warmup", lambda: calls.append("warmup"))
+    
+    app_bootstrap.bootstrap_app()
+    
+    assert calls == ["logging", "metrics", "warmup"]
+
+
+def test_a_failing_warmup_does_not_break_the_page(monkeypatch):
+    def start_warmup():
+        raise RuntimeError("no threads left")
+    
+    monkeypatch.setattr(app_bootstrap, "setup_logging", lambda: None)
+    monkeypatch.setattr(app_bootstrap, "start_metrics_server", lambda: None)
+    monkeypatch.setattr(app_bootstrap, "start_warmup", start_warmup)
+    
+    app_bootstrap.bootstrap_app()
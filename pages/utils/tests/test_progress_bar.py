@@ -0,0 +1,59 @@
+"""Tests for the progress bar callback of pages.utils.base_assessment_refactored."""
+
+import threading
+
+from core.progress import ProgressUpdate
+from pages.utils import base_assessment_refactored
+
+
+class ScriptContexts:
+    """Stand-in for Streamlit's per-thread script run context."""
+    
+    def __init__(self):
+        self.local = threading.local()
+    
+    def get(self, suppress_warning=False):
+        return getattr(self.local, "ctx", None)
+    
+    def add(self, thread, ctx):
+        self.local.ctx = ctx
+
+
+class Bar:
+    """Progress bar recording the session context each update was drawn in."""
+    
+    def __init__(self, contexts):
+        self.contexts = contexts
+        self.drawn_in = []
+    
+    def progress(self, value, text=None):
+        self.drawn_in.append(self.contexts.get())
+
+
+def test_shared_thread_draws_each_session_in_its_own_context(monkeypatch):
+    contexts = ScriptContexts()
+    bars = []
+    
+    def progress(value, text=None):
+        bars.append(Bar(contexts))
+        return bars[-1]
+    
+    monkeypatch.setattr(base_assessment_refactored.st, "progress", progress)
+    monkeypatch.setattr(base_assessment_refactored, "get_script_run_ctx", contexts.get)
+    monkeypatch.setattr(base_assessment_refactored, "add_script_run_ctx", contexts.add)
+    
+    callbacks = []
+    for session in ("session A", "session B"):
+        contexts.local.ctx = session
+        callbacks.append(base_assessment_refactored._progress_bar("Uploading"))
+    
+    # The async Graph loop thread reports progress for both sessions
+    def loop():
+        for callback in callbacks + callbacks:
+            callback(ProgressUpdate("upload", 1, 2, 0, 1, 0.1))
+    
+    thread = threading.Thread(target=loop)
+    thread.start()
+    thread.join()
+    
+    assert [bar.drawn_in for bar in bars] == [["session A"] * 2, ["session B"] * 2]
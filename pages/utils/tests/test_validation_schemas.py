@@ -0,0 +1,144 @@
+"""Tests for pages.utils.validation_schemas and the form validators built on it."""
+
+import pytest
+
+from pages.utils.validation_schemas import (
+    ASSESSMENT_SCHEMAS,
+    MISSING,
+    PERSONAL_EMAIL,
+    REQUIRED,
+    FieldError,
+    error_messages,
+    get_schema,
+    is_personal_email,
+)
+from pages.utils.validations import validate_email, validate_fields, validate_fields_iat
+from services.submission_service import validate_assessment, validate_assessment_batch
+
+
+def valid_info(**overrides):
+    info = {
+        "project_name": "Board test",
+        "contact_name": "Ana",
+        "date": "2026-01-15",
+        "contact_email": "ana@company.com",
+        "customer_name": "ACME",
+    }
+    info.update(overrides)
+    return info
+
+
+@pytest.mark.parametrize("email", [
+    "x@gmail.com",
+    "x@Gmail.com",
+    "X@GMAIL.COM",
+    "x@hotmail.com",
+    "x@live.com.mx",
+    "x@gmail.com.mx",
+])
+def test_validate_email_rejects_personal_domains_in_any_case(email):
+    assert not validate_email(email)
+    assert is_personal_email(email)
+
+
+@pytest.mark.parametrize("email", [
+    "x@gmail.company.com",
+    "x@company.com",
+    "x@mygmail.com",
+    "x@live.company.com.mx",
+    "gmail.com@company.com",
+])
+def test_validate_email_accepts_corporate_domains(email):
+    assert validate_email(email)
+    assert not is_personal_email(email)
+
+
+def test_validate_email_rejects_empty():
+    assert not validate_email("")
+    assert not validate_email(None)
+
+
+def test_validate_record_reports_errors_in_field_order():
+    schema = ASSESSMENT_SCHEMAS["ICT"]
+    info = valid_info(contact_email="a@yahoo.com", project_name="")
+    del info["date"]
+    
+    assert schema.validate_record(info, row=3) == [
+        FieldError(3, "project_name", REQUIRED, "The field project_name is required."),
+        FieldError(3, "date", MISSING, "The field date is required."),
+        FieldError(3, "contact_email", PERSONAL_EMAIL, "Invalid email, only corporate emails accepted"),
+    ]
+
+
+def test_empty_email_has_its_own_message():
+    errors = ASSESSMENT_SCHEMAS["FCT"].validate_record(valid_info(contact_email=""))
+    assert [error.message for error in errors] == ["The email field is required."]
+
+
+def test_customer_group_accepts_either_field():
+    schema = ASSESSMENT_SCHEMAS["ICT"]
+    assert schema.validate_record(valid_info(customer_name="", customer_name2="ACME")) == []
+    
+    errors = schema.validate_record(valid_info(customer_name=""))
+    assert errors == [FieldError(0, "customer_name", REQUIRED, "The field customer_name is required.")]
+
+
+def test_iat_requires_customer_name():
+    info = valid_info()
+    del info["customer_name"]
+    errors = ASSESSMENT_SCHEMAS["IAT"].validate_record(info)
+    assert [(error.field, error.code) for error in errors] == [("customer_name", MISSING)]
+
+
+def test_validate_batch_matches_validate_record():
+    schema = ASSESSMENT_SCHEMAS["FIX"]
+    records = [valid_info(), valid_info(contact_email="b@hotmail.com"), {}, valid_info(date="")]
+    
+    expected = [error for row, record in enumerate(records) for error in schema.validate_record(record, row)]
+    assert schema.validate_batch(records) == expected
+    assert sorted(error_messages(expected)) == [1, 2, 3]
+
+
+def test_validate_batch_of_nothing():
+    assert ASSESSMENT_SCHEMAS["ICT"].validate_batch([]) == []
+
+
+def test_get_schema_is_case_insensitive():
+    assert get_schema("iat") is ASSESSMENT_SCHEMAS["IAT"]
+    assert get_schema("XYZ") is None
+
+
+def test_form_validators_use_schema_messages():
+    assert validate_fields(valid_info(contact_email="x@Gmail.com")) == [
+        "Invalid email, only corporate emails accepted"
+    ]
+
+
+@pytest.mark.parametrize("kind, validate_form", [("ICT", validate_fields), ("IAT", validate_fields_iat)])
+def test_schemas_report_the_form_errors(kind, validate_form):
+    schema = ASSESSMENT_SCHEMAS[kind]
+    records = [
+        valid_info(),
+        valid_info(contact_email="a@yahoo.com"),
+        valid_info(contact_email=""),
+        valid_info(project_name="", date=""),
+        {"contact_email": "b@outlook.com"},
+    ]
+    
+    # The schemas' customer check has no counterpart in the form validators
+    by_schema = error_messages([error for error in schema.validate_batch(records) if error.field in schema.required])
+    assert [by_schema.get(row, []) for row in range(len(records))] == [validate_form(record) for record in records]
+
+
+def test_validate_assessment_single_and_batch():
+    assert validate_assessment("ICT", valid_info()) == []
+    assert validate_assessment("XYZ", valid_info())[0].startswith("Unknown assessment type 'XYZ'")
+    
+    results = validate_assessment_batch(
+        ["ICT", "IAT", "ICT", "XYZ"],
+        [valid_info(), valid_info(contact_email="a@live.com.mx"), valid_info(date=""), valid_info()]
+    )
+    assert results[0] == []
+    assert results[1] == ["Invalid email, only corporate emails accepted"]
+    assert results[2] == ["The field date is required."]
+    assert results[3][0].startswith("Unknown assessment type")
@@ -0,0 +1,194 @@
+"""
+Validation Schemas Module
+
+This module compiles the validation rules of each assessment type (ICT, FCT,
+IAT, FIX) into schemas that validate one record or a whole batch of records.
+
+The rules are the ones the forms apply (see validations.py): required fields
+must be filled and the contact email must not use a personal email domain.
+Personal domains are looked up in a set instead of searching every
+INVALID_EMAILS entry in every address; a domain matches when it or its
+leading labels equal a listed domain ("gmail.com", "gmail.com.mx"),
+regardless of case.
+
+``validate_batch`` checks many records with the same precompiled rules and
+returns structured per-field errors carrying the same messages as the forms.
+
+Usage:
+    schema = ASSESSMENT_SCHEMAS["ICT"]
+    errors = schema.validate_record(info)          # List[FieldError]
+    errors = schema.validate_batch(list_of_infos)  # FieldError.row = index
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from pages.utils.constants import INVALID_EMAILS
+
+# Error codes of FieldError
+MISSING = "missing"
+REQUIRED = "required"
+PERSONAL_EMAIL = "personal_email"
+
+# Domains of INVALID_EMAILS, without the "@"
+PERSONAL_EMAIL_DOMAINS: FrozenSet[str] = frozenset(domain.lstrip("@").lower() for domain in INVALID_EMAILS)
+
+# Label counts of the listed domains ("gmail.com" -> 2, "live.com.mx" -> 3)
+_DOMAIN_LABEL_COUNTS: Tuple[int, ...] = tuple(sorted({d.count(".") + 1 for d in PERSONAL_EMAIL_DOMAINS}))
+
+# Marks a field missing from a record
+_ABSENT = object()
+
+
+def is_personal_email(email: str) -> bool:
+    """
+    Check whether an email address uses a personal email domain.
+    
+    Args:
+        email: Email address.
+    
+    Returns:
+        True if its domain, or its leading labels, is in PERSONAL_EMAIL_DOMAINS.
+    """
+    domain = email[email.rfind("@") + 1:].lower()
+    if domain in PERSONAL_EMAIL_DOMAINS:
+        return True
+    labels = domain.split(".")
+    for count in _DOMAIN_LABEL_COUNTS:
+        if count >= len(labels):
+            break
+        if ".".join(labels[:count]) in PERSONAL_EMAIL_DOMAINS:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class FieldError:
+    """A validation error of one field of one record."""
+    row: int
+    field: str
+    code: str
+    message: str
+
+
+class ValidationSchema:
+    """Compiled validation rules of an assessment type."""
+    
+    def __init__(
+        self,
+        name: str,
+        required: Sequence[str],
+        email_fields: Sequence[str] = ("contact_email",),
+        any_of: Sequence[Tuple[str, ...]] = ()
+    ):
+        """
+        Initialize the schema.
+        
+        Args:
+            name: Assessment type.
+            required: Fields that must be present and filled, in report order.
+            email_fields: Required fields holding an email address.
+            any_of: Groups of fields of which at least one must be filled;
+                    errors are reported on the first field of the group.
+        """
+        self.name = name
+        self.required = tuple(required)
+        self.email_fields = frozenset(email_fields)
+        self.any_of = tuple(tuple(group) for group in any_of)
+        # (field, message if missing, message if empty, holds an email) per required field
+        self._rules = tuple(
+            (
+                field,
+                f"The field {field} is required.",
+                "The email field is required." if field in self.email_fields else f"The field {field} is required.",
+                field in self.email_fields,
+            )
+            for field in self.required
+        )
+        self._any_of_rules = tuple((group, f"The field {group[0]} is required.") for group in self.any_of)
+    
+    def validate_record(self, record: Dict, row: int = 0) -> List[FieldError]:
+        """
+        Validate one record.
+        
+        Args:
+            record: Form data.
+            row: Row number to put on the errors.
+        
+        Returns:
+            Errors in report order, empty if the record is valid.
+        """
+        errors = []
+        for field, missing_message, required_message, is_email in self._rules:
+            value = record.get(field, _ABSENT)
+            if value is _ABSENT:
+                errors.append(FieldError(row, field, MISSING, missing_message))
+            elif not value:
+                errors.append(FieldError(row, field, REQUIRED, required_message))
+            elif is_email and is_personal_email(str(value)):
+                errors.append(FieldError(
+                    row, field, PERSONAL_EMAIL, "Invalid email, only corporate emails accepted"
+                ))
+        
+        for group, message in self._any_of_rules:
+            for field in group:
+                if record.get(field):
+                    break
+            else:
+                errors.append(FieldError(row, group[0], REQUIRED, message))
+        return errors
+    
+    def validate_batch(self, records: Iterable[Dict]) -> List[FieldError]:
+        """
+        Validate many records.
+        
+        Args:
+            records: Form data dictionaries.
+        
+        Returns:
+            Errors ordered by row, then in report order; ``row`` is the
+            position of the record in ``records``.
+        """
+        errors: List[FieldError] = []
+        validate = self.validate_record
+        for row, record in enumerate(records):
+            record_errors = validate(record, row)
+            if record_errors:
+                errors.extend(record_errors)
+        return errors
+
+
+def error_messages(errors: List[FieldError]) -> Dict[int, List[str]]:
+    """
+    Group error messages by row.
+    
+    Args:
+        errors: Errors from validate_record()/validate_batch().
+    
+    Returns:
+        Row -> messages, in report order (rows without errors are absent).
+    """
+    grouped: Dict[int, List[str]] = {}
+    for error in errors:
+        grouped.setdefault(error.row, []).append(error.message)
+    return grouped
+
+
+# Required fields as on the forms (validate_fields / validate_fields_iat)
+ICT_FCT_REQUIRED = ("project_name", "contact_name", "date", "contact_email")
+IAT_REQUIRED = ("project_name", "contact_name", "contact_email", "customer_name", "date")
+
+# The forms always offer a customer; without one there is no project folder
+_CUSTOMER = (("customer_name", "customer_name2"),)
+
+ASSESSMENT_SCHEMAS: Dict[str, ValidationSchema] = {
+    "ICT": ValidationSchema("ICT", ICT_FCT_REQUIRED, any_of=_CUSTOMER),
+    "FCT": ValidationSchema("FCT", ICT_FCT_REQUIRED, any_of=_CUSTOMER),
+    "IAT": ValidationSchema("IAT", IAT_REQUIRED),
+    "FIX": ValidationSchema("FIX", ICT_FCT_REQUIRED, any_of=_CUSTOMER),
+}
+
+
+def get_schema(assessment_type: str) -> Optional[ValidationSchema]:
+    """Schema of an assessment type (ICT, FCT, IAT or FIX), or None if unknown."""
+    return ASSESSMENT_SCHEMAS.get(assessment_type.upper())
@@ -3,9 +3,10 @@ Validation Module
 
 This module provides validation functions for form data.
 It includes email validation and field validation for different assessment types.
+Batches of records are validated with the schemas in validation_schemas.py.
 """
 
-from pages.utils.constants import INVALID_EMAILS
+from pages.utils.validation_schemas import ICT_FCT_REQUIRED, IAT_REQUIRED, is_personal_email
 
 def validate_email(email):
     """
@@ -20,11 +21,8 @@ def validate_email(email):
     if not email:
         return False
         
-    for invalid_domain in INVALID_EMAILS:
-        if invalid_domain in email:
-            return False
-    
-    return True
+    # Set lookup of the domain (see validation_schemas.PERSONAL_EMAIL_DOMAINS)
+    return not is_personal_email(email)
 
 def validate_required_fields(fields, required_fields):
     """
@@ -64,14 +62,7 @@ def validate_fields(fields):
     Returns:
         list: List of error messages, empty if all validations pass
     """
-    required_fields = [
-        "project_name",
-        "contact_name",
-        "date",
-        "contact_email"
-    ]
-    
-    return validate_required_fields(fields, required_fields)
+    return validate_required_fields(fields, ICT_FCT_REQUIRED)
 
 def validate_fields_iat(fields):
     """
@@ -83,12 +74,4 @@ def validate_fields_iat(fields):
     Returns:
         list: List of error messages, empty if all validations pass
     """
-    required_fields = [
-        "project_name",
-        "contact_name",
-        "contact_email",
-        "customer_name",
-        "date"
-    ]
-    
-    return validate_required_fields(fields, required_fields)
\ No newline at end of file
+    return validate_required_fields(fields, IAT_REQUIRED)
\ No newline at end of file
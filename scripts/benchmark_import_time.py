@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+
+This script measures the cold-start import cost of the application entry
+points (main.py and each assessment page) using ``python -X importtime``.
+
+Each entry point is parsed to collect its module-level imports, which are then
+executed in a fresh interpreter so that no Streamlit code is run. The script
+reports the total import time, the heaviest modules and whether any module on
+the deferred list (Salesforce, Graph, imaging libraries) leaked into the
+startup path.
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --runs 5 --budget-ms 1500
+    python scripts/benchmark_import_time.py --json import_times.json
+"""
+
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Entry points executed by `streamlit run main.py` and its page routes
+ENTRYPOINTS = [
+    "main.py",
+    "pages/ict_assessment.py",
+    "pages/fct_assessment.py",
+    "pages/iat_assessment.py",
+]
+
+# Heavy modules that must only be imported on first use
+DEFERRED_MODULES = [
+    "simple_salesforce",
+    "zeep",
+    "lxml",
+    "msal",
+    "requests",
+    "PIL",
+]
+
+
+def collect_imports(entrypoint: Path) -> List[str]:
+    """
+    Collect the module-level import statements of a script.
+
+    Imports nested in functions or classes are ignored because they only run
+    when the code is called, not when the script starts.
+
+    Args:
+        entrypoint: Path to the Python script.
+
+    Returns:
+        List of import statements as source strings.
+    """
+    tree = ast.parse(entrypoint.read_text(encoding="utf-8"))
+    statements = []
+
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append(ast.unparse(node))
+        elif isinstance(node, ast.If):
+            pending.extend(node.body + node.orelse)
+        elif isinstance(node, ast.Try):
+            pending.extend(node.body)
+
+    return statements
+
+
+def parse_importtime(output: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Parse the stderr output of ``python -X importtime``.
+
+    Args:
+        output: Raw stderr text.
+
+    Returns:
+        Tuple of (total self time in microseconds, cumulative time per module).
+    """
+    total_us = 0
+    cumulative: Dict[str, int] = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+
+        self_us = int(fields[0])
+        cumulative_us = int(fields[1])
+        name = fields[2].strip()
+
+        total_us += self_us
+        cumulative[name] = cumulative_us
+
+    return total_us, cumulative
+
+
+def measure_entrypoint(entrypoint: str, runs: int) -> Dict:
+    """
+    Measure the import cost of an entry point over several cold runs.
+
+    Args:
+        entrypoint: Script path relative to the project root.
+        runs: Number of fresh interpreters to launch.
+
+    Returns:
+        Dictionary with median total time, heaviest modules and deferred
+        modules that were imported.
+    """
+    statements = collect_imports(PROJECT_ROOT / entrypoint)
+    code = "\n".join(statements)
+
+    totals = []
+    cumulative: Dict[str, int] = {}
+
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr else "unknown error"
+            return {"entrypoint": entrypoint, "error": error}
+
+        total_us, cumulative = parse_importtime(result.stderr)
+        totals.append(total_us)
+
+    heaviest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)
+    top_level = [(name, us) for name, us in heaviest if "." not in name][:10]
+    leaked = [name for name in DEFERRED_MODULES if name in cumulative]
+
+    return {
+        "entrypoint": entrypoint,
+        "total_ms": statistics.median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "max_ms": max(totals) / 1000,
+        "top_modules": [{"module": name, "cumulative_ms": us / 1000} for name, us in top_level],
+        "deferred_imported": leaked,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument("--runs", type=int, default=3, help="Cold runs per entry point (default: 3)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Fail if any entry point exceeds this import time")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to a JSON file")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("IMPORT TIME BENCHMARK")
+    print("=" * 70)
+
+    results = []
+    failed = False
+
+    for entrypoint in ENTRYPOINTS:
+        result = measure_entrypoint(entrypoint, args.runs)
+        results.append(result)
+
+        print(f"\n📄 {entrypoint}")
+        if "error" in result:
+            print(f"   ❌ Import failed: {result['error']}")
+            failed = True
+            continue
+
+        print(f"   ⏱️  Total: {result['total_ms']:.1f} ms "
+              f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+        for module in result["top_modules"][:5]:
+            print(f"      {module['cumulative_ms']:8.1f} ms  {module['module']}")
+
+        if result["deferred_imported"]:
+            print(f"   ❌ Deferred modules imported at startup: {', '.join(result['deferred_imported'])}")
+            failed = True
+
+        if args.budget_ms is not None and result["total_ms"] > args.budget_ms:
+            print(f"   ❌ Over budget ({args.budget_ms:.0f} ms)")
+            failed = True
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n💾 Results written to {args.json}")
+
+    print("\n" + "=" * 70)
+    print("❌ Import time budget exceeded" if failed else "✅ Import time within budget")
+    print("=" * 70)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Stage Metrics Report
+
+This script prints per-stage latency percentiles of recent form submissions
+from the local metrics store written by core.instrumentation.
+
+Usage:
+    python scripts/show_stage_metrics.py
+    python scripts/show_stage_metrics.py --window 86400
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.instrumentation import get_metrics_store
+
+# Pipeline order, used to sort the report
+STAGE_ORDER = [
+    "submission",
+    "validation",
+    "create_project_folder",
+    "copy_template",
+    "upload_files",
+    "upload",
+    "render_html",
+    "save_html",
+    "account_lookup",
+    "create_opportunity",
+]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Show submission stage percentiles")
+    parser.add_argument("--window", type=float, default=3600,
+                        help="Rolling window in seconds (default: 3600)")
+    args = parser.parse_args()
+    
+    store = get_metrics_store()
+    stats = store.percentiles(window_seconds=args.window)
+    
+    print("=" * 100)
+    print(f"STAGE METRICS - last {args.window:.0f}s ({store.db_path})")
+    print("=" * 100)
+    
+    if not stats:
+        print("\nNo submissions recorded in this window.")
+        return
+    
+    print(f"\n{'stage':<24}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}"
+          f"{'p95 ms':>10}{'p99 ms':>10}{'avg KB':>10}{'avg http':>10}")
+    print("-" * 100)
+    
+    ordered = sorted(stats, key=lambda s: STAGE_ORDER.index(s) if s in STAGE_ORDER else len(STAGE_ORDER))
+    for stage in ordered:
+        row = stats[stage]
+        print(f"{stage:<24}{row['count']:>7}{row['errors']:>8}{row['p50']:>10.1f}{row['p90']:>10.1f}"
+              f"{row['p95']:>10.1f}{row['p99']:>10.1f}{row['avg_bytes'] / 1024:>10.1f}"
+              f"{row['avg_http_calls']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Bulk Import Module
+
+This module runs assessment requests from a spreadsheet (CSV or XLSX)
+through the same pipeline as the assessment forms: rows are validated with
+the form rules, project folders are created from the templates and HTML
+reports saved for many rows in parallel, and the opportunities are created
+with batched sObject Collections requests while the storage steps of later
+rows are still running.
+
+Each step of each row is appended to a checkpoint file (JSON lines). Running
+the same import again skips rows whose opportunity exists and does not
+recreate folders or reports that are already there, so an interrupted import
+resumes where it stopped; rows edited in the spreadsheet since then start
+over. Rows are matched by content, not line number, so rows inserted,
+deleted or re-sorted in between keep their progress. A project folder is
+recorded as pending before it is created, so a template copy cut short is
+completed by the next run instead of failing as an existing project.
+
+Columns are the form field names (``project_name``, ``contact_name``,
+``contact_email``, ``customer_name``, ``country``, ...); headers are matched
+case-insensitively with spaces read as underscores. An optional ``type``
+column (ICT, FCT, IAT or FIX) overrides ``--type`` per row.
+
+Usage:
+    python -m services.bulk_import requests.xlsx --type ICT
+    python -m services.bulk_import requests.csv --type IAT --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.exceptions import SalesforceError, StorageError, ValidationError
+from core.logging_config import get_logger, setup_logging
+from services.salesforce_service import OPPORTUNITY_BATCH_SIZE
+from services.submission_service import (
+    ASSESSMENT_KINDS, Submission, SubmissionService, resolve_converter, validate_assessment_batch
+)
+
+logger = get_logger(__name__)
+
+# Rows whose storage steps run at once (override with BULK_IMPORT_WORKERS)
+DEFAULT_WORKERS = 8
+
+# Minimum seconds between two throughput log lines
+REPORT_INTERVAL = 2.0
+
+
+@dataclass
+class ImportRow:
+    """A spreadsheet row and its progress through the pipeline."""
+    number: int                 # Spreadsheet line, for reporting
+    kind: str
+    info: Dict[str, str]
+    key: str                    # Content fingerprint and occurrence, identifies the row in the checkpoint
+    state: Dict = field(default_factory=dict)
+    
+    @property
+    def done(self) -> bool:
+        """True if the row's opportunity was created by an earlier run."""
+        return bool(self.state.get("opportunity_id"))
+
+
+@dataclass
+class ImportReport:
+    """Outcome and throughput of an import run."""
+    total: int = 0
+    created: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    
+    @property
+    def processed(self) -> int:
+        """Rows handled by this run (not skipped from the checkpoint)."""
+        return self.total - self.skipped
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Rows handled per second."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def describe(self) -> str:
+        """One-line summary, e.g. "450 rows: 440 created, 0 skipped, ... in 12.3s (35.8 rows/s)"."""
+        return (
+            f"{self.total} rows: {self.created} created, {self.skipped} already done, "
+            f"{self.invalid} invalid, {self.failed} failed in {self.elapsed:.1f}s "
+            f"({self.rows_per_second:.1f} rows/s)"
+        )
+
+
+class ImportCheckpoint:
+    """Append-only JSON lines record of the steps each row has passed."""
+    
+    def __init__(self, path: Path):
+        """
+        Initialize the checkpoint.
+        
+        Args:
+            path: Checkpoint file (created on the first record).
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+    
+    def load(self) -> Dict[str, Dict]:
+        """
+        Read the recorded state of every row.
+        
+        Returns:
+            Row key -> merged state of its records (later records win).
+        """
+        states: Dict[str, Dict] = {}
+        if not self.path.exists():
+            return states
+        
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash
+                    continue
+                states.setdefault(record["key"], {}).update(record)
+        return states
+    
+    def record(self, row: ImportRow, **values) -> None:
+        """
+        Append a record for a row and merge it into the row's state.
+        
+        Args:
+            row: Row the record is about.
+            values: State values (status, project_path, opportunity_id, error...).
+        """
+        record = {"row": row.number, "key": row.key, **values}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            row.state.update(record)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def _column_name(header: str) -> str:
+    """Form field name of a spreadsheet header ("Contact Email" -> "contact_email")."""
+    return "_".join(str(header).strip().lower().split())
+
+
+def read_rows(path: Path) -> List[Dict[str, str]]:
+    """
+    Read the assessment rows of a CSV or XLSX file.
+    
+    Args:
+        path: Spreadsheet file (.csv or .xlsx).
+    
+    Returns:
+        One dictionary per row, keyed by form field name; empty cells are "".
+    
+    Raises:
+        ValidationError: If the file type is not supported or cannot be read.
+    """
+    import pandas as pd
+    
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".csv":
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        elif suffix == ".xlsx":
+            frame = pd.read_excel(path, dtype=str, keep_default_na=False)
+        else:
+            raise ValidationError(f"Unsupported spreadsheet type: {suffix} (use .csv or .xlsx)")
+    except ImportError as e:
+        raise ValidationError(f"Cannot read {suffix} files: {e}. Install it with: pip install openpyxl")
+    except (OSError, ValueError) as e:
+        raise ValidationError(f"Cannot read {path}: {e}")
+    
+    frame.columns = [_column_name(column) for column in frame.columns]
+    return [
+        {column: str(value).strip() for column, value in record.items()}
+        for record in frame.to_dict(orient="records")
+    ]
+
+
+def _row_key(kind: str, info: Dict[str, str]) -> str:
+    """Fingerprint of a row's content: moved rows keep their progress, edited rows start over."""
+    content = json.dumps([kind, sorted(info.items())], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+class BulkImporter:
+    """Runs spreadsheet rows through the submission pipeline."""
+    
+    def __init__(
+        self,
+        submission_service: SubmissionService,
+        checkpoint: ImportCheckpoint,
+        workers: int = DEFAULT_WORKERS
+    ):
+        """
+        Initialize the importer.
+        
+        Args:
+            submission_service: SubmissionService running the steps.
+            checkpoint: Checkpoint recording progress.
+            workers: Rows whose storage steps run at once.
+        """
+        self.service = submission_service
+        self.checkpoint = checkpoint
+        self.workers = max(workers, 1)
+        self._progress_lock = threading.Lock()
+        self._last_report = 0.0
+    
+    def prepare(self, records: List[Dict[str, str]], default_kind: Optional[str]) -> List[ImportRow]:
+        """
+        Turn spreadsheet records into rows, with their checkpoint state.
+        
+        Args:
+            records: Rows from read_rows().
+            default_kind: Assessment type of rows without a ``type`` column value.
+        
+        Returns:
+            The rows; row numbers match the spreadsheet lines (header is line 1).
+        """
+        states = self.checkpoint.load()
+        today = datetime.today().strftime("%Y-%m-%d")
+        rows = []
+        occurrences: Dict[str, int] = {}
+        for index, record in enumerate(records):
+            info = dict(record)
+            kind = (info.pop("type", "") or default_kind or "").upper()
+            # Filled in automatically by the forms
+            info["date"] = info.get("date") or today
+            info["country"] = info.get("country") or "Mexico"
+            if not info.get("customer_name") and info.get("customer_name2"):
+                # A customer that is not in the account list, as picked on the form
+                info["customer_name"] = "Other"
+            
+            # Identical rows are told apart by their order among themselves
+            fingerprint = _row_key(kind, record)
+            occurrences[fingerprint] = occurrences.get(fingerprint, 0) + 1
+            key = f"{fingerprint}-{occurrences[fingerprint]}"
+            row = ImportRow(number=index + 2, kind=kind, info=info, key=key, state=states.get(key, {}))
+            rows.append(row)
+        return rows
+    
+    def run(self, rows: List[ImportRow]) -> ImportReport:
+        """
+        Run rows through validation, storage and Salesforce.
+        
+        Args:
+            rows: Rows from prepare().
+        
+        Returns:
+            ImportReport with counts, errors and throughput.
+        """
+        report = ImportReport(total=len(rows))
+        started = time.perf_counter()
+        
+        todo = [row for row in rows if not row.done]
+        report.skipped = len(rows) - len(todo)
+        
+        pending = []
+        row_errors = validate_assessment_batch([row.kind for row in todo], [row.info for row in todo])
+        for row, errors in zip(todo, row_errors):
+            if errors:
+                self.checkpoint.record(row, status="invalid", error="; ".join(errors))
+                report.invalid += 1
+                report.errors.append((row.number, "; ".join(errors)))
+                continue
+            pending.append(row)
+        
+        logger.info(
+            "Importing %s rows (%s already done, %s invalid) with %s workers",
+            len(pending), report.skipped, report.invalid, self.workers
+        )
+        
+        # Storage steps run in the pool; opportunities are sent from here in
+        # batches as rows become ready, overlapping the remaining storage work
+        ready: List[Tuple[ImportRow, Submission]] = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-import") as pool:
+            futures = {pool.submit(self._store, row): row for row in pending}
+            for future in as_completed(futures):
+                row = futures[future]
+                submission = future.result()
+                if submission is None:
+                    self._count_failure(row, report)
+                else:
+                    ready.append((row, submission))
+                if len(ready) >= OPPORTUNITY_BATCH_SIZE:
+                    self._create_opportunities(ready, report)
+                    ready = []
+                self._report_progress(report, len(pending), started)
+        
+        if ready:
+            self._create_opportunities(ready, report)
+        
+        report.elapsed = time.perf_counter() - started
+        logger.info("Bulk import: %s", report.describe())
+        return report
+    
+    def _store(self, row: ImportRow) -> Optional[Submission]:
+        """
+        Create the project folder and HTML report of a row (skipping done steps).
+        
+        Returns:
+            The row's Submission, or None if a step failed (recorded in the checkpoint).
+        """
+        kind = ASSESSMENT_KINDS[row.kind]
+        submission = kind.submission(row.info)
+        try:
+            project_path = row.state.get("project_path")
+            pending = row.state.get("folder_pending", False)
+            if not project_path or pending:
+                if not pending:
+                    # Recorded first: a run stopped during the template copy
+                    # leaves a folder the next run must complete, not reject
+                    self.checkpoint.record(
+                        row, status="folder_pending", folder_pending=True,
+                        project_path=self.service.project_path(submission)
+                    )
+                project_path = self.service.create_project_structure(submission, [], resume=pending)
+                self.checkpoint.record(row, status="folder_created", folder_pending=False, project_path=project_path)
+            
+            if not row.state.get("html_saved"):
+                self.service.save_html_report(submission, project_path, resolve_converter(kind.converter))
+                self.checkpoint.record(row, status="stored", html_saved=True)
+            return submission
+        
+        except StorageError as e:
+            logger.error("Row %s: %s", row.number, e.message)
+            self.checkpoint.record(row, status="failed", error_kind="storage", error=e.message)
+        except Exception as e:
+            logger.error("Row %s failed: %s", row.number, e, exc_info=True)
+            self.checkpoint.record(row, status="failed", error_kind="unexpected", error=str(e))
+        return None
+    
+    def _create_opportunities(self, ready: List[Tuple[ImportRow, Submission]], report: ImportReport) -> None:
+        """Create the opportunities of stored rows with one batched request."""
+        fields = [self.service.opportunity_fields(submission, row.state["project_path"]) for row, submission in ready]
+        try:
+            results = self.service.salesforce_service.create_opportunities(fields)
+        except SalesforceError as e:
+            results = [{"success": False, "errors": [{"message": e.message}]} for _ in ready]
+        
+        for (row, _), result in zip(ready, results):
+            if result.get("success"):
+                self.checkpoint.record(row, status="created", opportunity_id=result["id"])
+                report.created += 1
+            else:
+                message = "; ".join(error.get("message", str(error)) for error in result.get("errors", []))
+                self.checkpoint.record(row, status="failed", error_kind="salesforce", error=message)
+                self._count_failure(row, report)
+    
+    @staticmethod
+    def _count_failure(row: ImportRow, report: ImportReport) -> None:
+        report.failed += 1
+        report.errors.append((row.number, row.state.get("error", "unknown error")))
+    
+    def _report_progress(self, report: ImportReport, total: int, started: float) -> None:
+        """Log rows done and throughput, at most every REPORT_INTERVAL seconds."""
+        now = time.perf_counter()
+        with self._progress_lock:
+            if now - self._last_report < REPORT_INTERVAL:
+                return
+            self._last_report = now
+        done = report.created + report.failed
+        elapsed = now - started
+        logger.info(
+            "Bulk import: %s/%s rows done, %s created (%.1f rows/s)",
+            done, total, report.created, done / elapsed if elapsed > 0 else 0.0
+        )
+
+
+def default_checkpoint_path(path: Path) -> Path:
+    """Checkpoint file next to the spreadsheet ("requests.xlsx" -> "requests.xlsx.checkpoint.jsonl")."""
+    return path.with_name(path.name + ".checkpoint.jsonl")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Import assessment requests from a CSV/XLSX file")
+    parser.add_argument("path", type=Path, help="Spreadsheet with one assessment per row")
+    parser.add_argument("--type", choices=sorted(ASSESSMENT_KINDS),
+                        help="Assessment type of rows without a 'type' column value")
+    parser.add_argument("--checkpoint", type=Path,
+                        help="Checkpoint file (default: <path>.checkpoint.jsonl)")
+    parser.add_argument("--workers", type=int,
+                        default=int(os.getenv("BULK_IMPORT_WORKERS", DEFAULT_WORKERS)),
+                        help="Rows whose storage steps run at once (default: 8)")
+    args = parser.parse_args(argv)
+    
+    setup_logging()
+    
+    # Imported here: the Streamlit-cached factories are only needed when importing
+    from services.salesforce_service import get_salesforce_service
+    from services.storage_service import get_storage_service
+    from services.warmup import start_warmup
+    
+    try:
+        records = read_rows(args.path)
+    except ValidationError as e:
+        print(f"Error: {e.message}", file=sys.stderr)
+        return 2
+    
+    start_warmup()
+    checkpoint = ImportCheckpoint(args.checkpoint or default_checkpoint_path(args.path))
+    importer = BulkImporter(
+        SubmissionService(get_storage_service(), get_salesforce_service()), checkpoint, args.workers
+    )
+    report = importer.run(importer.prepare(records, args.type))
+    
+    print(report.describe())
+    for number, error in sorted(report.errors):
+        print(f"  row {number}: {error}")
+    print(f"Checkpoint: {checkpoint.path} (run again to retry failed rows)")
+    return 1 if report.invalid or report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
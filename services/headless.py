@@ -0,0 +1,412 @@
+"""
+Headless Submission Module
+
+This module runs assessment submissions without a browser session: the form
+data is validated with the rules of its form and the storage and Salesforce
+steps run through SubmissionService, as on the pages, with the same
+correlation IDs and stage metrics. Integrations and load tests use it from
+the command line or through a small local HTTP API.
+
+HTTP API (``serve``):
+
+    POST /submissions              submit; 201 with the result when created
+    POST /submissions?queue=1      hand over to the worker pool; 202 with a job ID
+                                   (503 if no worker pool is running)
+    GET  /submissions/{job_id}     state of a queued submission
+    GET  /ready                    200 once the startup warm-up finished
+
+Submissions are JSON (``{"type": "ICT", "info": {...}, "files": [{"name":
+..., "content_base64": ...}]}``) or multipart/form-data with a
+``submission`` JSON part and one part per file. The server binds to
+127.0.0.1 by default; set SUBMISSION_API_TOKEN to require
+``Authorization: Bearer <token>``.
+
+Usage:
+    python -m services.headless submit --type ICT --info info.json drawing.pdf bom.xlsx
+    python -m services.headless serve --port 8600
+"""
+
+import argparse
+import base64
+import hmac
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from core.exceptions import SalesforceError, StorageError, ValidationError, WorkerUnavailableError
+from core.instrumentation import submission_trace
+from core.logging_config import correlation_context, get_logger, setup_logging
+from core.metrics import REGISTRY
+from services.submission_queue import SpooledUpload, get_submission_queue
+from services.submission_service import (
+    ASSESSMENT_KINDS, SubmissionService, resolve_converter, validate_assessment
+)
+
+logger = get_logger(__name__)
+
+API_REQUESTS = REGISTRY.counter(
+    "submission_api_requests_total",
+    "Requests to the headless submission API by endpoint and HTTP status",
+    ["endpoint", "status"]
+)
+
+# Local-only by default (override with SUBMISSION_API_ADDR / SUBMISSION_API_PORT)
+DEFAULT_ADDR = "127.0.0.1"
+DEFAULT_PORT = 8600
+
+# Largest accepted request body in bytes (override with SUBMISSION_API_MAX_BYTES)
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+def _prepare_info(kind: str, info: Dict) -> Tuple[str, Dict]:
+    """Normalize the type and fill in the values the forms set automatically."""
+    info = dict(info)
+    info["date"] = info.get("date") or datetime.today().strftime("%Y-%m-%d")
+    return kind.upper(), info
+
+
+def submit_assessment(service: SubmissionService, kind: str, info: Dict, files: List) -> Dict:
+    """
+    Validate and run one assessment submission.
+    
+    Args:
+        service: SubmissionService running the steps.
+        kind: Assessment type (ICT, FCT, IAT or FIX).
+        info: Form data, keyed by form field name.
+        files: Customer files (binary streams with a ``name``).
+    
+    Returns:
+        Salesforce result dictionary (``success``, ``id``, ``errors``) plus
+        ``project_path`` and ``correlation_id``.
+    
+    Raises:
+        ValidationError: If the form data is invalid.
+        StorageError: If a storage step fails.
+        SalesforceError: If opportunity creation fails.
+    """
+    kind, info = _prepare_info(kind, info)
+    errors = validate_assessment(kind, info)
+    if errors:
+        raise ValidationError("\n".join(errors))
+    
+    assessment = ASSESSMENT_KINDS[kind]
+    with correlation_context() as correlation_id, submission_trace(assessment.assessment_type):
+        result = service.run(assessment.submission(info), files, resolve_converter(assessment.converter))
+    result["correlation_id"] = correlation_id
+    return result
+
+
+def queue_assessment(kind: str, info: Dict, files: List) -> str:
+    """
+    Validate a submission and queue it for the worker pool.
+    
+    Args:
+        kind: Assessment type (ICT, FCT, IAT or FIX).
+        info: Form data, keyed by form field name.
+        files: Customer files (binary streams with a ``name``).
+    
+    Returns:
+        Job ID (see services/submission_queue.py).
+    
+    Raises:
+        ValidationError: If the form data is invalid.
+        WorkerUnavailableError: If no worker pool is running to take the job.
+    """
+    kind, info = _prepare_info(kind, info)
+    errors = validate_assessment(kind, info)
+    if errors:
+        raise ValidationError("\n".join(errors))
+    
+    # A job no pool claims would stay queued forever (only running jobs are failed as lost)
+    queue = get_submission_queue()
+    if not queue.workers_alive():
+        raise WorkerUnavailableError("no submission workers running")
+    
+    assessment = ASSESSMENT_KINDS[kind]
+    with correlation_context():
+        return queue.enqueue(assessment.submission(info), files, assessment.converter)
+
+
+def _named_stream(name: str, content: bytes) -> io.BytesIO:
+    """In-memory upload under a file name, like Streamlit's UploadedFile."""
+    stream = io.BytesIO(content)
+    stream.name = Path(name).name
+    return stream
+
+
+def parse_submission(content_type: str, body: bytes) -> Tuple[str, Dict, List]:
+    """
+    Parse a submission request body.
+    
+    Args:
+        content_type: Content-Type header (JSON or multipart/form-data).
+        body: Request body.
+    
+    Returns:
+        Tuple of (assessment type, form data, file streams).
+    
+    Raises:
+        ValueError: If the body is malformed.
+    """
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        payload, files = None, []
+        for part in message.iter_parts():
+            field_name = part.get_param("name", header="content-disposition")
+            if field_name == "submission":
+                payload = json.loads(part.get_payload(decode=True))
+            elif part.get_filename():
+                files.append(_named_stream(part.get_filename(), part.get_payload(decode=True) or b""))
+        if payload is None:
+            raise ValueError("multipart body has no 'submission' part")
+        if not isinstance(payload, dict):
+            raise ValueError("the 'submission' part must be a JSON object")
+    else:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("body must be a JSON object")
+        files = [
+            _named_stream(item["name"], base64.b64decode(item.get("content_base64", "")))
+            for item in payload.get("files", [])
+        ]
+    
+    if not isinstance(payload.get("info"), dict) or not payload.get("type"):
+        raise ValueError("submission needs 'type' and an 'info' object")
+    return str(payload["type"]), payload["info"], files
+
+
+def _job_view(job) -> Dict:
+    """JSON view of a queued job."""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "result": job.result,
+        "error": job.error,
+        "error_kind": job.error_kind,
+        "correlation_id": job.correlation_id,
+    }
+
+
+class _SubmissionHandler(BaseHTTPRequestHandler):
+    """Serve the headless submission API."""
+    
+    service: Optional[SubmissionService] = None
+    token: Optional[str] = None
+    max_bytes: int = DEFAULT_MAX_BYTES
+    
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/submissions":
+            return self._send_json("other", 404, {"error": "not found"})
+        if not self._authorized():
+            return self._send_json("submit", 401, {"error": "missing or invalid bearer token"})
+        
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._send_json("submit", 400, {"error": "invalid Content-Length"})
+        if length > self.max_bytes:
+            return self._send_json("submit", 413, {"error": f"request larger than {self.max_bytes} bytes"})
+        body = self.rfile.read(length)
+        
+        try:
+            kind, info, files = parse_submission(self.headers.get("Content-Type", ""), body)
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json("submit", 400, {"error": f"malformed submission: {e}"})
+        
+        queued = parse_qs(url.query).get("queue", ["0"])[0].lower() in ("1", "true", "yes")
+        try:
+            if queued:
+                job_id = queue_assessment(kind, info, files)
+                return self._send_json("submit", 202, {"job_id": job_id, "status_url": f"/submissions/{job_id}"})
+            result = submit_assessment(self.service, kind, info, files)
+        except ValidationError as e:
+            return self._send_json("submit", 422, {"error": e.message, "error_kind": "validation"})
+        except WorkerUnavailableError as e:
+            return self._send_json("submit", 503, {"error": e.message})
+        except StorageError as e:
+            logger.error("API submission failed: %s", e.message, exc_info=True)
+            return self._send_json("submit", 502, {"error": e.message, "error_kind": "storage"})
+        except SalesforceError as e:
+            logger.error("API submission failed: %s", e.message, exc_info=True)
+            return self._send_json("submit", 502, {"error": e.message, "error_kind": "salesforce"})
+        except Exception as e:
+            logger.error("API submission failed: %s", e, exc_info=True)
+            return self._send_json("submit", 500, {"error": str(e), "error_kind": "unexpected"})
+        
+        self._send_json("submit", 201 if result.get("success") else 502, result)
+    
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == "/ready":
+            return self._send_readiness()
+        if not path.startswith("/submissions/"):
+            return self._send_json("other", 404, {"error": "not found"})
+        if not self._authorized():
+            return self._send_json("status", 401, {"error": "missing or invalid bearer token"})
+        
+        job = get_submission_queue().get(path.rsplit("/", 1)[1])
+        if job is None:
+            return self._send_json("status", 404, {"error": "unknown job"})
+        self._send_json("status", 200, _job_view(job))
+    
+    def _send_readiness(self) -> None:
+        from services.warmup import get_warmup_status
+        
+        status = get_warmup_status()
+        ready = status is None or status.ready
+        self._send_json("ready", 200 if ready else 503, {
+            "ready": ready,
+            "details": status.describe() if status is not None else "ready"
+        })
+    
+    def _authorized(self) -> bool:
+        if not self.token:
+            return True
+        supplied = self.headers.get("Authorization", "")
+        return hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {self.token}".encode("utf-8"))
+    
+    def _send_json(self, endpoint: str, status: int, payload: Dict) -> None:
+        API_REQUESTS.labels(endpoint=endpoint, status=str(status)).inc()
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def create_server(
+    service: SubmissionService,
+    port: Optional[int] = None,
+    addr: Optional[str] = None
+) -> ThreadingHTTPServer:
+    """
+    Create the HTTP API server (call ``serve_forever()`` to run it).
+    
+    Each request runs in its own thread, so submissions proceed in parallel
+    on the shared storage and Salesforce connections.
+    
+    Args:
+        service: SubmissionService running the steps.
+        port: Port to listen on (SUBMISSION_API_PORT, default 8600; 0 picks a free port).
+        addr: Address to bind (SUBMISSION_API_ADDR, default 127.0.0.1).
+    
+    Returns:
+        The bound ThreadingHTTPServer.
+    """
+    if port is None:
+        port = int(os.getenv("SUBMISSION_API_PORT", DEFAULT_PORT))
+    if addr is None:
+        addr = os.getenv("SUBMISSION_API_ADDR", DEFAULT_ADDR)
+    
+    handler = type("SubmissionHandler", (_SubmissionHandler,), {
+        "service": service,
+        "token": os.getenv("SUBMISSION_API_TOKEN") or None,
+        "max_bytes": int(os.getenv("SUBMISSION_API_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    })
+    server = ThreadingHTTPServer((addr, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _default_service() -> SubmissionService:
+    """SubmissionService on the process-wide storage and Salesforce services, warming them up."""
+    # Imported here: the Streamlit-cached factories are only needed when running
+    from services.salesforce_service import get_salesforce_service
+    from services.storage_service import get_storage_service
+    from services.warmup import start_warmup
+    
+    start_warmup()
+    return SubmissionService(get_storage_service(), get_salesforce_service())
+
+
+def _submit_command(args) -> int:
+    """Run one submission from the command line and print its result as JSON."""
+    try:
+        info = json.loads(Path(args.info).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read {args.info}: {e}", file=sys.stderr)
+        return 2
+    if not isinstance(info, dict):
+        print(f"Error: {args.info} must hold a JSON object", file=sys.stderr)
+        return 2
+    
+    files = []
+    try:
+        for path in args.files:
+            try:
+                files.append(SpooledUpload(Path(path), Path(path).name))
+            except OSError as e:
+                print(f"Error: cannot read {path}: {e}", file=sys.stderr)
+                return 2
+        
+        if args.queue:
+            output = {"job_id": queue_assessment(args.type, info, files)}
+        else:
+            output = submit_assessment(_default_service(), args.type, info, files)
+    except (ValidationError, StorageError, SalesforceError, WorkerUnavailableError) as e:
+        print(f"Error: {e.message}", file=sys.stderr)
+        return 1
+    finally:
+        for stream in files:
+            stream.close()
+    
+    print(json.dumps(output, indent=2, default=str))
+    return 0 if args.queue or output.get("success") else 1
+
+
+def _serve_command(args) -> int:
+    """Run the HTTP API until interrupted."""
+    server = create_server(_default_service(), args.port, args.addr)
+    addr, port = server.server_address[:2]
+    logger.info("Submission API listening on http://%s:%s/submissions", addr, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Submit assessments without the Streamlit UI")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    submit = commands.add_parser("submit", help="Run one submission and print the result")
+    submit.add_argument("--type", required=True, choices=sorted(ASSESSMENT_KINDS), help="Assessment type")
+    submit.add_argument("--info", required=True, help="JSON file with the form data")
+    submit.add_argument("--queue", action="store_true", help="Queue for the worker pool instead of running here")
+    submit.add_argument("files", nargs="*", help="Customer files to upload")
+    
+    serve = commands.add_parser("serve", help="Run the local HTTP API")
+    serve.add_argument("--port", type=int, help="Port (default: SUBMISSION_API_PORT or 8600)")
+    serve.add_argument("--addr", help="Address to bind (default: SUBMISSION_API_ADDR or 127.0.0.1)")
+    
+    args = parser.parse_args(argv)
+    setup_logging()
+    if args.command == "submit":
+        return _submit_command(args)
+    return _serve_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,20 +6,77 @@ It encapsulates all Salesforce API interactions with proper error handling.
 """
 
 import time
-import requests
 import functools
+import threading
+from concurrent.futures import Future
 import streamlit as st
 from datetime import datetime
-from typing import Dict, Optional, List, Callable, Any
-from simple_salesforce import Salesforce
-from requests.exceptions import Timeout, ConnectionError, RequestException
+from typing import Dict, Optional, List, Callable, Any, Tuple, Type, TYPE_CHECKING
 
 from config import get_settings
 from core.exceptions import SalesforceError
 from core.logging_config import get_logger
+from core.metrics import REGISTRY
+from services.salesforce_session import create_salesforce_session
+
+# simple_salesforce pulls in zeep/lxml and requests; both are imported lazily
+# on first use so that importing this module (every page does) stays cheap.
+if TYPE_CHECKING:
+    from simple_salesforce import Salesforce
 
 logger = get_logger(__name__)
 
+SF_REQUEST_SECONDS = REGISTRY.histogram(
+    "salesforce_request_duration_seconds",
+    "Salesforce operation latency including retries",
+    ["operation"]
+)
+SF_RETRIES = REGISTRY.counter(
+    "salesforce_retries_total",
+    "Salesforce operations retried after a timeout/connection error",
+    ["operation"]
+)
+SF_ERRORS = REGISTRY.counter(
+    "salesforce_errors_total",
+    "Salesforce operations that failed",
+    ["operation"]
+)
+SF_LOGINS = REGISTRY.counter(
+    "salesforce_logins_total",
+    "Salesforce login attempts",
+    ["result"]
+)
+SF_LOGIN_WAITS = REGISTRY.counter(
+    "salesforce_login_waits_total",
+    "Requests that waited for a login already in progress instead of logging in"
+)
+SF_BATCH_RECORDS = REGISTRY.counter(
+    "salesforce_batch_records_total",
+    "Records sent through sObject Collections requests, by per-record result",
+    ["result"]
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "Lookups of cached data",
+    ["cache", "result"]
+)
+
+# Records per sObject Collections request (the API limit)
+OPPORTUNITY_BATCH_SIZE = 200
+
+
+def _retryable_exceptions() -> Tuple[Type[Exception], ...]:
+    """
+    Get the network exceptions that trigger a retry.
+    
+    Imported on demand to keep ``requests`` out of the module import path.
+    
+    Returns:
+        Tuple of exception classes (timeout and connection errors).
+    """
+    from requests.exceptions import Timeout, ConnectionError
+    return (Timeout, ConnectionError)
+
 
 def retry_on_timeout(max_retries: int = 3, base_delay: float = 2.0, max_delay: float = 30.0):
     """
@@ -36,38 +93,47 @@ def retry_on_timeout(max_retries: int = 3, base_delay: float = 2.0, max_delay: f
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            retryable = _retryable_exceptions()
             last_exception = None
+            start = time.perf_counter()
             
             for attempt in range(max_retries + 1):
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                    SF_REQUEST_SECONDS.labels(operation=func.__name__).observe(time.perf_counter() - start)
+                    return result
                     
-                except (Timeout, ConnectionError) as e:
+                except retryable as e:
                     last_exception = e
                     
                     if attempt < max_retries:
+                        SF_RETRIES.labels(operation=func.__name__).inc()
                         # Calculate delay with exponential backoff
                         delay = min(base_delay * (2 ** attempt), max_delay)
                         
                         logger.warning(
-                            f"Timeout/Connection error on {func.__name__} "
-                            f"(attempt {attempt + 1}/{max_retries + 1}). "
-                            f"Retrying in {delay:.1f} seconds... Error: {e}"
+                            "Timeout/Connection error on %s (attempt %s/%s). "
+                            "Retrying in %.1f seconds... Error: %s",
+                            func.__name__, attempt + 1, max_retries + 1, delay, e
                         )
                         
                         time.sleep(delay)
                     else:
                         logger.error(
-                            f"Failed after {max_retries + 1} attempts on {func.__name__}. "
-                            f"Last error: {e}"
+                            "Failed after %s attempts on %s. Last error: %s",
+                            max_retries + 1, func.__name__, e
                         )
                         
                 except Exception as e:
                     # For other exceptions, don't retry
-                    logger.error(f"Non-retryable error in {func.__name__}: {e}")
+                    logger.error("Non-retryable error in %s: %s", func.__name__, e)
+                    SF_ERRORS.labels(operation=func.__name__).inc()
+                    SF_REQUEST_SECONDS.labels(operation=func.__name__).observe(time.perf_counter() - start)
                     raise
             
             # If we exhausted all retries, raise the last exception
+            SF_ERRORS.labels(operation=func.__name__).inc()
+            SF_REQUEST_SECONDS.labels(operation=func.__name__).observe(time.perf_counter() - start)
             raise last_exception
         
         return wrapper
@@ -85,24 +151,55 @@ class SalesforceService:
     def __init__(self):
         """Initialize the Salesforce service."""
         self.settings = get_settings()
-        self._sf_client: Optional[Salesforce] = None
+        self._sf_client: Optional["Salesforce"] = None
+        # Login in progress, shared by every caller that needs the client meanwhile
+        self._login: Optional[Future] = None
+        self._client_lock = threading.Lock()
     
     @property
-    def client(self) -> Salesforce:
+    def client(self) -> "Salesforce":
         """
         Get Salesforce client instance.
         
+        The first caller logs in; callers arriving during that login wait
+        for it and share its outcome instead of logging in again.
+        
         Returns:
             Authenticated Salesforce client.
             
         Raises:
             SalesforceError: If connection fails.
         """
-        if self._sf_client is None:
+        client = self._sf_client
+        if client is not None:
+            return client
+        
+        with self._client_lock:
+            if self._sf_client is not None:
+                return self._sf_client
+            login = self._login
+            leader = login is None
+            if leader:
+                login = self._login = Future()
+        
+        if not leader:
+            SF_LOGIN_WAITS.inc()
+            logger.debug("Waiting for the Salesforce login in progress")
+            return login.result()
+        
+        try:
             self._sf_client = self._connect()
-        return self._sf_client
+            login.set_result(self._sf_client)
+            return self._sf_client
+        except BaseException as e:
+            # Waiters get the same error; the next caller tries again
+            login.set_exception(e)
+            raise
+        finally:
+            with self._client_lock:
+                self._login = None
     
-    def _connect(self) -> Salesforce:
+    def _connect(self) -> "Salesforce":
         """
         Connect to Salesforce using credentials from settings.
         
@@ -113,16 +210,14 @@ class SalesforceService:
             SalesforceError: If connection fails.
         """
         try:
+            from simple_salesforce import Salesforce
+            
             logger.info("Connecting to Salesforce...")
             
             sf_config = self.settings.salesforce
             
-            # Create session with timeout
-            session = requests.Session()
-            session.request = functools.partial(
-                session.request,
-                timeout=sf_config.timeout
-            )
+            # Pooled keep-alive session with connect/read timeouts, shared by all sessions
+            session = create_salesforce_session(sf_config)
             
             # Connect to Salesforce
             sf = Salesforce(
@@ -143,20 +238,18 @@ class SalesforceService:
                 'password': sf_config.password + sf_config.security_token
             }
             
-            response = requests.post(
-                sf_config.token_url,
-                data=payload,
-                timeout=sf_config.timeout
-            )
+            response = session.post(sf_config.token_url, data=payload)
             
             if response.status_code != 200:
                 raise SalesforceError(f"Token request failed: {response.text}")
             
+            SF_LOGINS.labels(result="success").inc()
             logger.info("Successfully connected to Salesforce")
             return sf
             
         except Exception as e:
-            logger.error(f"Failed to connect to Salesforce: {e}")
+            SF_LOGINS.labels(result="failure").inc()
+            logger.error("Failed to connect to Salesforce: %s", e)
             raise SalesforceError(f"Failed to connect to Salesforce: {e}")
     
     @retry_on_timeout(max_retries=3, base_delay=2.0, max_delay=30.0)
@@ -193,13 +286,39 @@ class SalesforceService:
             if "Other" not in seen_names:
                 accounts_dict["other"] = "Other"
             
-            logger.info(f"Retrieved {len(accounts_dict)} unique accounts")
+            logger.info("Retrieved %s unique accounts", len(accounts_dict))
             return accounts_dict
             
         except Exception as e:
-            logger.error(f"Failed to fetch accounts: {e}")
+            logger.error("Failed to fetch accounts: %s", e)
             raise SalesforceError(f"Failed to fetch accounts: {e}")
     
+    @staticmethod
+    def _opportunity_fields(
+        name: str,
+        stage_name: str,
+        close_date: str,
+        assessment_date: str,
+        path: str,
+        bu: str,
+        account_id: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Opportunity field values for create_opportunity()/create_opportunities()."""
+        opportunity_data = {
+            "Name": name,
+            "StageName": stage_name,
+            "CloseDate": close_date,
+            "Assessment_Date__c": assessment_date,
+            "Path__c": path,
+            "BU__c": bu
+        }
+        
+        # Add account ID if provided
+        if account_id:
+            opportunity_data["AccountId"] = account_id
+        
+        return opportunity_data
+    
     @retry_on_timeout(max_retries=3, base_delay=2.0, max_delay=30.0)
     def create_opportunity(
         self,
@@ -233,37 +352,135 @@ class SalesforceService:
             SalesforceError: If creation fails after all retries.
         """
         try:
-            logger.info(f"Creating opportunity: {name}")
+            logger.info("Creating opportunity: %s", name)
             
-            opportunity_data = {
-                "Name": name,
-                "StageName": stage_name,
-                "CloseDate": close_date,
-                "Assessment_Date__c": assessment_date,
-                "Path__c": path,
-                "BU__c": bu
-            }
-            
-            # Add account ID if provided
-            if account_id:
-                opportunity_data["AccountId"] = account_id
+            opportunity_data = self._opportunity_fields(
+                name, stage_name, close_date, assessment_date, path, bu, account_id
+            )
             
             # Create opportunity (will retry on timeout)
             result = self.client.Opportunity.create(opportunity_data)
             
             if result.get('success'):
-                logger.info(f"Successfully created opportunity: {result.get('id')}")
+                logger.info("Successfully created opportunity: %s", result.get('id'))
             else:
-                logger.error(f"Failed to create opportunity: {result.get('errors')}")
+                logger.error("Failed to create opportunity: %s", result.get('errors'))
             
             return result
             
-        except (Timeout, ConnectionError) as e:
+        except _retryable_exceptions():
             # This will be caught by the retry decorator
             raise
         except Exception as e:
-            logger.error(f"Failed to create opportunity: {e}")
+            logger.error("Failed to create opportunity: %s", e)
             raise SalesforceError(f"Failed to create opportunity: {e}")
+    
+    def create_opportunities(self, opportunities: List[Dict], all_or_none: bool = False) -> List[Dict]:
+        """
+        Create many opportunities with sObject Collections requests.
+        
+        Records are sent OPPORTUNITY_BATCH_SIZE (200) per request instead of
+        one request each. Each request is retried on timeouts/connection
+        errors like create_opportunity(). Failures are reported per record:
+        an invalid record, a record rejected by Salesforce, or every record of
+        a request that failed after its retries, while the other records are
+        still created (unless ``all_or_none``).
+        
+        Args:
+            opportunities: Keyword arguments of create_opportunity() for each
+                           record (name, stage_name, close_date,
+                           assessment_date, path, bu, optional account_id).
+            all_or_none: Roll back every record of a request if one of them fails.
+        
+        Returns:
+            One result per input record, in order: ``{"id", "success", "errors"}``
+            like create_opportunity(), with ``errors`` a list of
+            ``{"statusCode", "message", "fields"}`` dictionaries.
+        
+        Raises:
+            SalesforceError: If the connection to Salesforce fails.
+        """
+        # Log in once up front: without a client no record can be created
+        self.client
+        
+        results: List[Optional[Dict]] = [None] * len(opportunities)
+        
+        # Records that cannot be built are failed locally and never sent
+        pending: List[Tuple[int, Dict[str, str]]] = []
+        for index, opportunity in enumerate(opportunities):
+            try:
+                pending.append((index, self._opportunity_fields(**opportunity)))
+            except TypeError as e:
+                results[index] = _failed_record("INVALID_INPUT", str(e))
+        
+        for start in range(0, len(pending), OPPORTUNITY_BATCH_SIZE):
+            batch = pending[start:start + OPPORTUNITY_BATCH_SIZE]
+            try:
+                batch_results = self._create_opportunity_batch(
+                    [fields for _, fields in batch], all_or_none
+                )
+            except Exception as e:
+                logger.error("Opportunity batch of %s records failed: %s", len(batch), e)
+                batch_results = [_failed_record("REQUEST_FAILED", str(e)) for _ in batch]
+            
+            for (index, _), result in zip(batch, batch_results):
+                results[index] = result
+        
+        created = sum(1 for result in results if result["success"])
+        SF_BATCH_RECORDS.labels(result="success").inc(created)
+        SF_BATCH_RECORDS.labels(result="failure").inc(len(results) - created)
+        logger.info("Created %s of %s opportunities", created, len(results))
+        return results
+    
+    @retry_on_timeout(max_retries=3, base_delay=2.0, max_delay=30.0)
+    def _create_opportunity_batch(self, records: List[Dict[str, str]], all_or_none: bool) -> List[Dict]:
+        """
+        Send one sObject Collections create request.
+        
+        Args:
+            records: Field values of at most OPPORTUNITY_BATCH_SIZE opportunities.
+            all_or_none: Roll back every record if one of them fails.
+        
+        Returns:
+            Per-record results, in the order of ``records``.
+        
+        Raises:
+            SalesforceError: If the request fails (after retries for timeouts).
+        """
+        try:
+            logger.debug("Creating %s opportunities in one request", len(records))
+            
+            payload = {
+                "allOrNone": all_or_none,
+                "records": [{"attributes": {"type": "Opportunity"}, **fields} for fields in records]
+            }
+            response = self.client.restful("composite/sobjects", method="POST", json=payload)
+            
+            if not isinstance(response, list) or len(response) != len(records):
+                raise SalesforceError(f"Unexpected sObject Collections response: {response!r}")
+            
+            return [
+                {"id": result.get("id"), "success": bool(result.get("success")), "errors": result.get("errors", [])}
+                for result in response
+            ]
+        
+        except _retryable_exceptions():
+            # This will be caught by the retry decorator
+            raise
+        except SalesforceError:
+            raise
+        except Exception as e:
+            logger.error("Failed to create opportunities: %s", e)
+            raise SalesforceError(f"Failed to create opportunities: {e}")
+
+
+def _failed_record(status_code: str, message: str) -> Dict:
+    """Per-record result of a record that was not created."""
+    return {
+        "id": None,
+        "success": False,
+        "errors": [{"statusCode": status_code, "message": message, "fields": []}]
+    }
 
 
 # Cached functions for Streamlit
@@ -278,20 +495,40 @@ def get_salesforce_service() -> SalesforceService:
     return SalesforceService()
 
 
+# Set by _cached_account_dict when its body runs, i.e. on a cache miss
+_account_cache_miss = threading.local()
+
+
 @st.cache_data(ttl=600)  # Cache for 10 minutes
-def get_unique_account_dict() -> Dict[str, str]:
+def _cached_account_dict() -> Dict[str, str]:
     """
-    Get cached dictionary of unique Salesforce accounts.
-    
-    Cached for 10 minutes to improve performance while allowing updates.
-    Use st.cache_data instead of cache_resource because this is data, not a connection.
+    Fetch the account dictionary from Salesforce (cached for 10 minutes).
     
     Returns:
         Dictionary mapping account IDs to account names.
     """
+    _account_cache_miss.value = True
     try:
         service = get_salesforce_service()
         return service.get_accounts()
     except SalesforceError as e:
-        logger.error(f"Failed to get accounts: {e}")
+        logger.error("Failed to get accounts: %s", e)
         return {"other": "Other"}
+
+
+def get_unique_account_dict() -> Dict[str, str]:
+    """
+    Get cached dictionary of unique Salesforce accounts.
+    
+    Cached for 10 minutes to improve performance while allowing updates.
+    Use st.cache_data instead of cache_resource because this is data, not a connection.
+    Cache hits and misses are counted in ``cache_requests_total``.
+    
+    Returns:
+        Dictionary mapping account IDs to account names.
+    """
+    _account_cache_miss.value = False
+    accounts = _cached_account_dict()
+    result = "miss" if _account_cache_miss.value else "hit"
+    CACHE_REQUESTS.labels(cache="salesforce_accounts", result=result).inc()
+    return accounts
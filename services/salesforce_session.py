@@ -0,0 +1,166 @@
+"""
+Salesforce Session Module
+
+This module builds the HTTP session the Salesforce client runs on.
+
+The service is shared by every Streamlit session, so concurrent
+submissions share its connections. The session mounts an HTTPAdapter
+with an explicit pool size (requests beyond it wait for a free
+connection instead of opening throw-away ones), keeps connections alive
+between calls, retries failed connection attempts at the transport level,
+and applies separate connect and read timeouts to every request. Pool use
+is exported as metrics.
+
+Usage:
+    session = create_salesforce_session(settings.salesforce)
+    sf = Salesforce(..., session=session)
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from core.instrumentation import record_http_call
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+SF_HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "salesforce_http_requests_in_flight",
+    "Salesforce HTTP requests holding or waiting for a pooled connection"
+)
+SF_HTTP_POOL_SIZE = REGISTRY.gauge(
+    "salesforce_http_pool_size",
+    "Connections kept per Salesforce host"
+)
+SF_HTTP_REQUESTS = REGISTRY.counter(
+    "salesforce_http_requests_total",
+    "Salesforce HTTP requests sent through the pooled session"
+)
+SF_HTTP_CONNECTIONS = REGISTRY.counter(
+    "salesforce_http_connections_opened_total",
+    "New connections opened to Salesforce (low relative to requests means keep-alive works)"
+)
+
+# Connections kept per host (override with SALESFORCE_POOL_SIZE)
+DEFAULT_POOL_SIZE = 20
+
+# Seconds to establish a connection (override with SALESFORCE_CONNECT_TIMEOUT);
+# the read timeout is the Salesforce ``timeout`` setting
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+# Transport-level retries of failed connection attempts (override with SALESFORCE_CONNECT_RETRIES).
+# Only connects are retried here: a request that reached Salesforce is never resent
+# by the transport, so creating records stays safe; retry_on_timeout handles the rest.
+DEFAULT_CONNECT_RETRIES = 2
+
+
+def _pooled_adapter_class():
+    """HTTPAdapter subclass recording pool metrics (imported lazily with requests)."""
+    from requests.adapters import HTTPAdapter
+    
+    class PooledHTTPAdapter(HTTPAdapter):
+        """HTTPAdapter that counts in-flight requests and newly opened connections."""
+        
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._seen_lock = threading.Lock()
+            self._seen_connections: Dict[object, int] = {}
+        
+        def send(self, request, **kwargs):
+            SF_HTTP_REQUESTS.inc()
+            with SF_HTTP_IN_FLIGHT.track_inprogress():
+                try:
+                    return super().send(request, **kwargs)
+                finally:
+                    self._count_connections()
+        
+        def _count_connections(self) -> None:
+            """Add connections opened by the host pools since the last request."""
+            pools = self.poolmanager.pools
+            opened = 0
+            with self._seen_lock:
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    opened += pool.num_connections - self._seen_connections.get(key, 0)
+                    self._seen_connections[key] = pool.num_connections
+            if opened > 0:
+                SF_HTTP_CONNECTIONS.inc(opened)
+    
+    return PooledHTTPAdapter
+
+
+def _timeout_session_class():
+    """requests.Session subclass applying default timeouts (imported lazily)."""
+    import requests
+    
+    class TimeoutSession(requests.Session):
+        """Session that applies a default (connect, read) timeout to every request."""
+        
+        def __init__(self, timeout: Tuple[float, float]):
+            super().__init__()
+            self.default_timeout = timeout
+        
+        def request(self, method, url, **kwargs):
+            if kwargs.get("timeout") is None:
+                kwargs["timeout"] = self.default_timeout
+            return super().request(method, url, **kwargs)
+    
+    return TimeoutSession
+
+
+def session_settings(read_timeout: float) -> Tuple[int, Tuple[float, float], int]:
+    """
+    Read session settings from the environment.
+    
+    Args:
+        read_timeout: Read timeout in seconds (the Salesforce ``timeout`` setting).
+    
+    Returns:
+        Tuple of (pool size, (connect timeout, read timeout), connect retries).
+    """
+    pool_size = int(os.getenv("SALESFORCE_POOL_SIZE", DEFAULT_POOL_SIZE))
+    connect_timeout = float(os.getenv("SALESFORCE_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+    retries = int(os.getenv("SALESFORCE_CONNECT_RETRIES", DEFAULT_CONNECT_RETRIES))
+    return max(pool_size, 1), (connect_timeout, float(read_timeout)), max(retries, 0)
+
+
+def create_salesforce_session(sf_config, pool_size: Optional[int] = None):
+    """
+    Create a pooled, keep-alive HTTP session for Salesforce.
+    
+    Args:
+        sf_config: SalesforceConfig (its ``timeout`` is the read timeout).
+        pool_size: Connections per host (SALESFORCE_POOL_SIZE if omitted).
+    
+    Returns:
+        requests.Session with the pooled adapter mounted.
+    """
+    from urllib3.util.retry import Retry
+    
+    env_pool_size, timeout, retries = session_settings(sf_config.timeout)
+    pool_size = pool_size or env_pool_size
+    
+    session = _timeout_session_class()(timeout)
+    adapter = _pooled_adapter_class()(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # Wait for a free connection rather than opening one that is discarded afterwards
+        pool_block=True,
+        max_retries=Retry(total=retries, connect=retries, read=0, status=0, redirect=0, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    # Count every API call against the active pipeline span
+    session.hooks["response"].append(lambda response, *args, **kwargs: record_http_call())
+    
+    SF_HTTP_POOL_SIZE.set(pool_size)
+    logger.debug(
+        "Salesforce session: pool %s, timeouts %.0fs connect / %.0fs read, %s connect retries",
+        pool_size, timeout[0], timeout[1], retries
+    )
+    return session
@@ -7,17 +7,41 @@ It abstracts the storage provider and provides high-level operations.
 
 import streamlit as st
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 from config import get_settings
-from storage import StorageProvider, LocalStorageProvider, SharePointStorageProvider
+from storage import StorageProvider, LocalStorageProvider, SharePointStorageProvider, UploadItem
+from storage.project_index import ProjectIndex, create_project_index
+from storage.blob_index import BlobIndex, create_blob_index, upload_dedup_enabled
+from storage.upload_bundle import build_bundle, bundle_enabled, bundle_settings
+from storage.upload_stream import UploadStream, open_upload_stream
+from storage.template_manifest import get_template_manifest
+from storage.async_sharepoint_storage import async_client_enabled
 from core.exceptions import StorageError
 from core.logging_config import get_logger
+from core.instrumentation import span
+from core.progress import ProgressCallback, skip_progress, track_progress
+from core.metrics import REGISTRY, timed
 from pages.utils.constants import COUNTRIES_DICT
 
 logger = get_logger(__name__)
 
+STORAGE_OP_SECONDS = REGISTRY.histogram(
+    "storage_service_operation_duration_seconds",
+    "End-to-end latency of StorageService operations",
+    ["operation"]
+)
+STORAGE_OP_ERRORS = REGISTRY.counter(
+    "storage_service_errors_total",
+    "StorageService operations that failed",
+    ["operation"]
+)
+STORAGE_FILES = REGISTRY.counter(
+    "storage_service_uploaded_files_total",
+    "Customer files uploaded through StorageService"
+)
+
 
 class StorageService:
     """
@@ -41,7 +65,27 @@ class StorageService:
             storage_provider = self._create_provider_from_config()
         
         self.provider = storage_provider
-        logger.info(f"Initialized StorageService with {type(storage_provider).__name__}")
+        
+        # Delta-synced index of SharePoint project folders (None for local storage)
+        self.project_index: Optional[ProjectIndex] = None
+        if isinstance(storage_provider, SharePointStorageProvider):
+            try:
+                self.project_index = create_project_index(storage_provider)
+            except Exception as e:
+                logger.warning("Project index unavailable: %s", e)
+        
+        # Content index of uploaded files, for server-side copies of repeated uploads
+        self.blob_index: Optional[BlobIndex] = None
+        if upload_dedup_enabled():
+            try:
+                self.blob_index = create_blob_index()
+            except Exception as e:
+                logger.warning("Blob index unavailable: %s", e)
+        
+        # Build template manifests now rather than on the first project
+        self._prepare_template_manifests()
+        
+        logger.info("Initialized StorageService with %s", type(storage_provider).__name__)
     
     def _create_provider_from_config(self) -> StorageProvider:
         """
@@ -59,9 +103,16 @@ class StorageService:
             # Get base_path from settings (works for both local .env and Streamlit Cloud secrets)
             sharepoint_base_path = self.settings.sharepoint.base_path
             
-            logger.info(f"SharePoint base_path: '{sharepoint_base_path}'")
+            logger.info("SharePoint base_path: '%s'", sharepoint_base_path)
+            
+            provider_class = SharePointStorageProvider
+            if async_client_enabled():
+                # Concurrent Graph I/O on asyncio, behind the same sync interface
+                from storage.async_sharepoint_storage import AsyncSharePointStorageProvider
+                provider_class = AsyncSharePointStorageProvider
+                logger.info("Using async Graph client")
             
-            return SharePointStorageProvider(
+            return provider_class(
                 tenant_id=self.settings.azure.tenant_id,
                 client_id=self.settings.azure.client_id,
                 client_secret=self.settings.azure.client_secret,
@@ -74,6 +125,14 @@ class StorageService:
             logger.info("Creating Local storage provider")
             return LocalStorageProvider(self.settings.storage.base_path)
     
+    def _prepare_template_manifests(self) -> None:
+        """Build the manifests of the configured templates (missing ones are skipped)."""
+        for assessment_type in ("ICT", "FCT", "IAT"):
+            try:
+                get_template_manifest(str(self.get_template_path(assessment_type)))
+            except StorageError as e:
+                logger.warning("Template manifest for %s unavailable: %s", assessment_type, e)
+    
     def get_template_path(self, assessment_type: str) -> Path:
         """
         Get the template path for an assessment type.
@@ -98,13 +157,32 @@ class StorageService:
         
         return template_map[assessment_type]
     
+    def project_folder_path(self, projects_folder: str, customer_name: str, project_name: str, country: str) -> str:
+        """
+        Full path of a project folder, as create_project_folder() creates it.
+        
+        Args:
+            projects_folder: Base projects folder name.
+            customer_name: Customer name.
+            project_name: Project name.
+            country: Country name.
+        
+        Returns:
+            Full path to the project folder.
+        """
+        country_code = COUNTRIES_DICT.get(country, "OTHER")
+        return self.provider.get_full_path(projects_folder, country_code, customer_name, project_name)
+    
+    @timed(STORAGE_OP_SECONDS, STORAGE_OP_ERRORS, operation="create_project_folder")
     def create_project_folder(
         self,
         assessment_type: str,
         projects_folder: str,
         customer_name: str,
         project_name: str,
-        country: str
+        country: str,
+        progress: Optional[ProgressCallback] = None,
+        resume: bool = False
     ) -> str:
         """
         Create a project folder structure for an assessment.
@@ -115,6 +193,11 @@ class StorageService:
             customer_name: Customer name.
             project_name: Project name.
             country: Country name.
+            progress: Called with ProgressUpdate snapshots while the
+                template is copied (optional).
+            resume: Complete an existing folder whose creation was interrupted
+                instead of reporting it as existing; template files already
+                copied are skipped.
             
         Returns:
             Full path to the created project folder.
@@ -125,58 +208,111 @@ class StorageService:
         try:
             # Build project folder path
             country_code = COUNTRIES_DICT.get(country, "OTHER")
-            project_path = self.provider.get_full_path(
-                projects_folder,
-                country_code,
-                customer_name,
-                project_name
-            )
+            project_path = self.project_folder_path(projects_folder, customer_name, project_name, country)
             
-            logger.info(f"Creating project folder: {project_path}")
+            logger.info("Creating project folder: %s", project_path)
             
             # Check if project already exists
-            # Use _folder_exists_raw for SharePoint to avoid double base_path
-            if hasattr(self.provider, '_folder_exists_raw'):
-                # SharePoint provider - use raw method
-                exists = self.provider._folder_exists_raw(project_path)
+            # The project index answers locally once synced; otherwise ask the provider
+            if self.project_index is not None and self.project_index.ensure_fresh():
+                exists = self.project_index.project_exists(
+                    projects_folder, country_code, customer_name, project_name
+                )
             else:
-                # Local provider - use normal method
-                exists = self.provider.folder_exists(project_path)
+                # Batch operations take full paths on every provider
+                exists = self.provider.exists_many([project_path])[0]
             
-            if exists:
+            # Create project folder; a folder created concurrently since the
+            # check above is reported as existing too
+            created = not exists and self.provider.create_folders([project_path])[0]
+            if not created and not resume:
                 raise StorageError(
                     f"Project '{project_name}' already exists. "
                     "Please contact Sales Manager to update your requirement."
                 )
-            
-            # Create project folder
-            # Use _create_folder_raw for SharePoint to avoid double base_path
-            # project_path already includes base_path from get_full_path()
-            if hasattr(self.provider, '_create_folder_raw'):
-                # SharePoint provider - use raw method
-                self.provider._create_folder_raw(project_path)
-            else:
-                # Local provider - use normal method
-                self.provider.create_folder(project_path)
+            if not created:
+                logger.info("Resuming interrupted project folder: %s", project_path)
             
             # Copy template
             template_path = str(self.get_template_path(assessment_type))
-            self.provider.copy_template(template_path, project_path)
+            manifest = get_template_manifest(template_path)
+            with span("copy_template"), track_progress(
+                "copy_template", progress, total_bytes=manifest.total_size, total_files=len(manifest.files)
+            ):
+                self.provider.copy_template(template_path, project_path, skip_existing=not created)
             
-            logger.info(f"Successfully created project folder: {project_path}")
+            logger.info("Successfully created project folder: %s", project_path)
             return project_path
             
         except StorageError:
             raise
         except Exception as e:
-            logger.error(f"Failed to create project folder: {e}")
+            logger.error("Failed to create project folder: %s", e)
             raise StorageError(f"Failed to create project folder: {e}")
     
+    def list_customer_projects(
+        self,
+        customer_name: str,
+        projects_folder: Optional[str] = None
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        List existing projects of a customer across all countries.
+        
+        SharePoint storage answers from the project index; local storage
+        scans the project folders on disk.
+        
+        Args:
+            customer_name: Customer name (case-insensitive).
+            projects_folder: Restrict to one projects folder (e.g. "1_ICT").
+            
+        Returns:
+            List of dicts with project, country, projects_folder and path,
+            sorted by project name, or None if the lookup is unavailable
+            (e.g. the project index is still being built).
+        """
+        if not customer_name:
+            return []
+        
+        try:
+            if self.project_index is not None:
+                if not self.project_index.ensure_fresh():
+                    return None
+                return [
+                    {
+                        "project": entry.project,
+                        "country": entry.country,
+                        "projects_folder": entry.projects_folder,
+                        "path": entry.path
+                    }
+                    for entry in self.project_index.customer_projects(customer_name, projects_folder)
+                ]
+            
+            base = Path(self.provider.get_full_path())
+            pattern = f"{projects_folder or '*'}/*/*/*"
+            customer_key = customer_name.casefold()
+            projects = [
+                {
+                    "project": path.name,
+                    "country": path.parent.parent.name,
+                    "projects_folder": path.parent.parent.parent.name,
+                    "path": str(path)
+                }
+                for path in base.glob(pattern)
+                if path.is_dir() and path.parent.name.casefold() == customer_key
+            ]
+            return sorted(projects, key=lambda project: project["project"].casefold())
+            
+        except Exception as e:
+            logger.warning("Failed to list projects for %s: %s", customer_name, e)
+            return None
+    
+    @timed(STORAGE_OP_SECONDS, STORAGE_OP_ERRORS, operation="upload_assessment_files")
     def upload_assessment_files(
         self,
         project_path: str,
         assessment_type: str,
-        files: List
+        files: List,
+        progress: Optional[ProgressCallback] = None
     ) -> List[str]:
         """
         Upload assessment files to the project folder.
@@ -185,6 +321,8 @@ class StorageService:
             project_path: Path to the project folder.
             assessment_type: Type of assessment (ICT, FCT, IAT).
             files: List of uploaded files from Streamlit.
+            progress: Called with ProgressUpdate snapshots (bytes sent,
+                files done, throughput, ETA) while uploading (optional).
             
         Returns:
             List of uploaded file paths.
@@ -199,21 +337,134 @@ class StorageService:
             else:
                 destination = str(Path(project_path) / "1_Customer_Info" / "3_ALL_Info_Shared")
             
-            logger.info(f"Uploading {len(files)} files to {destination}")
+            logger.info("Uploading %s files to %s", len(files), destination)
             
-            # Prepare files for upload
-            files_to_upload = [(file.name, file) for file in files]
+            # Upload files (repeated content is copied server-side instead)
+            items = [
+                UploadItem(destination=destination, filename=file.name, content=file)
+                for file in files
+            ]
+            if bundle_enabled():
+                items = self._bundle_small_files(items)
+            total_bytes = sum(_stream_size(item.content) for item in items)
+            with track_progress("upload_files", progress, total_bytes=total_bytes, total_files=len(items)):
+                if self.blob_index is not None:
+                    uploaded_paths = self._upload_with_dedup(items)
+                else:
+                    uploaded_paths = self.provider.upload_many(items)
+            STORAGE_FILES.inc(len(uploaded_paths))
             
-            # Upload files
-            uploaded_paths = self.provider.upload_files(files_to_upload, destination)
-            
-            logger.info(f"Successfully uploaded {len(uploaded_paths)} files")
+            logger.info("Successfully uploaded %s files", len(uploaded_paths))
             return uploaded_paths
             
         except Exception as e:
-            logger.error(f"Failed to upload files: {e}")
+            logger.error("Failed to upload files: %s", e)
             raise StorageError(f"Failed to upload files: {e}")
     
+    def _bundle_small_files(self, items: List[UploadItem]) -> List[UploadItem]:
+        """
+        Replace many small files by one zip bundle and its manifest.
+        
+        Files larger than UPLOAD_BUNDLE_MAX_FILE_BYTES are kept as they
+        are; nothing is bundled below UPLOAD_BUNDLE_MIN_FILES small files.
+        
+        Args:
+            items: Files to upload (all with the same destination).
+        
+        Returns:
+            Items to upload instead.
+        """
+        max_file_bytes, min_files, levels = bundle_settings()
+        small = [item for item in items if _stream_size(item.content) <= max_file_bytes]
+        if len(small) < min_files:
+            return items
+        
+        with span("bundle_files", files=str(len(small))):
+            bundle = build_bundle([(item.filename, item.content) for item in small], levels)
+        
+        destination = small[0].destination
+        stem = f"Customer_Files_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        logger.info("Bundling %s small files into %s.zip", len(small), stem)
+        return [item for item in items if item not in small] + [
+            UploadItem(destination=destination, filename=f"{stem}.zip", content=bundle.archive),
+            UploadItem(destination=destination, filename=f"{stem}.manifest.json", content=bundle.manifest_stream())
+        ]
+    
+    def _blob_namespace(self) -> str:
+        """Namespace of this storage location in the blob index."""
+        drive_id = getattr(self.provider, "drive_id", None)
+        if drive_id:
+            return f"graph:{drive_id}"
+        return f"fs:{self.provider.get_full_path()}"
+    
+    def _upload_with_dedup(self, items: List[UploadItem]) -> List[str]:
+        """
+        Store files, copying already-stored content instead of uploading it.
+        
+        A file is hashed before upload only when the index holds content of
+        the same size: the digest decides between copying and uploading, so
+        it must be known first. Every other file is uploaded straight away
+        and hashed from the chunks the provider reads while sending it.
+        Files below the index's minimum size are neither looked up nor
+        recorded.
+        
+        Args:
+            items: Files to store (full destination paths).
+        
+        Returns:
+            Stored file paths, in the order of ``items``.
+        """
+        index = self.blob_index
+        namespace = self._blob_namespace()
+        paths: List[Optional[str]] = [None] * len(items)
+        pending: List[Tuple[int, UploadStream]] = []
+        
+        for position, item in enumerate(items):
+            stream = open_upload_stream(item.content)
+            target = f"{item.destination}/{item.filename}"
+            if stream.size >= index.min_size and index.has_size(namespace, stream.size):
+                digest = stream.sha256()
+                for source in index.lookup(namespace, digest):
+                    if source.casefold() == target.casefold():
+                        continue
+                    try:
+                        copied = self.provider.copy_file(source, item.destination, item.filename)
+                    except StorageError as e:
+                        logger.warning("Copy from %s failed, uploading instead: %s", source, e)
+                        copied = False
+                    if copied:
+                        skip_progress(stream.size, files_done=1)
+                        paths[position] = target
+                        index.record(namespace, digest, stream.size, target)
+                        index.count_upload(stream.size, copied=True)
+                        break
+                    # Stored file moved or deleted (or copies unsupported)
+                    index.forget(namespace, source)
+            if paths[position] is None:
+                stream.track_digest()
+                pending.append((position, stream))
+        
+        if pending:
+            uploaded = self.provider.upload_many([
+                UploadItem(destination=items[position].destination, filename=items[position].filename, content=stream)
+                for position, stream in pending
+            ])
+            for (position, stream), path in zip(pending, uploaded):
+                paths[position] = path
+                if stream.size >= index.min_size:
+                    # Set while uploading; read again only if the provider did not stream it
+                    index.record(namespace, stream.sha256(), stream.size, path)
+                index.count_upload(stream.size, copied=False)
+        
+        stats = index.stats()
+        logger.info(
+            "Upload dedup: %s of %s files copied; %.1f MB saved overall (ratio %.0f%%)",
+            len(items) - len(pending), len(items), stats["bytes_saved"] / 1024 / 1024,
+            stats["dedup_ratio"] * 100
+        )
+        return paths
+    
+    @timed(STORAGE_OP_SECONDS, STORAGE_OP_ERRORS, operation="save_assessment_html")
     def save_assessment_html(
         self,
         project_path: str,
@@ -237,20 +488,30 @@ class StorageService:
         try:
             filename = f"{assessment_type}_Assessment.html"
             
-            logger.info(f"Saving assessment HTML: {filename}")
+            logger.info("Saving assessment HTML: %s", filename)
             
             self.provider.write_file(html_content, project_path, filename)
             
             file_path = str(Path(project_path) / filename)
-            logger.info(f"Successfully saved HTML file: {file_path}")
+            logger.info("Successfully saved HTML file: %s", file_path)
             
             return file_path
             
         except Exception as e:
-            logger.error(f"Failed to save HTML file: {e}")
+            logger.error("Failed to save HTML file: %s", e)
             raise StorageError(f"Failed to save HTML file: {e}")
 
 
+def _stream_size(stream) -> int:
+    """Size of an uploaded file stream in bytes."""
+    size = getattr(stream, "size", None)
+    if size is None:
+        position = stream.tell()
+        size = stream.seek(0, 2)
+        stream.seek(position)
+    return size
+
+
 # Cached function for Streamlit
 @st.cache_resource
 def get_storage_service() -> StorageService:
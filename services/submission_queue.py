@@ -0,0 +1,471 @@
+"""
+Submission Queue Module
+
+This module queues assessment submissions for the submission worker pool
+(services/submission_worker.py), so the storage and Salesforce steps run
+in separate processes instead of inside the Streamlit server.
+
+Jobs live in a SQLite database (WAL mode, shared by the Streamlit process
+and every worker process); uploaded files are spooled to a per-job folder
+next to it. A page enqueues the validated form data and files, then polls
+the job until a worker marks it done or failed. Workers claim jobs in an
+IMMEDIATE transaction, so each job runs exactly once.
+
+The worker pool's supervisor records a heartbeat in the same database; a
+page that finds no live pool runs the submission itself instead of
+queueing it (or withdraws a job no worker picked up). Finished jobs are
+purged by the supervisor after SUBMISSION_JOB_RETENTION_HOURS.
+
+Usage:
+    queue = get_submission_queue()
+    job_id = queue.enqueue(submission, uploaded_files, converter_reference(json_to_html))
+    job = queue.get(job_id)  # job.status: queued, running, done or failed
+"""
+
+import io
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from core.logging_config import get_logger, get_correlation_id
+from core.metrics import REGISTRY
+from services.submission_service import Submission
+
+logger = get_logger(__name__)
+
+QUEUE_JOBS = REGISTRY.counter(
+    "submission_queue_jobs_total",
+    "Submission jobs by queue event",
+    ["event"]
+)
+
+# Default database location (override with SUBMISSION_QUEUE_DB_PATH)
+DEFAULT_QUEUE_DB = Path(__file__).parent.parent / ".cache" / "submission_queue.db"
+
+# Seconds without a heartbeat after which a running job is considered lost (override with SUBMISSION_JOB_LEASE)
+DEFAULT_LEASE = 600.0
+
+# Seconds without a supervisor heartbeat after which no worker pool is considered running
+# (override with SUBMISSION_WORKER_TIMEOUT)
+DEFAULT_WORKER_TIMEOUT = 10.0
+
+# Hours finished jobs are kept before purge() deletes them (override with SUBMISSION_JOB_RETENTION_HOURS)
+DEFAULT_RETENTION_HOURS = 168
+
+# Spool folders without a job older than this many seconds are left over from a crash
+ORPHAN_SPOOL_AGE = 3600.0
+
+# Spool copy chunk size
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+@dataclass
+class SubmissionJob:
+    """A queued submission and its outcome."""
+    id: str
+    status: str
+    submission: Submission
+    converter: str
+    files: List[str] = field(default_factory=list)  # Original file names, in upload order
+    correlation_id: Optional[str] = None
+    stage: str = ""
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    error_kind: Optional[str] = None  # "storage", "salesforce" or "unexpected"
+    worker: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done or failed."""
+        return self.status in (DONE, FAILED)
+
+
+class SpooledUpload(io.BufferedReader):
+    """A spooled upload, opened for reading under its original file name."""
+    
+    def __init__(self, path: Path, name: str):
+        super().__init__(io.FileIO(str(path), "rb"))
+        self._upload_name = name
+    
+    @property
+    def name(self) -> str:
+        return self._upload_name
+
+
+class SubmissionQueue:
+    """SQLite-backed submission queue shared by the app and worker processes."""
+    
+    def __init__(self, db_path: Path, lease: float = DEFAULT_LEASE, worker_timeout: float = DEFAULT_WORKER_TIMEOUT):
+        """
+        Initialize the queue.
+        
+        Args:
+            db_path: SQLite file holding the jobs; spooled files go to a
+                ``submission_spool`` folder next to it.
+            lease: Seconds without a heartbeat before a running job is failed.
+            worker_timeout: Seconds without a supervisor heartbeat before
+                the worker pool is considered gone.
+        """
+        self.db_path = Path(db_path)
+        self.spool_dir = self.db_path.parent / "submission_spool"
+        self.lease = lease
+        self.worker_timeout = worker_timeout
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    correlation_id TEXT,
+                    stage TEXT NOT NULL DEFAULT '',
+                    result TEXT,
+                    error TEXT,
+                    error_kind TEXT,
+                    worker TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    heartbeat_at REAL,
+                    finished_at REAL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS workers (name TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe to use from any thread or process)."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:  # Commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+    
+    def enqueue(self, submission: Submission, uploaded_files: List, converter: str) -> str:
+        """
+        Queue a validated submission.
+        
+        Args:
+            submission: Submission to process.
+            uploaded_files: Uploaded files (binary streams with a ``name``);
+                they are copied to the spool folder before this returns.
+            converter: HTML converter reference (see converter_reference()).
+        
+        Returns:
+            Job ID.
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = self.spool_dir / job_id
+        # Files are spooled before the job is visible to workers; if spooling
+        # or the insert fails, the folder goes too
+        job_dir.mkdir()
+        try:
+            names = []
+            for position, uploaded in enumerate(uploaded_files or []):
+                uploaded.seek(0)
+                with open(job_dir / str(position), "wb") as f:
+                    shutil.copyfileobj(uploaded, f, SPOOL_CHUNK_SIZE)
+                uploaded.seek(0)
+                names.append(uploaded.name)
+        
+            payload = {
+                "assessment_type": submission.assessment_type,
+                "projects_folder": submission.projects_folder,
+                "info": submission.info,
+                "customer_data": submission.customer_data,
+                "converter": converter,
+                "files": names,
+            }
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO jobs (id, status, payload, correlation_id, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, QUEUED, json.dumps(payload, default=str), get_correlation_id(), time.time())
+                )
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        QUEUE_JOBS.labels(event="enqueued").inc()
+        logger.info("Queued %s submission %s with %s files", submission.assessment_type, job_id, len(names))
+        return job_id
+    
+    def claim(self, worker: str) -> Optional[SubmissionJob]:
+        """
+        Claim the oldest queued job.
+        
+        Args:
+            worker: Worker name recorded on the job.
+        
+        Returns:
+            The claimed job (now running), or None if the queue is empty.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        try:
+            # IMMEDIATE takes the write lock up front: no two workers see the same job
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker, now, now, row[0])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        
+        QUEUE_JOBS.labels(event="claimed").inc()
+        return self.get(row[0])
+    
+    def update_stage(self, job_id: str, stage: str) -> None:
+        """Record what a running job is doing (also refreshes its heartbeat)."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+                (stage, time.time(), job_id, RUNNING)
+            )
+    
+    def heartbeat(self, job_id: str) -> None:
+        """Tell the supervisor a running job is still alive."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING))
+    
+    def complete(self, job_id: str, result: Dict) -> None:
+        """Mark a job done with its result and drop its spooled files."""
+        self._finish(job_id, DONE, result=json.dumps(result, default=str))
+        QUEUE_JOBS.labels(event="done").inc()
+    
+    def fail(self, job_id: str, error: str, error_kind: str = "unexpected") -> None:
+        """Mark a job failed and drop its spooled files."""
+        self._finish(job_id, FAILED, error=error, error_kind=error_kind)
+        QUEUE_JOBS.labels(event="failed").inc()
+    
+    def withdraw(self, job_id: str, error: str) -> bool:
+        """
+        Fail a job that no worker has claimed yet, so its submitter can run it.
+        
+        Args:
+            job_id: Queued job.
+            error: Reason recorded on the job.
+        
+        Returns:
+            True if the job was still queued and is now failed; False if a
+            worker claimed it meanwhile.
+        """
+        with self._connect() as conn:
+            withdrawn = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, error_kind = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (FAILED, error, "unexpected", time.time(), job_id, QUEUED)
+            ).rowcount == 1
+        if withdrawn:
+            shutil.rmtree(self.spool_dir / job_id, ignore_errors=True)
+            QUEUE_JOBS.labels(event="withdrawn").inc()
+        return withdrawn
+    
+    def _finish(self, job_id: str, status: str, **columns) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, error_kind = ?, finished_at = ? WHERE id = ?",
+                (status, columns.get("result"), columns.get("error"), columns.get("error_kind"), time.time(), job_id)
+            )
+        shutil.rmtree(self.spool_dir / job_id, ignore_errors=True)
+    
+    def get(self, job_id: str) -> Optional[SubmissionJob]:
+        """
+        Get a job.
+        
+        Args:
+            job_id: Job ID returned by enqueue().
+        
+        Returns:
+            SubmissionJob, or None if unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, payload, correlation_id, stage, result, error, error_kind, worker, "
+                "created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        payload = json.loads(row[2])
+        return SubmissionJob(
+            id=row[0],
+            status=row[1],
+            submission=Submission(
+                assessment_type=payload["assessment_type"],
+                projects_folder=payload["projects_folder"],
+                info=payload["info"],
+                customer_data=payload["customer_data"]
+            ),
+            converter=payload["converter"],
+            files=payload["files"],
+            correlation_id=row[3],
+            stage=row[4],
+            result=json.loads(row[5]) if row[5] else None,
+            error=row[6],
+            error_kind=row[7],
+            worker=row[8],
+            created_at=row[9],
+            started_at=row[10],
+            finished_at=row[11]
+        )
+    
+    def open_files(self, job: SubmissionJob) -> List[SpooledUpload]:
+        """
+        Open the spooled files of a job under their original names.
+        
+        Args:
+            job: Claimed job.
+        
+        Returns:
+            Open file streams; the caller closes them.
+        """
+        job_dir = self.spool_dir / job.id
+        return [SpooledUpload(job_dir / str(position), name) for position, name in enumerate(job.files)]
+    
+    def fail_lost_jobs(self) -> int:
+        """
+        Fail running jobs whose worker stopped sending heartbeats.
+        
+        Lost jobs are not retried: their project folder may already exist,
+        and a retry would be rejected as a duplicate project.
+        
+        Returns:
+            Number of jobs failed.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND heartbeat_at < ?",
+                (RUNNING, time.time() - self.lease)
+            ).fetchall()
+        for (job_id,) in rows:
+            logger.warning("Submission %s lost its worker, marking it failed", job_id)
+            self.fail(job_id, "The submission worker stopped while processing this submission", "unexpected")
+        return len(rows)
+    
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+    
+    def beat(self, worker: str) -> None:
+        """Record that a worker pool supervisor is alive."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO workers (name, seen_at) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET seen_at = excluded.seen_at",
+                (worker, time.time())
+            )
+    
+    def workers_alive(self) -> bool:
+        """Whether a worker pool sent a heartbeat within ``worker_timeout`` seconds."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM workers WHERE seen_at >= ? LIMIT 1", (time.time() - self.worker_timeout,)
+            ).fetchone()
+        return row is not None
+    
+    def purge(self, older_than: float) -> int:
+        """
+        Delete finished jobs older than a number of seconds.
+        
+        Heartbeats of pools gone for as long, and spool folders left without
+        a job by a crash, are deleted too.
+        
+        Args:
+            older_than: Age in seconds of the finished jobs to delete.
+        
+        Returns:
+            Number of jobs deleted.
+        """
+        cutoff = time.time() - older_than
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, cutoff)
+            ).rowcount
+            conn.execute("DELETE FROM workers WHERE seen_at < ?", (cutoff,))
+            job_ids = {row[0] for row in conn.execute("SELECT id FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING))}
+        
+        for job_dir in self.spool_dir.iterdir():
+            try:
+                orphan = job_dir.name not in job_ids and time.time() - job_dir.stat().st_mtime > ORPHAN_SPOOL_AGE
+            except OSError:
+                continue
+            if orphan:
+                shutil.rmtree(job_dir, ignore_errors=True)
+        
+        if deleted:
+            QUEUE_JOBS.labels(event="purged").inc(deleted)
+            logger.info("Purged %s finished submission jobs", deleted)
+        return deleted
+
+
+def submission_workers_enabled() -> bool:
+    """Whether SUBMISSION_WORKERS routes submissions through the worker pool (default false)."""
+    return os.getenv("SUBMISSION_WORKERS", "false").lower() in ("1", "true", "yes")
+
+
+def job_retention_seconds() -> float:
+    """Age of finished jobs purged by the supervisor (SUBMISSION_JOB_RETENTION_HOURS, default 168)."""
+    return float(os.getenv("SUBMISSION_JOB_RETENTION_HOURS", DEFAULT_RETENTION_HOURS)) * 3600
+
+
+def worker_name() -> str:
+    """Name recorded on claimed jobs: host and process ID."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# Singleton shared by the Streamlit sessions (and the threads of a worker process)
+_submission_queue: Optional[SubmissionQueue] = None
+_submission_queue_lock = threading.Lock()
+
+
+def get_submission_queue() -> SubmissionQueue:
+    """
+    Get the submission queue of this process.
+    
+    The database path is read from SUBMISSION_QUEUE_DB_PATH (default
+    ``.cache/submission_queue.db``), the job lease from SUBMISSION_JOB_LEASE
+    and the worker pool timeout from SUBMISSION_WORKER_TIMEOUT.
+    
+    Returns:
+        SubmissionQueue instance.
+    """
+    global _submission_queue
+    if _submission_queue is None:
+        with _submission_queue_lock:
+            if _submission_queue is None:
+                _submission_queue = SubmissionQueue(
+                    Path(os.getenv("SUBMISSION_QUEUE_DB_PATH", str(DEFAULT_QUEUE_DB))),
+                    lease=float(os.getenv("SUBMISSION_JOB_LEASE", DEFAULT_LEASE)),
+                    worker_timeout=float(os.getenv("SUBMISSION_WORKER_TIMEOUT", DEFAULT_WORKER_TIMEOUT))
+                )
+    return _submission_queue
@@ -0,0 +1,398 @@
+"""
+Submission Service Module
+
+This module runs the storage and Salesforce steps of an assessment
+submission without any Streamlit widgets: project folder creation and
+template copy, customer file upload, HTML report, and opportunity
+creation.
+
+BaseAssessment calls it inside the Streamlit script run; the submission
+worker pool (services/submission_worker.py) calls it in separate processes
+for submissions queued by the pages; services/headless.py and
+services/bulk_import.py call it without Streamlit.
+
+Usage:
+    service = SubmissionService(get_storage_service(), get_salesforce_service())
+    submission = Submission("ICT", "1_ICT", info)
+    project_path = service.create_project_structure(submission, uploaded_files)
+    service.save_html_report(submission, project_path, json_to_html)
+    result = service.create_salesforce_opportunity(submission, project_path)
+"""
+
+import importlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config import get_settings
+from core.instrumentation import span
+from core.logging_config import get_logger
+from core.progress import ProgressCallback
+from pages.utils.dates_info import get_last_weekday_of_next_month
+from pages.utils.validation_schemas import ASSESSMENT_SCHEMAS, ValidationSchema, error_messages
+from services.salesforce_service import get_unique_account_dict
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Submission:
+    """An assessment submission: form data plus where its project goes."""
+    assessment_type: str
+    projects_folder: str
+    info: Dict
+    customer_data: Dict = field(default_factory=dict)
+    
+    def __post_init__(self):
+        if not self.customer_data:
+            self.customer_data = prepare_customer_data(self.info)
+
+
+@dataclass(frozen=True)
+class AssessmentKind:
+    """Where and how an assessment type is filed, as on its form page."""
+    assessment_type: str
+    projects_folder: str
+    converter: str
+    schema: ValidationSchema
+    
+    def submission(self, info: Dict) -> Submission:
+        """A Submission of this kind for the given form data."""
+        return Submission(self.assessment_type, self.projects_folder, info)
+
+
+# Same settings as the pages in pages/*_assessment.py
+ASSESSMENT_KINDS: Dict[str, AssessmentKind] = {
+    "ICT": AssessmentKind("ICT", "1_In_Circuit Test (ICT)", "pages.utils.ict_create_html:json_to_html", ASSESSMENT_SCHEMAS["ICT"]),
+    "FCT": AssessmentKind("FCT", "2_Functional Test (FCT)", "pages.utils.fct_create_html:json_to_html", ASSESSMENT_SCHEMAS["FCT"]),
+    "IAT": AssessmentKind("IAT", "4_Industrial Automation (IAT)", "pages.utils.iat_create_html:json_to_html", ASSESSMENT_SCHEMAS["IAT"]),
+    "FIX": AssessmentKind("IAT", "7_Fixtures (FIX)", "pages.utils.fix_create_html:json_to_html", ASSESSMENT_SCHEMAS["FIX"]),
+}
+
+
+def validate_assessment(kind: str, info: Dict) -> List[str]:
+    """
+    Validate form data with the rules of its assessment form.
+    
+    Args:
+        kind: Key of ASSESSMENT_KINDS (ICT, FCT, IAT or FIX).
+        info: Form data.
+    
+    Returns:
+        List of error messages, empty if the data is valid.
+    """
+    if kind not in ASSESSMENT_KINDS:
+        return [_unknown_kind_message(kind)]
+    return [error.message for error in ASSESSMENT_KINDS[kind].schema.validate_record(info)]
+
+
+def _unknown_kind_message(kind: str) -> str:
+    """Error message for a kind that is not in ASSESSMENT_KINDS."""
+    return f"Unknown assessment type '{kind}' (use one of {', '.join(ASSESSMENT_KINDS)})"
+    
+
+def validate_assessment_batch(kinds: List[str], infos: List[Dict]) -> List[List[str]]:
+    """
+    Validate many submissions, grouped by assessment type.
+    
+    Args:
+        kinds: Key of ASSESSMENT_KINDS of each submission.
+        infos: Form data of each submission.
+    
+    Returns:
+        Error messages of each submission, in order (empty lists if valid).
+    """
+    results: List[List[str]] = [[] for _ in infos]
+    positions: Dict[str, List[int]] = {}
+    for position, kind in enumerate(kinds):
+        positions.setdefault(kind, []).append(position)
+    
+    for kind, members in positions.items():
+        if kind not in ASSESSMENT_KINDS:
+            message = _unknown_kind_message(kind)
+            for position in members:
+                results[position] = [message]
+            continue
+        
+        errors = ASSESSMENT_KINDS[kind].schema.validate_batch([infos[position] for position in members])
+        for row, messages in error_messages(errors).items():
+            results[members[row]] = messages
+    return results
+
+
+def prepare_customer_data(info: Dict) -> Dict:
+    """
+    Prepare customer data for processing.
+    
+    Args:
+        info: Form data.
+    
+    Returns:
+        Dictionary with country, customer_name and customer_in_list.
+    """
+    customer_data = {
+        "country": info.get("country", "Mexico"),
+        "customer_in_list": True
+    }
+    
+    # Handle customer name
+    if info.get("customer_name") is None or info["customer_name"] == "Other":
+        customer_data["customer_name"] = info.get("customer_name2")
+        customer_data["customer_in_list"] = False
+    else:
+        customer_data["customer_name"] = info["customer_name"]
+    
+    return customer_data
+
+
+def converter_reference(html_converter: Callable) -> str:
+    """
+    Importable reference of an HTML converter, e.g. "pages.utils.ict_create_html:json_to_html".
+    
+    Args:
+        html_converter: Module-level function.
+    
+    Returns:
+        "module:qualname" string accepted by resolve_converter().
+    """
+    return f"{html_converter.__module__}:{html_converter.__qualname__}"
+
+
+def resolve_converter(reference: str) -> Callable:
+    """
+    Import an HTML converter from its converter_reference().
+    
+    Args:
+        reference: "module:qualname" string.
+    
+    Returns:
+        The converter function.
+    """
+    module_name, _, qualname = reference.partition(":")
+    target = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class SubmissionService:
+    """Storage and Salesforce steps of an assessment submission."""
+    
+    def __init__(self, storage_service, salesforce_service, settings=None):
+        """
+        Initialize the submission service.
+        
+        Args:
+            storage_service: StorageService instance.
+            salesforce_service: SalesforceService instance.
+            settings: Application settings (loaded if omitted).
+        """
+        self.storage_service = storage_service
+        self.salesforce_service = salesforce_service
+        self.settings = settings or get_settings()
+    
+    def project_path(self, submission: Submission) -> str:
+        """
+        Path of a submission's project folder, before it is created.
+        
+        Args:
+            submission: Submission to locate.
+        
+        Returns:
+            Path create_project_structure() creates the project at.
+        """
+        return self.storage_service.project_folder_path(
+            submission.projects_folder,
+            submission.customer_data["customer_name"],
+            submission.info["project_name"],
+            submission.customer_data["country"]
+        )
+    
+    def create_project_structure(
+        self,
+        submission: Submission,
+        uploaded_files: List,
+        folder_progress: Optional[ProgressCallback] = None,
+        upload_progress: Optional[ProgressCallback] = None,
+        resume: bool = False
+    ) -> str:
+        """
+        Create the project folder from its template and upload the files.
+        
+        Args:
+            submission: Submission to create the project for.
+            uploaded_files: Uploaded files (binary streams with a ``name``).
+            folder_progress: Progress callback for the template copy (optional).
+            upload_progress: Progress callback for the upload (optional).
+            resume: Complete a project folder whose creation was interrupted
+                (see StorageService.create_project_folder).
+        
+        Returns:
+            Path to the created project folder.
+        
+        Raises:
+            StorageError: If folder creation or file upload fails.
+        """
+        with span("create_project_folder"):
+            project_path = self.storage_service.create_project_folder(
+                assessment_type=submission.assessment_type,
+                projects_folder=submission.projects_folder,
+                customer_name=submission.customer_data["customer_name"],
+                project_name=submission.info["project_name"],
+                country=submission.customer_data["country"],
+                progress=folder_progress,
+                resume=resume
+            )
+        
+        logger.info("Created project structure at: %s", project_path)
+        
+        if uploaded_files:
+            with span("upload_files"):
+                self.storage_service.upload_assessment_files(
+                    project_path=project_path,
+                    assessment_type=submission.assessment_type,
+                    files=uploaded_files,
+                    progress=upload_progress
+                )
+            logger.info("Uploaded %s files", len(uploaded_files))
+        
+        return project_path
+    
+    def save_html_report(
+        self,
+        submission: Submission,
+        project_path: str,
+        html_converter: Callable
+    ) -> None:
+        """
+        Generate and save the HTML report.
+        
+        Args:
+            submission: Submission to report.
+            project_path: Path to the project folder.
+            html_converter: Function to convert info to HTML.
+        
+        Raises:
+            StorageError: If save fails.
+        """
+        with span("render_html"):
+            # Fields a form always sets may be absent in imported or API submissions
+            html_data = html_converter(defaultdict(str, submission.info))
+        
+        if html_data:
+            with span("save_html") as save_span:
+                save_span.add_bytes(len(html_data.encode("utf-8")))
+                self.storage_service.save_assessment_html(
+                    project_path=project_path,
+                    assessment_type=submission.assessment_type,
+                    html_content=html_data
+                )
+            logger.info("Saved HTML report")
+    
+    def get_sharepoint_url(self, project_path: str) -> str:
+        """
+        Generate SharePoint URL for the project folder.
+        
+        Args:
+            project_path: Relative path to the project folder (from StorageService).
+                         This path already includes SHAREPOINT_BASE_PATH if configured.
+        
+        Returns:
+            Full SharePoint URL to the project folder.
+        """
+        base_url = self.settings.storage.sharepoint_path
+        
+        # Note: project_relative already includes SHAREPOINT_BASE_PATH (e.g., "01_2025/1_ICT/...")
+        # because SharePointStorageProvider.get_full_path() adds it
+        project_relative = str(Path(project_path)).replace("\\", "/").lstrip("/")
+        if base_url.endswith("/"):
+            sharepoint_url = f"{base_url}{project_relative}"
+        else:
+            sharepoint_url = f"{base_url}/{project_relative}"
+        
+        logger.info("Generated SharePoint URL: %s", sharepoint_url)
+        return sharepoint_url
+    
+    def opportunity_fields(self, submission: Submission, project_path: str) -> Dict:
+        """
+        Opportunity values of a submission.
+        
+        Args:
+            submission: Submission to register.
+            project_path: Path to the created project folder.
+        
+        Returns:
+            Keyword arguments of SalesforceService.create_opportunity().
+        """
+        # Get account ID if customer is in list
+        account_id = None
+        if submission.customer_data["customer_in_list"]:
+            with span("account_lookup"):
+                all_accounts = get_unique_account_dict()
+                accounts_by_name = {name: id for id, name in all_accounts.items()}
+                account_id = accounts_by_name.get(submission.customer_data["customer_name"])
+        
+        return {
+            "name": submission.info["project_name"],
+            "stage_name": "New Request",
+            "close_date": get_last_weekday_of_next_month().strftime("%Y-%m-%d"),
+            "assessment_date": datetime.now().strftime("%Y-%m-%d"),
+            "path": self.get_sharepoint_url(project_path),
+            "bu": submission.assessment_type,
+            "account_id": account_id
+        }
+    
+    def create_salesforce_opportunity(self, submission: Submission, project_path: str) -> Dict:
+        """
+        Create the Salesforce opportunity of a submission.
+        
+        Args:
+            submission: Submission to register.
+            project_path: Path to the created project folder.
+        
+        Returns:
+            Result dictionary from Salesforce.
+        
+        Raises:
+            SalesforceError: If creation fails.
+        """
+        fields = self.opportunity_fields(submission, project_path)
+        
+        with span("create_opportunity"):
+            return self.salesforce_service.create_opportunity(**fields)
+    
+    def run(
+        self,
+        submission: Submission,
+        uploaded_files: List,
+        html_converter: Callable,
+        folder_progress: Optional[ProgressCallback] = None,
+        upload_progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Run all steps of an already validated submission.
+        
+        Args:
+            submission: Submission to process.
+            uploaded_files: Uploaded files (binary streams with a ``name``).
+            html_converter: Function to convert info to HTML.
+            folder_progress: Progress callback for the template copy (optional).
+            upload_progress: Progress callback for the upload (optional).
+        
+        Returns:
+            Salesforce result dictionary, plus ``project_path``.
+        
+        Raises:
+            StorageError: If a storage step fails.
+            SalesforceError: If opportunity creation fails.
+        """
+        logger.info("Processing %s assessment submission", submission.assessment_type)
+        project_path = self.create_project_structure(
+            submission, uploaded_files, folder_progress, upload_progress
+        )
+        self.save_html_report(submission, project_path, html_converter)
+        result = dict(self.create_salesforce_opportunity(submission, project_path))
+        result["project_path"] = project_path
+        return result
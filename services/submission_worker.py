@@ -0,0 +1,220 @@
+"""
+Submission Worker Module
+
+This module runs queued assessment submissions (services/submission_queue.py)
+in a pool of worker processes, so hashing, zipping, HTML rendering and the
+storage and Salesforce round trips of one submission no longer hold the
+GIL of the Streamlit server that renders every other session.
+
+Each worker process claims one job at a time and runs it through
+SubmissionService; the supervisor restarts workers that die and fails jobs
+whose worker stopped sending heartbeats. It also records its own heartbeat,
+which pages check before queueing, and purges finished jobs. Enable the pool for the app with
+SUBMISSION_WORKERS=true and start it next to Streamlit:
+
+Usage:
+    python -m services.submission_worker --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import List, Optional
+
+from core.exceptions import SalesforceError, StorageError
+from core.instrumentation import submission_trace
+from core.logging_config import correlation_context, get_logger, setup_logging
+from core.progress import ProgressCallback, ProgressUpdate
+from services.submission_queue import (
+    SubmissionJob,
+    SubmissionQueue,
+    get_submission_queue,
+    job_retention_seconds,
+    worker_name,
+)
+from services.submission_service import SubmissionService, resolve_converter
+
+logger = get_logger(__name__)
+
+# Seconds an idle worker waits before polling the queue again (override with SUBMISSION_POLL_INTERVAL)
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Seconds between supervisor checks for dead workers, lost jobs and stop requests
+SUPERVISOR_INTERVAL = 1.0
+
+# Seconds between purges of finished jobs
+PURGE_INTERVAL = 3600.0
+
+
+def _stage_reporter(queue: SubmissionQueue, job_id: str, label: str) -> ProgressCallback:
+    """Progress callback that publishes the progress line as the job's stage."""
+    def update(progress: ProgressUpdate) -> None:
+        details = progress.describe()
+        queue.update_stage(job_id, f"{label}: {details}" if details else label)
+    
+    return update
+
+
+def process_job(queue: SubmissionQueue, service: SubmissionService, job: SubmissionJob) -> None:
+    """
+    Run a claimed job and record its outcome in the queue.
+    
+    Args:
+        queue: Queue the job was claimed from.
+        service: SubmissionService running the steps.
+        job: Claimed job.
+    """
+    stop_heartbeat = threading.Event()
+    
+    def heartbeat() -> None:
+        # Keeps the job alive through long steps that report no progress
+        while not stop_heartbeat.wait(queue.lease / 4):
+            queue.heartbeat(job.id)
+    
+    files = queue.open_files(job)
+    heartbeat_thread = threading.Thread(target=heartbeat, name=f"heartbeat-{job.id[:8]}", daemon=True)
+    heartbeat_thread.start()
+    try:
+        with correlation_context(job.correlation_id), submission_trace(job.submission.assessment_type):
+            queue.update_stage(job.id, "Creating project folder")
+            result = service.run(
+                job.submission,
+                files,
+                resolve_converter(job.converter),
+                folder_progress=_stage_reporter(queue, job.id, "Copying template"),
+                upload_progress=_stage_reporter(queue, job.id, "Uploading files")
+            )
+    except StorageError as e:
+        logger.error("Submission %s failed: %s", job.id, e.message, exc_info=True)
+        queue.fail(job.id, e.message, "storage")
+    except SalesforceError as e:
+        logger.error("Submission %s failed: %s", job.id, e.message, exc_info=True)
+        queue.fail(job.id, e.message, "salesforce")
+    except Exception as e:
+        logger.error("Submission %s failed: %s", job.id, e, exc_info=True)
+        queue.fail(job.id, str(e), "unexpected")
+    else:
+        queue.complete(job.id, result)
+        logger.info("Submission %s done", job.id)
+    finally:
+        stop_heartbeat.set()
+        for stream in files:
+            stream.close()
+
+
+def worker_loop(stop, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+    """
+    Claim and run jobs until ``stop`` is set.
+    
+    Args:
+        stop: Event set by the supervisor to stop after the current job.
+        poll_interval: Seconds to wait when the queue is empty.
+    """
+    # Imported here: the Streamlit-cached factories are only needed in workers
+    from services.salesforce_service import get_salesforce_service
+    from services.storage_service import get_storage_service
+    from services.warmup import start_warmup
+    
+    queue = get_submission_queue()
+    start_warmup()
+    service = SubmissionService(get_storage_service(), get_salesforce_service())
+    name = worker_name()
+    logger.info("Submission worker %s started", name)
+    
+    while not stop.is_set():
+        job = queue.claim(name)
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+        process_job(queue, service, job)
+    
+    logger.info("Submission worker %s stopped", name)
+
+
+def _worker_main(stop, poll_interval: float) -> None:
+    """Entry point of a worker process."""
+    # Ctrl+C reaches the whole process group; let the supervisor stop workers
+    # between jobs instead of interrupting a submission halfway
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_logging()
+    worker_loop(stop, poll_interval)
+
+
+def run_pool(processes: int, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+    """
+    Run a pool of worker processes until interrupted.
+    
+    Args:
+        processes: Number of worker processes.
+        poll_interval: Seconds an idle worker waits between polls.
+    """
+    # Spawned, not forked: the parent may hold locks of logging or HTTP threads
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    queue = get_submission_queue()
+    
+    def start(slot: int):
+        process = context.Process(
+            target=_worker_main, args=(stop, poll_interval), name=f"submission-worker-{slot}"
+        )
+        process.start()
+        return process
+    
+    # The handler only flips a flag: setting the Event from a signal handler
+    # would deadlock if the signal arrived while the main thread waited on it
+    stopping = False
+    
+    def request_stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    workers: List = [start(slot) for slot in range(processes)]
+    logger.info("Started %s submission workers (queue: %s)", processes, queue.db_path)
+    name = worker_name()
+    queue.beat(name)
+    retention = job_retention_seconds()
+    next_purge = time.monotonic()
+    
+    while not stopping:
+        time.sleep(SUPERVISOR_INTERVAL)
+        if stopping:
+            break
+        queue.beat(name)
+        queue.fail_lost_jobs()
+        if retention > 0 and time.monotonic() >= next_purge:
+            queue.purge(retention)
+            next_purge = time.monotonic() + PURGE_INTERVAL
+        for slot, process in enumerate(workers):
+            if not process.is_alive():
+                logger.warning("Submission worker %s exited (code %s), restarting", process.name, process.exitcode)
+                workers[slot] = start(slot)
+    
+    logger.info("Stopping submission workers after their current jobs")
+    stop.set()
+    for process in workers:
+        process.join()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Run queued assessment submissions in worker processes")
+    parser.add_argument("--processes", type=int,
+                        default=int(os.getenv("SUBMISSION_WORKER_PROCESSES", os.cpu_count() or 2)),
+                        help="Worker processes (default: SUBMISSION_WORKER_PROCESSES or CPU count)")
+    parser.add_argument("--poll-interval", type=float,
+                        default=float(os.getenv("SUBMISSION_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)),
+                        help="Seconds an idle worker waits between polls (default: 0.5)")
+    args = parser.parse_args(argv)
+    
+    setup_logging()
+    run_pool(max(args.processes, 1), args.poll_interval)
+
+
+if __name__ == "__main__":
+    main()
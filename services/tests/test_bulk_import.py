@@ -0,0 +1,229 @@
+"""Tests for services.bulk_import."""
+
+import pytest
+
+from core.exceptions import ValidationError
+from services import submission_service
+from services.bulk_import import (
+    BulkImporter,
+    ImportCheckpoint,
+    ImportRow,
+    default_checkpoint_path,
+    read_rows,
+)
+from services.submission_service import SubmissionService
+from storage.template_manifest import get_template_manifest
+
+
+HEADER = "Type,Project Name,Contact Name,Contact Email,Customer Name,Date\n"
+
+
+def csv_row(project, kind="ICT", email="ana@company.com"):
+    return f"{kind},{project},Ana,{email},ACME,2026-01-15\n"
+
+
+@pytest.fixture(autouse=True)
+def import_settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROJECT_INDEX_DB_PATH", str(tmp_path / "projects.db"))
+    monkeypatch.setattr(submission_service, "get_unique_account_dict", lambda: {"001ACME": "ACME"})
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return ImportCheckpoint(tmp_path / "requests.csv.checkpoint.jsonl")
+
+
+@pytest.fixture
+def importer(storage_service, salesforce_service, settings, checkpoint, fake_graph):
+    for folder in ("1_In_Circuit Test (ICT)", "2_Functional Test (FCT)"):
+        fake_graph.drive.mkdirs(storage_service.provider.get_full_path(folder, "MX", "ACME"))
+    service = SubmissionService(storage_service, salesforce_service, settings)
+    return BulkImporter(service, checkpoint, workers=4)
+
+
+def write_csv(tmp_path, *rows):
+    path = tmp_path / "requests.csv"
+    path.write_text(HEADER + "".join(rows), encoding="utf-8")
+    return path
+
+
+def test_read_rows_normalizes_headers(tmp_path):
+    path = tmp_path / "requests.csv"
+    path.write_text(" Project  Name ,CONTACT EMAIL,Notes\nBoard test , ana@company.com,\n", encoding="utf-8")
+    
+    assert read_rows(path) == [{"project_name": "Board test", "contact_email": "ana@company.com", "notes": ""}]
+
+
+@pytest.mark.parametrize("name", ["requests.txt", "requests.xls"])
+def test_read_rows_rejects_other_files(tmp_path, name):
+    path = tmp_path / name
+    path.write_text("project_name\n", encoding="utf-8")
+    
+    with pytest.raises(ValidationError, match="use .csv or .xlsx"):
+        read_rows(path)
+    with pytest.raises(ValidationError):
+        read_rows(tmp_path / "missing.csv")
+
+
+def test_read_rows_reads_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Project Name", "Contact Email"])
+    workbook.active.append(["Board test", "ana@company.com"])
+    path = tmp_path / "requests.xlsx"
+    workbook.save(path)
+    
+    assert read_rows(path) == [{"project_name": "Board test", "contact_email": "ana@company.com"}]
+
+
+def states_by_line(checkpoint):
+    """Checkpoint states keyed by the spreadsheet line they were last recorded for."""
+    return {state["row"]: state for state in checkpoint.load().values()}
+
+
+def test_checkpoint_merges_records_and_skips_cut_lines(checkpoint):
+    row = ImportRow(number=2, kind="ICT", info={}, key="k1")
+    checkpoint.record(row, status="folder_created", project_path="ACME/Line 1")
+    checkpoint.record(row, status="stored", html_saved=True)
+    assert row.state["html_saved"] is True
+    
+    # Another row took the line, then a crash cut the last record short
+    checkpoint.record(ImportRow(number=2, kind="ICT", info={}, key="k2"), status="invalid")
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"row": 3, "key": "k')
+    assert checkpoint.load() == {
+        "k1": {"row": 2, "key": "k1", "status": "stored", "project_path": "ACME/Line 1", "html_saved": True},
+        "k2": {"row": 2, "key": "k2", "status": "invalid"},
+    }
+
+
+def test_prepare_keys_rows_by_content(importer):
+    records = [{"project_name": "Line 1"}, {"project_name": "Line 2"}, {"project_name": "Line 1"}]
+    keys = [row.key for row in importer.prepare(records, "ICT")]
+    
+    assert len(set(keys)) == 3
+    assert keys[0].rsplit("-", 1)[0] == keys[2].rsplit("-", 1)[0]
+    moved = [row.key for row in importer.prepare(records[1:] + records[:1], "ICT")]
+    assert moved == [keys[1], keys[0], keys[2]]
+
+
+def test_prepare_fills_form_defaults(importer):
+    rows = importer.prepare([
+        {"project_name": "Line 1", "customer_name2": "Initech"},
+        {"type": "fct", "project_name": "Line 2", "country": "USA", "date": "2026-01-15"},
+    ], "ict")
+    
+    assert [(row.number, row.kind) for row in rows] == [(2, "ICT"), (3, "FCT")]
+    assert rows[0].info["customer_name"] == "Other"
+    assert rows[0].info["country"] == "Mexico"
+    assert rows[0].info["date"]
+    assert (rows[1].info["country"], rows[1].info["date"]) == ("USA", "2026-01-15")
+    assert "type" not in rows[1].info
+
+
+def test_run_creates_folders_reports_and_opportunities(importer, tmp_path, fake_graph, fake_salesforce):
+    path = write_csv(tmp_path, csv_row("Line 1"), csv_row("Line 2", kind="FCT"), csv_row("Line 3", email="ana@gmail.com"))
+    before = fake_salesforce.count("Opportunity")
+    
+    report = importer.run(importer.prepare(read_rows(path), None))
+    
+    assert (report.total, report.created, report.invalid, report.failed) == (3, 2, 1, 0)
+    assert [number for number, _ in report.errors] == [4]
+    assert fake_salesforce.count("Opportunity") == before + 2
+    states = states_by_line(importer.checkpoint)
+    assert states[2]["status"] == "created" and states[2]["opportunity_id"]
+    assert fake_graph.drive.lookup(states[3]["project_path"]) is not None
+    assert states[4]["status"] == "invalid"
+    assert "3 rows: 2 created" in report.describe()
+
+
+def test_rerun_skips_done_rows_and_restarts_edited_ones(importer, tmp_path, fake_salesforce):
+    path = write_csv(tmp_path, csv_row("Line 1"), csv_row("Line 2", email="ana@gmail.com"))
+    importer.run(importer.prepare(read_rows(path), None))
+    created = fake_salesforce.count("Opportunity")
+    
+    # The invalid row is fixed in the spreadsheet
+    path = write_csv(tmp_path, csv_row("Line 1"), csv_row("Line 2"))
+    report = importer.run(importer.prepare(read_rows(path), None))
+    
+    assert (report.skipped, report.created, report.invalid) == (1, 1, 0)
+    assert report.processed == 1
+    assert fake_salesforce.count("Opportunity") == created + 1
+
+
+def test_reordered_and_inserted_rows_keep_their_progress(importer, tmp_path, fake_salesforce):
+    path = write_csv(tmp_path, csv_row("Line 1"), csv_row("Line 2"))
+    importer.run(importer.prepare(read_rows(path), None))
+    created = fake_salesforce.count("Opportunity")
+    
+    path = write_csv(tmp_path, csv_row("Line 3"), csv_row("Line 2"), csv_row("Line 1"))
+    report = importer.run(importer.prepare(read_rows(path), None))
+    
+    assert (report.skipped, report.created, report.failed) == (2, 1, 0)
+    assert fake_salesforce.count("Opportunity") == created + 1
+    states = importer.checkpoint.load().values()
+    assert len(states) == 3 and all(state["opportunity_id"] for state in states)
+
+
+def test_failed_storage_steps_are_resumed(importer, tmp_path, monkeypatch):
+    path = write_csv(tmp_path, csv_row("Line 1"))
+    real_save = importer.service.save_html_report
+    
+    def failing_save(*args, **kwargs):
+        raise RuntimeError("renderer crashed")
+    
+    monkeypatch.setattr(importer.service, "save_html_report", failing_save)
+    report = importer.run(importer.prepare(read_rows(path), None))
+    assert (report.failed, report.errors) == (1, [(2, "renderer crashed")])
+    state = states_by_line(importer.checkpoint)[2]
+    assert (state["status"], state["error_kind"]) == ("failed", "unexpected")
+    
+    # The folder was created: the rerun only saves the report
+    monkeypatch.setattr(importer.service, "save_html_report", real_save)
+    report = importer.run(importer.prepare(read_rows(path), None))
+    assert (report.created, report.failed) == (1, 0)
+    assert states_by_line(importer.checkpoint)[2]["project_path"] == state["project_path"]
+
+
+def test_interrupted_template_copy_is_completed_on_rerun(importer, tmp_path, storage_service, graph_calls, monkeypatch):
+    path = write_csv(tmp_path, csv_row("Line 1"))
+    provider = storage_service.provider
+    real_upload = provider._upload_bytes_raw
+    
+    def upload_then_stop(data, folder, name):
+        if any(method == "PUT" for method, _ in graph_calls):
+            raise KeyboardInterrupt
+        return real_upload(data, folder, name)
+    
+    # The run stops after the first template file
+    monkeypatch.setattr(provider, "_upload_bytes_raw", upload_then_stop)
+    with pytest.raises(KeyboardInterrupt):
+        importer.run(importer.prepare(read_rows(path), None))
+    state = states_by_line(importer.checkpoint)[2]
+    assert (state["status"], state["folder_pending"]) == ("folder_pending", True)
+    
+    monkeypatch.setattr(provider, "_upload_bytes_raw", real_upload)
+    graph_calls.clear()
+    report = importer.run(importer.prepare(read_rows(path), None))
+    
+    assert (report.created, report.failed) == (1, 0)
+    state = states_by_line(importer.checkpoint)[2]
+    assert (state["status"], state["folder_pending"]) == ("created", False)
+    # The other template files and the HTML report; the copied file is skipped
+    template = get_template_manifest(str(storage_service.get_template_path("ICT")))
+    assert len([url for method, url in graph_calls if method == "PUT"]) == len(template.files)
+
+
+def test_existing_project_is_a_storage_failure(importer, tmp_path, storage_service, fake_graph):
+    path = write_csv(tmp_path, csv_row("Line 1"))
+    rows = importer.prepare(read_rows(path), None)
+    fake_graph.drive.mkdirs(storage_service.provider.get_full_path("1_In_Circuit Test (ICT)", "MX", "ACME", "Line 1"))
+    
+    report = importer.run(rows)
+    
+    assert report.failed == 1
+    assert states_by_line(importer.checkpoint)[2]["error_kind"] == "storage"
+
+
+def test_default_checkpoint_path(tmp_path):
+    assert default_checkpoint_path(tmp_path / "requests.xlsx") == tmp_path / "requests.xlsx.checkpoint.jsonl"
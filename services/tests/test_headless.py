@@ -0,0 +1,237 @@
+"""Tests for services.headless."""
+
+import argparse
+import base64
+import http.client
+import json
+import threading
+
+import pytest
+
+from services import headless, submission_queue, submission_service
+from services.headless import _submit_command, create_server, parse_submission
+from services.submission_queue import QUEUED, SpooledUpload, SubmissionQueue
+from services.submission_service import SubmissionService
+
+
+INFO = {
+    "project_name": "Board test",
+    "contact_name": "Ana",
+    "contact_email": "ana@company.com",
+    "customer_name": "ACME",
+}
+
+BOUNDARY = "form-boundary"
+
+
+def multipart(*parts):
+    """multipart/form-data body of (field name, file name, content) parts."""
+    chunks = []
+    for name, filename, content in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"'
+        chunks.append(f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode("utf-8") + content + b"\r\n")
+    return b"".join(chunks) + f"--{BOUNDARY}--\r\n".encode("utf-8")
+
+
+MULTIPART_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+@pytest.fixture(autouse=True)
+def api_settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROJECT_INDEX_DB_PATH", str(tmp_path / "projects.db"))
+    monkeypatch.delenv("SUBMISSION_API_TOKEN", raising=False)
+    monkeypatch.setattr(submission_service, "get_unique_account_dict", lambda: {"001ACME": "ACME"})
+
+
+@pytest.fixture(autouse=True)
+def queue(monkeypatch, tmp_path):
+    queue = SubmissionQueue(tmp_path / "queue.db")
+    monkeypatch.setattr(submission_queue, "_submission_queue", queue)
+    return queue
+
+
+@pytest.fixture
+def server(storage_service, salesforce_service, settings, fake_graph):
+    fake_graph.drive.mkdirs(storage_service.provider.get_full_path("1_In_Circuit Test (ICT)", "MX", "ACME"))
+    server = create_server(SubmissionService(storage_service, salesforce_service, settings), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=b"", headers=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def post_json(server, payload, path="/submissions"):
+    return request(server, "POST", path, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+
+def test_parse_json_submission():
+    body = json.dumps({
+        "type": "ict",
+        "info": INFO,
+        "files": [{"name": "../specs/bom.csv", "content_base64": base64.b64encode(b"csv").decode("ascii")}],
+    }).encode("utf-8")
+    
+    kind, info, files = parse_submission("application/json", body)
+    
+    assert (kind, info) == ("ict", INFO)
+    assert [(f.name, f.read()) for f in files] == [("bom.csv", b"csv")]
+
+
+def test_parse_multipart_submission():
+    body = multipart(
+        ("submission", None, json.dumps({"type": "ICT", "info": INFO}).encode("utf-8")),
+        ("files", "drawing.pdf", b"%PDF"),
+        ("files", "empty.txt", b""),
+    )
+    
+    kind, info, files = parse_submission(MULTIPART_TYPE, body)
+    
+    assert (kind, info) == ("ICT", INFO)
+    assert [(f.name, f.read()) for f in files] == [("drawing.pdf", b"%PDF"), ("empty.txt", b"")]
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("application/json", b"[1, 2]"),
+    ("application/json", b'{"type": "ICT"}'),
+    ("application/json", b'{"type": "", "info": {}}'),
+    (MULTIPART_TYPE, multipart(("files", "a.pdf", b"a"))),
+    (MULTIPART_TYPE, multipart(("submission", None, b'"ICT"'))),
+])
+def test_malformed_submissions_raise_value_error(content_type, body):
+    with pytest.raises(ValueError):
+        parse_submission(content_type, body)
+
+
+def test_api_runs_a_submission(server, fake_graph, fake_salesforce):
+    before = fake_salesforce.count("Opportunity")
+    
+    status, result = post_json(server, {"type": "ICT", "info": INFO})
+    
+    assert status == 201
+    assert result["success"] and result["id"] and result["correlation_id"]
+    assert fake_graph.drive.lookup(result["project_path"]) is not None
+    assert fake_salesforce.count("Opportunity") == before + 1
+
+
+def test_api_rejects_invalid_form_data(server):
+    status, result = post_json(server, {"type": "ICT", "info": dict(INFO, contact_email="ana@gmail.com")})
+    assert (status, result["error_kind"]) == (422, "validation")
+
+
+@pytest.mark.parametrize("body, headers", [
+    (b"{}", {"Content-Length": "abc"}),
+    (b"{}", {"Content-Length": "-5"}),
+    (b"[]", {"Content-Type": "application/json"}),
+    (b"not json", {"Content-Type": "application/json"}),
+])
+def test_api_rejects_malformed_requests(server, body, headers):
+    status, result = request(server, "POST", "/submissions", body, headers)
+    assert status == 400
+    assert result["error"]
+
+
+def test_api_limits_the_body_size(server):
+    server.RequestHandlerClass.max_bytes = 10
+    status, _ = post_json(server, {"type": "ICT", "info": INFO})
+    assert status == 413
+
+
+def test_api_checks_the_bearer_token(server):
+    server.RequestHandlerClass.token = "secret"
+    
+    assert post_json(server, {"type": "ICT", "info": INFO})[0] == 401
+    assert request(server, "GET", "/submissions/job", headers={"Authorization": "Bearer wrong"})[0] == 401
+    assert request(server, "GET", "/submissions/job", headers={"Authorization": "Bearer secret"})[0] == 404
+
+
+def test_api_queues_submissions(server, queue):
+    queue.beat("pool")
+    status, queued = post_json(server, {"type": "ICT", "info": INFO}, "/submissions?queue=1")
+    assert status == 202
+    
+    status, job = request(server, "GET", queued["status_url"])
+    assert status == 200
+    assert (job["job_id"], job["status"]) == (queued["job_id"], QUEUED)
+
+
+def test_api_does_not_queue_without_a_worker_pool(server, queue):
+    status, result = post_json(server, {"type": "ICT", "info": INFO}, "/submissions?queue=1")
+    assert (status, result) == (503, {"error": "no submission workers running"})
+    assert queue.depth() == 0
+    
+    # Invalid form data is still reported as such
+    status, _ = post_json(server, {"type": "ICT", "info": dict(INFO, contact_email="")}, "/submissions?queue=1")
+    assert status == 422
+
+
+def test_api_readiness_and_unknown_paths(server):
+    assert request(server, "GET", "/ready") == (200, {"ready": True, "details": "ready"})
+    assert request(server, "GET", "/other")[0] == 404
+    assert post_json(server, {}, "/other")[0] == 404
+
+
+def submit_args(info_path, files=()):
+    return argparse.Namespace(info=str(info_path), type="ICT", files=[str(path) for path in files], queue=True)
+
+
+def test_submit_command_needs_a_json_object(tmp_path, capsys):
+    info_path = tmp_path / "info.json"
+    info_path.write_text("[]", encoding="utf-8")
+    assert _submit_command(submit_args(info_path)) == 2
+    assert "must hold a JSON object" in capsys.readouterr().err
+    
+    assert _submit_command(submit_args(tmp_path / "missing.json")) == 2
+    info_path.write_text("{not json", encoding="utf-8")
+    assert _submit_command(submit_args(info_path)) == 2
+
+
+def test_submit_command_reports_invalid_form_data(tmp_path, capsys):
+    info_path = tmp_path / "info.json"
+    info_path.write_text(json.dumps(dict(INFO, contact_email="")), encoding="utf-8")
+    
+    assert _submit_command(submit_args(info_path)) == 1
+    assert "email" in capsys.readouterr().err
+
+
+def test_submit_command_reports_unreadable_files(tmp_path, capsys, monkeypatch):
+    info_path = tmp_path / "info.json"
+    info_path.write_text(json.dumps(INFO), encoding="utf-8")
+    drawing = tmp_path / "drawing.pdf"
+    drawing.write_bytes(b"%PDF")
+    opened = []
+    
+    def spooled_upload(path, name):
+        opened.append(SpooledUpload(path, name))
+        return opened[-1]
+    
+    monkeypatch.setattr(headless, "SpooledUpload", spooled_upload)
+    
+    assert _submit_command(submit_args(info_path, [drawing, tmp_path / "missing.pdf"])) == 2
+    assert f"cannot read {tmp_path / 'missing.pdf'}" in capsys.readouterr().err
+    assert [stream.closed for stream in opened] == [True]
+
+
+def test_submit_command_queues_only_for_a_running_pool(tmp_path, capsys, queue):
+    info_path = tmp_path / "info.json"
+    info_path.write_text(json.dumps(INFO), encoding="utf-8")
+    
+    assert _submit_command(submit_args(info_path)) == 1
+    assert "no submission workers running" in capsys.readouterr().err
+    
+    queue.beat("pool")
+    assert _submit_command(submit_args(info_path)) == 0
+    job_id = json.loads(capsys.readouterr().out)["job_id"]
+    assert queue.get(job_id).status == QUEUED
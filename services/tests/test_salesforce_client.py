@@ -0,0 +1,82 @@
+"""Tests for the lazily created client of services.salesforce_service."""
+
+import threading
+import time
+
+import pytest
+
+from core.exceptions import SalesforceError
+from services.salesforce_service import SF_LOGIN_WAITS, SalesforceService
+
+
+class SlowLogin:
+    """Stand-in for SalesforceService._connect that blocks until released."""
+    
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.release = threading.Event()
+    
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def access_concurrently(service, count):
+    """Read ``service.client`` from several threads; returns each result or error."""
+    results = []
+    
+    def access():
+        try:
+            results.append(service.client)
+        except SalesforceError as e:
+            results.append(e)
+    
+    threads = [threading.Thread(target=access) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+@pytest.fixture
+def service(settings):
+    return SalesforceService()
+
+
+def test_concurrent_callers_share_one_login(service, monkeypatch):
+    client = object()
+    login = SlowLogin(client)
+    monkeypatch.setattr(service, "_connect", login)
+    waits = SF_LOGIN_WAITS._default().value
+    
+    threads, results = access_concurrently(service, 8)
+    time.sleep(0.1)
+    login.release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert login.calls == 1
+    assert results == [client] * 8
+    assert SF_LOGIN_WAITS._default().value == waits + 7
+    assert service.client is client
+
+
+def test_a_failed_login_fails_its_waiters_and_is_retried(service, monkeypatch):
+    client = object()
+    login = SlowLogin(SalesforceError("invalid_grant"), client)
+    monkeypatch.setattr(service, "_connect", login)
+    
+    threads, results = access_concurrently(service, 4)
+    time.sleep(0.1)
+    login.release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert login.calls == 1
+    assert len(results) == 4 and all(isinstance(result, SalesforceError) for result in results)
+    assert service.client is client
+    assert login.calls == 2
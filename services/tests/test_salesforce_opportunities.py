@@ -0,0 +1,102 @@
+"""Tests for opportunity creation in services.salesforce_service."""
+
+import time
+
+import pytest
+import requests
+
+
+def opportunity(index, **overrides):
+    fields = dict(
+        name=f"ICT - ACME - Line {index}",
+        stage_name="Prospecting",
+        close_date="2025-12-31",
+        assessment_date="2025-06-30",
+        path=f"01_2025/1_ICT/MX/ACME/Line {index}",
+        bu="ICT",
+    )
+    fields.update(overrides)
+    return fields
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_create_opportunity_creates_one_record(salesforce_service, fake_salesforce):
+    result = salesforce_service.create_opportunity(**opportunity(1), account_id="001000000000001")
+    
+    assert result["success"]
+    [record] = fake_salesforce.records["Opportunity"]
+    assert (record["Id"], record["AccountId"], record["BU__c"]) == (result["id"], "001000000000001", "ICT")
+
+
+def test_records_are_sent_200_per_request(salesforce_service, fake_salesforce):
+    before = fake_salesforce.total_requests
+    
+    results = salesforce_service.create_opportunities([opportunity(index) for index in range(450)])
+    
+    assert fake_salesforce.total_requests - before == 3
+    assert all(result["success"] for result in results)
+    stored = {record["Id"]: record["Name"] for record in fake_salesforce.records["Opportunity"]}
+    assert [stored[result["id"]] for result in results] == [f"ICT - ACME - Line {index}" for index in range(450)]
+
+
+def test_failures_are_reported_per_record(salesforce_service, fake_salesforce):
+    records = [opportunity(0), {"name": "missing fields"}, opportunity(2, name=""), opportunity(3)]
+    
+    results = salesforce_service.create_opportunities(records)
+    
+    assert [result["success"] for result in results] == [True, False, False, True]
+    assert results[1]["errors"][0]["statusCode"] == "INVALID_INPUT"
+    assert results[2]["errors"][0]["statusCode"] == "REQUIRED_FIELD_MISSING"
+    assert fake_salesforce.count("Opportunity") == 2
+
+
+def test_all_or_none_rolls_back_the_request(salesforce_service, fake_salesforce):
+    results = salesforce_service.create_opportunities([opportunity(0), opportunity(1, name="")], all_or_none=True)
+    
+    assert [result["errors"][0]["statusCode"] for result in results] == [
+        "ALL_OR_NONE_OPERATION_ROLLED_BACK", "REQUIRED_FIELD_MISSING"
+    ]
+    assert fake_salesforce.count("Opportunity") == 0
+
+
+def test_a_failed_request_only_fails_its_own_records(salesforce_service, fake_salesforce, monkeypatch, no_backoff):
+    client = salesforce_service.client
+    real_restful = client.restful
+    
+    def restful(path, method="GET", **kwargs):
+        if kwargs["json"]["records"][0]["Name"] == "ICT - ACME - Line 0":
+            raise requests.exceptions.ConnectionError("connection reset")
+        return real_restful(path, method=method, **kwargs)
+    
+    monkeypatch.setattr(client, "restful", restful)
+    
+    results = salesforce_service.create_opportunities([opportunity(index) for index in range(250)])
+    
+    assert len(no_backoff) == 3  # Retried like create_opportunity()
+    assert {result["errors"][0]["statusCode"] for result in results[:200]} == {"REQUEST_FAILED"}
+    assert all(result["success"] for result in results[200:])
+    assert fake_salesforce.count("Opportunity") == 50
+
+
+def test_timeouts_are_retried(salesforce_service, fake_salesforce, monkeypatch, no_backoff):
+    client = salesforce_service.client
+    real_restful = client.restful
+    failures = [requests.exceptions.ReadTimeout("read timed out")]
+    
+    def restful(path, method="GET", **kwargs):
+        if failures:
+            raise failures.pop()
+        return real_restful(path, method=method, **kwargs)
+    
+    monkeypatch.setattr(client, "restful", restful)
+    
+    results = salesforce_service.create_opportunities([opportunity(0), opportunity(1)])
+    
+    assert [result["success"] for result in results] == [True, True]
+    assert len(no_backoff) == 1
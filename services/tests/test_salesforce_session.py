@@ -0,0 +1,78 @@
+"""Tests for services.salesforce_session."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from benchmarks.fake_salesforce import FakeSalesforceServer
+from benchmarks.fake_server import FaultConfig
+from core.instrumentation import span
+from services.salesforce_session import (
+    SF_HTTP_CONNECTIONS,
+    SF_HTTP_POOL_SIZE,
+    SF_HTTP_REQUESTS,
+    create_salesforce_session,
+    session_settings,
+)
+
+
+def query_url(salesforce):
+    return f"{salesforce.url}/services/data/v59.0/query/?q=SELECT+Id+FROM+Account"
+
+
+def counts():
+    return SF_HTTP_REQUESTS._default().value, SF_HTTP_CONNECTIONS._default().value
+
+
+def test_session_settings_read_and_clamp_the_environment(monkeypatch):
+    assert session_settings(30) == (20, (5.0, 30.0), 2)
+    
+    monkeypatch.setenv("SALESFORCE_POOL_SIZE", "0")
+    monkeypatch.setenv("SALESFORCE_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("SALESFORCE_CONNECT_RETRIES", "-1")
+    assert session_settings(10) == (1, (1.5, 10.0), 0)
+
+
+def test_requests_reuse_kept_alive_connections(fake_salesforce):
+    session = create_salesforce_session(SimpleNamespace(timeout=30), pool_size=4)
+    requests_before, connections_before = counts()
+    
+    with span("salesforce") as calls:
+        for _ in range(5):
+            assert session.get(query_url(fake_salesforce)).status_code == 200
+    
+    assert counts() == (requests_before + 5, connections_before + 1)
+    assert calls.http_calls == 5
+    assert SF_HTTP_POOL_SIZE._default().value == 4
+    assert session.headers["Connection"] == "keep-alive"
+
+
+def test_concurrent_requests_wait_for_a_pooled_connection():
+    with FakeSalesforceServer(FaultConfig(latency_ms=50), account_count=1) as salesforce:
+        session = create_salesforce_session(SimpleNamespace(timeout=30), pool_size=2)
+        _, connections_before = counts()
+        statuses = []
+        
+        def call():
+            statuses.append(session.get(query_url(salesforce)).status_code)
+        
+        workers = [threading.Thread(target=call) for _ in range(6)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    
+    assert statuses == [200] * 6
+    assert counts()[1] - connections_before == 2
+
+
+def test_the_read_timeout_applies_to_every_request():
+    with FakeSalesforceServer(FaultConfig(latency_ms=500), account_count=1) as salesforce:
+        session = create_salesforce_session(SimpleNamespace(timeout=0.1))
+        # Surfaces as an error retry_on_timeout retries; the transport never resends it
+        with pytest.raises((requests.exceptions.Timeout, requests.exceptions.ConnectionError), match="Read timed out"):
+            session.get(query_url(salesforce))
+        assert salesforce.total_requests == 1
+        assert session.get(query_url(salesforce), timeout=5).status_code == 200
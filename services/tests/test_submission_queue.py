@@ -0,0 +1,223 @@
+"""Tests for services.submission_queue and the job runner of services.submission_worker."""
+
+import io
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from core.exceptions import StorageError
+from services import submission_queue
+from services.submission_queue import DONE, FAILED, QUEUED, RUNNING, SubmissionQueue
+from services.submission_service import Submission, converter_reference
+from services.submission_worker import process_job
+
+
+class UploadedFile(io.BytesIO):
+    """Stand-in for a Streamlit UploadedFile."""
+    
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+class BrokenFile(UploadedFile):
+    """Upload whose connection drops while it is spooled."""
+    
+    def read(self, size=-1):
+        raise OSError("connection reset")
+
+
+class StubSubmissionService:
+    """SubmissionService that records its input and returns or raises a preset outcome."""
+    
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.files = None
+    
+    def run(self, submission, files, html_converter, folder_progress=None, upload_progress=None):
+        self.files = [(f.name, f.read()) for f in files]
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+CONVERTER = converter_reference(json.dumps)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SubmissionQueue(tmp_path / "queue.db", lease=60, worker_timeout=10)
+
+
+def submission(project="Line 7"):
+    return Submission(
+        assessment_type="ICT",
+        projects_folder="01_2025",
+        info={"project_name": project},
+        customer_data={"customer_name": "ACME"}
+    )
+
+
+def enqueue(queue, project="Line 7", files=()):
+    return queue.enqueue(submission(project), list(files), CONVERTER)
+
+
+def test_enqueue_spools_files_and_round_trips_the_submission(queue):
+    job_id = enqueue(queue, files=[UploadedFile("spec.zip", b"zip"), UploadedFile("bom.csv", b"csv")])
+    
+    job = queue.get(job_id)
+    assert (job.status, job.converter, job.files) == (QUEUED, CONVERTER, ["spec.zip", "bom.csv"])
+    assert job.submission == submission()
+    assert queue.depth() == 1
+    files = queue.open_files(job)
+    try:
+        assert [(f.name, f.read()) for f in files] == [("spec.zip", b"zip"), ("bom.csv", b"csv")]
+    finally:
+        for f in files:
+            f.close()
+    assert queue.get("unknown") is None
+
+
+def test_failed_enqueue_leaves_no_job_or_spool(queue):
+    with pytest.raises(OSError):
+        enqueue(queue, files=[UploadedFile("spec.zip", b"zip"), BrokenFile("bom.csv", b"")])
+    assert queue.depth() == 0
+    assert list(queue.spool_dir.iterdir()) == []
+
+
+def test_claims_are_oldest_first(queue, clock):
+    first = enqueue(queue, "Line 1")
+    clock[0] += 1
+    second = enqueue(queue, "Line 2")
+    
+    job = queue.claim("worker-a")
+    assert (job.id, job.status, job.worker) == (first, RUNNING, "worker-a")
+    assert queue.claim("worker-b").id == second
+    assert queue.claim("worker-c") is None
+
+
+def test_each_job_is_claimed_once_across_workers(queue):
+    job_ids = {enqueue(queue, f"Line {index}") for index in range(20)}
+    claimed = []
+    
+    def work(name):
+        while True:
+            job = queue.claim(name)
+            if job is None:
+                return
+            claimed.append(job.id)
+    
+    workers = [threading.Thread(target=work, args=(f"worker-{index}",)) for index in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    assert sorted(claimed) == sorted(job_ids)
+
+
+def test_complete_and_fail_record_the_outcome_and_drop_the_spool(queue):
+    done_id = enqueue(queue, files=[UploadedFile("spec.zip", b"zip")])
+    failed_id = enqueue(queue, "Line 8")
+    queue.claim("worker")
+    queue.claim("worker")
+    
+    queue.complete(done_id, {"project_path": "01_2025/1_ICT/ACME/Line 7"})
+    queue.fail(failed_id, "Salesforce is down", "salesforce")
+    
+    done, failed = queue.get(done_id), queue.get(failed_id)
+    assert (done.status, done.result, done.finished) == (DONE, {"project_path": "01_2025/1_ICT/ACME/Line 7"}, True)
+    assert (failed.status, failed.error, failed.error_kind) == (FAILED, "Salesforce is down", "salesforce")
+    assert not (queue.spool_dir / done_id).exists()
+
+
+def test_running_jobs_without_heartbeat_are_failed(queue, clock):
+    lost_id, alive_id = enqueue(queue, "Line 1"), enqueue(queue, "Line 2")
+    queue.claim("worker")
+    queue.claim("worker")
+    
+    clock[0] += 45
+    queue.update_stage(alive_id, "Uploading files")
+    clock[0] += 30
+    
+    assert queue.fail_lost_jobs() == 1
+    assert (queue.get(lost_id).status, queue.get(lost_id).error_kind) == (FAILED, "unexpected")
+    assert (queue.get(alive_id).status, queue.get(alive_id).stage) == (RUNNING, "Uploading files")
+
+
+def test_withdraw_only_takes_back_unclaimed_jobs(queue):
+    queued_id = enqueue(queue, "Line 1", files=[UploadedFile("spec.zip", b"zip")])
+    
+    assert queue.withdraw(queued_id, "No submission worker is running")
+    assert queue.get(queued_id).status == FAILED
+    assert not (queue.spool_dir / queued_id).exists()
+    
+    claimed_id = enqueue(queue, "Line 2")
+    queue.claim("worker")
+    assert not queue.withdraw(claimed_id, "No submission worker is running")
+    assert queue.get(claimed_id).status == RUNNING
+
+
+def test_workers_alive_follows_supervisor_heartbeats(queue, clock):
+    assert not queue.workers_alive()
+    queue.beat("host:1")
+    assert queue.workers_alive()
+    clock[0] += 11
+    assert not queue.workers_alive()
+
+
+def test_purge_deletes_old_jobs_stale_workers_and_orphan_spools(queue, clock):
+    old_id, recent_id, running_id = enqueue(queue, "Line 1"), enqueue(queue, "Line 2"), enqueue(queue, "Line 3")
+    queue.beat("gone:1")
+    queue.fail(old_id, "boom")
+    clock[0] += 3600
+    queue.complete(recent_id, {})
+    queue.claim("worker")
+    
+    orphan, fresh_orphan = queue.spool_dir / "crashed", queue.spool_dir / "enqueueing"
+    orphan.mkdir()
+    fresh_orphan.mkdir()
+    stale = time.time() - submission_queue.ORPHAN_SPOOL_AGE - 60
+    os.utime(orphan, (stale, stale))
+    running_spool = queue.spool_dir / running_id
+    os.utime(running_spool, (stale, stale))
+    os.utime(fresh_orphan, (clock[0], clock[0]))
+    clock[0] += 60
+    
+    assert queue.purge(older_than=1800) == 1
+    assert queue.get(old_id) is None
+    assert queue.get(recent_id).status == DONE
+    assert queue.get(running_id).status == RUNNING
+    with queue._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM workers").fetchone()[0] == 0
+    assert not orphan.exists()
+    assert fresh_orphan.exists() and running_spool.exists()
+
+
+def test_process_job_completes_with_the_service_result(queue):
+    job_id = enqueue(queue, files=[UploadedFile("spec.zip", b"zip")])
+    service = StubSubmissionService({"project_path": "ACME/Line 7"})
+    
+    process_job(queue, service, queue.claim("worker"))
+    
+    assert service.files == [("spec.zip", b"zip")]
+    assert (queue.get(job_id).status, queue.get(job_id).result) == (DONE, {"project_path": "ACME/Line 7"})
+
+
+def test_process_job_records_the_failing_step(queue):
+    job_id = enqueue(queue)
+    
+    process_job(queue, StubSubmissionService(StorageError("SharePoint is read-only")), queue.claim("worker"))
+    
+    job = queue.get(job_id)
+    assert (job.status, job.error, job.error_kind) == (FAILED, "SharePoint is read-only", "storage")
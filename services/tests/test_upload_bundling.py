@@ -0,0 +1,51 @@
+"""Tests for bundling of small uploads in services.storage_service."""
+
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from services.storage_service import StorageService
+from storage.local_storage import LocalStorageProvider
+
+
+class UploadedFile(io.BytesIO):
+    """Stand-in for a Streamlit UploadedFile."""
+    
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+@pytest.fixture
+def service(settings, tmp_path, monkeypatch):
+    monkeypatch.setenv("UPLOAD_BUNDLE", "true")
+    monkeypatch.setenv("UPLOAD_BUNDLE_MAX_FILE_BYTES", "1000")
+    monkeypatch.setenv("UPLOAD_BUNDLE_MIN_FILES", "3")
+    monkeypatch.setenv("UPLOAD_DEDUP", "false")
+    return StorageService(storage_provider=LocalStorageProvider(tmp_path / "files"))
+
+
+def test_small_files_are_uploaded_as_one_bundle(service, tmp_path):
+    files = [UploadedFile(f"layer_{index}.gbr", b"G04 layer" * index) for index in range(1, 5)]
+    files.append(UploadedFile("panel.step", b"x" * 5000))
+    
+    paths = service.upload_assessment_files(str(tmp_path / "files" / "Line 1"), "FCT", files)
+    
+    assert len(paths) == 3
+    large, archive, manifest = paths
+    assert Path(large).name == "panel.step"
+    assert Path(archive).name.startswith("Customer_Files_") and archive.endswith(".zip")
+    assert manifest == archive[:-len(".zip")] + ".manifest.json"
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == [f"layer_{index}.gbr" for index in range(1, 5)]
+    with open(manifest, encoding="utf-8") as f:
+        assert json.load(f)["file_count"] == 4
+
+
+def test_too_few_small_files_are_uploaded_as_they_are(service, tmp_path):
+    files = [UploadedFile("a.txt", b"a"), UploadedFile("b.txt", b"b")]
+    paths = service.upload_assessment_files(str(tmp_path / "files" / "Line 1"), "FCT", files)
+    assert [Path(path).name for path in paths] == ["a.txt", "b.txt"]
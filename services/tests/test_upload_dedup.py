@@ -0,0 +1,107 @@
+"""Tests for content dedup of uploads in services.storage_service."""
+
+import hashlib
+import io
+
+import pytest
+
+from benchmarks.run_offline import build_storage_service
+from services.storage_service import StorageService
+from storage.local_storage import LocalStorageProvider
+
+
+class UploadedFile(io.BytesIO):
+    """Stand-in for a Streamlit UploadedFile."""
+    
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+SPEC = b"gerber layers " * 100
+
+
+@pytest.fixture(autouse=True)
+def blob_settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("BLOB_INDEX_DB_PATH", str(tmp_path / "blobs.db"))
+    monkeypatch.setenv("UPLOAD_DEDUP_MIN_BYTES", "1000")
+    monkeypatch.setenv("UPLOAD_BUNDLE", "false")
+
+
+@pytest.fixture
+def service(settings, fake_graph):
+    return build_storage_service(fake_graph)
+
+
+def project(service, fake_graph, name):
+    path = service.provider.get_full_path("1_ICT", "MX", "ACME", name)
+    fake_graph.drive.mkdirs(f"{path}/1_Customer_Info/7_ALL_Info_Shared")
+    return path
+
+
+def upload_calls(graph_calls):
+    return [url for method, url in graph_calls if method == "PUT"]
+
+
+def test_repeated_content_is_copied_server_side(service, fake_graph, graph_calls):
+    first, second = project(service, fake_graph, "Line 1"), project(service, fake_graph, "Line 2")
+    service.upload_assessment_files(first, "ICT", [UploadedFile("spec.zip", SPEC)])
+    graph_calls.clear()
+    
+    [path] = service.upload_assessment_files(second, "ICT", [UploadedFile("spec-copy.zip", SPEC)])
+    
+    assert upload_calls(graph_calls) == []
+    assert any(url.endswith("/copy") for _, url in graph_calls)
+    assert fake_graph.drive.lookup(path).size == len(SPEC)
+    stats = service.blob_index.stats()
+    assert (stats["files_copied"], stats["bytes_saved"]) == (1, len(SPEC))
+
+
+def test_digest_is_taken_while_uploading(service, fake_graph):
+    first = project(service, fake_graph, "Line 1")
+    namespace = service._blob_namespace()
+    
+    [path] = service.upload_assessment_files(first, "ICT", [UploadedFile("spec.zip", SPEC)])
+    
+    assert service.blob_index.lookup(namespace, hashlib.sha256(SPEC).hexdigest()) == [path]
+
+
+def test_small_and_new_sizes_are_uploaded(service, fake_graph, graph_calls):
+    first, second = project(service, fake_graph, "Line 1"), project(service, fake_graph, "Line 2")
+    files = [UploadedFile("notes.txt", b"tiny"), UploadedFile("spec.zip", SPEC)]
+    service.upload_assessment_files(first, "ICT", files)
+    graph_calls.clear()
+    
+    service.upload_assessment_files(second, "ICT", [
+        UploadedFile("notes.txt", b"tiny"), UploadedFile("other.zip", SPEC + b"!")
+    ])
+    
+    assert len(upload_calls(graph_calls)) == 2
+    assert not any(url.endswith("/copy") for _, url in graph_calls)
+
+
+def test_stale_sources_are_forgotten_and_uploaded(service, fake_graph):
+    first, second = project(service, fake_graph, "Line 1"), project(service, fake_graph, "Line 2")
+    [stored] = service.upload_assessment_files(first, "ICT", [UploadedFile("spec.zip", SPEC)])
+    item = fake_graph.drive.lookup(stored)
+    del fake_graph.drive.items[item.parent_id].children[item.name.casefold()]
+    del fake_graph.drive.items[item.id]
+    
+    [path] = service.upload_assessment_files(second, "ICT", [UploadedFile("spec.zip", SPEC)])
+    
+    namespace = service._blob_namespace()
+    assert service.blob_index.lookup(namespace, hashlib.sha256(SPEC).hexdigest()) == [path]
+    assert fake_graph.drive.lookup(path).size == len(SPEC)
+    assert service.blob_index.stats()["files_copied"] == 0
+
+
+def test_local_storage_hardlinks_duplicates(settings, tmp_path):
+    service = StorageService(storage_provider=LocalStorageProvider(tmp_path / "files"))
+    first, second = str(tmp_path / "files" / "Line 1"), str(tmp_path / "files" / "Line 2")
+    
+    [original] = service.upload_assessment_files(first, "FCT", [UploadedFile("spec.zip", SPEC)])
+    [copy] = service.upload_assessment_files(second, "FCT", [UploadedFile("spec.zip", SPEC)])
+    
+    assert (tmp_path / "files" / "Line 2" / "1_Customer_Info" / "3_ALL_Info_Shared" / "spec.zip").read_bytes() == SPEC
+    assert service.blob_index.stats()["files_copied"] == 1
+    assert original != copy
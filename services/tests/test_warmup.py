@@ -0,0 +1,86 @@
+"""Tests for services.warmup."""
+
+import threading
+
+import pytest
+
+from core import metrics
+from services import warmup
+from services.warmup import APP_READY, DONE, FAILED, SKIPPED, WarmupStatus, start_warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_warmup(monkeypatch):
+    """No warm-up started yet in this process, and no readiness check left behind."""
+    monkeypatch.setattr(warmup, "_status", None)
+    monkeypatch.setattr(metrics, "_readiness_check", None)
+
+
+def not_applicable():
+    raise warmup._NotApplicable("local storage")
+
+
+def failing():
+    raise RuntimeError("login refused")
+
+
+def states(status):
+    return {name: step.state for name, step in status.steps.items()}
+
+
+def test_a_failed_step_skips_the_rest_of_its_chain():
+    ran = []
+    status = WarmupStatus(["login", "catalog", "token", "index"])
+    
+    warmup._run_chain(status, [("login", failing), ("catalog", lambda: ran.append("catalog"))])
+    warmup._run_chain(status, [("token", not_applicable), ("index", lambda: ran.append("index"))])
+    
+    assert ran == ["index"]
+    assert states(status) == {"login": FAILED, "catalog": SKIPPED, "token": SKIPPED, "index": DONE}
+    assert status.steps["catalog"].error == "login failed"
+    assert status.failed_steps == ["login"]
+    assert "login: failed" in status.describe() and "login refused" in status.describe()
+
+
+def test_status_reports_readiness_once_finished():
+    status = WarmupStatus(["login"])
+    assert status.readiness()[0] is False
+    assert not status.wait(timeout=0.01)
+    assert status.describe().splitlines() == ["warming up", "login: pending"]
+    
+    status.finish()
+    ready, summary = status.readiness()
+    assert ready and summary.startswith("ready (warm-up took")
+
+
+def test_disabled_warmup_is_ready_at_once():
+    status = start_warmup()  # STARTUP_WARMUP=false in the test session
+    
+    assert status.ready
+    assert set(states(status).values()) == {SKIPPED}
+    assert APP_READY._default().value == 1
+    assert metrics._readiness_check == status.readiness
+
+
+def test_chains_run_in_parallel_once_per_process(monkeypatch):
+    monkeypatch.setenv("STARTUP_WARMUP", "true")
+    release = threading.Event()
+    started = []
+    
+    def login():
+        started.append("login")
+        release.wait(5)
+    
+    monkeypatch.setattr(warmup, "_salesforce_chain", lambda: [("salesforce_login", login)])
+    monkeypatch.setattr(warmup, "_storage_chain", lambda: [("storage_service", lambda: started.append("storage"))])
+    
+    status = start_warmup()
+    assert start_warmup() is status
+    assert not status.wait(timeout=0.2)
+    assert "storage" in started
+    assert APP_READY._default().value == 0
+    
+    release.set()
+    assert status.wait(timeout=5)
+    assert states(status) == {"salesforce_login": DONE, "storage_service": DONE}
+    assert APP_READY._default().value == 1
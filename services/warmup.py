@@ -0,0 +1,275 @@
+"""
+Startup Warm-up Module
+
+This module prepares the expensive shared resources of a process right
+after it starts, so the first submission after a deploy or restart runs as
+fast as any later one instead of paying for them inline:
+
+- ``salesforce_login``: OAuth login and the pooled Salesforce session
+- ``account_catalog``: the cached Salesforce account list
+- ``storage_service``: the storage provider, template manifests and indexes
+- ``graph_token``: the MSAL token for Microsoft Graph (SharePoint only)
+- ``project_index``: the first sync of the project folder index (SharePoint only)
+
+The Salesforce and storage steps run in two background threads; steps of
+one chain run in order and a failed step skips the rest of its chain (the
+first request that needs the resource retries it inline, as before).
+Readiness is exported as the ``app_ready`` gauge and on the metrics
+server's ``/ready`` endpoint, which answers 503 until the warm-up finished.
+
+Usage:
+    status = start_warmup()   # once per process, safe on every rerun
+    status.wait(timeout=30)
+    print(status.describe())
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.logging_config import get_logger
+from core.metrics import REGISTRY, set_readiness_check
+from services.salesforce_service import get_salesforce_service, get_unique_account_dict
+from services.storage_service import get_storage_service
+
+logger = get_logger(__name__)
+
+APP_READY = REGISTRY.gauge(
+    "app_ready",
+    "1 once the startup warm-up has finished, 0 while it runs"
+)
+WARMUP_STEP_DURATION = REGISTRY.gauge(
+    "warmup_step_duration_seconds",
+    "Duration of the last run of each startup warm-up step",
+    ["step", "result"]
+)
+
+# Step states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class WarmupStep:
+    """State of one warm-up step."""
+    name: str
+    state: str = PENDING
+    duration: float = 0.0
+    error: Optional[str] = None
+    
+    def describe(self) -> str:
+        """One-line state, e.g. "salesforce_login: done (1.2s)"."""
+        if self.state in (DONE, FAILED):
+            line = f"{self.name}: {self.state} ({self.duration:.1f}s)"
+        else:
+            line = f"{self.name}: {self.state}"
+        return f"{line} - {self.error}" if self.error else line
+
+
+class WarmupStatus:
+    """Thread-safe progress of the startup warm-up."""
+    
+    def __init__(self, step_names: List[str]):
+        """
+        Initialize the status.
+        
+        Args:
+            step_names: Names of all steps, in display order.
+        """
+        self.steps: Dict[str, WarmupStep] = {name: WarmupStep(name) for name in step_names}
+        self.started = time.perf_counter()
+        self.elapsed: Optional[float] = None
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+    
+    @property
+    def ready(self) -> bool:
+        """True once every step has finished (successfully or not)."""
+        return self._finished.is_set()
+    
+    @property
+    def failed_steps(self) -> List[str]:
+        """Names of the steps that failed."""
+        with self._lock:
+            return [step.name for step in self.steps.values() if step.state == FAILED]
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the warm-up to finish.
+        
+        Args:
+            timeout: Seconds to wait at most (None waits indefinitely).
+        
+        Returns:
+            True if the warm-up finished.
+        """
+        return self._finished.wait(timeout)
+    
+    def update(self, name: str, state: str, duration: float = 0.0, error: Optional[str] = None) -> None:
+        """Record the new state of a step."""
+        with self._lock:
+            step = self.steps[name]
+            step.state = state
+            step.duration = duration
+            step.error = error
+    
+    def finish(self) -> None:
+        """Mark the warm-up as finished."""
+        self.elapsed = time.perf_counter() - self.started
+        self._finished.set()
+    
+    def describe(self) -> str:
+        """Multi-line summary: overall state, then one line per step."""
+        with self._lock:
+            lines = [step.describe() for step in self.steps.values()]
+        if self.ready:
+            header = f"ready (warm-up took {self.elapsed:.1f}s)"
+        else:
+            header = "warming up"
+        return "\n".join([header] + lines)
+    
+    def readiness(self) -> Tuple[bool, str]:
+        """(ready, summary) for the metrics server's /ready endpoint."""
+        return self.ready, self.describe()
+
+
+def warmup_enabled() -> bool:
+    """Whether the startup warm-up runs (STARTUP_WARMUP, default true)."""
+    return os.getenv("STARTUP_WARMUP", "true").lower() in ("1", "true", "yes")
+
+
+class _NotApplicable(Exception):
+    """Raised by a step that does not apply to this configuration."""
+
+
+def _salesforce_chain() -> List[Tuple[str, Callable[[], None]]]:
+    """Steps preparing Salesforce: login, then the account catalog."""
+    return [
+        ("salesforce_login", lambda: get_salesforce_service().client),
+        ("account_catalog", get_unique_account_dict),
+    ]
+
+
+def _storage_chain() -> List[Tuple[str, Callable[[], None]]]:
+    """Steps preparing storage: service and manifests, then the Graph token and project index."""
+    def graph_token() -> None:
+        provider = get_storage_service().provider
+        if not hasattr(provider, "_get_access_token"):
+            raise _NotApplicable("local storage")
+        provider._get_access_token()
+    
+    def project_index() -> None:
+        index = get_storage_service().project_index
+        if index is None:
+            raise _NotApplicable("no project index")
+        # Starts the first full sync in the background, or catches up incrementally
+        index.ensure_fresh()
+    
+    return [
+        ("storage_service", get_storage_service),
+        ("graph_token", graph_token),
+        ("project_index", project_index),
+    ]
+
+
+def _run_chain(status: WarmupStatus, chain: List[Tuple[str, Callable[[], None]]]) -> None:
+    """Run the steps of a chain in order, skipping the rest after a failure."""
+    failed = None
+    for name, step in chain:
+        if failed is not None:
+            status.update(name, SKIPPED, error=f"{failed} failed")
+            continue
+        
+        status.update(name, RUNNING)
+        started = time.perf_counter()
+        try:
+            step()
+        except _NotApplicable as e:
+            status.update(name, SKIPPED, error=str(e))
+            continue
+        except Exception as e:
+            duration = time.perf_counter() - started
+            WARMUP_STEP_DURATION.labels(step=name, result="failure").set(duration)
+            status.update(name, FAILED, duration, str(e))
+            logger.warning("Warm-up step %s failed after %.1fs: %s", name, duration, e)
+            failed = name
+            continue
+        
+        duration = time.perf_counter() - started
+        WARMUP_STEP_DURATION.labels(step=name, result="success").set(duration)
+        status.update(name, DONE, duration)
+        logger.info("Warm-up step %s done in %.1fs", name, duration)
+
+
+def _run_warmup(status: WarmupStatus, chains: List[List[Tuple[str, Callable[[], None]]]]) -> None:
+    """Run the chains in parallel and publish readiness when all finished."""
+    threads = [
+        threading.Thread(target=_run_chain, args=(status, chain), name=f"warmup-{chain[0][0]}", daemon=True)
+        for chain in chains
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    status.finish()
+    APP_READY.set(1)
+    failed = status.failed_steps
+    if failed:
+        logger.warning("Warm-up finished in %.1fs, failed steps: %s", status.elapsed, ", ".join(failed))
+    else:
+        logger.info("Warm-up finished in %.1fs, ready", status.elapsed)
+
+
+_status: Optional[WarmupStatus] = None
+_status_lock = threading.Lock()
+
+
+def start_warmup() -> WarmupStatus:
+    """
+    Start the warm-up in the background (once per process).
+    
+    Safe to call on every Streamlit rerun and from worker processes. With
+    STARTUP_WARMUP=false nothing is prepared and the process reports ready
+    at once.
+    
+    Returns:
+        The process's WarmupStatus.
+    """
+    global _status
+    
+    if _status is not None:
+        return _status
+    
+    with _status_lock:
+        if _status is not None:
+            return _status
+        
+        chains = [_salesforce_chain(), _storage_chain()]
+        status = WarmupStatus([name for chain in chains for name, _ in chain])
+        set_readiness_check(status.readiness)
+        
+        if not warmup_enabled():
+            for name in status.steps:
+                status.update(name, SKIPPED, error="STARTUP_WARMUP=false")
+            status.finish()
+            APP_READY.set(1)
+        else:
+            APP_READY.set(0)
+            threading.Thread(
+                target=_run_warmup, args=(status, chains), name="warmup", daemon=True
+            ).start()
+            logger.info("Warm-up started: %s", ", ".join(status.steps))
+        
+        _status = status
+        return status
+
+
+def get_warmup_status() -> Optional[WarmupStatus]:
+    """The process's WarmupStatus, or None if the warm-up was never started."""
+    return _status
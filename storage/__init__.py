@@ -5,8 +5,11 @@ This package provides an abstraction layer for file storage operations.
 It allows easy switching between different storage backends (local, SharePoint, etc.).
 """
 
-from .base import StorageProvider
+from .base import ItemStat, StorageProvider, UploadItem
 from .local_storage import LocalStorageProvider
 from .sharepoint_storage import SharePointStorageProvider
 
-__all__ = ['StorageProvider', 'LocalStorageProvider', 'SharePointStorageProvider']
+__all__ = [
+    'StorageProvider', 'LocalStorageProvider', 'SharePointStorageProvider',
+    'UploadItem', 'ItemStat'
+]
@@ -0,0 +1,844 @@
+"""
+Async SharePoint Storage Provider Module
+
+This module implements the SharePoint storage operations on asyncio with a
+pooled aiohttp client, so that one process can keep hundreds of Graph
+requests in flight (backfills, template re-staging) without a thread per
+request.
+
+``AsyncSharePointStorageProvider`` offers ``*_async`` coroutines for
+``create_folder``, ``folder_exists``, ``upload_file(s)``, ``copy_template``
+and ``write_file``. Its regular methods are a sync facade for Streamlit:
+they run the coroutines on a background event loop owned by the provider
+and block until they finish. Everything else (token, item cache, project
+index requests) is shared with ``SharePointStorageProvider``.
+
+Requires aiohttp (pip install aiohttp). StorageService uses this provider
+when GRAPH_ASYNC_CLIENT=true.
+
+Settings (environment variables):
+    GRAPH_ASYNC_CLIENT        Use this provider for SharePoint (default false)
+    GRAPH_ASYNC_CONCURRENCY   Maximum Graph requests in flight (default 64)
+    GRAPH_ASYNC_TIMEOUT       Total timeout per request in seconds (default 120)
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, List, Mapping, Optional, TypeVar
+from urllib.parse import quote
+
+from .base import ItemStat, UploadItem
+from .sharepoint_storage import SharePointStorageProvider, GRAPH_BYTES, ITEM_SELECT, SIMPLE_UPLOAD_MAX_BYTES
+from .template_manifest import TemplateFile, get_template_manifest
+from .template_cache import get_template_blob_cache
+from .upload_stream import UploadStream, get_chunk_size, open_upload_stream
+from .graph_throttle import (
+    GRAPH_RETRIES, RETRYABLE_STATUS, backoff_delay, get_graph_throttle, get_max_retries, parse_retry_after
+)
+from core.exceptions import StorageError
+from core.logging_config import get_logger, SampledLogger
+from core.instrumentation import record_bytes
+from core.progress import report_progress
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+GRAPH_IN_FLIGHT = REGISTRY.gauge(
+    "graph_async_requests_in_flight",
+    "Graph requests currently awaiting a response on the async client"
+)
+
+DEFAULT_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 120.0
+
+T = TypeVar("T")
+
+
+def async_client_enabled() -> bool:
+    """Whether GRAPH_ASYNC_CLIENT asks for the async SharePoint provider."""
+    return os.getenv("GRAPH_ASYNC_CLIENT", "false").lower() in ("1", "true", "yes")
+
+
+class GraphResponse:
+    """
+    Fully read Graph response.
+    
+    Mirrors the parts of ``requests.Response`` the providers use
+    (``status_code``, ``headers``, ``content``, ``json()``), so response
+    handling reads the same for both clients.
+    """
+    
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+    
+    def json(self) -> Any:
+        return json.loads(self.content) if self.content else {}
+
+
+class AsyncGraphClient:
+    """
+    Pooled aiohttp client for Microsoft Graph.
+    
+    Requests share the process-wide GraphThrottle with the sync provider and
+    are retried on throttling and transient errors the same way.
+    """
+    
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initialize the client. The session is created on first use, inside the event loop.
+        
+        Args:
+            concurrency: Maximum open connections (requests in flight).
+            timeout: Total timeout per request in seconds.
+        """
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._session = None
+    
+    def _get_session(self):
+        import aiohttp
+        
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.concurrency,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def request(self, operation: str, method: str, url: str, **kwargs) -> GraphResponse:
+        """
+        Send one Graph request through the shared rate limiter, with retries.
+        
+        Args:
+            operation: Logical operation name for metrics.
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Passed to aiohttp (headers, params, json, data).
+        
+        Returns:
+            GraphResponse (the last one if retries ran out).
+        
+        Raises:
+            aiohttp.ClientError: If the connection keeps failing.
+        """
+        import aiohttp
+        
+        session = self._get_session()
+        throttle = get_graph_throttle()
+        max_retries = get_max_retries()
+        attempt = 0
+        
+        while True:
+            await throttle.acquire_async()
+            started = time.perf_counter()
+            try:
+                with GRAPH_IN_FLIGHT.track_inprogress():
+                    async with session.request(method, url, **kwargs) as raw:
+                        response = GraphResponse(raw.status, raw.headers, await raw.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                GRAPH_RETRIES.labels(reason="connection").inc()
+                logger.warning("Graph %s failed (%r), retry %s in %.1fs", operation, e, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+            
+            SharePointStorageProvider._record_graph_call(operation, response, started)
+            if response.status_code not in RETRYABLE_STATUS:
+                throttle.on_success(response.headers)
+                return response
+            
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code in (429, 503):
+                throttle.on_throttled(response.status_code, retry_after)
+            
+            attempt += 1
+            if attempt > max_retries:
+                return response
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            GRAPH_RETRIES.labels(reason=str(response.status_code)).inc()
+            logger.debug("Graph %s returned %s, retry %s in %.1fs", operation, response.status_code, attempt, delay)
+            await asyncio.sleep(delay)
+    
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+class EventLoopThread:
+    """
+    Event loop running in a daemon thread, for calling coroutines from sync code.
+    """
+    
+    def __init__(self, name: str = "graph-async-loop"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name=self._name, daemon=True)
+                self._thread.start()
+            return self._loop
+    
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the loop and wait for its result.
+        
+        The coroutine runs in a copy of the caller's context, so open
+        instrumentation spans keep counting its HTTP calls.
+        
+        Raises:
+            RuntimeError: If called from the loop thread itself (it would deadlock).
+        """
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Sync facade called from the event loop; await the *_async method instead")
+        loop = self._ensure_started()
+        context = contextvars.copy_context()
+        result: concurrent.futures.Future = concurrent.futures.Future()
+        
+        def transfer(task: asyncio.Task) -> None:
+            if task.cancelled():
+                result.cancel()
+            elif task.exception() is not None:
+                result.set_exception(task.exception())
+            else:
+                result.set_result(task.result())
+        
+        def start() -> None:
+            loop.create_task(coro, context=context).add_done_callback(transfer)
+        
+        loop.call_soon_threadsafe(start)
+        return result.result()
+    
+    def stop(self) -> None:
+        """Stop the loop and join its thread."""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+async def gather_limited(items: Iterable[T], func: Callable[[T], Awaitable[Any]], limit: int) -> List[Any]:
+    """
+    Run ``func`` over items concurrently, with at most ``limit`` running at once.
+    
+    Unlike a bare ``asyncio.gather`` over thousands of items, this keeps the
+    number of started coroutines (and file contents held in memory) bounded.
+    
+    Returns:
+        Results in item order. The first exception is raised after all finish.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run_one(item):
+        async with semaphore:
+            return await func(item)
+    
+    results = await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class AsyncSharePointStorageProvider(SharePointStorageProvider):
+    """
+    SharePoint storage provider whose file operations run on asyncio.
+    
+    Usage:
+        provider = AsyncSharePointStorageProvider(tenant_id, client_id, client_secret, site_id, drive_id)
+        
+        # From Streamlit (sync facade)
+        provider.copy_template("templates/ICT", "01_2025/1_ICT/MX/ACME/Line 1")
+        
+        # From async code (bulk jobs)
+        await provider.upload_files_async(files, destination)
+    """
+    
+    def __init__(self, *args, concurrency: Optional[int] = None, **kwargs):
+        """
+        Initialize the provider.
+        
+        Args:
+            *args, **kwargs: SharePointStorageProvider arguments.
+            concurrency: Maximum Graph requests in flight (GRAPH_ASYNC_CONCURRENCY).
+        
+        Raises:
+            StorageError: If aiohttp is not installed.
+        """
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            raise StorageError(
+                "aiohttp library not installed. "
+                "Install it with: pip install aiohttp"
+            )
+        super().__init__(*args, **kwargs)
+        self.concurrency = concurrency or int(os.getenv("GRAPH_ASYNC_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self._client = AsyncGraphClient(
+            concurrency=self.concurrency,
+            timeout=float(os.getenv("GRAPH_ASYNC_TIMEOUT", DEFAULT_TIMEOUT))
+        )
+        self._loop_thread = EventLoopThread()
+        # Close pooled connections cleanly when the app process exits
+        atexit.register(self.close)
+    
+    def _run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine of this provider from sync code."""
+        return self._loop_thread.run(coro)
+    
+    def close(self) -> None:
+        """Close pooled connections and stop the background event loop."""
+        if self._loop_thread._loop is not None:
+            self._run(self._client.close())
+        self._loop_thread.stop()
+    
+    async def _get_headers_async(self) -> dict:
+        """Get Graph headers; MSAL runs in a worker thread when a token is needed."""
+        if self._access_token:
+            return self._get_headers()
+        return await asyncio.get_running_loop().run_in_executor(None, self._get_headers)
+    
+    async def _graph_request_async(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        fallback_url: Optional[str] = None,
+        stale_path: Optional[str] = None,
+        **kwargs
+    ) -> GraphResponse:
+        """
+        Async counterpart of ``_graph_request``: falls back to path addressing for stale IDs.
+        """
+        if "headers" not in kwargs:
+            kwargs["headers"] = await self._get_headers_async()
+        response = await self._client.request(operation, method, url, **kwargs)
+        
+        if response.status_code == 404 and fallback_url:
+            logger.debug("Stale item ID for %s, retrying by path", stale_path)
+            self._item_cache.invalidate(stale_path)
+            response = await self._client.request(operation, method, fallback_url, **kwargs)
+        
+        return response
+    
+    async def _resolve_item_id_async(self, path: str) -> Optional[str]:
+        """Resolve a path to its item ID, from the cache or with one request."""
+        item_id = self._cached_item_id(path)
+        if item_id:
+            return item_id
+        
+        response = await self._graph_request_async(
+            "get_item", "GET", self._path_url(path),
+            params={"$select": ITEM_SELECT}
+        )
+        if response.status_code != 200:
+            return None
+        item = response.json()
+        self._item_cache.remember(item)
+        return item.get("id")
+    
+    async def _post_folder_async(self, path: str) -> GraphResponse:
+        """Send the create request for a folder and cache the outcome (created or 409)."""
+        parent_path = str(Path(path).parent)
+        parent_url, fallback_url = self._item_url(parent_path)
+        payload = {
+            "name": Path(path).name,
+            "folder": {},
+            "@microsoft.graph.conflictBehavior": "fail"
+        }
+        
+        response = await self._graph_request_async(
+            "create_folder", "POST", f"{parent_url}/children",
+            fallback_url=f"{fallback_url}/children" if fallback_url else None,
+            stale_path=parent_path,
+            json=payload
+        )
+        
+        if response.status_code in [200, 201]:
+            self._item_cache.remember(response.json())
+            self._item_cache.mark_empty(path)
+            logger.debug("Created folder: %s", path)
+        elif response.status_code == 409:
+            self._item_cache.put(path, None, is_folder=True)
+        return response
+    
+    async def _create_folder_raw_async(self, path: str) -> bool:
+        """
+        Create a folder using a raw path (already includes base_path).
+        
+        Raises:
+            StorageError: If folder creation fails.
+        """
+        try:
+            response = await self._post_folder_async(path)
+            if response.status_code in [200, 201]:
+                return True
+            error_msg = response.json().get("error", {}).get("message", "Unknown error")
+            raise StorageError(f"Failed to create folder: {error_msg}")
+        
+        except Exception as e:
+            logger.error("Failed to create folder %s: %s", path, e)
+            raise StorageError(f"Failed to create folder: {e}")
+    
+    async def create_folder_async(self, path: str) -> bool:
+        """Create a folder (path relative to base_path)."""
+        return await self._create_folder_raw_async(self._get_item_path(path))
+    
+    async def _list_children_raw_async(self, path: str) -> Optional[List[dict]]:
+        """
+        List and cache the children of a folder (path already includes base_path).
+        
+        Returns:
+            List of child driveItem dicts, or None if the folder does not exist.
+        """
+        folder_url, fallback_url = self._item_url(path)
+        response = await self._graph_request_async(
+            "list_children", "GET", f"{folder_url}/children",
+            fallback_url=f"{fallback_url}/children" if fallback_url else None,
+            stale_path=path,
+            params={"$select": "name,id,folder,eTag", "$top": "999"}
+        )
+        
+        children = []
+        while True:
+            if response.status_code == 404:
+                return None
+            if response.status_code != 200:
+                error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                raise StorageError(f"Failed to list folder {path}: {error_msg}")
+            
+            body = response.json()
+            children.extend(body.get("value", []))
+            next_link = body.get("@odata.nextLink")
+            if not next_link:
+                break
+            response = await self._graph_request_async("list_children", "GET", next_link)
+        
+        self._item_cache.put_listing(path, children)
+        if self._item_cache.get(path) is None:
+            self._item_cache.put(path, None, is_folder=True)
+        return children
+    
+    async def _folder_exists_raw_async(self, path: str) -> bool:
+        """Check if a folder exists (path already includes base_path)."""
+        try:
+            cached = self._item_cache.exists(path)
+            if cached is not None:
+                return cached
+            
+            parent_path = str(Path(path).parent).replace("\\", "/")
+            children = await self._list_children_raw_async("" if parent_path == "." else parent_path)
+            name = Path(path).name.casefold()
+            return children is not None and any(
+                child.get("name", "").casefold() == name for child in children
+            )
+        
+        except Exception as e:
+            logger.error("Error checking folder existence for %s: %s", path, e)
+            return False
+    
+    async def folder_exists_async(self, path: str) -> bool:
+        """Check if a folder exists (path relative to base_path)."""
+        return await self._folder_exists_raw_async(self._get_item_path(path))
+    
+    async def _upload_bytes_raw_async(self, data, destination: str, filename: str) -> bool:
+        """
+        Upload file content to a folder (path already includes base_path).
+        
+        Raises:
+            StorageError: If upload fails.
+        """
+        try:
+            item_path = f"{destination}/{filename}"
+            path_url = f"{self._path_url(item_path)}/content"
+            parent_id = self._cached_item_id(destination)
+            if parent_id:
+                url = (
+                    f"{self.graph_url}/drives/{self.drive_id}/items/{parent_id}"
+                    f":/{quote(filename, safe='')}:/content"
+                )
+                fallback_url = path_url
+            else:
+                url, fallback_url = path_url, None
+            
+            headers = dict(await self._get_headers_async())
+            headers["Content-Type"] = "application/octet-stream"
+            
+            started = time.perf_counter()
+            response = await self._graph_request_async(
+                "upload", "PUT", url,
+                fallback_url=fallback_url,
+                stale_path=destination,
+                data=data,
+                headers=headers
+            )
+            
+            if response.status_code in [200, 201]:
+                # Only bytes Graph accepted count as transferred
+                record_bytes(len(data))
+                GRAPH_BYTES.inc(len(data))
+                self._item_cache.remember(response.json())
+                report_progress(len(data), files_done=1, seconds=time.perf_counter() - started)
+                logger.debug("Uploaded file: %s", item_path)
+                return True
+            error_msg = response.json().get("error", {}).get("message", "Unknown error")
+            raise StorageError(f"Failed to upload file: {error_msg}")
+        
+        except Exception as e:
+            logger.error("Failed to upload file %s to %s: %s", filename, destination, e)
+            raise StorageError(f"Failed to upload file: {e}")
+    
+    async def _upload_stream_raw_async(self, file_content, destination: str, filename: str) -> bool:
+        """
+        Upload a file stream without copying it whole (path already includes base_path).
+        
+        Small files go in one request; larger ones through an upload session.
+        """
+        stream = open_upload_stream(file_content)
+        if stream.size <= SIMPLE_UPLOAD_MAX_BYTES:
+            return await self._upload_bytes_raw_async(stream.view(), destination, filename)
+        return await self._upload_session_raw_async(stream, destination, filename)
+    
+    async def _upload_session_raw_async(self, stream: UploadStream, destination: str, filename: str) -> bool:
+        """
+        Async counterpart of ``_upload_session_raw``: upload a large file chunk by chunk.
+        
+        Raises:
+            StorageError: If upload fails.
+        """
+        item_path = f"{destination}/{filename}"
+        loop = asyncio.get_running_loop()
+        try:
+            response = await self._graph_request_async(
+                "create_upload_session", "POST", f"{self._path_url(item_path)}/createUploadSession",
+                json={"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+            )
+            if response.status_code != 200:
+                error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                raise StorageError(f"Failed to create upload session: {error_msg}")
+            upload_url = response.json()["uploadUrl"]
+            
+            offset = 0
+            chunks = stream.chunks(get_chunk_size())
+            while True:
+                # Chunks read from disk are read off the event loop
+                if stream.in_memory:
+                    chunk = next(chunks, None)
+                else:
+                    chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                end = offset + len(chunk) - 1
+                # The upload URL is pre-authenticated: no Authorization header
+                started = time.perf_counter()
+                response = await self._client.request("upload_chunk", "PUT", upload_url, data=chunk, headers={
+                    "Content-Length": str(len(chunk)),
+                    "Content-Range": f"bytes {offset}-{end}/{stream.size}"
+                })
+                if response.status_code not in (200, 201, 202):
+                    await self._client.request("cancel_upload_session", "DELETE", upload_url)
+                    raise StorageError(f"Upload failed at byte {offset}: HTTP {response.status_code}")
+                record_bytes(len(chunk))
+                GRAPH_BYTES.inc(len(chunk))
+                report_progress(len(chunk), seconds=time.perf_counter() - started)
+                offset = end + 1
+            
+            self._item_cache.remember(response.json())
+            report_progress(files_done=1)
+            logger.debug("Uploaded file in chunks: %s", item_path)
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to upload file %s to %s: %s", filename, destination, e)
+            raise StorageError(f"Failed to upload file: {e}")
+    
+    async def upload_file_async(self, file_content, destination: str, filename: str) -> bool:
+        """Upload a file (destination relative to base_path)."""
+        return await self._upload_stream_raw_async(
+            file_content, self._get_item_path(destination), filename
+        )
+    
+    async def upload_files_async(self, files: List[tuple], destination: str) -> List[str]:
+        """
+        Upload multiple files concurrently.
+        
+        Args:
+            files: List of tuples (filename, file_content).
+            destination: Destination folder path (already includes base_path).
+        
+        Returns:
+            List of uploaded file paths.
+        
+        Raises:
+            StorageError: If any upload fails.
+        """
+        if len(files) > 1:
+            await self._resolve_item_id_async(destination)
+        
+        await gather_limited(
+            files,
+            lambda item: self._upload_stream_raw_async(item[1], destination, item[0]),
+            self.concurrency
+        )
+        logger.info("Uploaded %s files to %s", len(files), destination)
+        return [f"{destination}/{filename}" for filename, _ in files]
+    
+    async def copy_template_async(self, template_path: str, destination: str, skip_existing: bool = False) -> bool:
+        """
+        Copy a local template folder to SharePoint concurrently.
+        
+        Folders are created one depth level at a time (a folder's parent must
+        exist first), each level in parallel; files are then uploaded in
+        parallel under their already-cached parent IDs.
+        
+        Args:
+            template_path: Path to the LOCAL template folder.
+            destination: Destination path in SharePoint (already includes base_path).
+            skip_existing: Leave files already at the destination with their
+                template size alone (resumes an interrupted copy).
+        
+        Returns:
+            True if copy was successful.
+        
+        Raises:
+            StorageError: If copy fails or template doesn't exist.
+        """
+        template_root = Path(template_path)
+        if not template_root.exists():
+            raise StorageError(f"Template not found locally: {template_path}")
+        if not template_root.is_dir():
+            raise StorageError(f"Template path is not a directory: {template_path}")
+        
+        logger.info("Copying template from %s to SharePoint: %s", template_path, destination)
+        
+        # Folders and files come from the cached template manifest
+        manifest = get_template_manifest(template_path)
+        blob_cache = get_template_blob_cache()
+        levels = {
+            depth: [f"{destination}/{folder}" for folder in folders]
+            for depth, folders in manifest.folder_levels().items()
+        }
+        files = list(manifest.files)
+        
+        folder_log = SampledLogger(logger, every=10)
+        folders_created = 0
+        
+        async def create(path: str) -> bool:
+            if self._item_cache.exists(path):
+                folder_log.debug("Folder already exists, skipped: %s", path)
+                return False
+            try:
+                return await self._create_folder_raw_async(path)
+            except StorageError:
+                folder_log.debug("Folder creation skipped (might exist): %s", path)
+                return False
+        
+        async def upload(entry: TemplateFile) -> bool:
+            loop = asyncio.get_running_loop()
+            # Zero-copy view of the mapped template file (mapped off the loop on a miss)
+            data = await loop.run_in_executor(None, blob_cache.read, manifest, entry)
+            parent = f"{destination}/{entry.parent}" if entry.parent else destination
+            try:
+                return await self._upload_bytes_raw_async(data, parent, entry.name)
+            except Exception as e:
+                raise StorageError(f"Failed to upload {entry.name}: {e}")
+        
+        try:
+            for depth in sorted(levels):
+                created = await gather_limited(levels[depth], create, self.concurrency)
+                folders_created += sum(created)
+            if skip_existing:
+                stats = await self.stat_many_async([f"{destination}/{entry.path}" for entry in files])
+                files = self._files_to_copy(files, stats)
+            await gather_limited(files, upload, self.concurrency)
+        except StorageError:
+            raise
+        except Exception as e:
+            logger.error("Failed to copy template: %s", e, exc_info=True)
+            raise StorageError(f"Failed to copy template from {template_path}: {e}")
+        
+        logger.info(
+            "✅ Template copied successfully: %s folders created, %s files uploaded",
+            folders_created, len(files)
+        )
+        return True
+    
+    async def write_file_async(self, content: str, destination: str, filename: str) -> bool:
+        """Write text content to a file (destination already includes base_path)."""
+        return await self._upload_bytes_raw_async(content.encode('utf-8'), destination, filename)
+    
+    async def create_folders_async(self, paths: List[str]) -> List[bool]:
+        """
+        Create several folders, each depth level concurrently.
+        
+        Args:
+            paths: Full folder paths (already include base_path).
+        
+        Returns:
+            One bool per path: True if created by this call, False if it already existed.
+        
+        Raises:
+            StorageError: If any folder cannot be created.
+        """
+        results = {}
+        failures = []
+        levels = {}
+        for path in set(paths):
+            levels.setdefault(len(Path(path).parts), []).append(path)
+        
+        async def create(path: str) -> None:
+            if self._item_cache.exists(path):
+                results[path] = False
+                return
+            response = await self._post_folder_async(path)
+            if response.status_code in [200, 201, 409]:
+                results[path] = response.status_code != 409
+            else:
+                error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                failures.append(f"{path}: {error_msg}")
+        
+        for depth in sorted(levels):
+            await gather_limited(levels[depth], create, self.concurrency)
+        
+        if failures:
+            logger.error("Failed to create %s folders: %s", len(failures), failures)
+            raise StorageError(f"Failed to create {len(failures)} folder(s): {failures[0]}")
+        return [results[path] for path in paths]
+    
+    async def upload_many_async(self, items: List[UploadItem]) -> List[str]:
+        """
+        Upload files to any number of folders concurrently.
+        
+        Args:
+            items: Files to upload (destinations already include base_path).
+        
+        Returns:
+            Uploaded file paths, in input order.
+        
+        Raises:
+            StorageError: If any upload fails.
+        """
+        # Folders receiving several files are resolved once, so uploads go by ID
+        destinations = Counter(item.destination for item in items)
+        shared = [path for path, count in destinations.items() if count > 1]
+        await gather_limited(shared, self._resolve_item_id_async, self.concurrency)
+        
+        await gather_limited(
+            items,
+            lambda item: self._upload_stream_raw_async(item.content, item.destination, item.filename),
+            self.concurrency
+        )
+        logger.info("Uploaded %s files to %s folders", len(items), len(destinations))
+        return [f"{item.destination}/{item.filename}" for item in items]
+    
+    async def _stat_raw_async(self, path: str) -> Optional[ItemStat]:
+        """Get the metadata of one item (path already includes base_path)."""
+        response = await self._graph_request_async(
+            "get_item", "GET", self._path_url(path), params={"$select": ITEM_SELECT}
+        )
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            error_msg = response.json().get("error", {}).get("message", "Unknown error")
+            raise StorageError(f"Failed to read {path}: {error_msg}")
+        item = response.json()
+        self._item_cache.remember(item)
+        return self._item_stat(path, item)
+    
+    async def stat_many_async(self, paths: List[str]) -> List[Optional[ItemStat]]:
+        """
+        Get metadata of several items concurrently.
+        
+        Args:
+            paths: Full item paths (already include base_path).
+        
+        Returns:
+            One ItemStat per path (None if it does not exist).
+        """
+        return await gather_limited(paths, self._stat_raw_async, self.concurrency)
+    
+    async def exists_many_async(self, paths: List[str]) -> List[bool]:
+        """
+        Check whether several items exist, from the item cache where possible.
+        
+        Args:
+            paths: Full item paths (already include base_path).
+        
+        Returns:
+            One bool per path.
+        """
+        results = [self._item_cache.exists(path) for path in paths]
+        unknown = [index for index, exists in enumerate(results) if exists is None]
+        stats = await self.stat_many_async([paths[index] for index in unknown])
+        for index, stat in zip(unknown, stats):
+            results[index] = stat is not None
+        return results
+    
+    # Sync facade: same signatures and semantics as SharePointStorageProvider
+    
+    def _create_folder_raw(self, path: str) -> bool:
+        return self._run(self._create_folder_raw_async(path))
+    
+    def create_folder(self, path: str) -> bool:
+        return self._run(self.create_folder_async(path))
+    
+    def _folder_exists_raw(self, path: str) -> bool:
+        return self._run(self._folder_exists_raw_async(path))
+    
+    def folder_exists(self, path: str) -> bool:
+        return self._run(self.folder_exists_async(path))
+    
+    def _upload_file_raw(self, file_content, destination: str, filename: str) -> bool:
+        return self._run(self._upload_stream_raw_async(file_content, destination, filename))
+    
+    def upload_file(self, file_content, destination: str, filename: str) -> bool:
+        return self._run(self.upload_file_async(file_content, destination, filename))
+    
+    def upload_files(self, files: List[tuple], destination: str) -> List[str]:
+        return self._run(self.upload_files_async(files, destination))
+    
+    def copy_template(self, template_path: str, destination: str, skip_existing: bool = False) -> bool:
+        return self._run(self.copy_template_async(template_path, destination, skip_existing))
+    
+    def write_file(self, content: str, destination: str, filename: str) -> bool:
+        return self._run(self.write_file_async(content, destination, filename))
+
+    def create_folders(self, paths: List[str]) -> List[bool]:
+        return self._run(self.create_folders_async(paths))
+    
+    def upload_many(self, items: List[UploadItem]) -> List[str]:
+        return self._run(self.upload_many_async(items))
+    
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        return self._run(self.exists_many_async(paths))
+    
+    def stat_many(self, paths: List[str]) -> List[Optional[ItemStat]]:
+        return self._run(self.stat_many_async(paths))
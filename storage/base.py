@@ -3,11 +3,42 @@ Base Storage Provider Module
 
 This module defines the abstract interface for storage providers.
 All storage implementations must inherit from this base class.
+
+Besides the single-item operations, the interface has batch operations
+(``create_folders``, ``upload_many``, ``exists_many``, ``stat_many``) and
+``*_async`` variants of them. Their default implementations loop over the
+single-item methods (the async ones in a worker thread); providers
+override them with efficient bulk paths.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO
+
+from core.logging_config import get_logger
+from core.progress import report_progress
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class UploadItem:
+    """One file of an ``upload_many`` batch."""
+    destination: str      # Full destination folder path (as returned by get_full_path)
+    filename: str
+    content: BinaryIO
+
+
+@dataclass(frozen=True)
+class ItemStat:
+    """Metadata of a stored file or folder; fields a provider cannot tell are None."""
+    path: str
+    is_folder: Optional[bool] = None
+    size: Optional[int] = None
+    modified: Optional[float] = None   # POSIX timestamp
+    item_id: Optional[str] = None
 
 
 class StorageProvider(ABC):
@@ -84,13 +115,15 @@ class StorageProvider(ABC):
         pass
     
     @abstractmethod
-    def copy_template(self, template_path: str, destination: str) -> bool:
+    def copy_template(self, template_path: str, destination: str, skip_existing: bool = False) -> bool:
         """
         Copy a template folder to a destination.
         
         Args:
             template_path: Path to the template folder.
             destination: Destination path.
+            skip_existing: Leave files already at the destination with their
+                template size alone (resumes an interrupted copy).
             
         Returns:
             True if copy was successful, False otherwise.
@@ -130,3 +163,137 @@ class StorageProvider(ABC):
             Full path as string.
         """
         pass
+
+    def copy_file(self, source_path: str, destination: str, filename: str) -> bool:
+        """
+        Copy a stored file without sending its bytes again.
+        
+        Providers that cannot copy server-side keep this default and return
+        False; callers then upload the content instead.
+        
+        Args:
+            source_path: Full path of the stored file.
+            destination: Full destination folder path.
+            filename: Name of the copy.
+        
+        Returns:
+            True if the copy was made, False if unsupported or the source is gone.
+        
+        Raises:
+            StorageError: If the copy fails for another reason.
+        """
+        return False
+    
+    # Batch operations. Paths are full paths as returned by get_full_path().
+    
+    def create_folders(self, paths: List[str]) -> List[bool]:
+        """
+        Create several folders; parents are created before their children.
+        
+        Args:
+            paths: Full folder paths.
+        
+        Returns:
+            One bool per path, in input order: True if the folder was created
+            by this call, False if it already existed.
+        
+        Raises:
+            StorageError: If a folder cannot be created.
+        """
+        results: Dict[str, bool] = {}
+        for path in sorted(set(paths), key=lambda p: len(Path(p).parts)):
+            results[path] = not self.folder_exists(path) and self.create_folder(path)
+        return [results[path] for path in paths]
+    
+    def upload_many(self, items: List[UploadItem]) -> List[str]:
+        """
+        Upload files to any number of destination folders.
+        
+        Args:
+            items: Files to upload.
+        
+        Returns:
+            Uploaded file paths, in input order.
+        
+        Raises:
+            StorageError: If an upload fails.
+        """
+        by_destination: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            by_destination.setdefault(item.destination, []).append(index)
+        
+        uploaded: List[Optional[str]] = [None] * len(items)
+        for destination, indexes in by_destination.items():
+            files = [(items[i].filename, items[i].content) for i in indexes]
+            for index, path in zip(indexes, self.upload_files(files, destination)):
+                uploaded[index] = path
+        return uploaded
+    
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        """
+        Check whether several files or folders exist.
+        
+        Args:
+            paths: Full paths.
+        
+        Returns:
+            One bool per path, in input order.
+        """
+        return [self.folder_exists(path) for path in paths]
+    
+    def stat_many(self, paths: List[str]) -> List[Optional[ItemStat]]:
+        """
+        Get metadata of several files or folders.
+        
+        The default implementation only knows whether items exist.
+        
+        Args:
+            paths: Full paths.
+        
+        Returns:
+            One ItemStat per path (None if it does not exist), in input order.
+        """
+        return [ItemStat(path) if exists else None for path, exists in zip(paths, self.exists_many(paths))]
+    
+    def _files_to_copy(self, files: List, stats: List[Optional[ItemStat]]) -> List:
+        """
+        Template files an interrupted copy did not finish.
+        
+        Files already at the destination count as done (and are reported as
+        progress); a provider that cannot tell sizes trusts existence.
+        
+        Args:
+            files: TemplateFile entries of a template manifest.
+            stats: stat_many() results of their destination paths.
+        
+        Returns:
+            The entries still to copy.
+        """
+        missing = [
+            entry for entry, stat in zip(files, stats)
+            if stat is None or stat.size not in (None, entry.size)
+        ]
+        skipped = len(files) - len(missing)
+        if skipped:
+            report_progress(sum(entry.size for entry in files) - sum(entry.size for entry in missing), files_done=skipped)
+            logger.info("Template copy resumed: %s files already copied", skipped)
+        return missing
+    
+    # Async variants: by default the sync batch runs in a worker thread,
+    # so async callers never block their event loop
+    
+    async def create_folders_async(self, paths: List[str]) -> List[bool]:
+        """Async variant of create_folders."""
+        return await asyncio.to_thread(self.create_folders, paths)
+    
+    async def upload_many_async(self, items: List[UploadItem]) -> List[str]:
+        """Async variant of upload_many."""
+        return await asyncio.to_thread(self.upload_many, items)
+    
+    async def exists_many_async(self, paths: List[str]) -> List[bool]:
+        """Async variant of exists_many."""
+        return await asyncio.to_thread(self.exists_many, paths)
+    
+    async def stat_many_async(self, paths: List[str]) -> List[Optional[ItemStat]]:
+        """Async variant of stat_many."""
+        return await asyncio.to_thread(self.stat_many, paths)
@@ -0,0 +1,232 @@
+"""
+Blob Index Module
+
+This module keeps a content-addressed index of uploaded files: the SHA-256
+digest of each stored file mapped to the paths holding that content.
+
+Customers re-send the same Gerber/BOM/ODB++ archives for duplicated
+projects. When an upload's digest is already indexed, StorageService asks
+the provider for a server-side copy (a hardlink on local storage) of the
+stored file instead of sending the bytes again.
+
+Entries are grouped by namespace (one per storage location, e.g. a
+SharePoint drive), so content stored in one drive is never looked up for
+another. A stale entry (the stored file was moved or deleted) is dropped
+when copying from it fails.
+
+Content is only hashed ahead of an upload when a stored file has the same
+size (``has_size``); otherwise no copy is possible and the digest is taken
+while the file is uploaded (see UploadStream.track_digest).
+
+Usage:
+    index = BlobIndex(Path(".cache/blob_index.db"))
+    if index.has_size("graph:b!abc", size):
+        digest, size = hash_stream(uploaded_file)
+        for source in index.lookup("graph:b!abc", digest):
+        ...
+    index.record("graph:b!abc", digest, size, "01_2025/1_ICT/MX/ACME/Line 7/spec.zip")
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+DEDUP_FILES = REGISTRY.counter(
+    "storage_dedup_files_total",
+    "Uploaded files by content dedup outcome",
+    ["result"]
+)
+DEDUP_BYTES = REGISTRY.counter(
+    "storage_dedup_bytes_total",
+    "Bytes of uploaded files, sent or saved by content dedup",
+    ["kind"]
+)
+
+# Default database location (override with BLOB_INDEX_DB_PATH)
+DEFAULT_BLOB_DB = Path(__file__).parent.parent / ".cache" / "blob_index.db"
+
+# Files smaller than this are uploaded directly; a copy is not cheaper (override with UPLOAD_DEDUP_MIN_BYTES)
+DEFAULT_MIN_SIZE = 256 * 1024
+
+# Read size while hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_stream(stream: BinaryIO, chunk_size: int = HASH_CHUNK_SIZE) -> Tuple[str, int]:
+    """
+    Compute the SHA-256 digest and size of a seekable stream, chunk by chunk.
+    
+    The stream is rewound before and after hashing, so it can be uploaded next.
+    
+    Args:
+        stream: Binary stream (e.g. a Streamlit UploadedFile).
+        chunk_size: Bytes read per step.
+    
+    Returns:
+        Tuple of (hex digest, size in bytes).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    stream.seek(0)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    stream.seek(0)
+    return digest.hexdigest(), size
+
+
+class BlobIndex:
+    """
+    SQLite-backed digest -> stored paths index, with dedup statistics.
+    """
+    
+    def __init__(self, db_path: Path, min_size: int = DEFAULT_MIN_SIZE):
+        """
+        Initialize the index.
+        
+        Args:
+            db_path: SQLite file holding the index.
+            min_size: Smallest file size worth deduplicating.
+        """
+        self.db_path = Path(db_path)
+        self.min_size = min_size
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {"files_copied": 0, "files_uploaded": 0, "bytes_saved": 0, "bytes_uploaded": 0}
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                "namespace TEXT NOT NULL, digest TEXT NOT NULL, size INTEGER NOT NULL, "
+                "path TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, digest, path))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS blobs_by_path ON blobs (namespace, path)")
+            conn.execute("CREATE INDEX IF NOT EXISTS blobs_by_size ON blobs (namespace, size)")
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe to use from any thread)."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:  # Commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+    
+    def lookup(self, namespace: str, digest: str) -> List[str]:
+        """
+        Find stored copies of some content.
+        
+        Args:
+            namespace: Storage location the copies must live in.
+            digest: SHA-256 hex digest.
+        
+        Returns:
+            Paths holding the content, most recently stored first.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT path FROM blobs WHERE namespace = ? AND digest = ? ORDER BY stored_at DESC",
+                (namespace, digest)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def has_size(self, namespace: str, size: int) -> bool:
+        """
+        Whether any stored content has this size.
+        
+        When none has, an upload cannot be a duplicate and hashing it
+        before sending is not needed.
+        
+        Args:
+            namespace: Storage location.
+            size: Size in bytes.
+        
+        Returns:
+            True if content of this size is indexed.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM blobs WHERE namespace = ? AND size = ? LIMIT 1",
+                (namespace, size)
+            ).fetchone()
+        return row is not None
+    
+    def record(self, namespace: str, digest: str, size: int, path: str) -> None:
+        """
+        Record that a path holds some content.
+        
+        A path holds one content at a time, so older digests for it are dropped.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM blobs WHERE namespace = ? AND path = ?", (namespace, path))
+            conn.execute(
+                "INSERT INTO blobs (namespace, digest, size, path, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, digest, size, path, time.time())
+            )
+    
+    def forget(self, namespace: str, path: str) -> None:
+        """Drop a path that no longer holds its recorded content."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM blobs WHERE namespace = ? AND path = ?", (namespace, path))
+    
+    def count_upload(self, size: int, copied: bool) -> None:
+        """Count one file as deduplicated (copied) or sent."""
+        DEDUP_FILES.labels(result="copied" if copied else "uploaded").inc()
+        DEDUP_BYTES.labels(kind="saved" if copied else "uploaded").inc(size)
+        with self._stats_lock:
+            if copied:
+                self._stats["files_copied"] += 1
+                self._stats["bytes_saved"] += size
+            else:
+                self._stats["files_uploaded"] += 1
+                self._stats["bytes_uploaded"] += size
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Dedup statistics since the process started.
+        
+        Returns:
+            Dict with files_copied, files_uploaded, bytes_saved, bytes_uploaded
+            and dedup_ratio (share of bytes that did not need sending).
+        """
+        with self._stats_lock:
+            stats: Dict[str, float] = dict(self._stats)
+        total = stats["bytes_saved"] + stats["bytes_uploaded"]
+        stats["dedup_ratio"] = stats["bytes_saved"] / total if total else 0.0
+        return stats
+
+
+def upload_dedup_enabled() -> bool:
+    """Whether UPLOAD_DEDUP enables content dedup of uploads (default true)."""
+    return os.getenv("UPLOAD_DEDUP", "true").lower() in ("1", "true", "yes")
+
+
+def create_blob_index() -> BlobIndex:
+    """
+    Create the blob index from environment settings.
+    
+    The database path is read from BLOB_INDEX_DB_PATH (default
+    ``.cache/blob_index.db``) and the size threshold from
+    UPLOAD_DEDUP_MIN_BYTES.
+    
+    Returns:
+        BlobIndex instance.
+    """
+    db_path = Path(os.getenv("BLOB_INDEX_DB_PATH", str(DEFAULT_BLOB_DB)))
+    min_size = int(os.getenv("UPLOAD_DEDUP_MIN_BYTES", DEFAULT_MIN_SIZE))
+    return BlobIndex(db_path, min_size=min_size)
@@ -0,0 +1,329 @@
+"""
+Graph Throttling Module
+
+This module paces Microsoft Graph requests so that bursts of template
+copies degrade smoothly instead of failing when SharePoint throttles.
+
+All SharePoint providers in the process share one ``GraphThrottle``:
+
+- Requests are not limited until Graph pushes back. The first 429/503
+  starts a token bucket at half the rate the process was sending at; each
+  further slow-down signal halves it again.
+- On success the rate grows back by 5% per response; once it is twice the
+  rate that was throttled, the bucket is lifted again.
+- ``Retry-After`` pauses every sender, not only the throttled request.
+- Threads wait with ``acquire()``, coroutines with ``acquire_async()``;
+  both draw from the same bucket.
+- ``RateLimit-Remaining`` / ``RateLimit-Reset`` headers (sent by SharePoint
+  when close to the limit) spread the remaining quota over the reset window.
+
+Settings (environment variables):
+    GRAPH_RATE_LIMIT     Optional hard ceiling in requests per second
+                         (default 0: no ceiling, only adaptive limiting)
+    GRAPH_BURST          Token bucket capacity while limiting (default 20)
+    GRAPH_MAX_RETRIES    Retries for throttled or failed requests (default 4)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+GRAPH_THROTTLED = REGISTRY.counter(
+    "graph_throttled_total",
+    "Graph responses asking the client to slow down",
+    ["status"]
+)
+GRAPH_RETRIES = REGISTRY.counter(
+    "graph_retries_total",
+    "Graph requests retried after throttling or transient errors",
+    ["reason"]
+)
+GRAPH_THROTTLE_WAIT = REGISTRY.histogram(
+    "graph_throttle_wait_seconds",
+    "Time requests waited for the Graph rate limiter"
+)
+GRAPH_RATE = REGISTRY.gauge(
+    "graph_rate_limit_per_second",
+    "Current adaptive Graph request rate (0 while not limited)"
+)
+
+# Responses that mean "slow down / try again"
+RETRYABLE_STATUS = (429, 502, 503, 504)
+
+# Throttled responses within this many seconds count as one slow-down signal
+DECREASE_COOLDOWN = 1.0
+
+# Growth of a limited rate per successful response
+RECOVERY_FACTOR = 1.05
+
+# The limit is lifted once the rate is this multiple of the rate that was throttled
+UNLIMIT_FACTOR = 2.0
+
+# Window over which the sending rate is measured, in seconds
+RATE_WINDOW = 1.0
+
+# Backoff for retries without Retry-After
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    Args:
+        value: Header value, either delay seconds or an HTTP date.
+    
+    Returns:
+        Seconds to wait, or None if absent or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Exponential backoff with full jitter.
+    
+    Args:
+        attempt: Retry number starting at 1.
+    
+    Returns:
+        Seconds to wait before the retry.
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class GraphThrottle:
+    """
+    Adaptive token bucket shared by all Graph requests of the process.
+    
+    ``rate`` is None while requests are not limited.
+    """
+    
+    def __init__(self, max_rate: Optional[float] = None, burst: float = 20.0, min_rate: float = 1.0):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_rate: Hard ceiling in requests per second, or None for no
+                      ceiling (requests are only limited after throttling).
+            burst: Bucket capacity (requests that may be sent back to back).
+            min_rate: Lowest rate the adaptive limiter will fall to.
+        """
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate) if max_rate else min_rate
+        self.rate: Optional[float] = max_rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._unlimit_at: Optional[float] = None
+        # Requests granted in the current measuring window, and the last measured rate
+        self._window_start = self._updated
+        self._window_sent = 0
+        self._sent_rate = 0.0
+        self._lock = threading.Lock()
+        GRAPH_RATE.set(self.rate or 0)
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def _count_sent(self, now: float) -> None:
+        """Measure the sending rate (caller holds the lock)."""
+        self._window_sent += 1
+        elapsed = now - self._window_start
+        if elapsed >= RATE_WINDOW:
+            self._sent_rate = self._window_sent / elapsed
+            self._window_start = now
+            self._window_sent = 0
+    
+    def _current_sent_rate(self, now: float) -> float:
+        """Best estimate of the requests per second being sent (caller holds the lock)."""
+        elapsed = now - self._window_start
+        in_window = self._window_sent / elapsed if elapsed > 0 else 0.0
+        return max(self._sent_rate, in_window if elapsed >= RATE_WINDOW / 4 else 0.0)
+    
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate is None:
+                self._count_sent(now)
+                return 0.0
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._count_sent(now)
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self) -> float:
+        """
+        Wait until a request may be sent.
+        
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        delay = self._reserve()
+        while delay > 0:
+            time.sleep(delay)
+            waited += delay
+            delay = self._reserve()
+        
+        if waited:
+            GRAPH_THROTTLE_WAIT.observe(waited)
+        return waited
+    
+    async def acquire_async(self) -> float:
+        """
+        Wait until a request may be sent, without blocking the event loop.
+        
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        delay = self._reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+            delay = self._reserve()
+        
+        if waited:
+            GRAPH_THROTTLE_WAIT.observe(waited)
+        return waited
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every sender for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def _limit(self, rate: float, now: float) -> None:
+        """Set a limited rate, starting the bucket if requests were unlimited (caller holds the lock)."""
+        if self.rate is None:
+            self._tokens = 0.0
+            self._updated = now
+        if self.max_rate:
+            rate = min(rate, self.max_rate)
+        self.rate = max(self.min_rate, rate)
+    
+    def on_throttled(self, status: int, retry_after: Optional[float]) -> None:
+        """
+        Slow down after a 429/503 response.
+        
+        Args:
+            status: HTTP status received.
+            retry_after: Parsed Retry-After seconds, if any.
+        """
+        GRAPH_THROTTLED.labels(status=str(status)).inc()
+        with self._lock:
+            now = time.monotonic()
+            # Requests in flight together are throttled together; halve once
+            if now - self._last_decrease >= DECREASE_COOLDOWN:
+                current = self.rate if self.rate is not None else self._current_sent_rate(now)
+                self._unlimit_at = None if self.max_rate else max(current, self.min_rate) * UNLIMIT_FACTOR
+                self._limit(current / 2, now)
+                self._last_decrease = now
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            rate = self.rate
+        GRAPH_RATE.set(rate)
+        logger.warning(
+            "Graph throttled (%s), rate now %.1f req/s%s",
+            status, rate, f", pausing {retry_after:.1f}s" if retry_after else ""
+        )
+    
+    def on_success(self, headers: Mapping[str, str]) -> None:
+        """
+        Recover the rate and honor RateLimit-* headers of a successful response.
+        
+        Args:
+            headers: Response headers.
+        """
+        remaining = headers.get("RateLimit-Remaining")
+        reset = headers.get("RateLimit-Reset")
+        with self._lock:
+            if self.rate is not None and (self.max_rate is None or self.rate < self.max_rate):
+                self.rate *= RECOVERY_FACTOR
+                if self.max_rate:
+                    self.rate = min(self.rate, self.max_rate)
+                elif self._unlimit_at is not None and self.rate >= self._unlimit_at:
+                    self.rate = None
+                    self._unlimit_at = None
+                GRAPH_RATE.set(self.rate or 0)
+            if remaining is None or reset is None:
+                return
+            try:
+                remaining_requests = float(remaining)
+                reset_seconds = float(reset)
+            except ValueError:
+                return
+        if remaining_requests <= 0:
+            self.pause(reset_seconds)
+        elif reset_seconds > 0:
+            # Spread what is left of the quota over the reset window
+            with self._lock:
+                now = time.monotonic()
+                quota_rate = remaining_requests / reset_seconds
+                if self.rate is None:
+                    self._unlimit_at = max(self._current_sent_rate(now), quota_rate) * UNLIMIT_FACTOR
+                    self._limit(quota_rate, now)
+                else:
+                    self._limit(min(self.rate, quota_rate), now)
+                rate = self.rate
+            GRAPH_RATE.set(rate)
+
+
+# Singleton shared by all providers in the process
+_graph_throttle: Optional[GraphThrottle] = None
+_graph_throttle_lock = threading.Lock()
+
+
+def get_graph_throttle() -> GraphThrottle:
+    """
+    Get the process-wide Graph throttle.
+    
+    The optional ceiling and the burst are read from GRAPH_RATE_LIMIT
+    (0 or unset: no ceiling) and GRAPH_BURST.
+    
+    Returns:
+        GraphThrottle instance.
+    """
+    global _graph_throttle
+    if _graph_throttle is None:
+        with _graph_throttle_lock:
+            if _graph_throttle is None:
+                max_rate = float(os.getenv("GRAPH_RATE_LIMIT", "0"))
+                _graph_throttle = GraphThrottle(
+                    max_rate=max_rate if max_rate > 0 else None,
+                    burst=float(os.getenv("GRAPH_BURST", "20"))
+                )
+    return _graph_throttle
+
+
+def get_max_retries() -> int:
+    """Retries per Graph request (GRAPH_MAX_RETRIES, default 4)."""
+    return int(os.getenv("GRAPH_MAX_RETRIES", "4"))
@@ -0,0 +1,242 @@
+"""
+Drive Item Cache Module
+
+This module provides a thread-safe metadata cache for SharePoint drive
+items, mapping drive paths to item IDs and eTags.
+
+The cache is filled from folder listings and from the items returned by
+create and upload calls. A folder whose full listing is cached can answer
+"does this child exist?" without a request: a name missing from a fresh
+listing does not exist. Entries expire after a TTL so that folders created
+or deleted by other users are picked up again.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from urllib.parse import unquote
+
+from core.metrics import REGISTRY
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "Lookups of cached data",
+    ["cache", "result"]
+)
+
+# Default entry lifetime in seconds (override with GRAPH_ITEM_CACHE_TTL)
+DEFAULT_TTL = 300.0
+
+
+@dataclass
+class CachedItem:
+    """Cached metadata of one drive item."""
+    id: Optional[str]
+    etag: Optional[str]
+    is_folder: bool
+    cached_at: float
+
+
+def normalize_path(path: str) -> str:
+    """
+    Normalize a drive path for use as a cache key.
+    
+    SharePoint paths are case-insensitive, so keys are casefolded and
+    stripped of leading, trailing and duplicate slashes.
+    
+    Args:
+        path: Drive path relative to the root.
+    
+    Returns:
+        Normalized key ("" for the drive root).
+    """
+    parts = [part for part in path.replace("\\", "/").split("/") if part and part != "."]
+    return "/".join(parts).casefold()
+
+
+def _split(key: str):
+    """Split a normalized key into (parent key, name)."""
+    if "/" not in key:
+        return "", key
+    parent, name = key.rsplit("/", 1)
+    return parent, name
+
+
+class DriveItemCache:
+    """
+    Path to item metadata cache for one drive.
+    
+    Usage:
+        cache = DriveItemCache(ttl=300)
+        cache.put("Projects/ACME", item_id="01ABC", etag='"{01ABC},1"', is_folder=True)
+        cache.exists("Projects/ACME/Line 1")  # None (unknown), True or False
+    """
+    
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Lifetime of entries and listings in seconds (0 disables caching).
+        """
+        self.ttl = ttl
+        self._items: Dict[str, CachedItem] = {}
+        self._listed: Dict[str, float] = {}  # folder key -> time its full listing was cached
+        self._lock = threading.Lock()
+    
+    def _fresh(self, cached_at: float) -> bool:
+        return self.ttl > 0 and time.monotonic() - cached_at < self.ttl
+    
+    def get(self, path: str) -> Optional[CachedItem]:
+        """
+        Get cached metadata for a path.
+        
+        Args:
+            path: Drive path.
+        
+        Returns:
+            CachedItem, or None if not cached or expired.
+        """
+        key = normalize_path(path)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and not self._fresh(item.cached_at):
+                del self._items[key]
+                item = None
+        CACHE_REQUESTS.labels(cache="graph_items", result="hit" if item else "miss").inc()
+        return item
+    
+    def is_listed(self, path: str) -> bool:
+        """Whether the full, fresh listing of a folder is cached."""
+        key = normalize_path(path)
+        with self._lock:
+            listed_at = self._listed.get(key)
+            return listed_at is not None and self._fresh(listed_at)
+    
+    def exists(self, path: str) -> Optional[bool]:
+        """
+        Answer an existence check from the cache.
+        
+        Args:
+            path: Drive path.
+        
+        Returns:
+            True if the item is cached, False if the parent's fresh listing
+            does not contain it, None if the cache cannot tell.
+        """
+        if self.get(path) is not None:
+            return True
+        parent, _ = _split(normalize_path(path))
+        if self.is_listed(parent):
+            return False
+        return None
+    
+    def put(self, path: str, item_id: Optional[str], etag: Optional[str] = None, is_folder: bool = True) -> None:
+        """
+        Cache metadata for a path.
+        
+        Args:
+            path: Drive path.
+            item_id: Graph item ID (None if only existence is known).
+            etag: Item eTag.
+            is_folder: Whether the item is a folder.
+        """
+        if self.ttl <= 0:
+            return
+        key = normalize_path(path)
+        with self._lock:
+            self._items[key] = CachedItem(item_id, etag, is_folder, time.monotonic())
+    
+    def put_listing(self, path: str, children: Iterable[dict]) -> None:
+        """
+        Cache the complete listing of a folder.
+        
+        Args:
+            path: Folder path.
+            children: Graph driveItem dicts with at least ``name`` and ``id``.
+        """
+        if self.ttl <= 0:
+            return
+        key = normalize_path(path)
+        now = time.monotonic()
+        prefix = f"{key}/" if key else ""
+        listed = {prefix + child["name"].casefold(): child for child in children}
+        with self._lock:
+            # Children gone since the last listing (or replaced by another item
+            # with the same name) take everything cached below them along
+            removed = [
+                k for k, item in self._items.items()
+                if k != key and k.startswith(prefix) and "/" not in k[len(prefix):]
+                and (k not in listed or (item.id and listed[k].get("id") not in (None, item.id)))
+            ]
+            for child_key in removed:
+                self._drop_subtree(child_key)
+            for child_key, child in listed.items():
+                self._items[child_key] = CachedItem(
+                    child.get("id"), child.get("eTag"), "folder" in child, now
+                )
+            self._listed[key] = now
+    
+    def _drop_subtree(self, key: str) -> None:
+        """Forget a key and everything below it (caller holds the lock)."""
+        prefix = f"{key}/"
+        for mapping in (self._items, self._listed):
+            for k in [k for k in mapping if k == key or k.startswith(prefix)]:
+                del mapping[k]
+    
+    def mark_empty(self, path: str) -> None:
+        """Record that a folder was just created and has no children."""
+        self.put_listing(path, [])
+    
+    def remember(self, item: dict) -> Optional[str]:
+        """
+        Cache a driveItem returned by Graph (create, upload or get).
+        
+        The item's path is rebuilt from ``parentReference.path`` and its
+        name; the parent folder's ID is cached too.
+        
+        Args:
+            item: Graph driveItem dict.
+        
+        Returns:
+            Drive path of the item, or None if it could not be determined.
+        """
+        parent_ref = item.get("parentReference") or {}
+        parent_path = parent_ref.get("path")
+        if not parent_path or "root:" not in parent_path or "name" not in item:
+            return None
+        
+        parent = unquote(parent_path.split("root:", 1)[1]).strip("/")
+        path = f"{parent}/{item['name']}" if parent else item["name"]
+        
+        self.put(path, item.get("id"), item.get("eTag"), "folder" in item)
+        parent_id = parent_ref.get("id")
+        if parent_id and self.ttl > 0:
+            parent_key = normalize_path(parent)
+            with self._lock:
+                existing = self._items.get(parent_key)
+                if existing is None or existing.id != parent_id:
+                    self._items[parent_key] = CachedItem(parent_id, None, True, time.monotonic())
+        return path
+    
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Forget a path and everything below it, or the whole cache.
+        
+        Args:
+            path: Drive path, or None to clear everything.
+        """
+        with self._lock:
+            if path is None:
+                self._items.clear()
+                self._listed.clear()
+                return
+            key = normalize_path(path)
+            self._drop_subtree(key)
+            # The parent's listing no longer reflects reality
+            self._listed.pop(_split(key)[0], None)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
@@ -5,16 +5,43 @@ This module implements the StorageProvider interface for local filesystem storag
 This is the current implementation that the application uses.
 """
 
+import contextvars
 import os
 import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, BinaryIO
-from .base import StorageProvider
+from typing import List, BinaryIO, Optional
+from .base import ItemStat, StorageProvider, UploadItem
+from .template_manifest import get_template_manifest
+from .upload_stream import open_upload_stream
 from core.exceptions import StorageError
 from core.logging_config import get_logger
+from core.instrumentation import span, record_bytes
+from core.progress import report_progress
+from core.metrics import REGISTRY, timed
 
 logger = get_logger(__name__)
 
+LOCAL_OP_SECONDS = REGISTRY.histogram(
+    "local_storage_operation_duration_seconds",
+    "Local filesystem storage operation latency",
+    ["operation"]
+)
+LOCAL_OP_ERRORS = REGISTRY.counter(
+    "local_storage_errors_total",
+    "Local filesystem storage operations that failed",
+    ["operation"]
+)
+LOCAL_BYTES = REGISTRY.counter(
+    "local_storage_written_bytes_total",
+    "Bytes written by the local storage provider"
+)
+
+# Threads writing files in parallel in upload_many (file I/O releases the GIL)
+BATCH_IO_WORKERS = 8
+
 
 class LocalStorageProvider(StorageProvider):
     """
@@ -33,8 +60,9 @@ class LocalStorageProvider(StorageProvider):
             base_path: Base path for all storage operations.
         """
         self.base_path = Path(base_path)
-        logger.info(f"Initialized LocalStorageProvider with base_path: {self.base_path}")
+        logger.info("Initialized LocalStorageProvider with base_path: %s", self.base_path)
     
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="create_folder")
     def create_folder(self, path: str) -> bool:
         """
         Create a folder at the specified path.
@@ -51,10 +79,10 @@ class LocalStorageProvider(StorageProvider):
         try:
             full_path = Path(path)
             full_path.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Created folder: {full_path}")
+            logger.info("Created folder: %s", full_path)
             return True
         except Exception as e:
-            logger.error(f"Failed to create folder {path}: {e}")
+            logger.error("Failed to create folder %s: %s", path, e)
             raise StorageError(f"Failed to create folder: {e}")
     
     def folder_exists(self, path: str) -> bool:
@@ -68,9 +96,10 @@ class LocalStorageProvider(StorageProvider):
             True if folder exists, False otherwise.
         """
         exists = Path(path).exists()
-        logger.debug(f"Folder exists check for {path}: {exists}")
+        logger.debug("Folder exists check for %s: %s", path, exists)
         return exists
     
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="upload_file")
     def upload_file(self, file_content: BinaryIO, destination: str, filename: str) -> bool:
         """
         Upload a file to the specified destination.
@@ -91,13 +120,22 @@ class LocalStorageProvider(StorageProvider):
             dest_path.mkdir(parents=True, exist_ok=True)
             
             file_path = dest_path / filename
+            # Replace rather than truncate: the file may be a hardlink made by copy_file
+            file_path.unlink(missing_ok=True)
+            # Written chunk by chunk: no second in-memory copy of the upload
+            written = 0
+            started = time.perf_counter()
             with open(file_path, 'wb') as f:
-                f.write(file_content.getvalue())
+                for chunk in open_upload_stream(file_content).chunks():
+                    written += f.write(chunk)
+            record_bytes(written)
+            LOCAL_BYTES.inc(written)
+            report_progress(written, files_done=1, seconds=time.perf_counter() - started)
             
-            logger.info(f"Uploaded file: {file_path}")
+            logger.info("Uploaded file: %s", file_path)
             return True
         except Exception as e:
-            logger.error(f"Failed to upload file {filename} to {destination}: {e}")
+            logger.error("Failed to upload file %s to %s: %s", filename, destination, e)
             raise StorageError(f"Failed to upload file: {e}")
     
     def upload_files(self, files: List[tuple], destination: str) -> List[str]:
@@ -118,22 +156,26 @@ class LocalStorageProvider(StorageProvider):
         
         for filename, file_content in files:
             try:
-                self.upload_file(file_content, destination, filename)
+                with span("upload", filename=filename):
+                    self.upload_file(file_content, destination, filename)
                 uploaded_paths.append(str(Path(destination) / filename))
             except StorageError as e:
-                logger.error(f"Failed to upload {filename}: {e}")
+                logger.error("Failed to upload %s: %s", filename, e)
                 raise
         
-        logger.info(f"Uploaded {len(uploaded_paths)} files to {destination}")
+        logger.info("Uploaded %s files to %s", len(uploaded_paths), destination)
         return uploaded_paths
     
-    def copy_template(self, template_path: str, destination: str) -> bool:
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="copy_template")
+    def copy_template(self, template_path: str, destination: str, skip_existing: bool = False) -> bool:
         """
         Copy a template folder to a destination.
         
         Args:
             template_path: Path to the template folder.
             destination: Destination path.
+            skip_existing: Leave files already at the destination with their
+                template size alone (resumes an interrupted copy).
             
         Returns:
             True if copy was successful.
@@ -148,13 +190,25 @@ class LocalStorageProvider(StorageProvider):
             if not src.exists():
                 raise StorageError(f"Template path does not exist: {template_path}")
             
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-            logger.info(f"Copied template from {template_path} to {destination}")
+            # Driven by the cached manifest instead of walking the template
+            manifest = get_template_manifest(template_path)
+            dst.mkdir(parents=True, exist_ok=True)
+            for folder in manifest.folders:
+                (dst / folder).mkdir(exist_ok=True)
+            files = list(manifest.files)
+            if skip_existing:
+                files = self._files_to_copy(files, self.stat_many([str(dst / entry.path) for entry in files]))
+            for entry in files:
+                started = time.perf_counter()
+                shutil.copy2(manifest.local_path(entry.path), dst / entry.path)
+                report_progress(entry.size, files_done=1, seconds=time.perf_counter() - started)
+            logger.info("Copied template from %s to %s", template_path, destination)
             return True
         except Exception as e:
-            logger.error(f"Failed to copy template from {template_path} to {destination}: {e}")
+            logger.error("Failed to copy template from %s to %s: %s", template_path, destination, e)
             raise StorageError(f"Failed to copy template: {e}")
     
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="write_file")
     def write_file(self, content: str, destination: str, filename: str) -> bool:
         """
         Write text content to a file.
@@ -178,10 +232,10 @@ class LocalStorageProvider(StorageProvider):
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
             
-            logger.info(f"Wrote file: {file_path}")
+            logger.info("Wrote file: %s", file_path)
             return True
         except Exception as e:
-            logger.error(f"Failed to write file {filename} to {destination}: {e}")
+            logger.error("Failed to write file %s to %s: %s", filename, destination, e)
             raise StorageError(f"Failed to write file: {e}")
     
     def get_full_path(self, *path_parts: str) -> str:
@@ -196,3 +250,134 @@ class LocalStorageProvider(StorageProvider):
         """
         full_path = os.path.join(str(self.base_path), *path_parts)
         return full_path
+
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="copy_file")
+    def copy_file(self, source_path: str, destination: str, filename: str) -> bool:
+        """
+        Copy a stored file by hardlinking it (byte copy across filesystems).
+        
+        Args:
+            source_path: Path of the stored file.
+            destination: Destination folder path.
+            filename: Name of the copy.
+        
+        Returns:
+            True if the copy was made, False if the source no longer exists.
+        
+        Raises:
+            StorageError: If the copy fails.
+        """
+        source = Path(source_path)
+        target = Path(destination) / filename
+        if not source.is_file():
+            return False
+        if target.exists() and target.samefile(source):
+            return True
+        
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.unlink(missing_ok=True)
+            try:
+                os.link(source, target)
+            except OSError:
+                # Different filesystem or no hardlink support
+                shutil.copyfile(source, target)
+            logger.info("Copied file: %s -> %s", source, target)
+            return True
+        except Exception as e:
+            logger.error("Failed to copy %s to %s: %s", source, target, e)
+            raise StorageError(f"Failed to copy file: {e}")
+    
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="create_folders")
+    def create_folders(self, paths: List[str]) -> List[bool]:
+        """
+        Create several folders (with their parents).
+        
+        Args:
+            paths: Folder paths.
+        
+        Returns:
+            One bool per path: True if created by this call, False if it already existed.
+        
+        Raises:
+            StorageError: If a folder cannot be created.
+        """
+        results = {}
+        for path in sorted(set(paths), key=lambda p: len(Path(p).parts)):
+            try:
+                Path(path).mkdir(parents=True)
+                results[path] = True
+            except FileExistsError:
+                results[path] = False
+            except Exception as e:
+                logger.error("Failed to create folder %s: %s", path, e)
+                raise StorageError(f"Failed to create folder: {e}")
+        
+        logger.info("Created %s of %s folders", sum(results.values()), len(results))
+        return [results[path] for path in paths]
+    
+    @timed(LOCAL_OP_SECONDS, LOCAL_OP_ERRORS, operation="upload_many")
+    def upload_many(self, items: List[UploadItem]) -> List[str]:
+        """
+        Write files to any number of folders, in parallel.
+        
+        Args:
+            items: Files to upload.
+        
+        Returns:
+            Uploaded file paths, in input order.
+        
+        Raises:
+            StorageError: If an upload fails.
+        """
+        for destination in {item.destination for item in items}:
+            Path(destination).mkdir(parents=True, exist_ok=True)
+        
+        def write(item: UploadItem) -> str:
+            self.upload_file(item.content, item.destination, item.filename)
+            return str(Path(item.destination) / item.filename)
+        
+        if len(items) <= 1:
+            return [write(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(BATCH_IO_WORKERS, len(items))) as executor:
+            # Each task runs in a copy of this context, so spans and progress follow it
+            futures = [executor.submit(contextvars.copy_context().run, write, item) for item in items]
+            return [future.result() for future in futures]
+    
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        """
+        Check whether several files or folders exist.
+        
+        Args:
+            paths: Paths to check.
+        
+        Returns:
+            One bool per path.
+        """
+        return [os.path.exists(path) for path in paths]
+    
+    def stat_many(self, paths: List[str]) -> List[Optional[ItemStat]]:
+        """
+        Get metadata of several files or folders.
+        
+        Args:
+            paths: Paths to inspect.
+        
+        Returns:
+            One ItemStat per path (None if it does not exist).
+        """
+        stats = []
+        for path in paths:
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                stats.append(None)
+                continue
+            is_folder = stat.S_ISDIR(info.st_mode)
+            stats.append(ItemStat(
+                path=path,
+                is_folder=is_folder,
+                size=None if is_folder else info.st_size,
+                modified=info.st_mtime
+            ))
+        return stats
@@ -0,0 +1,386 @@
+"""
+Project Index Module
+
+This module maintains a local index of the SharePoint project tree, built
+with the Microsoft Graph drive ``delta`` API.
+
+Projects live at ``{base_path}/{projects_folder}/{country}/{customer}/{project}``.
+The first sync walks the whole drive; later syncs only fetch changes since
+the saved delta link, usually in a single request. Folders and the delta
+link are persisted in SQLite, so a restart resumes incrementally.
+
+Lookups are answered from in-memory dictionaries and never touch the
+network.
+
+Usage:
+    index = ProjectIndex(provider, Path(".cache/project_index.db"))
+    if index.ensure_fresh():
+        index.project_exists("1_ICT", "MX", "ACME", "Line 7")
+        index.customer_projects("ACME")
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.exceptions import StorageError
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+from .item_cache import normalize_path
+
+logger = get_logger(__name__)
+
+INDEX_SYNCS = REGISTRY.counter(
+    "project_index_syncs_total",
+    "Delta syncs of the project index",
+    ["kind", "result"]
+)
+INDEX_PROJECTS = REGISTRY.gauge(
+    "project_index_projects",
+    "Projects currently known to the project index"
+)
+
+# Default database location (override with PROJECT_INDEX_DB_PATH)
+DEFAULT_INDEX_DB = Path(__file__).parent.parent / ".cache" / "project_index.db"
+
+# Seconds after which a lookup triggers an incremental sync (override with PROJECT_INDEX_MAX_AGE)
+DEFAULT_MAX_AGE = 30.0
+
+# Levels below base_path: projects_folder / country / customer / project
+PROJECT_DEPTH = 4
+
+
+@dataclass(frozen=True)
+class ProjectEntry:
+    """A project folder found in the index."""
+    projects_folder: str
+    country: str
+    customer: str
+    project: str
+    path: str
+
+
+# (projects_folder, country, customer) casefolded -> {project casefolded: entry}
+_ProjectMap = Dict[Tuple[str, str, str], Dict[str, ProjectEntry]]
+
+
+class ProjectIndex:
+    """
+    Delta-synced index of project folders under the SharePoint base path.
+    
+    Syncs are serialized; lookups read an immutable snapshot that is
+    swapped in after each sync, so they never wait for a sync.
+    """
+    
+    def __init__(self, provider, db_path: Path, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Initialize the index and load the persisted state.
+        
+        Args:
+            provider: SharePointStorageProvider used for Graph requests.
+            db_path: SQLite file holding folders and the delta link.
+            max_age: Seconds before ensure_fresh() syncs again.
+        """
+        self.provider = provider
+        self.db_path = Path(db_path)
+        self.max_age = max_age
+        self._base_parts = normalize_path(provider.base_path or "").split("/") if provider.base_path else []
+        
+        self._folders: Dict[str, Tuple[str, Optional[str]]] = {}  # id -> (name, parent id)
+        self._root_id: Optional[str] = None
+        self._delta_link: Optional[str] = None
+        self._projects: _ProjectMap = {}
+        self._synced_at = 0.0
+        self._failed_at = float("-inf")
+        
+        self._sync_lock = threading.Lock()
+        self._initial_sync: Optional[threading.Thread] = None
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS folders (id TEXT PRIMARY KEY, name TEXT NOT NULL, parent_id TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        self._load()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe to use from any thread)."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:  # Commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+    
+    def _load(self) -> None:
+        """Load persisted folders and delta link, if they belong to this drive."""
+        with self._connect() as conn:
+            state = dict(conn.execute("SELECT key, value FROM state").fetchall())
+            if state.get("drive_id") != self.provider.drive_id:
+                return
+            self._folders = {
+                row[0]: (row[1], row[2])
+                for row in conn.execute("SELECT id, name, parent_id FROM folders")
+            }
+        self._root_id = state.get("root_id")
+        self._delta_link = state.get("delta_link")
+        self._rebuild()
+        logger.info("Loaded project index: %s projects", self.project_count)
+    
+    @property
+    def ready(self) -> bool:
+        """Whether a full sync has completed (now or in a previous run)."""
+        return self._delta_link is not None
+    
+    @property
+    def project_count(self) -> int:
+        """Number of indexed projects."""
+        return sum(len(projects) for projects in self._projects.values())
+    
+    def _fetch_changes(self) -> Tuple[List[dict], str, bool]:
+        """
+        Fetch all pages of changes since the saved delta link.
+        
+        Returns:
+            Tuple of (changed items, new delta link, whether this was a full sync).
+        
+        Raises:
+            StorageError: If a delta request fails.
+        """
+        full = self._delta_link is None
+        url = self._delta_link or f"{self.provider.graph_url}/drives/{self.provider.drive_id}/root/delta"
+        params = None if self._delta_link else {"$select": "id,name,parentReference,folder,deleted,root"}
+        
+        items: List[dict] = []
+        while True:
+            response = self.provider._graph_request("delta", "GET", url, params=params)
+            if response.status_code == 410 and not full:
+                # Delta link expired; Graph requires a full resync
+                logger.warning("Project index delta link expired, resyncing")
+                self._delta_link = None
+                return self._fetch_changes()
+            if response.status_code != 200:
+                error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                raise StorageError(f"Project index sync failed: {error_msg}")
+            
+            body = response.json()
+            items.extend(body.get("value", []))
+            if "@odata.deltaLink" in body:
+                return items, body["@odata.deltaLink"], full
+            url, params = body["@odata.nextLink"], None
+    
+    def sync(self) -> int:
+        """
+        Apply changes since the last sync (full sync the first time).
+        
+        Returns:
+            Number of folder changes applied.
+        
+        Raises:
+            StorageError: If the sync fails.
+        """
+        with self._sync_lock:
+            kind = "full" if self._delta_link is None else "incremental"
+            try:
+                items, delta_link, full = self._fetch_changes()
+            except Exception:
+                INDEX_SYNCS.labels(kind=kind, result="failure").inc()
+                raise
+            
+            folders = {} if full else dict(self._folders)
+            upserts: Dict[str, Tuple[str, Optional[str]]] = {}
+            deletes: List[str] = []
+            root_id = self._root_id
+            
+            for item in items:
+                item_id = item.get("id")
+                if not item_id:
+                    continue
+                if "deleted" in item:
+                    if folders.pop(item_id, None) is not None:
+                        deletes.append(item_id)
+                    continue
+                if "root" in item:
+                    root_id = item_id
+                    continue
+                if "folder" not in item:
+                    continue  # Only the folder tree is indexed
+                entry = (item["name"], (item.get("parentReference") or {}).get("id"))
+                folders[item_id] = entry
+                upserts[item_id] = entry
+            
+            with self._connect() as conn:
+                if full:
+                    conn.execute("DELETE FROM folders")
+                conn.executemany("DELETE FROM folders WHERE id = ?", [(i,) for i in deletes])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO folders (id, name, parent_id) VALUES (?, ?, ?)",
+                    [(i, name, parent) for i, (name, parent) in upserts.items()]
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                    [("drive_id", self.provider.drive_id), ("root_id", root_id), ("delta_link", delta_link)]
+                )
+            
+            self._folders = folders
+            self._root_id = root_id
+            self._delta_link = delta_link
+            self._rebuild()
+            self._synced_at = time.monotonic()
+            INDEX_SYNCS.labels(kind="full" if full else "incremental", result="success").inc()
+            
+            logger.debug(
+                "Project index synced (%s): %s changes, %s projects",
+                "full" if full else "incremental", len(upserts) + len(deletes), self.project_count
+            )
+            return len(upserts) + len(deletes)
+    
+    def _rebuild(self) -> None:
+        """Rebuild the project lookup tables from the folder tree."""
+        folders = self._folders
+        paths: Dict[str, Optional[List[str]]] = {}
+        
+        def path_of(folder_id: str) -> Optional[List[str]]:
+            # Iterative walk to the root, memoized; None for orphans
+            chain = []
+            current = folder_id
+            while current not in paths:
+                if current == self._root_id:
+                    paths[current] = []
+                    break
+                entry = folders.get(current)
+                if entry is None:
+                    paths[current] = None
+                    break
+                chain.append(current)
+                current = entry[1]
+            result = paths[current]
+            for node in reversed(chain):
+                result = None if result is None else result + [folders[node][0]]
+                paths[node] = result
+            return paths[folder_id]
+        
+        base = self._base_parts
+        depth = len(base) + PROJECT_DEPTH
+        projects: _ProjectMap = {}
+        for folder_id in folders:
+            parts = path_of(folder_id)
+            if parts is None or len(parts) != depth:
+                continue
+            if [part.casefold() for part in parts[:len(base)]] != base:
+                continue
+            projects_folder, country, customer, project = parts[len(base):]
+            key = (projects_folder.casefold(), country.casefold(), customer.casefold())
+            projects.setdefault(key, {})[project.casefold()] = ProjectEntry(
+                projects_folder, country, customer, project, "/".join(parts)
+            )
+        
+        self._projects = projects  # Atomic swap for readers
+        INDEX_PROJECTS.set(self.project_count)
+    
+    def ensure_fresh(self) -> bool:
+        """
+        Make sure the index is recent enough to answer lookups.
+        
+        An incremental sync runs if the last one is older than ``max_age``.
+        Callers never queue behind a sync already running in another thread,
+        and a failed sync is not retried for ``max_age`` seconds; both cases
+        return False. The first full sync of a drive can take long, so it is
+        started in a background thread instead and this call returns False
+        meanwhile.
+        
+        Returns:
+            True if lookups can be trusted, False if callers should fall back.
+        """
+        if not self.ready:
+            self.start_initial_sync()
+            return False
+        now = time.monotonic()
+        if now - self._synced_at < self.max_age:
+            return True
+        if now - self._failed_at < self.max_age or self._sync_lock.locked():
+            return False
+        try:
+            self.sync()
+            return True
+        except Exception as e:
+            self._failed_at = time.monotonic()
+            logger.warning("Project index sync failed, falling back: %s", e)
+            return False
+    
+    def start_initial_sync(self) -> None:
+        """Start the first full sync in a background thread (once)."""
+        with self._sync_lock:
+            if self.ready or (self._initial_sync is not None and self._initial_sync.is_alive()):
+                return
+            
+            def run():
+                try:
+                    self.sync()
+                    logger.info("Project index built: %s projects", self.project_count)
+                except Exception as e:
+                    logger.warning("Project index initial sync failed: %s", e)
+            
+            self._initial_sync = threading.Thread(target=run, name="project-index-sync", daemon=True)
+            self._initial_sync.start()
+    
+    def project_exists(self, projects_folder: str, country: str, customer: str, project: str) -> bool:
+        """
+        Check whether a project folder exists (case-insensitive).
+        
+        Args:
+            projects_folder: Projects folder name (e.g. "1_ICT").
+            country: Country code folder (e.g. "MX").
+            customer: Customer folder name.
+            project: Project folder name.
+        
+        Returns:
+            True if the project is in the index.
+        """
+        key = (projects_folder.casefold(), country.casefold(), customer.casefold())
+        return project.casefold() in self._projects.get(key, {})
+    
+    def customer_projects(self, customer: str, projects_folder: Optional[str] = None) -> List[ProjectEntry]:
+        """
+        List the projects of a customer across countries.
+        
+        Args:
+            customer: Customer folder name (case-insensitive).
+            projects_folder: Restrict to one projects folder (e.g. "1_ICT").
+        
+        Returns:
+            Projects sorted by name.
+        """
+        customer_key = customer.casefold()
+        folder_key = projects_folder.casefold() if projects_folder else None
+        found = [
+            entry
+            for (folder, _, name), projects in self._projects.items()
+            if name == customer_key and (folder_key is None or folder == folder_key)
+            for entry in projects.values()
+        ]
+        return sorted(found, key=lambda entry: entry.project.casefold())
+
+
+def create_project_index(provider) -> ProjectIndex:
+    """
+    Create a project index for a SharePoint provider from environment settings.
+    
+    The database path is read from PROJECT_INDEX_DB_PATH (default
+    ``.cache/project_index.db``) and the refresh interval from
+    PROJECT_INDEX_MAX_AGE.
+    
+    Args:
+        provider: SharePointStorageProvider to index.
+    
+    Returns:
+        ProjectIndex instance.
+    """
+    db_path = Path(os.getenv("PROJECT_INDEX_DB_PATH", str(DEFAULT_INDEX_DB)))
+    max_age = float(os.getenv("PROJECT_INDEX_MAX_AGE", DEFAULT_MAX_AGE))
+    return ProjectIndex(provider, db_path, max_age=max_age)
@@ -11,15 +11,65 @@ NOTE: This is a template/skeleton implementation. You'll need to:
 4. Test with your SharePoint environment
 """
 
+import os
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, BinaryIO, Optional
-import requests
-from .base import StorageProvider
+from typing import Dict, List, BinaryIO, Optional, Tuple
+from urllib.parse import quote
+from .base import ItemStat, StorageProvider
+from .item_cache import DriveItemCache, DEFAULT_TTL
+from .template_manifest import get_template_manifest
+from .template_cache import get_template_blob_cache
+from .upload_stream import UploadStream, get_chunk_size, open_upload_stream
+from .graph_throttle import (
+    GRAPH_RETRIES, RETRYABLE_STATUS, backoff_delay, get_graph_throttle, get_max_retries, parse_retry_after
+)
 from core.exceptions import StorageError
-from core.logging_config import get_logger
+from core.logging_config import get_logger, SampledLogger
+from core.instrumentation import span, record_http_call, record_bytes
+from core.progress import report_progress
+from core.metrics import REGISTRY
 
 logger = get_logger(__name__)
 
+# Seconds to wait for a server-side copy to complete (override with GRAPH_COPY_TIMEOUT)
+DEFAULT_COPY_TIMEOUT = 60
+
+# Larger files are uploaded through an upload session instead of one PUT
+SIMPLE_UPLOAD_MAX_BYTES = 4 * 1024 * 1024
+
+# Graph JSON batching accepts at most 20 requests per call
+GRAPH_BATCH_SIZE = 20
+
+# Fields requested when stat-ing items
+ITEM_SELECT = "id,name,eTag,folder,file,size,lastModifiedDateTime,parentReference"
+
+GRAPH_REQUEST_SECONDS = REGISTRY.histogram(
+    "graph_request_duration_seconds",
+    "Microsoft Graph request latency",
+    ["operation"]
+)
+GRAPH_REQUESTS = REGISTRY.counter(
+    "graph_requests_total",
+    "Microsoft Graph requests by response status",
+    ["operation", "status"]
+)
+GRAPH_BYTES = REGISTRY.counter(
+    "graph_upload_bytes_total",
+    "Bytes uploaded to SharePoint through Microsoft Graph"
+)
+GRAPH_BATCHED_REQUESTS = REGISTRY.counter(
+    "graph_batched_requests_total",
+    "Requests sent inside Graph $batch calls, by response status",
+    ["operation", "status"]
+)
+GRAPH_TOKEN_REQUESTS = REGISTRY.counter(
+    "graph_token_requests_total",
+    "Access token acquisitions from Azure AD",
+    ["result"]
+)
+
 
 class SharePointStorageProvider(StorageProvider):
     """
@@ -64,7 +114,10 @@ class SharePointStorageProvider(StorageProvider):
         self.graph_url = "https://graph.microsoft.com/v1.0"
         self._access_token: Optional[str] = None
         
-        logger.info(f"Initialized SharePointStorageProvider for site: {site_id}")
+        # Path -> item ID/eTag metadata, answers existence checks locally
+        self._item_cache = DriveItemCache(ttl=float(os.getenv("GRAPH_ITEM_CACHE_TTL", DEFAULT_TTL)))
+        
+        logger.info("Initialized SharePointStorageProvider for site: %s", site_id)
     
     def _get_access_token(self) -> str:
         """
@@ -95,10 +148,12 @@ class SharePointStorageProvider(StorageProvider):
             result = app.acquire_token_for_client(scopes=scope)
             
             if "access_token" in result:
+                GRAPH_TOKEN_REQUESTS.labels(result="success").inc()
                 self._access_token = result["access_token"]
                 logger.info("Successfully obtained access token")
                 return self._access_token
             else:
+                GRAPH_TOKEN_REQUESTS.labels(result="failure").inc()
                 error = result.get("error_description", "Unknown error")
                 raise StorageError(f"Failed to obtain access token: {error}")
                 
@@ -108,9 +163,23 @@ class SharePointStorageProvider(StorageProvider):
                 "Install it with: pip install msal"
             )
         except Exception as e:
-            logger.error(f"Authentication failed: {e}")
+            logger.error("Authentication failed: %s", e)
             raise StorageError(f"Authentication failed: {e}")
     
+    @staticmethod
+    def _record_graph_call(operation: str, response, started: float) -> None:
+        """
+        Record latency, status and call count of a Graph request.
+        
+        Args:
+            operation: Logical operation name (e.g. "create_folder").
+            response: Response returned by requests.
+            started: time.perf_counter() value taken before the request.
+        """
+        GRAPH_REQUEST_SECONDS.labels(operation=operation).observe(time.perf_counter() - started)
+        GRAPH_REQUESTS.labels(operation=operation, status=str(response.status_code)).inc()
+        record_http_call()
+    
     def _get_headers(self) -> dict:
         """Get headers for Graph API requests."""
         return {
@@ -124,6 +193,272 @@ class SharePointStorageProvider(StorageProvider):
             return f"{self.base_path}/{path}".replace("//", "/")
         return path
     
+    def _path_url(self, path: str) -> str:
+        """
+        Get the path-addressed Graph URL of an item.
+        
+        Each path segment is percent-encoded, so customer and project names
+        containing spaces, '&', '#' or '%' are addressed correctly.
+        
+        Args:
+            path: Full item path (already includes base_path).
+            
+        Returns:
+            URL of the form ``.../root:/{path}:`` (``.../root`` for the drive root).
+        """
+        path = path.replace("\\", "/").strip("/")
+        if not path or path == ".":
+            return f"{self.graph_url}/drives/{self.drive_id}/root"
+        return f"{self.graph_url}/drives/{self.drive_id}/root:/{quote(path, safe='/')}:"
+    
+    def _cached_item_id(self, path: str) -> Optional[str]:
+        """Get the cached item ID of a path, if known."""
+        item = self._item_cache.get(path)
+        return item.id if item is not None else None
+    
+    def _item_url(self, path: str) -> Tuple[str, Optional[str]]:
+        """
+        Get the Graph URL of an item, addressed by ID when the ID is cached.
+        
+        Addressing by ID spares SharePoint from resolving the full
+        base_path/projects_folder/country/customer/project path again.
+        
+        Args:
+            path: Full item path (already includes base_path).
+            
+        Returns:
+            Tuple of (URL, path-addressed fallback URL). The fallback is None
+            when the URL is already path-addressed.
+        """
+        item_id = self._cached_item_id(path)
+        path_url = self._path_url(path)
+        if item_id:
+            return f"{self.graph_url}/drives/{self.drive_id}/items/{item_id}", path_url
+        return path_url, None
+    
+    def _send(self, operation: str, method: str, url: str, **kwargs):
+        """
+        Send one Graph request through the shared rate limiter, with retries.
+        
+        Throttled (429/503) and transient (502/504, connection error)
+        failures are retried up to GRAPH_MAX_RETRIES times, waiting for
+        Retry-After when Graph sends it and exponential backoff otherwise.
+        
+        Args:
+            operation: Logical operation name for metrics.
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Passed to requests.
+            
+        Returns:
+            requests.Response (the last one if retries ran out).
+            
+        Raises:
+            requests.RequestException: If the connection keeps failing.
+        """
+        import requests
+        
+        throttle = get_graph_throttle()
+        max_retries = get_max_retries()
+        attempt = 0
+        
+        while True:
+            throttle.acquire()
+            started = time.perf_counter()
+            try:
+                response = requests.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                GRAPH_RETRIES.labels(reason="connection").inc()
+                logger.warning("Graph %s failed (%s), retry %s in %.1fs", operation, e, attempt, delay)
+                time.sleep(delay)
+                continue
+            
+            self._record_graph_call(operation, response, started)
+            if response.status_code not in RETRYABLE_STATUS:
+                throttle.on_success(response.headers)
+                return response
+            
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code in (429, 503):
+                throttle.on_throttled(response.status_code, retry_after)
+            
+            attempt += 1
+            if attempt > max_retries:
+                return response
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            GRAPH_RETRIES.labels(reason=str(response.status_code)).inc()
+            logger.debug("Graph %s returned %s, retry %s in %.1fs", operation, response.status_code, attempt, delay)
+            time.sleep(delay)
+    
+    def _graph_request(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        fallback_url: Optional[str] = None,
+        stale_path: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Send a Graph request, falling back to path addressing for stale IDs.
+        
+        Args:
+            operation: Logical operation name for metrics (e.g. "upload").
+            method: HTTP method.
+            url: Request URL (ID- or path-addressed).
+            fallback_url: Path-addressed URL to retry with if ``url`` returns 404.
+            stale_path: Cache path to invalidate before retrying.
+            **kwargs: Passed to requests (json, data, params, headers).
+            
+        Returns:
+            requests.Response of the last attempt.
+        """
+        kwargs.setdefault("headers", self._get_headers())
+        response = self._send(operation, method, url, **kwargs)
+        
+        if response.status_code == 404 and fallback_url:
+            # The cached ID was deleted or moved; resolve by path again
+            logger.debug("Stale item ID for %s, retrying by path", stale_path)
+            self._item_cache.invalidate(stale_path)
+            response = self._send(operation, method, fallback_url, **kwargs)
+        
+        return response
+    
+    def _resolve_item_id(self, path: str) -> Optional[str]:
+        """
+        Resolve a path to its item ID, from the cache or with one request.
+        
+        Args:
+            path: Full item path (already includes base_path).
+            
+        Returns:
+            Item ID, or None if the item does not exist.
+        """
+        item_id = self._cached_item_id(path)
+        if item_id:
+            return item_id
+        
+        response = self._graph_request(
+            "get_item", "GET", self._path_url(path),
+            params={"$select": ITEM_SELECT}
+        )
+        if response.status_code != 200:
+            return None
+        item = response.json()
+        self._item_cache.remember(item)
+        return item.get("id")
+    
+    def _batch(self, operation: str, requests: List[dict]) -> List[dict]:
+        """
+        Send requests through Graph JSON batching (``$batch``).
+        
+        Requests go 20 per call. Entries answered with a retryable status
+        are resent with backoff, and entries whose ID-addressed URL returns
+        404 are resent by path, as for single requests.
+        
+        Args:
+            operation: Logical operation name for metrics.
+            requests: Dicts with ``method``, ``url`` (absolute Graph URL) and
+                optionally ``body``, ``fallback_url`` and ``stale_path``.
+        
+        Returns:
+            One response dict (``status``, ``headers``, ``body``) per request, in order.
+        
+        Raises:
+            StorageError: If a $batch call itself fails.
+        """
+        if len(requests) == 1:
+            # Not worth a batch envelope
+            request = requests[0]
+            kwargs = {"json": request["body"]} if "body" in request else {}
+            response = self._graph_request(
+                operation, request["method"], request["url"],
+                fallback_url=request.get("fallback_url"),
+                stale_path=request.get("stale_path"),
+                **kwargs
+            )
+            body = response.json() if response.content else None
+            return [{"status": response.status_code, "headers": dict(response.headers), "body": body}]
+        
+        results: List[Optional[dict]] = [None] * len(requests)
+        urls = [request["url"] for request in requests]
+        pending = list(range(len(requests)))
+        throttle = get_graph_throttle()
+        max_retries = get_max_retries()
+        attempt = 0
+        
+        while pending:
+            resend, retry_after, throttled = [], None, None
+            for start in range(0, len(pending), GRAPH_BATCH_SIZE):
+                chunk = pending[start:start + GRAPH_BATCH_SIZE]
+                entries = []
+                for index in chunk:
+                    entry = {
+                        "id": str(index),
+                        "method": requests[index]["method"],
+                        "url": urls[index][len(self.graph_url):]
+                    }
+                    if "body" in requests[index]:
+                        entry["body"] = requests[index]["body"]
+                        entry["headers"] = {"Content-Type": "application/json"}
+                    entries.append(entry)
+                
+                response = self._graph_request(operation, "POST", f"{self.graph_url}/$batch", json={"requests": entries})
+                if response.status_code != 200:
+                    error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                    raise StorageError(f"Graph batch request failed: {error_msg}")
+                
+                for sub in response.json().get("responses", []):
+                    index = int(sub["id"])
+                    status = int(sub.get("status", 500))
+                    GRAPH_BATCHED_REQUESTS.labels(operation=operation, status=str(status)).inc()
+                    results[index] = sub
+                    request = requests[index]
+                    
+                    if status == 404 and request.get("fallback_url") and urls[index] != request["fallback_url"]:
+                        # The cached ID was deleted or moved; resend by path
+                        self._item_cache.invalidate(request.get("stale_path"))
+                        urls[index] = request["fallback_url"]
+                        resend.append(index)
+                    elif status in RETRYABLE_STATUS:
+                        resend.append(index)
+                        headers = sub.get("headers") or {}
+                        delay = parse_retry_after(headers.get("Retry-After") or headers.get("retry-after"))
+                        if delay is not None:
+                            retry_after = max(retry_after or 0.0, delay)
+                        if status in (429, 503):
+                            throttled = status
+            
+            if not resend:
+                break
+            if any(results[index]["status"] in RETRYABLE_STATUS for index in resend):
+                attempt += 1
+                if attempt > max_retries:
+                    break
+                if throttled:
+                    throttle.on_throttled(throttled, retry_after)
+                GRAPH_RETRIES.labels(reason="batch").inc()
+                time.sleep(retry_after if retry_after is not None else backoff_delay(attempt))
+            pending = sorted(resend)
+        
+        return results
+    
+    @staticmethod
+    def _item_stat(path: str, item: dict) -> ItemStat:
+        """Build an ItemStat from a Graph driveItem."""
+        modified = item.get("lastModifiedDateTime")
+        return ItemStat(
+            path=path,
+            is_folder="folder" in item,
+            size=None if "folder" in item else item.get("size"),
+            modified=datetime.fromisoformat(modified.replace("Z", "+00:00")).timestamp() if modified else None,
+            item_id=item.get("id")
+        )
+    
     def _create_folder_raw(self, path: str) -> bool:
         """
         Create a folder in SharePoint using raw path (without adding base_path).
@@ -143,8 +478,8 @@ class SharePointStorageProvider(StorageProvider):
             parent_path = str(Path(path).parent)
             folder_name = Path(path).name
             
-            # Create folder using Graph API
-            url = f"{self.graph_url}/drives/{self.drive_id}/root:/{parent_path}:/children"
+            # Create under the parent's item ID when known, else by parent path
+            parent_url, fallback_url = self._item_url(parent_path)
             
             payload = {
                 "name": folder_name,
@@ -152,17 +487,27 @@ class SharePointStorageProvider(StorageProvider):
                 "@microsoft.graph.conflictBehavior": "fail"  # Fail if exists instead of creating duplicate
             }
             
-            response = requests.post(url, json=payload, headers=self._get_headers())
+            response = self._graph_request(
+                "create_folder", "POST", f"{parent_url}/children",
+                fallback_url=f"{fallback_url}/children" if fallback_url else None,
+                stale_path=parent_path,
+                json=payload
+            )
             
             if response.status_code in [200, 201]:
-                logger.info(f"Created folder: {path}")
+                # conflictBehavior "fail" guarantees a new, empty folder
+                self._item_cache.remember(response.json())
+                self._item_cache.mark_empty(path)
+                logger.debug("Created folder: %s", path)
                 return True
             else:
+                if response.status_code == 409:
+                    self._item_cache.put(path, None, is_folder=True)
                 error_msg = response.json().get("error", {}).get("message", "Unknown error")
                 raise StorageError(f"Failed to create folder: {error_msg}")
                 
         except Exception as e:
-            logger.error(f"Failed to create folder {path}: {e}")
+            logger.error("Failed to create folder %s: %s", path, e)
             raise StorageError(f"Failed to create folder: {e}")
     
     def create_folder(self, path: str) -> bool:
@@ -181,10 +526,59 @@ class SharePointStorageProvider(StorageProvider):
         item_path = self._get_item_path(path)
         return self._create_folder_raw(item_path)
     
+    def _list_children_raw(self, path: str) -> Optional[List[dict]]:
+        """
+        List the children of a folder and cache the result.
+        
+        Only name, id, folder and eTag are requested so that large folders
+        stay cheap to list. Paged results are followed.
+        
+        Args:
+            path: Full folder path (already includes base_path).
+            
+        Returns:
+            List of child driveItem dicts, or None if the folder does not exist.
+            
+        Raises:
+            StorageError: If the listing fails.
+        """
+        folder_url, fallback_url = self._item_url(path)
+        response = self._graph_request(
+            "list_children", "GET", f"{folder_url}/children",
+            fallback_url=f"{fallback_url}/children" if fallback_url else None,
+            stale_path=path,
+            params={"$select": "name,id,folder,eTag", "$top": "999"}
+        )
+        
+        children = []
+        while True:
+            if response.status_code == 404:
+                return None
+            if response.status_code != 200:
+                error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                raise StorageError(f"Failed to list folder {path}: {error_msg}")
+            
+            body = response.json()
+            children.extend(body.get("value", []))
+            next_link = body.get("@odata.nextLink")
+            if not next_link:
+                break
+            # nextLink already carries the query
+            response = self._graph_request("list_children", "GET", next_link)
+        
+        self._item_cache.put_listing(path, children)
+        if self._item_cache.get(path) is None:
+            self._item_cache.put(path, None, is_folder=True)
+        return children
+    
     def _folder_exists_raw(self, path: str) -> bool:
         """
         Check if a folder exists in SharePoint using raw path.
         
+        The check is answered from the item cache when possible. Otherwise
+        the parent folder is listed in a single call, which also caches
+        every sibling for later checks.
+        
         Args:
             path: Full path to check (already includes base_path).
             
@@ -192,16 +586,23 @@ class SharePointStorageProvider(StorageProvider):
             True if folder exists, False otherwise.
         """
         try:
-            url = f"{self.graph_url}/drives/{self.drive_id}/root:/{path}"
+            cached = self._item_cache.exists(path)
+            if cached is not None:
+                logger.debug("Folder exists check for %s (cached): %s", path, cached)
+                return cached
             
-            response = requests.get(url, headers=self._get_headers())
-            exists = response.status_code == 200
+            parent_path = str(Path(path).parent).replace("\\", "/")
+            children = self._list_children_raw("" if parent_path == "." else parent_path)
+            name = Path(path).name.casefold()
+            exists = children is not None and any(
+                child.get("name", "").casefold() == name for child in children
+            )
             
-            logger.debug(f"Folder exists check for {path}: {exists}")
+            logger.debug("Folder exists check for %s: %s", path, exists)
             return exists
             
         except Exception as e:
-            logger.error(f"Error checking folder existence for {path}: {e}")
+            logger.error("Error checking folder existence for %s: %s", path, e)
             return False
     
     def folder_exists(self, path: str) -> bool:
@@ -230,6 +631,28 @@ class SharePointStorageProvider(StorageProvider):
         Returns:
             True if upload was successful.
             
+        Raises:
+            StorageError: If upload fails.
+        """
+        # Small files go in one request as a view of the upload buffer; larger
+        # ones are streamed through an upload session, one chunk at a time
+        stream = open_upload_stream(file_content)
+        if stream.size <= SIMPLE_UPLOAD_MAX_BYTES:
+            return self._upload_bytes_raw(stream.view(), destination, filename)
+        return self._upload_session_raw(stream, destination, filename)
+    
+    def _upload_bytes_raw(self, data, destination: str, filename: str) -> bool:
+        """
+        Upload in-memory content to SharePoint using raw path.
+        
+        Args:
+            data: File content (bytes or a bytes-like object such as a memoryview).
+            destination: Full destination folder path (already includes base_path).
+            filename: Name of the file.
+        
+        Returns:
+            True if upload was successful.
+        
         Raises:
             StorageError: If upload fails.
         """
@@ -239,22 +662,97 @@ class SharePointStorageProvider(StorageProvider):
             
             # For files < 4MB, use simple upload
             # For larger files, use resumable upload session
-            url = f"{self.graph_url}/drives/{self.drive_id}/root:/{item_path}:/content"
+            # Upload under the folder's item ID when known; by path, Graph
+            # also creates missing parent folders
+            path_url = f"{self._path_url(item_path)}/content"
+            parent_id = self._cached_item_id(destination)
+            if parent_id:
+                url = (
+                    f"{self.graph_url}/drives/{self.drive_id}/items/{parent_id}"
+                    f":/{quote(filename, safe='')}:/content"
+                )
+                fallback_url = path_url
+            else:
+                url, fallback_url = path_url, None
             
             headers = self._get_headers()
             headers["Content-Type"] = "application/octet-stream"
             
-            response = requests.put(url, data=file_content.getvalue(), headers=headers)
+            started = time.perf_counter()
+            response = self._graph_request(
+                "upload", "PUT", url,
+                fallback_url=fallback_url,
+                stale_path=destination,
+                data=data,
+                headers=headers
+            )
             
             if response.status_code in [200, 201]:
-                logger.info(f"Uploaded file: {item_path}")
+                # Only bytes Graph accepted count as transferred
+                record_bytes(len(data))
+                GRAPH_BYTES.inc(len(data))
+                self._item_cache.remember(response.json())
+                report_progress(len(data), files_done=1, seconds=time.perf_counter() - started)
+                logger.debug("Uploaded file: %s", item_path)
                 return True
             else:
                 error_msg = response.json().get("error", {}).get("message", "Unknown error")
                 raise StorageError(f"Failed to upload file: {error_msg}")
+        
+        except Exception as e:
+            logger.error("Failed to upload file %s to %s: %s", filename, destination, e)
+            raise StorageError(f"Failed to upload file: {e}")
+    
+    def _upload_session_raw(self, stream: UploadStream, destination: str, filename: str) -> bool:
+        """
+        Upload a large file through a Graph upload session, chunk by chunk.
+        
+        Args:
+            stream: File content.
+            destination: Full destination folder path (already includes base_path).
+            filename: Name of the file.
+        
+        Returns:
+            True if upload was successful.
+        
+        Raises:
+            StorageError: If upload fails.
+        """
+        item_path = f"{destination}/{filename}"
+        try:
+            response = self._graph_request(
+                "create_upload_session", "POST", f"{self._path_url(item_path)}/createUploadSession",
+                json={"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+            )
+            if response.status_code != 200:
+                error_msg = response.json().get("error", {}).get("message", "Unknown error")
+                raise StorageError(f"Failed to create upload session: {error_msg}")
+            upload_url = response.json()["uploadUrl"]
+            
+            offset = 0
+            for chunk in stream.chunks(get_chunk_size()):
+                end = offset + len(chunk) - 1
+                # The upload URL is pre-authenticated: no Authorization header
+                started = time.perf_counter()
+                response = self._send("upload_chunk", "PUT", upload_url, data=chunk, headers={
+                    "Content-Length": str(len(chunk)),
+                    "Content-Range": f"bytes {offset}-{end}/{stream.size}"
+                })
+                if response.status_code not in (200, 201, 202):
+                    self._send("cancel_upload_session", "DELETE", upload_url)
+                    raise StorageError(f"Upload failed at byte {offset}: HTTP {response.status_code}")
+                record_bytes(len(chunk))
+                GRAPH_BYTES.inc(len(chunk))
+                report_progress(len(chunk), seconds=time.perf_counter() - started)
+                offset = end + 1
+            
+            self._item_cache.remember(response.json())
+            report_progress(files_done=1)
+            logger.debug("Uploaded file in %s-byte chunks: %s", get_chunk_size(), item_path)
+            return True
                 
         except Exception as e:
-            logger.error(f"Failed to upload file {filename} to {destination}: {e}")
+            logger.error("Failed to upload file %s to %s: %s", filename, destination, e)
             raise StorageError(f"Failed to upload file: {e}")
     
     def upload_file(self, file_content: BinaryIO, destination: str, filename: str) -> bool:
@@ -291,20 +789,94 @@ class SharePointStorageProvider(StorageProvider):
         """
         uploaded_paths = []
         
+        # Resolve the destination once so every upload is addressed by ID;
+        # a single file goes by path rather than paying for the lookup
+        if len(files) > 1:
+            self._resolve_item_id(destination)
+        
         for filename, file_content in files:
             try:
                 # Use _raw method to avoid double base_path
                 # destination already includes base_path from StorageService
-                self._upload_file_raw(file_content, destination, filename)
+                with span("upload", filename=filename):
+                    self._upload_file_raw(file_content, destination, filename)
                 uploaded_paths.append(f"{destination}/{filename}")
             except StorageError as e:
-                logger.error(f"Failed to upload {filename}: {e}")
+                logger.error("Failed to upload %s: %s", filename, e)
                 raise
         
-        logger.info(f"Uploaded {len(uploaded_paths)} files to {destination}")
+        logger.info("Uploaded %s files to %s", len(uploaded_paths), destination)
         return uploaded_paths
     
-    def copy_template(self, template_path: str, destination: str) -> bool:
+    def copy_file(self, source_path: str, destination: str, filename: str) -> bool:
+        """
+        Copy a stored file inside the drive with Graph's server-side copy.
+        
+        Graph answers 202 with a monitor URL; the copy is polled until it
+        completes or GRAPH_COPY_TIMEOUT seconds pass.
+        
+        Args:
+            source_path: Full path of the stored file (already includes base_path).
+            destination: Full destination folder path (already includes base_path).
+            filename: Name of the copy.
+        
+        Returns:
+            True if the copy completed, False if the source or destination
+            folder is missing or the copy did not complete in time.
+        
+        Raises:
+            StorageError: If Graph rejects the copy.
+        """
+        source_id = self._resolve_item_id(source_path)
+        parent_id = self._resolve_item_id(destination) if source_id else None
+        if not source_id or not parent_id:
+            return False
+        
+        response = self._graph_request(
+            "copy", "POST",
+            f"{self.graph_url}/drives/{self.drive_id}/items/{source_id}/copy",
+            params={"@microsoft.graph.conflictBehavior": "replace"},
+            json={
+                "parentReference": {"driveId": self.drive_id, "id": parent_id},
+                "name": filename
+            }
+        )
+        if response.status_code == 404:
+            # Source deleted since it was cached or indexed
+            self._item_cache.invalidate(source_path)
+            return False
+        if response.status_code != 202:
+            error_msg = response.json().get("error", {}).get("message", "Unknown error")
+            raise StorageError(f"Failed to copy file: {error_msg}")
+        
+        # The monitor URL is pre-authenticated and must not get the token; polls
+        # go through the shared throttle and retry 429/503 like other requests
+        monitor_url = response.headers.get("Location")
+        deadline = time.monotonic() + float(os.getenv("GRAPH_COPY_TIMEOUT", DEFAULT_COPY_TIMEOUT))
+        interval = 0.1
+        while monitor_url and time.monotonic() < deadline:
+            status = self._send("copy_monitor", "GET", monitor_url, allow_redirects=False, timeout=30)
+            if status.status_code == 303:
+                break
+            job = status.json() if status.status_code in (200, 202) else {}
+            if job.get("status") == "completed":
+                if job.get("resourceId"):
+                    self._item_cache.put(f"{destination}/{filename}", job["resourceId"], is_folder=False)
+                break
+            if job.get("status") == "failed":
+                logger.warning("Graph copy of %s failed: %s", source_path, job.get("error"))
+                return False
+            time.sleep(interval)
+            interval = min(interval * 2, 2.0)
+        else:
+            if monitor_url:
+                logger.warning("Graph copy of %s did not complete in time", source_path)
+                return False
+        
+        logger.debug("Copied file: %s -> %s/%s", source_path, destination, filename)
+        return True
+    
+    def copy_template(self, template_path: str, destination: str, skip_existing: bool = False) -> bool:
         """
         Copy a local template folder to a destination in SharePoint.
         
@@ -314,6 +886,8 @@ class SharePointStorageProvider(StorageProvider):
         Args:
             template_path: Path to the LOCAL template folder.
             destination: Destination path in SharePoint.
+            skip_existing: Leave files already at the destination with their
+                template size alone (resumes an interrupted copy).
             
         Returns:
             True if copy was successful.
@@ -322,7 +896,6 @@ class SharePointStorageProvider(StorageProvider):
             StorageError: If copy fails or template doesn't exist.
         """
         from pathlib import Path
-        from io import BytesIO
         
         template_path_obj = Path(template_path)
         
@@ -333,7 +906,7 @@ class SharePointStorageProvider(StorageProvider):
         if not template_path_obj.is_dir():
             raise StorageError(f"Template path is not a directory: {template_path}")
         
-        logger.info(f"Copying template from {template_path} to SharePoint: {destination}")
+        logger.info("Copying template from %s to SharePoint: %s", template_path, destination)
         
         try:
             # NOTE: destination already includes base_path (e.g., "01_2025/1_ICT/...")
@@ -347,51 +920,60 @@ class SharePointStorageProvider(StorageProvider):
             files_copied = 0
             folders_created = 0
             
-            # Recursively walk through template directory
-            for item in template_path_obj.rglob("*"):
-                # Calculate relative path from template root
-                relative_path = item.relative_to(template_path_obj)
+            # Per-item logs are sampled so large templates don't flood the log
+            folder_log = SampledLogger(logger, every=10)
+            progress_log = SampledLogger(logger, every=10)
+            
+            # Folders (parents first) and files come from the cached template
+            # manifest instead of walking the template directory
+            manifest = get_template_manifest(template_path)
+            blob_cache = get_template_blob_cache()
+            
+            for folder in manifest.folders:
                 # destination already includes base_path, so we use it directly
-                sharepoint_path = f"{destination}/{relative_path}".replace("\\", "/")
+                sharepoint_path = f"{destination}/{folder}"
                 
-                if item.is_dir():
-                    # Create folder in SharePoint (use raw path)
-                    try:
-                        self._create_folder_raw(sharepoint_path)
-                        folders_created += 1
-                        logger.debug(f"Created folder: {sharepoint_path}")
-                    except StorageError as e:
-                        # Folder might already exist, continue
-                        logger.debug(f"Folder creation skipped (might exist): {sharepoint_path}")
+                if self._item_cache.exists(sharepoint_path):
+                    folder_log.debug("Folder already exists, skipped: %s", sharepoint_path)
+                    continue
+                    
+                # Create folder in SharePoint (use raw path)
+                try:
+                    self._create_folder_raw(sharepoint_path)
+                    folders_created += 1
+                    folder_log.debug("Created folder: %s", sharepoint_path)
+                except StorageError as e:
+                    # Folder might already exist, continue
+                    folder_log.debug("Folder creation skipped (might exist): %s", sharepoint_path)
                 
-                elif item.is_file():
-                    # Upload file to SharePoint (use raw path)
-                    try:
-                        with open(item, 'rb') as f:
-                            file_content = BytesIO(f.read())
-                            parent_folder = str(Path(sharepoint_path).parent)
-                            filename = item.name
-                            
-                            self._upload_file_raw(file_content, parent_folder, filename)
-                            files_copied += 1
+            files = list(manifest.files)
+            if skip_existing:
+                files = self._files_to_copy(files, self.stat_many([f"{destination}/{entry.path}" for entry in files]))
+            
+            for entry in files:
+                # Upload file to SharePoint (use raw path), straight from the mapped template file
+                try:
+                    data = blob_cache.read(manifest, entry)
+                    parent_folder = f"{destination}/{entry.parent}" if entry.parent else destination
                             
-                            if files_copied % 10 == 0:  # Progress log every 10 files
-                                logger.info(f"Progress: {files_copied} files copied...")
+                    self._upload_bytes_raw(data, parent_folder, entry.name)
+                    files_copied += 1
+                    progress_log.info("Progress: %s files copied...", files_copied)
                                 
-                    except Exception as e:
-                        logger.error(f"Failed to upload file {item.name}: {e}")
-                        raise StorageError(f"Failed to upload {item.name}: {e}")
+                except Exception as e:
+                    logger.error("Failed to upload file %s: %s", entry.name, e)
+                    raise StorageError(f"Failed to upload {entry.name}: {e}")
             
             logger.info(
-                f"✅ Template copied successfully: "
-                f"{folders_created} folders created, {files_copied} files uploaded"
+                "✅ Template copied successfully: %s folders created, %s files uploaded",
+                folders_created, files_copied
             )
             return True
             
         except StorageError:
             raise
         except Exception as e:
-            logger.error(f"Failed to copy template: {e}", exc_info=True)
+            logger.error("Failed to copy template: %s", e, exc_info=True)
             raise StorageError(f"Failed to copy template from {template_path}: {e}")
     
     def write_file(self, content: str, destination: str, filename: str) -> bool:
@@ -420,7 +1002,7 @@ class SharePointStorageProvider(StorageProvider):
             return self._upload_file_raw(file_content, destination, filename)
             
         except Exception as e:
-            logger.error(f"Failed to write file {filename} to {destination}: {e}")
+            logger.error("Failed to write file %s to %s: %s", filename, destination, e)
             raise StorageError(f"Failed to write file: {e}")
     
     def get_full_path(self, *path_parts: str) -> str:
@@ -437,6 +1019,121 @@ class SharePointStorageProvider(StorageProvider):
         full_path = "/".join([base] + list(path_parts)).replace("//", "/")
         return full_path
 
+    def create_folders(self, paths: List[str]) -> List[bool]:
+        """
+        Create several folders with one $batch call per depth level.
+        
+        Folders already known to exist are skipped; parents are created
+        before their children.
+        
+        Args:
+            paths: Full folder paths (already include base_path).
+        
+        Returns:
+            One bool per path: True if created by this call, False if it already existed.
+        
+        Raises:
+            StorageError: If any folder cannot be created.
+        """
+        results: Dict[str, bool] = {}
+        failures = []
+        levels: Dict[int, List[str]] = {}
+        for path in set(paths):
+            levels.setdefault(len(Path(path).parts), []).append(path)
+        
+        for depth in sorted(levels):
+            todo = []
+            for path in levels[depth]:
+                if self._item_cache.exists(path):
+                    results[path] = False
+                else:
+                    todo.append(path)
+            
+            requests = []
+            for path in todo:
+                parent_path = str(Path(path).parent)
+                parent_url, fallback_url = self._item_url(parent_path)
+                requests.append({
+                    "method": "POST",
+                    "url": f"{parent_url}/children",
+                    "fallback_url": f"{fallback_url}/children" if fallback_url else None,
+                    "stale_path": parent_path,
+                    "body": {
+                        "name": Path(path).name,
+                        "folder": {},
+                        "@microsoft.graph.conflictBehavior": "fail"
+                    }
+                })
+            
+            for path, response in zip(todo, self._batch("create_folder", requests)):
+                if response["status"] in (200, 201):
+                    self._item_cache.remember(response["body"])
+                    self._item_cache.mark_empty(path)
+                    results[path] = True
+                elif response["status"] == 409:
+                    self._item_cache.put(path, None, is_folder=True)
+                    results[path] = False
+                else:
+                    error_msg = (response.get("body") or {}).get("error", {}).get("message", "Unknown error")
+                    failures.append(f"{path}: {error_msg}")
+        
+        if failures:
+            logger.error("Failed to create %s folders: %s", len(failures), failures)
+            raise StorageError(f"Failed to create {len(failures)} folder(s): {failures[0]}")
+        
+        logger.info("Created %s of %s folders", sum(results.values()), len(results))
+        return [results[path] for path in paths]
+    
+    def stat_many(self, paths: List[str]) -> List[Optional[ItemStat]]:
+        """
+        Get metadata of several items with $batch (20 items per request).
+        
+        Args:
+            paths: Full item paths (already include base_path).
+        
+        Returns:
+            One ItemStat per path (None if it does not exist).
+        
+        Raises:
+            StorageError: If an item cannot be read.
+        """
+        requests = [
+            {"method": "GET", "url": f"{self._path_url(path)}?$select={ITEM_SELECT}"}
+            for path in paths
+        ]
+        
+        stats = []
+        for path, response in zip(paths, self._batch("get_item", requests)):
+            if response["status"] == 404:
+                stats.append(None)
+            elif response["status"] == 200:
+                self._item_cache.remember(response["body"])
+                stats.append(self._item_stat(path, response["body"]))
+            else:
+                error_msg = (response.get("body") or {}).get("error", {}).get("message", "Unknown error")
+                raise StorageError(f"Failed to read {path}: {error_msg}")
+        return stats
+    
+    def exists_many(self, paths: List[str]) -> List[bool]:
+        """
+        Check whether several items exist.
+        
+        Answers from the item cache where possible; the rest are read with $batch.
+        
+        Args:
+            paths: Full item paths (already include base_path).
+        
+        Returns:
+            One bool per path.
+        """
+        results = [self._item_cache.exists(path) for path in paths]
+        unknown = [index for index, exists in enumerate(results) if exists is None]
+        if unknown:
+            stats = self.stat_many([paths[index] for index in unknown])
+            for index, stat in zip(unknown, stats):
+                results[index] = stat is not None
+        return results
+
 
 # Factory function to create storage provider based on configuration
 def create_storage_provider(provider_type: str, **kwargs) -> StorageProvider:
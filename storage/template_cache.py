@@ -0,0 +1,157 @@
+"""
+Template Blob Cache Module
+
+This module keeps template files memory-mapped, so copy_template hands the
+uploaders zero-copy ``memoryview`` slices instead of reading every
+template file into a new BytesIO for every project.
+
+Entries are keyed by file path, size and mtime as recorded in the template
+manifest: when a template file changes, the rebuilt manifest carries a new
+key and the file is mapped again; the stale mapping is dropped. The total
+size of mapped files is bounded (TEMPLATE_CACHE_MAX_BYTES); least recently
+used files are unmapped first.
+
+Mappings are read-only. Template files should be replaced (written to a
+new file and renamed), not truncated in place, while the app is running.
+
+Usage:
+    manifest = get_template_manifest(template_path)
+    for entry in manifest.files:
+        data = get_template_blob_cache().read(manifest, entry)
+        upload(data)
+"""
+
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .template_manifest import TemplateFile, TemplateManifest
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+TEMPLATE_CACHE_LOOKUPS = REGISTRY.counter(
+    "template_cache_lookups_total",
+    "Template blob cache lookups by result",
+    ["result"]
+)
+TEMPLATE_CACHE_BYTES = REGISTRY.gauge(
+    "template_cache_bytes",
+    "Bytes of template files currently memory-mapped"
+)
+
+# Upper bound of mapped template bytes (override with TEMPLATE_CACHE_MAX_BYTES)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+CacheKey = Tuple[str, int, int]
+
+
+class TemplateBlobCache:
+    """Thread-safe LRU cache of memory-mapped template files."""
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Upper bound of mapped bytes (0 disables caching).
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._maps: "OrderedDict[CacheKey, mmap.mmap]" = OrderedDict()
+        self._bytes = 0
+    
+    @property
+    def cached_bytes(self) -> int:
+        """Bytes currently mapped."""
+        return self._bytes
+    
+    def read(self, manifest: TemplateManifest, entry: TemplateFile) -> memoryview:
+        """
+        Get the content of a template file without copying it.
+        
+        Args:
+            manifest: Manifest the entry belongs to.
+            entry: Template file.
+        
+        Returns:
+            Read-only memoryview of the file content.
+        """
+        path = manifest.local_path(entry.path)
+        key = (str(path), entry.size, entry.mtime_ns)
+        
+        with self._lock:
+            mapped = self._maps.get(key)
+            if mapped is not None:
+                self._maps.move_to_end(key)
+                TEMPLATE_CACHE_LOOKUPS.labels(result="hit").inc()
+                return memoryview(mapped)
+        
+        TEMPLATE_CACHE_LOOKUPS.labels(result="miss").inc()
+        if entry.size == 0:
+            return memoryview(b"")
+        if entry.size > self.max_bytes:
+            # Too large to keep; read it once
+            return memoryview(path.read_bytes())
+        
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        with self._lock:
+            if key not in self._maps:
+                self._drop_stale(str(path))
+                self._maps[key] = mapped
+                self._bytes += len(mapped)
+                self._evict()
+            mapped = self._maps[key]
+            TEMPLATE_CACHE_BYTES.set(self._bytes)
+        return memoryview(mapped)
+    
+    def _drop_stale(self, path: str) -> None:
+        """Drop mappings of older versions of a file (caller holds the lock)."""
+        for key in [key for key in self._maps if key[0] == path]:
+            self._bytes -= len(self._maps.pop(key))
+            logger.debug("Template file changed, remapping: %s", path)
+    
+    def _evict(self) -> None:
+        """Unmap least recently used files above the bound (caller holds the lock)."""
+        while self._bytes > self.max_bytes and len(self._maps) > 1:
+            key, mapped = self._maps.popitem(last=False)
+            self._bytes -= len(mapped)
+            logger.debug("Evicted template file from cache: %s", key[0])
+        # Mappings are not closed explicitly: uploads may still hold views
+        # of them, and the mapping is released with its last view
+    
+    def clear(self) -> None:
+        """Drop all mappings."""
+        with self._lock:
+            self._maps.clear()
+            self._bytes = 0
+            TEMPLATE_CACHE_BYTES.set(0)
+
+
+# Singleton shared by all providers in the process
+_blob_cache: Optional[TemplateBlobCache] = None
+_blob_cache_lock = threading.Lock()
+
+
+def get_template_blob_cache() -> TemplateBlobCache:
+    """
+    Get the process-wide template blob cache.
+    
+    The memory bound is read from TEMPLATE_CACHE_MAX_BYTES.
+    
+    Returns:
+        TemplateBlobCache instance.
+    """
+    global _blob_cache
+    if _blob_cache is None:
+        with _blob_cache_lock:
+            if _blob_cache is None:
+                _blob_cache = TemplateBlobCache(
+                    max_bytes=int(os.getenv("TEMPLATE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+                )
+    return _blob_cache
@@ -0,0 +1,328 @@
+"""
+Template Manifest Module
+
+This module describes a local template folder (TEMPLATES/TEMPLATE_*) as a
+manifest: its folders and files, sorted, with sizes, mtimes and SHA-256
+digests. Providers drive copy_template from the manifest instead of
+walking the template with rglob and stat calls on every project.
+
+Manifests are cached per template. A cached manifest is reused without
+touching the filesystem for TEMPLATE_MANIFEST_CHECK_INTERVAL seconds;
+after that the template is re-scanned (stat only) and the manifest is
+rebuilt if anything changed, re-hashing only files whose size or mtime
+differ. ``TemplateManifest.diff`` compares two manifests, so a changed
+template can be re-staged by copying only what changed.
+
+Usage:
+    manifest = get_template_manifest("TEMPLATES/TEMPLATE_ICT")
+    for folder in manifest.folders:
+        ...
+    for entry in manifest.files:
+        print(entry.path, entry.size, entry.sha256)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.exceptions import StorageError
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+MANIFEST_BUILDS = REGISTRY.counter(
+    "template_manifest_builds_total",
+    "Template manifests built or rebuilt after a change"
+)
+MANIFEST_HASHED_FILES = REGISTRY.counter(
+    "template_manifest_hashed_files_total",
+    "Template files hashed while building manifests"
+)
+
+# Seconds a manifest is trusted before the template is re-scanned (override with TEMPLATE_MANIFEST_CHECK_INTERVAL)
+DEFAULT_CHECK_INTERVAL = 5.0
+
+# Read size while hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TemplateFile:
+    """A file of a template, relative to the template root."""
+    path: str          # POSIX-style relative path, e.g. "1_Customer_Info/readme.txt"
+    size: int
+    mtime_ns: int
+    sha256: str
+    
+    @property
+    def parent(self) -> str:
+        """Relative path of the containing folder ("" for the root)."""
+        return self.path.rpartition("/")[0]
+    
+    @property
+    def name(self) -> str:
+        """File name."""
+        return self.path.rpartition("/")[2]
+
+
+@dataclass(frozen=True)
+class ManifestDiff:
+    """Differences between two manifests of the same template."""
+    added_folders: List[str] = field(default_factory=list)
+    removed_folders: List[str] = field(default_factory=list)
+    added_files: List[TemplateFile] = field(default_factory=list)
+    changed_files: List[TemplateFile] = field(default_factory=list)
+    removed_files: List[str] = field(default_factory=list)
+    
+    @property
+    def empty(self) -> bool:
+        """Whether the manifests describe the same content."""
+        return not (self.added_folders or self.removed_folders or self.added_files
+                    or self.changed_files or self.removed_files)
+    
+    def files_to_copy(self) -> List[TemplateFile]:
+        """Files a re-staging has to copy (added or changed)."""
+        return sorted(self.added_files + self.changed_files, key=lambda entry: entry.path)
+
+
+@dataclass(frozen=True)
+class TemplateManifest:
+    """
+    Snapshot of a template folder.
+    
+    Folders are sorted parents first, so they can be created in order;
+    files are sorted by path.
+    """
+    root: Path
+    folders: Tuple[str, ...]
+    files: Tuple[TemplateFile, ...]
+    built_at: float
+    
+    @property
+    def total_size(self) -> int:
+        """Total size of the template files in bytes."""
+        return sum(entry.size for entry in self.files)
+    
+    def folder_levels(self) -> Dict[int, List[str]]:
+        """
+        Folders grouped by depth (1 = direct children of the root).
+        
+        Returns:
+            Mapping of depth to relative folder paths, in manifest order.
+        """
+        levels: Dict[int, List[str]] = {}
+        for folder in self.folders:
+            levels.setdefault(folder.count("/") + 1, []).append(folder)
+        return levels
+    
+    def local_path(self, relative_path: str) -> Path:
+        """Absolute local path of a manifest entry."""
+        return self.root.joinpath(*relative_path.split("/"))
+    
+    def diff(self, newer: "TemplateManifest") -> ManifestDiff:
+        """
+        Compare with a newer manifest of the same template.
+        
+        Args:
+            newer: The later manifest.
+        
+        Returns:
+            What was added, changed (different digest) or removed.
+        """
+        old_files = {entry.path: entry for entry in self.files}
+        new_files = {entry.path: entry for entry in newer.files}
+        old_folders, new_folders = set(self.folders), set(newer.folders)
+        return ManifestDiff(
+            added_folders=[folder for folder in newer.folders if folder not in old_folders],
+            removed_folders=[folder for folder in self.folders if folder not in new_folders],
+            added_files=[entry for path, entry in new_files.items() if path not in old_files],
+            changed_files=[
+                entry for path, entry in new_files.items()
+                if path in old_files and old_files[path].sha256 != entry.sha256
+            ],
+            removed_files=[path for path in old_files if path not in new_files]
+        )
+
+
+def _hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan(root: Path) -> Tuple[List[str], Dict[str, Tuple[int, int]]]:
+    """
+    Stat a template tree with os.scandir.
+    
+    Returns:
+        Tuple of (sorted relative folder paths, relative file path -> (size, mtime_ns)).
+    """
+    folders: List[str] = []
+    files: Dict[str, Tuple[int, int]] = {}
+    pending = [("", str(root))]
+    while pending:
+        relative, directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                child = f"{relative}/{entry.name}" if relative else entry.name
+                if entry.is_dir():
+                    folders.append(child)
+                    pending.append((child, entry.path))
+                elif entry.is_file():
+                    info = entry.stat()
+                    files[child] = (info.st_size, info.st_mtime_ns)
+    # Parents first: sort by depth, then by path
+    folders.sort(key=lambda folder: (folder.count("/"), folder))
+    return folders, files
+
+
+def build_manifest(template_path: str, previous: Optional[TemplateManifest] = None) -> TemplateManifest:
+    """
+    Build the manifest of a template folder.
+    
+    Args:
+        template_path: Local template folder.
+        previous: Earlier manifest of the same folder; digests of files with
+            unchanged size and mtime are reused instead of re-hashing.
+    
+    Returns:
+        TemplateManifest.
+    
+    Raises:
+        StorageError: If the template folder does not exist.
+    """
+    root = Path(template_path)
+    if not root.is_dir():
+        raise StorageError(f"Template not found locally: {template_path}")
+    
+    folders, stats = _scan(root)
+    known = {entry.path: entry for entry in previous.files} if previous is not None else {}
+    files = []
+    hashed = 0
+    for path in sorted(stats):
+        size, mtime_ns = stats[path]
+        cached = known.get(path)
+        if cached is not None and cached.size == size and cached.mtime_ns == mtime_ns:
+            files.append(cached)
+            continue
+        files.append(TemplateFile(path, size, mtime_ns, _hash_file(root / path)))
+        hashed += 1
+    
+    MANIFEST_BUILDS.inc()
+    MANIFEST_HASHED_FILES.inc(hashed)
+    logger.info(
+        "Built template manifest for %s: %s folders, %s files (%s hashed)",
+        root.name, len(folders), len(files), hashed
+    )
+    return TemplateManifest(root=root, folders=tuple(folders), files=tuple(files), built_at=time.time())
+
+
+class TemplateManifestCache:
+    """Thread-safe cache of template manifests, rebuilt when templates change."""
+    
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        """
+        Initialize the cache.
+        
+        Args:
+            check_interval: Seconds a manifest is reused before re-scanning.
+        """
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._manifests: Dict[str, TemplateManifest] = {}
+        self._checked_at: Dict[str, float] = {}
+    
+    def get(self, template_path: str) -> TemplateManifest:
+        """
+        Get the current manifest of a template folder.
+        
+        Args:
+            template_path: Local template folder.
+        
+        Returns:
+            TemplateManifest (rebuilt if the template changed).
+        
+        Raises:
+            StorageError: If the template folder does not exist.
+        """
+        key = str(Path(template_path).resolve())
+        with self._lock:
+            cached = self._manifests.get(key)
+            now = time.monotonic()
+            if cached is not None and now - self._checked_at[key] < self.check_interval:
+                return cached
+            
+            if cached is not None and cached.root.is_dir():
+                folders, stats = _scan(cached.root)
+                unchanged = (
+                    tuple(folders) == cached.folders
+                    and stats == {entry.path: (entry.size, entry.mtime_ns) for entry in cached.files}
+                )
+                if unchanged:
+                    self._checked_at[key] = now
+                    return cached
+            
+            manifest = build_manifest(template_path, previous=cached)
+            if cached is not None:
+                changes = cached.diff(manifest)
+                logger.info(
+                    "Template %s changed: %s files added, %s changed, %s removed",
+                    manifest.root.name, len(changes.added_files), len(changes.changed_files),
+                    len(changes.removed_files)
+                )
+            self._manifests[key] = manifest
+            self._checked_at[key] = now
+            return manifest
+    
+    def invalidate(self, template_path: Optional[str] = None) -> None:
+        """Forget one template's manifest, or all of them."""
+        with self._lock:
+            if template_path is None:
+                self._manifests.clear()
+                self._checked_at.clear()
+            else:
+                key = str(Path(template_path).resolve())
+                self._manifests.pop(key, None)
+                self._checked_at.pop(key, None)
+
+
+# Singleton shared by all providers in the process
+_manifest_cache: Optional[TemplateManifestCache] = None
+_manifest_cache_lock = threading.Lock()
+
+
+def get_template_manifest(template_path: str) -> TemplateManifest:
+    """
+    Get the cached manifest of a template folder.
+    
+    The re-scan interval is read from TEMPLATE_MANIFEST_CHECK_INTERVAL
+    (seconds, default 5).
+    
+    Args:
+        template_path: Local template folder.
+    
+    Returns:
+        TemplateManifest.
+    
+    Raises:
+        StorageError: If the template folder does not exist.
+    """
+    global _manifest_cache
+    if _manifest_cache is None:
+        with _manifest_cache_lock:
+            if _manifest_cache is None:
+                _manifest_cache = TemplateManifestCache(
+                    check_interval=float(os.getenv("TEMPLATE_MANIFEST_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL))
+                )
+    return _manifest_cache.get(template_path)
@@ -0,0 +1,9 @@
+"""Fixtures shared by the storage tests."""
+
+import pytest
+
+
+@pytest.fixture
+def provider(storage_service):
+    """SharePoint provider of ``storage_service`` (talks to the fake Graph server)."""
+    return storage_service.provider
@@ -0,0 +1,160 @@
+"""Tests for storage.async_sharepoint_storage."""
+
+import asyncio
+import io
+
+import pytest
+
+from benchmarks.fake_graph import FakeGraphServer
+from benchmarks.fake_server import FaultConfig
+from benchmarks.run_offline import DRIVE_ID, build_storage_service
+from core.exceptions import StorageError
+from core.instrumentation import span
+from storage import async_sharepoint_storage
+from storage.async_sharepoint_storage import EventLoopThread, gather_limited
+from storage.sharepoint_storage import GRAPH_BYTES
+
+
+def build_async_provider(graph):
+    return build_storage_service(graph, async_graph=True).provider
+
+
+@pytest.fixture
+def async_provider(settings, fake_graph):
+    provider = build_async_provider(fake_graph)
+    yield provider
+    provider.close()
+
+
+def test_sync_facade_creates_probes_and_uploads(async_provider, fake_graph):
+    folder = async_provider.get_full_path("1_ICT", "MX", "ACME")
+    fake_graph.drive.mkdirs(async_provider.get_full_path("1_ICT", "MX"))
+    
+    assert async_provider._create_folder_raw(folder)
+    assert async_provider._folder_exists_raw(folder)
+    assert not async_provider._folder_exists_raw(f"{folder}/Missing")
+    assert async_provider._upload_file_raw(io.BytesIO(b"abc"), folder, "report.html")
+    assert async_provider.write_file("hello", folder, "notes.txt")
+    
+    assert fake_graph.drive.lookup(f"{folder}/report.html").size == 3
+    assert fake_graph.drive.lookup(f"{folder}/notes.txt").size == 5
+
+
+def test_upload_files_runs_concurrently_into_one_folder(async_provider, fake_graph):
+    folder = async_provider.get_full_path("ACME")
+    fake_graph.drive.mkdirs(folder)
+    files = [(f"photo_{index}.jpg", io.BytesIO(b"x" * index)) for index in range(1, 21)]
+    
+    paths = async_provider.upload_files(files, folder)
+    
+    assert paths == [f"{folder}/photo_{index}.jpg" for index in range(1, 21)]
+    assert fake_graph.drive.lookup(f"{folder}/photo_20.jpg").size == 20
+
+
+def test_large_files_go_through_an_upload_session(async_provider, fake_graph, monkeypatch):
+    monkeypatch.setattr(async_sharepoint_storage, "SIMPLE_UPLOAD_MAX_BYTES", 1024)
+    monkeypatch.setenv("UPLOAD_CHUNK_SIZE", "1")  # Rounded up to one 320 KiB unit
+    folder = async_provider.get_full_path("ACME")
+    fake_graph.drive.mkdirs(folder)
+    
+    assert async_provider._upload_file_raw(io.BytesIO(b"z" * 700_000), folder, "video.mp4")
+    assert fake_graph.drive.lookup(f"{folder}/video.mp4").size == 700_000
+
+
+def test_copy_template_creates_every_level(async_provider, fake_graph, tmp_path):
+    template = tmp_path / "ICT"
+    (template / "Photos" / "Before").mkdir(parents=True)
+    (template / "Reports").mkdir()
+    (template / "Photos" / "Before" / "readme.txt").write_bytes(b"before")
+    (template / "checklist.xlsx").write_bytes(b"sheet")
+    destination = async_provider.get_full_path("1_ICT", "ACME", "Line 1")
+    fake_graph.drive.mkdirs(destination)
+    
+    assert async_provider.copy_template(str(template), destination)
+    
+    assert fake_graph.drive.lookup(f"{destination}/Reports") is not None
+    assert fake_graph.drive.lookup(f"{destination}/Photos/Before/readme.txt").size == 6
+    assert fake_graph.drive.lookup(f"{destination}/checklist.xlsx").size == 5
+    with pytest.raises(StorageError):
+        async_provider.copy_template(str(tmp_path / "Missing"), destination)
+
+
+def test_copy_template_can_skip_files_already_copied(async_provider, fake_graph, tmp_path):
+    template = tmp_path / "ICT"
+    (template / "Reports").mkdir(parents=True)
+    (template / "Reports" / "summary.txt").write_bytes(b"summary")
+    (template / "checklist.xlsx").write_bytes(b"sheet")
+    destination = async_provider.get_full_path("1_ICT", "ACME", "Line 1")
+    fake_graph.drive.mkdirs(destination)
+    fake_graph.drive.put_file(f"{destination}/checklist.xlsx", 5)
+    fake_graph.drive.put_file(f"{destination}/Reports/summary.txt", 3)  # Cut short
+    uploaded = fake_graph.drive.bytes_uploaded
+    
+    assert async_provider.copy_template(str(template), destination, skip_existing=True)
+    
+    assert fake_graph.drive.bytes_uploaded - uploaded == 7
+    assert fake_graph.drive.lookup(f"{destination}/Reports/summary.txt").size == 7
+
+
+def test_spans_count_calls_and_only_accepted_bytes(settings, monkeypatch):
+    monkeypatch.setenv("GRAPH_MAX_RETRIES", "0")
+    with FakeGraphServer(FaultConfig(), drive_id=DRIVE_ID) as graph:
+        provider = build_async_provider(graph)
+        folder = provider.get_full_path("ACME")
+        graph.drive.mkdirs(folder)
+        try:
+            with span("upload") as ok:
+                provider._upload_file_raw(io.BytesIO(b"a" * 10), folder, "a.txt")
+            
+            graph.faults.error_rate = 1.0
+            graph.faults.error_status = 500
+            uploaded = GRAPH_BYTES._default().value
+            with pytest.raises(StorageError), span("upload") as failed:
+                provider._upload_file_raw(io.BytesIO(b"b" * 10), folder, "b.txt")
+        finally:
+            provider.close()
+    
+    assert (ok.http_calls, ok.bytes) == (1, 10)
+    assert (failed.http_calls, failed.bytes) == (1, 0)
+    assert GRAPH_BYTES._default().value == uploaded
+
+
+def test_event_loop_thread_propagates_results_and_errors():
+    loop_thread = EventLoopThread()
+    
+    async def answer():
+        return 42
+    
+    async def fail():
+        raise ValueError("boom")
+    
+    async def reenter():
+        return loop_thread.run(answer())
+    
+    try:
+        assert loop_thread.run(answer()) == 42
+        with pytest.raises(ValueError):
+            loop_thread.run(fail())
+        with pytest.raises(RuntimeError):
+            loop_thread.run(reenter())
+    finally:
+        loop_thread.stop()
+
+
+def test_gather_limited_bounds_concurrency_and_keeps_order():
+    running = []
+    peak = []
+    
+    async def work(item):
+        running.append(item)
+        peak.append(len(running))
+        await asyncio.sleep(0.001)
+        running.remove(item)
+        if item == 7:
+            raise ValueError("item 7")
+        return item * 2
+    
+    assert asyncio.run(gather_limited(range(6), work, 3)) == [0, 2, 4, 6, 8, 10]
+    assert max(peak) == 3
+    with pytest.raises(ValueError):
+        asyncio.run(gather_limited(range(10), work, 4))
@@ -0,0 +1,153 @@
+"""Tests for the batch operations of the storage providers."""
+
+import asyncio
+import io
+
+import pytest
+
+from core.exceptions import StorageError
+from storage import UploadItem
+from storage.local_storage import LocalStorageProvider
+
+
+class RewrittenResponse:
+    """Graph response whose JSON body was altered by the test."""
+    
+    def __init__(self, response, body):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.content
+        self._body = body
+    
+    def json(self):
+        return self._body
+
+
+def batch_calls(graph_calls):
+    return [url for _, url in graph_calls if url.endswith("/$batch")]
+
+
+def test_create_folders_batches_each_level(provider, fake_graph, graph_calls):
+    customer = provider.get_full_path("1_ICT", "ACME")
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT"))
+    lines = [f"{customer}/Line {index:02d}" for index in range(25)]
+    
+    assert provider.create_folders([customer] + lines) == [True] * 26
+    # One plain request for the customer, then 25 lines in two $batch calls
+    assert len(graph_calls) == 3
+    assert len(batch_calls(graph_calls)) == 2
+    assert fake_graph.drive.lookup(f"{customer}/Line 24") is not None
+
+
+def test_create_folders_reports_existing_folders(provider, fake_graph):
+    customer = provider.get_full_path("1_ICT", "ACME")
+    fake_graph.drive.mkdirs(f"{customer}/Line 1")
+    
+    assert provider.create_folders([f"{customer}/Line 1", f"{customer}/Line 2"]) == [False, True]
+    with pytest.raises(StorageError):
+        provider.create_folders([provider.get_full_path("Missing", "A"), provider.get_full_path("Missing", "B")])
+
+
+def test_create_folders_resends_stale_ids_by_path(provider, fake_graph):
+    customer = provider.get_full_path("1_ICT", "ACME")
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT"))
+    provider.create_folders([customer])
+    
+    # Deleted and recreated by someone else: the cached ID is gone
+    item = fake_graph.drive.lookup(customer)
+    del fake_graph.drive.items[item.parent_id].children[item.name.casefold()]
+    del fake_graph.drive.items[item.id]
+    fake_graph.drive.mkdirs(customer)
+    
+    assert provider.create_folders([f"{customer}/Line 1", f"{customer}/Line 2"]) == [True, True]
+    assert fake_graph.drive.lookup(f"{customer}/Line 2") is not None
+
+
+def test_stat_many_splits_batches_of_twenty(provider, fake_graph, graph_calls):
+    folder = provider.get_full_path("ACME")
+    for index in range(44):
+        fake_graph.drive.put_file(f"{folder}/photo_{index}.jpg", index)
+    paths = [f"{folder}/photo_{index}.jpg" for index in range(44)] + [f"{folder}/missing.jpg"]
+    
+    stats = provider.stat_many(paths)
+    
+    assert len(batch_calls(graph_calls)) == 3
+    assert [stat.size for stat in stats[:44]] == list(range(44))
+    assert stats[0].is_folder is False and stats[0].item_id
+    assert stats[0].modified is not None
+    assert stats[44] is None
+
+
+def test_throttled_batch_entries_are_resent(provider, fake_graph, monkeypatch):
+    folder = provider.get_full_path("ACME")
+    fake_graph.drive.put_file(f"{folder}/a.pdf", 1)
+    fake_graph.drive.put_file(f"{folder}/b.pdf", 2)
+    real_request = provider._graph_request
+    sent = []
+    
+    def graph_request(operation, method, url, **kwargs):
+        response = real_request(operation, method, url, **kwargs)
+        sent.append(len(kwargs["json"]["requests"]))
+        if len(sent) > 1:
+            return response
+        body = response.json()
+        body["responses"][0] = {"id": body["responses"][0]["id"], "status": 429, "headers": {"Retry-After": "0"}}
+        return RewrittenResponse(response, body)
+    
+    monkeypatch.setattr(provider, "_graph_request", graph_request)
+    
+    assert [stat.size for stat in provider.stat_many([f"{folder}/a.pdf", f"{folder}/b.pdf"])] == [1, 2]
+    assert sent == [2, 1]
+
+
+def test_exists_many_answers_from_the_item_cache(provider, fake_graph, graph_calls):
+    folder = provider.get_full_path("ACME")
+    fake_graph.drive.put_file(f"{folder}/a.pdf", 1)
+    fake_graph.drive.put_file(f"{folder}/b.pdf", 1)
+    paths = [f"{folder}/a.pdf", f"{folder}/b.pdf", f"{folder}/c.pdf"]
+    
+    assert provider.exists_many(paths) == [True, True, False]
+    assert len(batch_calls(graph_calls)) == 1
+    
+    provider._list_children_raw(folder)
+    graph_calls.clear()
+    assert provider.exists_many(paths) == [True, True, False]
+    assert graph_calls == []
+
+
+def test_upload_many_spans_several_folders(storage_service, fake_graph):
+    provider = storage_service.provider
+    first, second = provider.get_full_path("ACME"), provider.get_full_path("Globex")
+    items = [
+        UploadItem(first, "a.pdf", io.BytesIO(b"a")),
+        UploadItem(first, "b.pdf", io.BytesIO(b"bb")),
+        UploadItem(second, "c.pdf", io.BytesIO(b"ccc")),
+    ]
+    
+    assert provider.upload_many(items) == [f"{first}/a.pdf", f"{first}/b.pdf", f"{second}/c.pdf"]
+    assert fake_graph.drive.lookup(f"{second}/c.pdf").size == 3
+
+
+def test_local_batch_operations(tmp_path):
+    provider = LocalStorageProvider(tmp_path)
+    folders = [str(tmp_path / "ACME" / "Line 1"), str(tmp_path / "ACME")]
+    (tmp_path / "ACME").mkdir()
+    
+    assert provider.create_folders(folders) == [True, False]
+    paths = provider.upload_many([
+        UploadItem(folders[0], f"photo_{index}.jpg", io.BytesIO(b"x" * index)) for index in range(12)
+    ])
+    
+    assert provider.exists_many(paths[:2] + [str(tmp_path / "missing")]) == [True, True, False]
+    stats = provider.stat_many([paths[5], folders[1], str(tmp_path / "missing")])
+    assert (stats[0].size, stats[0].is_folder) == (5, False)
+    assert (stats[1].size, stats[1].is_folder) == (None, True)
+    assert stats[2] is None
+
+
+def test_default_async_variants_run_the_sync_batch(tmp_path):
+    provider = LocalStorageProvider(tmp_path)
+    folder = str(tmp_path / "ACME")
+    
+    assert asyncio.run(provider.create_folders_async([folder])) == [True]
+    assert asyncio.run(provider.exists_many_async([folder, folder + "x"])) == [True, False]
@@ -0,0 +1,69 @@
+"""Tests for storage.blob_index."""
+
+import hashlib
+import io
+import time
+
+import pytest
+
+from storage.blob_index import BlobIndex, hash_stream
+
+
+@pytest.fixture
+def index(tmp_path):
+    return BlobIndex(tmp_path / "blobs.db", min_size=16)
+
+
+def test_hash_stream_rewinds_the_stream():
+    stream = io.BytesIO(b"gerber" * 1000)
+    stream.read(10)
+    
+    digest, size = hash_stream(stream, chunk_size=7)
+    
+    assert (digest, size) == (hashlib.sha256(b"gerber" * 1000).hexdigest(), 6000)
+    assert stream.tell() == 0
+
+
+def test_lookup_returns_newest_copies_first(index, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    index.record("graph:a", "d1", 100, "ACME/Line 1/spec.zip")
+    now[0] += 1
+    index.record("graph:a", "d1", 100, "ACME/Line 2/spec.zip")
+    
+    assert index.lookup("graph:a", "d1") == ["ACME/Line 2/spec.zip", "ACME/Line 1/spec.zip"]
+    assert index.lookup("graph:b", "d1") == []
+    assert index.lookup("graph:a", "d2") == []
+
+
+def test_a_path_holds_one_digest(index):
+    index.record("graph:a", "d1", 100, "ACME/spec.zip")
+    index.record("graph:a", "d2", 200, "ACME/spec.zip")
+    
+    assert index.lookup("graph:a", "d1") == []
+    assert index.lookup("graph:a", "d2") == ["ACME/spec.zip"]
+    assert not index.has_size("graph:a", 100)
+    assert index.has_size("graph:a", 200)
+    assert not index.has_size("graph:b", 200)
+
+
+def test_forget_drops_a_stale_path(index):
+    index.record("graph:a", "d1", 100, "ACME/spec.zip")
+    index.forget("graph:a", "ACME/spec.zip")
+    assert index.lookup("graph:a", "d1") == []
+
+
+def test_entries_survive_a_restart(index, tmp_path):
+    index.record("graph:a", "d1", 100, "ACME/spec.zip")
+    assert BlobIndex(tmp_path / "blobs.db").lookup("graph:a", "d1") == ["ACME/spec.zip"]
+
+
+def test_stats_report_the_dedup_ratio(index):
+    assert index.stats()["dedup_ratio"] == 0.0
+    index.count_upload(300, copied=True)
+    index.count_upload(100, copied=False)
+    
+    stats = index.stats()
+    assert (stats["files_copied"], stats["files_uploaded"]) == (1, 1)
+    assert (stats["bytes_saved"], stats["bytes_uploaded"]) == (300, 100)
+    assert stats["dedup_ratio"] == pytest.approx(0.75)
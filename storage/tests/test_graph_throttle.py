@@ -0,0 +1,140 @@
+"""Tests for storage.graph_throttle and the retrying Graph client."""
+
+import io
+import time
+from email.utils import formatdate
+
+import pytest
+
+from benchmarks.fake_graph import FakeGraphServer
+from benchmarks.fake_server import FaultConfig
+from benchmarks.run_offline import DRIVE_ID, build_storage_service
+from storage import graph_throttle
+from storage.graph_throttle import GraphThrottle, backoff_delay, parse_retry_after
+
+
+def send(throttle, count):
+    for _ in range(count):
+        assert throttle._reserve() == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after("-3") == 0
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt) <= graph_throttle.BACKOFF_MAX for attempt in range(1, 12))
+
+
+def test_requests_are_unlimited_until_throttled():
+    throttle = GraphThrottle()
+    assert throttle.rate is None
+    send(throttle, 1000)
+    assert throttle.acquire() == 0
+
+
+def test_throttling_halves_the_measured_rate_once_per_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    throttle = GraphThrottle(min_rate=1)
+    
+    send(throttle, 40)
+    now[0] += 1.0
+    send(throttle, 1)  # Closes the measuring window: 41 requests in 1s
+    throttle.on_throttled(429, None)
+    assert throttle.rate == pytest.approx(20.5)
+    assert throttle._reserve() == pytest.approx(1 / 20.5)
+    
+    throttle.on_throttled(429, None)
+    assert throttle.rate == pytest.approx(20.5)
+    
+    now[0] += graph_throttle.DECREASE_COOLDOWN
+    throttle.on_throttled(503, None)
+    assert throttle.rate == pytest.approx(10.25)
+
+
+def test_retry_after_pauses_every_sender(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    throttle = GraphThrottle()
+    
+    throttle.on_throttled(429, 3)
+    assert throttle._reserve() == pytest.approx(3)
+    now[0] += 3
+    assert throttle.rate == throttle.min_rate
+    assert throttle._reserve() == 0
+
+
+def test_successes_recover_and_lift_the_limit(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    throttle = GraphThrottle()
+    send(throttle, 10)
+    now[0] += 1
+    send(throttle, 1)
+    throttle.on_throttled(429, None)
+    limited = throttle.rate
+    
+    throttle.on_success({})
+    assert throttle.rate == pytest.approx(limited * graph_throttle.RECOVERY_FACTOR)
+    for _ in range(100):
+        throttle.on_success({})
+    assert throttle.rate is None
+
+
+def test_hard_ceiling_is_never_exceeded():
+    throttle = GraphThrottle(max_rate=5)
+    for _ in range(100):
+        throttle.on_success({})
+    assert throttle.rate == 5
+    throttle.on_throttled(429, None)
+    assert throttle.rate == 2.5
+
+
+def test_ratelimit_headers_spread_the_remaining_quota(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    throttle = GraphThrottle()
+    
+    throttle.on_success({"RateLimit-Remaining": "30", "RateLimit-Reset": "10"})
+    assert throttle.rate == pytest.approx(3)
+    
+    throttle.on_success({"RateLimit-Remaining": "0", "RateLimit-Reset": "4"})
+    assert throttle._reserve() == pytest.approx(4)
+
+
+def test_client_retries_after_retry_after(monkeypatch, settings):
+    monkeypatch.setenv("GRAPH_MAX_RETRIES", "2")
+    with FakeGraphServer(FaultConfig(error_rate=1.0, error_status=429, retry_after=0.01), drive_id=DRIVE_ID) as graph:
+        provider = build_storage_service(graph).provider
+        response = provider._send("get_item", "GET", f"{graph.url}/v1.0/drives/{graph.drive.drive_id}/root")
+    assert response.status_code == 429
+    assert graph.total_requests == 3
+    assert graph_throttle.get_graph_throttle().rate is not None
+
+
+def test_client_recovers_from_throttling(settings):
+    with FakeGraphServer(FaultConfig(throttle_rps=1), drive_id=DRIVE_ID) as graph:
+        provider = build_storage_service(graph).provider
+        folder = provider.get_full_path("ACME")
+        graph.drive.mkdirs(folder)
+        started = time.monotonic()
+        assert provider._upload_file_raw(io.BytesIO(b"a"), folder, "a.txt")
+        assert provider._upload_file_raw(io.BytesIO(b"b"), folder, "b.txt")
+    assert graph.throttled_requests >= 1
+    assert time.monotonic() - started >= 0.9
+    assert graph.drive.lookup(f"{folder}/b.txt") is not None
+
+
+def test_copy_monitor_polls_go_through_the_client(provider, fake_graph, graph_calls):
+    folder = provider.get_full_path("ACME")
+    fake_graph.drive.put_file(f"{folder}/source.pdf", 10)
+    fake_graph.drive.mkdirs(f"{folder}/Copies")
+    
+    assert provider.copy_file(f"{folder}/source.pdf", f"{folder}/Copies", "copy.pdf")
+    assert any("/monitor/" in url for _, url in graph_calls)
+    assert fake_graph.drive.lookup(f"{folder}/Copies/copy.pdf").size == 10
@@ -0,0 +1,123 @@
+"""Tests for storage.item_cache and the existence probes built on it."""
+
+import time
+
+import pytest
+
+from storage.item_cache import DriveItemCache, normalize_path
+
+
+def child(name, item_id, folder=True):
+    item = {"name": name, "id": item_id, "eTag": f'"{{{item_id}}},1"'}
+    if folder:
+        item["folder"] = {}
+    return item
+
+
+@pytest.fixture
+def cache():
+    return DriveItemCache(ttl=60)
+
+
+def test_normalize_path():
+    assert normalize_path("/Projects//ACME/./Line 1/") == "projects/acme/line 1"
+    assert normalize_path("Projects\\ACME") == "projects/acme"
+    assert normalize_path("/") == ""
+
+
+def test_listing_answers_existence_checks(cache):
+    assert cache.exists("Projects/ACME") is None
+    
+    cache.put_listing("Projects", [child("ACME", "1"), child("Globex", "2")])
+    assert cache.exists("projects/acme") is True
+    assert cache.exists("Projects/Initech") is False
+    assert cache.exists("Projects/ACME/Line 1") is None
+    assert cache.get("Projects/Globex").id == "2"
+
+
+def test_entries_expire(monkeypatch):
+    cache = DriveItemCache(ttl=10)
+    cache.put_listing("Projects", [child("ACME", "1")])
+    
+    later = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert cache.get("Projects/ACME") is None
+    assert cache.exists("Projects/Initech") is None
+
+
+def test_zero_ttl_disables_caching():
+    cache = DriveItemCache(ttl=0)
+    cache.put("Projects", "1")
+    cache.put_listing("Projects", [child("ACME", "2")])
+    assert len(cache) == 0
+    assert cache.exists("Projects/ACME") is None
+
+
+def test_new_listing_drops_descendants_of_removed_children(cache):
+    cache.put_listing("Projects", [child("ACME", "1"), child("Globex", "2")])
+    cache.put_listing("Projects/ACME", [child("Line 1", "3")])
+    cache.put_listing("Projects/Globex", [child("Line 2", "4")])
+    
+    cache.put_listing("Projects", [child("Globex", "2")])
+    
+    assert cache.exists("Projects/ACME") is False
+    assert cache.get("Projects/ACME/Line 1") is None
+    assert not cache.is_listed("Projects/ACME")
+    assert cache.exists("Projects/Globex/Line 2") is True
+
+
+def test_new_listing_drops_descendants_of_replaced_children(cache):
+    cache.put_listing("Projects", [child("ACME", "1")])
+    cache.put_listing("Projects/ACME", [child("Line 1", "3")])
+    
+    cache.put_listing("Projects", [child("ACME", "9")])
+    
+    assert cache.get("Projects/ACME").id == "9"
+    assert cache.get("Projects/ACME/Line 1") is None
+    assert cache.exists("Projects/ACME/Line 1") is None
+
+
+def test_invalidate_forgets_subtree_and_parent_listing(cache):
+    cache.put_listing("Projects", [child("ACME", "1")])
+    cache.put_listing("Projects/ACME", [child("Line 1", "3")])
+    
+    cache.invalidate("Projects/ACME")
+    
+    assert cache.get("Projects/ACME") is None
+    assert cache.get("Projects/ACME/Line 1") is None
+    assert cache.exists("Projects/Initech") is None
+    
+    cache.put("Other", "5")
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_remember_caches_item_and_parent(cache):
+    path = cache.remember({
+        "id": "7",
+        "name": "report.html",
+        "file": {},
+        "parentReference": {"id": "6", "path": "/drives/d/root:/Projects/ACME%20Corp"},
+    })
+    assert path == "Projects/ACME Corp/report.html"
+    assert cache.get(path).is_folder is False
+    assert cache.get("projects/acme corp").id == "6"
+    assert cache.remember({"id": "8", "name": "x"}) is None
+
+
+def test_mark_empty_caches_an_empty_listing(cache):
+    cache.mark_empty("Projects/New")
+    assert cache.exists("Projects/New/Anything") is False
+
+
+def test_provider_probes_siblings_with_one_listing(storage_service, fake_graph):
+    provider = storage_service.provider
+    customer = provider.get_full_path("1_ICT", "Mexico", "ACME")
+    fake_graph.drive.mkdirs(f"{customer}/Project A")
+    fake_graph.drive.mkdirs(f"{customer}/Project B")
+    before = fake_graph.total_requests
+    
+    assert provider._folder_exists_raw(f"{customer}/Project A")
+    assert provider._folder_exists_raw(f"{customer}/project b")
+    assert not provider._folder_exists_raw(f"{customer}/Project C")
+    assert fake_graph.total_requests - before == 1
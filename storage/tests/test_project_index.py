@@ -0,0 +1,148 @@
+"""Tests for storage.project_index."""
+
+import time
+
+import pytest
+
+from storage.project_index import ProjectIndex
+
+
+class StubResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+    
+    def json(self):
+        return self._body
+
+
+class ScriptedProvider:
+    """Provider whose delta requests return scripted pages."""
+    
+    graph_url = "https://graph.test/v1.0"
+    drive_id = "drive"
+    base_path = "Base"
+    
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.urls = []
+    
+    def _graph_request(self, operation, method, url, **kwargs):
+        self.urls.append(url)
+        return self.pages.pop(0)
+
+
+def folder(item_id, name, parent_id):
+    return {"id": item_id, "name": name, "folder": {}, "parentReference": {"id": parent_id}}
+
+
+def delta_page(items, link="delta-1"):
+    return StubResponse(200, {"value": items, "@odata.deltaLink": link})
+
+
+TREE = [
+    {"id": "root", "root": {}},
+    folder("b", "Base", "root"),
+    folder("f", "1_ICT", "b"),
+    folder("c", "MX", "f"),
+    folder("a", "ACME", "c"),
+    folder("p1", "Line 7", "a"),
+    folder("p2", "Line 8", "a"),
+    {"id": "x", "name": "notes.txt", "file": {}, "parentReference": {"id": "p1"}},
+]
+
+
+@pytest.fixture
+def index(provider, tmp_path):
+    return ProjectIndex(provider, tmp_path / "index.db", max_age=60)
+
+
+def seed_projects(fake_graph, provider, *projects):
+    for project in projects:
+        fake_graph.drive.mkdirs(provider.get_full_path("1_ICT", "MX", "ACME", project))
+
+
+def test_full_then_incremental_sync(index, provider, fake_graph):
+    seed_projects(fake_graph, provider, "Line 7", "Line 8")
+    assert not index.ready
+    
+    index.sync()
+    assert index.ready
+    assert index.project_exists("1_ict", "mx", "acme", "LINE 7")
+    assert not index.project_exists("1_ICT", "MX", "ACME", "Line 9")
+    assert [entry.project for entry in index.customer_projects("ACME")] == ["Line 7", "Line 8"]
+    
+    seed_projects(fake_graph, provider, "Line 9")
+    before = fake_graph.total_requests
+    assert index.sync() == 1
+    assert fake_graph.total_requests - before == 1
+    assert index.project_exists("1_ICT", "MX", "ACME", "Line 9")
+
+
+def test_state_survives_a_restart(index, provider, fake_graph, tmp_path):
+    seed_projects(fake_graph, provider, "Line 7")
+    index.sync()
+    
+    reopened = ProjectIndex(provider, tmp_path / "index.db")
+    assert reopened.ready
+    assert reopened.project_count == 1
+    assert reopened.project_exists("1_ICT", "MX", "ACME", "Line 7")
+
+
+def test_folders_outside_the_project_depth_are_ignored(index, provider, fake_graph):
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT", "MX", "ACME"))
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT", "MX", "ACME", "Line 7", "Photos"))
+    fake_graph.drive.mkdirs("Elsewhere/1_ICT/MX/ACME/Line 1")
+    index.sync()
+    assert [entry.project for entry in index.customer_projects("ACME")] == ["Line 7"]
+
+
+def test_deletions_remove_projects(tmp_path):
+    provider = ScriptedProvider(
+        delta_page(TREE, "delta-1"),
+        delta_page([{"id": "p2", "deleted": {}}], "delta-2"),
+    )
+    index = ProjectIndex(provider, tmp_path / "index.db")
+    
+    index.sync()
+    assert index.project_count == 2
+    assert index.sync() == 1
+    assert [entry.project for entry in index.customer_projects("acme", "1_ICT")] == ["Line 7"]
+    assert provider.urls[1] == "delta-1"
+
+
+def test_expired_delta_link_triggers_a_full_resync(tmp_path):
+    provider = ScriptedProvider(
+        delta_page(TREE, "delta-1"),
+        StubResponse(410, {"error": {"message": "resync required"}}),
+        delta_page(TREE[:6], "delta-2"),
+    )
+    index = ProjectIndex(provider, tmp_path / "index.db")
+    index.sync()
+    
+    index.sync()
+    assert index.project_count == 1
+    assert provider.urls[2].endswith("/drives/drive/root/delta")
+
+
+def test_failed_syncs_fall_back_and_are_not_retried_immediately(tmp_path):
+    provider = ScriptedProvider(
+        delta_page(TREE, "delta-1"),
+        StubResponse(500, {"error": {"message": "boom"}}),
+    )
+    index = ProjectIndex(provider, tmp_path / "index.db", max_age=0.05)
+    index.sync()
+    time.sleep(0.06)
+    
+    assert index.ensure_fresh() is False
+    assert index.ensure_fresh() is False
+    assert len(provider.urls) == 2
+    assert index.project_count == 2
+
+
+def test_another_drive_starts_from_scratch(tmp_path):
+    provider = ScriptedProvider(delta_page(TREE))
+    ProjectIndex(provider, tmp_path / "index.db").sync()
+    
+    provider.drive_id = "other-drive"
+    assert not ProjectIndex(provider, tmp_path / "index.db").ready
@@ -0,0 +1,70 @@
+"""Tests for item-ID addressing and path encoding in storage.sharepoint_storage."""
+
+import io
+
+
+def remove_item(drive, path):
+    """Delete an item from the fake drive, as another user would."""
+    item = drive.lookup(path)
+    parent = drive.items[item.parent_id]
+    del parent.children[item.name.casefold()]
+    del drive.items[item.id]
+
+
+def test_path_urls_encode_every_segment(provider):
+    url = provider._path_url("Base/R&D #1/100%/")
+    assert url.endswith("/root:/Base/R%26D%20%231/100%25:")
+    assert provider._path_url("/").endswith("/root")
+
+
+def test_names_with_special_characters_round_trip(provider, fake_graph):
+    folder = provider.get_full_path("1_ICT", "Mexico", "R&D #1 100%")
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT", "Mexico"))
+    
+    assert provider._create_folder_raw(folder)
+    assert provider._upload_file_raw(io.BytesIO(b"abc"), folder, "a&b #2.txt")
+    assert fake_graph.drive.lookup(f"{folder}/a&b #2.txt").size == 3
+
+
+def test_known_folders_are_addressed_by_id(provider, fake_graph, graph_calls):
+    folder = provider.get_full_path("1_ICT", "Mexico", "ACME")
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT", "Mexico"))
+    provider._create_folder_raw(folder)
+    folder_id = fake_graph.drive.lookup(folder).id
+    graph_calls.clear()
+    
+    provider._upload_file_raw(io.BytesIO(b"abc"), folder, "report.html")
+    provider._create_folder_raw(f"{folder}/Project")
+    
+    assert [url.split("/v1.0", 1)[1] for _, url in graph_calls] == [
+        f"/drives/{fake_graph.drive.drive_id}/items/{folder_id}:/report.html:/content",
+        f"/drives/{fake_graph.drive.drive_id}/items/{folder_id}/children",
+    ]
+
+
+def test_stale_ids_fall_back_to_the_path(provider, fake_graph, graph_calls):
+    folder = provider.get_full_path("1_ICT", "Mexico", "ACME")
+    fake_graph.drive.mkdirs(provider.get_full_path("1_ICT", "Mexico"))
+    provider._create_folder_raw(folder)
+    
+    # Deleted and recreated by someone else: the cached ID is gone
+    remove_item(fake_graph.drive, folder)
+    new_id = fake_graph.drive.mkdirs(folder).id
+    graph_calls.clear()
+    
+    assert provider._upload_file_raw(io.BytesIO(b"abc"), folder, "report.html")
+    assert len(graph_calls) == 2
+    assert "/items/" in graph_calls[0][1]
+    assert "/root:/" in graph_calls[1][1]
+    assert fake_graph.drive.lookup(f"{folder}/report.html").parent_id == new_id
+    assert provider._cached_item_id(folder) == new_id
+
+
+def test_resolve_item_id_uses_the_cache(provider, fake_graph, graph_calls):
+    folder = provider.get_full_path("1_ICT")
+    folder_id = fake_graph.drive.mkdirs(folder).id
+    
+    assert provider._resolve_item_id(folder) == folder_id
+    assert provider._resolve_item_id(folder) == folder_id
+    assert provider._resolve_item_id(f"{folder}/Missing") is None
+    assert len(graph_calls) == 2
@@ -0,0 +1,91 @@
+"""Tests for storage.template_cache."""
+
+import os
+
+import pytest
+
+from storage.template_cache import TEMPLATE_CACHE_LOOKUPS, TemplateBlobCache
+from storage.template_manifest import build_manifest
+
+
+@pytest.fixture
+def template(tmp_path):
+    root = tmp_path / "TEMPLATE_ICT"
+    root.mkdir()
+    for name, size in (("a.bin", 100), ("b.bin", 100), ("c.bin", 100), ("empty.txt", 0)):
+        (root / name).write_bytes(name[0].encode() * size)
+    return root
+
+
+def entries(template):
+    manifest = build_manifest(str(template))
+    return manifest, {entry.name: entry for entry in manifest.files}
+
+
+def lookups(result):
+    return TEMPLATE_CACHE_LOOKUPS.labels(result=result).value
+
+
+def test_files_are_mapped_once(template):
+    cache = TemplateBlobCache(max_bytes=1000)
+    manifest, files = entries(template)
+    hits = lookups("hit")
+    
+    first = cache.read(manifest, files["a.bin"])
+    second = cache.read(manifest, files["a.bin"])
+    
+    assert bytes(first) == b"a" * 100
+    assert first.readonly
+    assert second.obj is first.obj
+    assert cache.cached_bytes == 100
+    assert lookups("hit") == hits + 1
+
+
+def test_changed_files_are_remapped(template):
+    cache = TemplateBlobCache(max_bytes=1000)
+    manifest, files = entries(template)
+    cache.read(manifest, files["a.bin"])
+    
+    replacement = template / "a.new"
+    replacement.write_bytes(b"A" * 50)
+    os.replace(replacement, template / "a.bin")
+    manifest, files = entries(template)
+    
+    assert bytes(cache.read(manifest, files["a.bin"])) == b"A" * 50
+    assert cache.cached_bytes == 50
+
+
+def test_least_recently_used_files_are_evicted(template):
+    cache = TemplateBlobCache(max_bytes=250)
+    manifest, files = entries(template)
+    cache.read(manifest, files["a.bin"])
+    cache.read(manifest, files["b.bin"])
+    cache.read(manifest, files["a.bin"])
+    misses = lookups("miss")
+    
+    cache.read(manifest, files["c.bin"])
+    assert cache.cached_bytes == 200
+    cache.read(manifest, files["a.bin"])
+    assert lookups("miss") == misses + 1
+    cache.read(manifest, files["b.bin"])
+    assert lookups("miss") == misses + 2
+
+
+def test_empty_and_oversized_files_are_not_mapped(template):
+    cache = TemplateBlobCache(max_bytes=50)
+    manifest, files = entries(template)
+    
+    assert bytes(cache.read(manifest, files["empty.txt"])) == b""
+    assert bytes(cache.read(manifest, files["a.bin"])) == b"a" * 100
+    assert cache.cached_bytes == 0
+
+
+def test_clear_drops_all_mappings(template):
+    cache = TemplateBlobCache(max_bytes=1000)
+    manifest, files = entries(template)
+    view = cache.read(manifest, files["a.bin"])
+    
+    cache.clear()
+    
+    assert cache.cached_bytes == 0
+    assert bytes(view) == b"a" * 100  # Views handed out stay readable
@@ -0,0 +1,101 @@
+"""Tests for storage.template_manifest."""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from core.exceptions import StorageError
+from storage import template_manifest
+from storage.template_manifest import TemplateManifestCache, build_manifest
+
+
+@pytest.fixture
+def template(tmp_path):
+    root = tmp_path / "TEMPLATE_ICT"
+    (root / "1_Customer_Info" / "7_ALL_Info_Shared").mkdir(parents=True)
+    (root / "2_Design").mkdir()
+    (root / "1_Customer_Info" / "readme.txt").write_bytes(b"read me")
+    (root / "checklist.xlsx").write_bytes(b"sheet")
+    return root
+
+
+def touch(path, data):
+    """Rewrite a file with a later mtime, even on coarse-grained filesystems."""
+    stat = path.stat()
+    path.write_bytes(data)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_manifest_lists_folders_parents_first_and_hashes_files(template):
+    manifest = build_manifest(str(template))
+    
+    assert manifest.folders == ("1_Customer_Info", "2_Design", "1_Customer_Info/7_ALL_Info_Shared")
+    assert manifest.folder_levels() == {1: ["1_Customer_Info", "2_Design"], 2: ["1_Customer_Info/7_ALL_Info_Shared"]}
+    assert [entry.path for entry in manifest.files] == ["1_Customer_Info/readme.txt", "checklist.xlsx"]
+    readme = manifest.files[0]
+    assert (readme.parent, readme.name, readme.size) == ("1_Customer_Info", "readme.txt", 7)
+    assert readme.sha256 == hashlib.sha256(b"read me").hexdigest()
+    assert manifest.total_size == 12
+    assert manifest.local_path(readme.path) == template / "1_Customer_Info" / "readme.txt"
+
+
+def test_missing_template_raises(tmp_path):
+    with pytest.raises(StorageError):
+        build_manifest(str(tmp_path / "Missing"))
+
+
+def test_rebuild_rehashes_only_changed_files(template, monkeypatch):
+    first = build_manifest(str(template))
+    touch(template / "checklist.xlsx", b"new sheet")
+    hashed = []
+    real_hash = template_manifest._hash_file
+    monkeypatch.setattr(template_manifest, "_hash_file", lambda path: hashed.append(path.name) or real_hash(path))
+    
+    second = build_manifest(str(template), previous=first)
+    
+    assert hashed == ["checklist.xlsx"]
+    assert second.files[0] is first.files[0]
+
+
+def test_diff_reports_added_changed_and_removed_entries(template):
+    first = build_manifest(str(template))
+    touch(template / "checklist.xlsx", b"new sheet")
+    (template / "1_Customer_Info" / "readme.txt").unlink()
+    (template / "3_Photos").mkdir()
+    (template / "3_Photos" / "board.jpg").write_bytes(b"jpg")
+    (template / "2_Design").rmdir()
+    
+    changes = first.diff(build_manifest(str(template), previous=first))
+    
+    assert changes.added_folders == ["3_Photos"]
+    assert changes.removed_folders == ["2_Design"]
+    assert [entry.path for entry in changes.files_to_copy()] == ["3_Photos/board.jpg", "checklist.xlsx"]
+    assert changes.removed_files == ["1_Customer_Info/readme.txt"]
+    assert first.diff(first).empty
+
+
+def test_cache_rescans_only_after_the_interval(template, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TemplateManifestCache(check_interval=5)
+    first = cache.get(str(template))
+    
+    (template / "new.txt").write_bytes(b"new")
+    assert cache.get(str(template)) is first
+    
+    now[0] += 5
+    second = cache.get(str(template))
+    assert second is not first
+    assert "new.txt" in [entry.path for entry in second.files]
+    
+    now[0] += 5
+    assert cache.get(str(template)) is second
+
+
+def test_invalidate_forces_a_rebuild(template):
+    cache = TemplateManifestCache(check_interval=60)
+    first = cache.get(str(template))
+    cache.invalidate(str(template))
+    assert cache.get(str(template)) is not first
@@ -0,0 +1,71 @@
+"""Tests for storage.upload_bundle."""
+
+import hashlib
+import io
+import json
+import zipfile
+
+import pytest
+
+from storage.upload_bundle import bundle_settings, build_bundle, compression_level, extract_member, parse_levels
+
+
+def test_compression_follows_the_mime_type():
+    assert compression_level("spec.pdf") == 0
+    assert compression_level("photo.JPG") == 0
+    assert compression_level("layout.xlsx") == 0
+    assert compression_level("top.gbr") == 6
+    assert compression_level("notes.txt", {"text/*": 9}) == 9
+    assert compression_level("unknown.bin") == 6
+
+
+def test_parse_levels_clamps_and_skips_invalid_entries():
+    assert parse_levels("application/pdf=3, text/*=12,image/*=-1,bogus,") == {
+        "application/pdf": 3, "text/*": 9, "image/*": 0
+    }
+
+
+def test_bundle_members_round_trip_through_the_manifest():
+    files = [
+        ("notes.txt", io.BytesIO(b"hello " * 500)),
+        ("spec.pdf", io.BytesIO(b"%PDF-1.7 binary")),
+        ("dir\\notes.txt", io.BytesIO(b"second notes")),
+    ]
+    
+    bundle = build_bundle(files)
+    
+    assert bundle.member_names == ["notes.txt", "spec.pdf", "notes (2).txt"]
+    manifest = json.loads(bundle.manifest_stream().read())
+    assert manifest["file_count"] == 3
+    assert manifest["total_size"] == 3000 + 15 + 12
+    assert manifest["archive_size"] == len(bundle.archive.getvalue())
+    
+    entries = {entry["name"]: entry for entry in manifest["files"]}
+    assert entries["notes.txt"]["compression"] == "deflate"
+    assert entries["notes.txt"]["compressed_size"] < 3000
+    assert entries["spec.pdf"]["compression"] == "stored"
+    assert entries["notes (2).txt"]["sha256"] == hashlib.sha256(b"second notes").hexdigest()
+    assert extract_member(bundle.archive, entries["notes (2).txt"]) == b"second notes"
+    assert all(stream.tell() == 0 for _, stream in files)
+    
+    with zipfile.ZipFile(bundle.archive) as zf:
+        assert zf.getinfo("spec.pdf").header_offset == entries["spec.pdf"]["header_offset"]
+
+
+def test_extract_member_rejects_a_mismatched_digest():
+    bundle = build_bundle([("notes.txt", io.BytesIO(b"hello"))])
+    entry = dict(bundle.manifest["files"][0], sha256="0" * 64)
+    with pytest.raises(ValueError):
+        extract_member(bundle.archive, entry)
+
+
+def test_bundle_settings_put_overrides_first(monkeypatch):
+    monkeypatch.setenv("UPLOAD_BUNDLE_MAX_FILE_BYTES", "100")
+    monkeypatch.setenv("UPLOAD_BUNDLE_MIN_FILES", "2")
+    monkeypatch.setenv("UPLOAD_BUNDLE_LEVELS", "application/pdf=3")
+    
+    max_file_bytes, min_files, levels = bundle_settings()
+    
+    assert (max_file_bytes, min_files) == (100, 2)
+    assert list(levels)[0] == "application/pdf"
+    assert compression_level("spec.pdf", levels) == 3
@@ -0,0 +1,106 @@
+"""Tests for storage.upload_stream."""
+
+import hashlib
+import io
+
+import pytest
+
+from storage import sharepoint_storage
+from storage.upload_stream import GRAPH_CHUNK_UNIT, UploadStream, get_chunk_size, open_upload_stream
+
+
+class Pipe(io.RawIOBase):
+    """Non-seekable stream, like a socket or a pipe."""
+    
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+DATA = bytes(range(256)) * 40
+
+
+def test_in_memory_buffers_are_viewed_without_copying():
+    source = io.BytesIO(DATA)
+    stream = UploadStream(source)
+    
+    assert stream.in_memory and stream.size == len(DATA)
+    view = stream.view()
+    assert isinstance(view, memoryview)
+    source.getbuffer()[0] = 255
+    assert view[0] == 255
+    del view
+    assert b"".join(stream.chunks(1000)) == source.getvalue()
+
+
+def test_files_on_disk_are_read_in_chunks(tmp_path):
+    path = tmp_path / "spec.zip"
+    path.write_bytes(DATA)
+    with open(path, "rb") as f:
+        stream = UploadStream(f)
+        assert not stream.in_memory
+        sizes = [len(chunk) for chunk in stream.chunks(4096)]
+        assert sizes == [4096, 4096, len(DATA) - 8192]
+        assert bytes(stream.view()) == DATA
+
+
+def test_non_seekable_streams_are_spooled():
+    small = UploadStream(Pipe(DATA), spill_threshold=len(DATA))
+    large = UploadStream(Pipe(DATA), spill_threshold=1000)
+    
+    assert (small.size, small.spilled) == (len(DATA), False)
+    assert (large.size, large.spilled) == (len(DATA), True)
+    assert b"".join(bytes(chunk) for chunk in large.chunks(3000)) == DATA
+
+
+def test_digest_is_tracked_by_a_complete_pass():
+    expected = hashlib.sha256(DATA).hexdigest()
+    stream = UploadStream(io.BytesIO(DATA))
+    stream.track_digest()
+    
+    chunks = stream.chunks(1000)
+    next(chunks)
+    chunks.close()
+    assert stream.digest is None  # Abandoned pass
+    
+    for _ in stream.chunks(1000):
+        pass
+    assert stream.digest == expected
+    
+    viewed = UploadStream(io.BytesIO(DATA))
+    viewed.track_digest()
+    viewed.view()
+    assert viewed.digest == expected
+    assert UploadStream(io.BytesIO(DATA)).sha256() == expected
+
+
+def test_chunk_size_is_a_multiple_of_the_graph_unit(monkeypatch):
+    monkeypatch.setenv("UPLOAD_CHUNK_SIZE", str(GRAPH_CHUNK_UNIT * 3 + 5))
+    assert get_chunk_size() == GRAPH_CHUNK_UNIT * 3
+    monkeypatch.setenv("UPLOAD_CHUNK_SIZE", "10")
+    assert get_chunk_size() == GRAPH_CHUNK_UNIT
+
+
+def test_open_upload_stream_keeps_existing_streams(monkeypatch):
+    monkeypatch.setenv("UPLOAD_SPILL_THRESHOLD", "10")
+    stream = open_upload_stream(Pipe(DATA))
+    assert stream.spilled
+    assert open_upload_stream(stream) is stream
+
+
+def test_large_non_seekable_uploads_use_an_upload_session(provider, fake_graph, graph_calls, monkeypatch):
+    monkeypatch.setattr(sharepoint_storage, "SIMPLE_UPLOAD_MAX_BYTES", 1024)
+    monkeypatch.setenv("UPLOAD_CHUNK_SIZE", "1")
+    size = GRAPH_CHUNK_UNIT * 2 + 100
+    folder = provider.get_full_path("ACME")
+    fake_graph.drive.mkdirs(folder)
+    
+    assert provider._upload_file_raw(Pipe(b"x" * size), folder, "panel.step")
+    
+    assert len([url for method, url in graph_calls if method == "PUT"]) == 3
+    assert fake_graph.drive.lookup(f"{folder}/panel.step").size == size
@@ -0,0 +1,253 @@
+"""
+Upload Bundle Module
+
+This module packs many small customer files into a single zip archive so
+they can be stored with one upload instead of one Graph PUT per file.
+
+Each file is compressed according to its MIME type: text-like formats are
+deflated, formats that are already compressed (PDF, images, Office/zip
+containers, archives) are stored as-is. A JSON manifest stored next to the
+archive indexes every member (name, size, SHA-256, offset), so single
+files can be found and extracted without scanning the archive.
+
+Usage:
+    bundle = build_bundle([("spec.pdf", pdf_stream), ("notes.txt", txt_stream)])
+    provider.upload_files([
+        ("Customer_Files.zip", bundle.archive),
+        ("Customer_Files.manifest.json", bundle.manifest_stream())
+    ], destination)
+"""
+
+import fnmatch
+import hashlib
+import json
+import mimetypes
+import os
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from core.logging_config import get_logger
+from core.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+BUNDLE_FILES = REGISTRY.counter(
+    "storage_bundled_files_total",
+    "Uploaded files packed into bundle archives"
+)
+BUNDLE_BYTES = REGISTRY.counter(
+    "storage_bundle_bytes_total",
+    "Bytes of bundled files before and after compression",
+    ["kind"]
+)
+
+# Files up to this size are bundled (override with UPLOAD_BUNDLE_MAX_FILE_BYTES)
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+
+# Bundle only when at least this many small files are uploaded together (override with UPLOAD_BUNDLE_MIN_FILES)
+DEFAULT_MIN_FILES = 4
+
+# Copy chunk size while writing members
+COPY_CHUNK_SIZE = 256 * 1024
+
+# Compression level (0 stores the file) by MIME type pattern; the first match wins.
+# Extend or override with UPLOAD_BUNDLE_LEVELS, e.g. "application/pdf=3,text/*=9".
+DEFAULT_LEVELS: Dict[str, int] = {
+    "application/zip": 0,
+    "application/x-zip-compressed": 0,
+    "application/gzip": 0,
+    "application/x-7z-compressed": 0,
+    "application/x-rar-compressed": 0,
+    "application/vnd.openxmlformats-officedocument.*": 0,  # docx/xlsx/pptx are zips
+    "application/pdf": 0,
+    "image/png": 0,
+    "image/jpeg": 0,
+    "image/*": 6,
+    "video/*": 0,
+    "audio/*": 0,
+    "text/*": 6,
+    "*": 6,
+}
+
+# Extensions of CAD/ECAD outputs that mimetypes does not know
+mimetypes.add_type("text/plain", ".gbr")
+mimetypes.add_type("text/plain", ".drl")
+mimetypes.add_type("text/plain", ".ipc")
+mimetypes.add_type("text/csv", ".bom")
+
+
+@dataclass
+class Bundle:
+    """A built bundle: the zip archive and its manifest."""
+    archive: BytesIO
+    manifest: dict
+    member_names: List[str] = field(default_factory=list)
+    
+    def manifest_stream(self) -> BytesIO:
+        """Manifest as a JSON stream, ready to upload."""
+        return BytesIO(json.dumps(self.manifest, indent=2).encode("utf-8"))
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse a ``pattern=level`` list, e.g. "application/pdf=3,text/*=9".
+    
+    Args:
+        spec: Comma-separated MIME patterns with levels 0..9.
+    
+    Returns:
+        Mapping of pattern to level (invalid entries are skipped).
+    """
+    levels = {}
+    for entry in spec.split(","):
+        pattern, _, level = entry.strip().partition("=")
+        try:
+            levels[pattern.strip()] = min(max(int(level), 0), 9)
+        except ValueError:
+            if entry.strip():
+                logger.warning("Ignoring invalid UPLOAD_BUNDLE_LEVELS entry: %s", entry)
+    return levels
+
+
+def compression_level(filename: str, levels: Optional[Dict[str, int]] = None) -> int:
+    """
+    Choose the compression level of a file from its MIME type.
+    
+    Args:
+        filename: File name (the MIME type is guessed from its extension).
+        levels: Pattern -> level mapping (DEFAULT_LEVELS if omitted).
+    
+    Returns:
+        Level 0..9, where 0 means the file is stored uncompressed.
+    """
+    mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    for pattern, level in (levels or DEFAULT_LEVELS).items():
+        if fnmatch.fnmatch(mime_type, pattern):
+            return level
+    return 6
+
+
+def build_bundle(files: List[Tuple[str, BinaryIO]], levels: Optional[Dict[str, int]] = None) -> Bundle:
+    """
+    Stream files into a zip archive, compressing each by its MIME type.
+    
+    Args:
+        files: List of tuples (filename, file_content). Streams are read
+            from the start and rewound afterwards.
+        levels: Pattern -> level mapping (DEFAULT_LEVELS if omitted).
+    
+    Returns:
+        Bundle with the archive (rewound) and its manifest.
+    """
+    archive = BytesIO()
+    entries = []
+    names = []
+    raw_total = 0
+    
+    with zipfile.ZipFile(archive, "w", allowZip64=True) as zf:
+        for filename, stream in files:
+            level = compression_level(filename, levels)
+            name = _unique_name(filename, names)
+            names.append(name)
+            # Members opened by name take the archive's current compression
+            zf.compression = zipfile.ZIP_DEFLATED if level > 0 else zipfile.ZIP_STORED
+            zf.compresslevel = level if level > 0 else None
+            
+            digest = hashlib.sha256()
+            stream.seek(0)
+            with zf.open(name, "w") as member:
+                while True:
+                    chunk = stream.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    member.write(chunk)
+            stream.seek(0)
+            
+            info = zf.getinfo(name)
+            raw_total += info.file_size
+            entries.append({
+                "name": info.filename,
+                "size": info.file_size,
+                "compressed_size": info.compress_size,
+                "sha256": digest.hexdigest(),
+                "compression": "deflate" if level > 0 else "stored",
+                "header_offset": info.header_offset,
+            })
+    
+    archive.seek(0)
+    manifest = {
+        "format": "zip",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "file_count": len(entries),
+        "total_size": raw_total,
+        "archive_size": archive.getbuffer().nbytes,
+        "files": entries,
+    }
+    
+    BUNDLE_FILES.inc(len(entries))
+    BUNDLE_BYTES.labels(kind="raw").inc(raw_total)
+    BUNDLE_BYTES.labels(kind="compressed").inc(manifest["archive_size"])
+    logger.info(
+        "Bundled %s files: %.1f KB -> %.1f KB",
+        len(entries), raw_total / 1024, manifest["archive_size"] / 1024
+    )
+    return Bundle(archive=archive, manifest=manifest, member_names=names)
+
+
+def _unique_name(filename: str, taken: List[str]) -> str:
+    """Archive member name, suffixed when the same name was already added."""
+    name = os.path.basename(filename.replace("\\", "/")) or "file"
+    if name not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    n = 2
+    while f"{stem} ({n}){ext}" in taken:
+        n += 1
+    return f"{stem} ({n}){ext}"
+
+
+def extract_member(archive: BinaryIO, entry: dict) -> bytes:
+    """
+    Extract one file of a bundle, verifying it against its manifest entry.
+    
+    Args:
+        archive: Bundle archive stream.
+        entry: Manifest entry of the file (from ``manifest["files"]``).
+    
+    Returns:
+        File content.
+    
+    Raises:
+        ValueError: If the content does not match the manifest digest.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        content = zf.read(entry["name"])
+    if hashlib.sha256(content).hexdigest() != entry["sha256"]:
+        raise ValueError(f"Bundle member {entry['name']} does not match its manifest")
+    return content
+
+
+def bundle_enabled() -> bool:
+    """Whether UPLOAD_BUNDLE enables bundling of small uploads (default false)."""
+    return os.getenv("UPLOAD_BUNDLE", "false").lower() in ("1", "true", "yes")
+
+
+def bundle_settings() -> Tuple[int, int, Dict[str, int]]:
+    """
+    Read bundling settings from the environment.
+    
+    Returns:
+        Tuple of (max file bytes, min file count, compression levels).
+        UPLOAD_BUNDLE_LEVELS entries take precedence over DEFAULT_LEVELS.
+    """
+    max_file_bytes = int(os.getenv("UPLOAD_BUNDLE_MAX_FILE_BYTES", DEFAULT_MAX_FILE_BYTES))
+    min_files = int(os.getenv("UPLOAD_BUNDLE_MIN_FILES", DEFAULT_MIN_FILES))
+    # Overrides go first so they match before the defaults
+    levels = parse_levels(os.getenv("UPLOAD_BUNDLE_LEVELS", ""))
+    for pattern, level in DEFAULT_LEVELS.items():
+        levels.setdefault(pattern, level)
+    return max_file_bytes, min_files, levels
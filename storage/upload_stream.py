@@ -0,0 +1,212 @@
+"""
+Upload Stream Module
+
+This module adapts uploaded files (Streamlit ``UploadedFile`` or any
+binary stream) for the storage providers without copying them whole.
+
+Streamlit already holds each upload in an in-memory buffer; calling
+``getvalue()`` on it allocates a second full copy. ``UploadStream`` hands
+out zero-copy views of that buffer instead, and reads any other stream in
+fixed-size chunks with ``readinto``. Streams that cannot seek (and so
+cannot be re-read for hashing, retries or chunked upload sessions) are
+spooled first: in memory up to UPLOAD_SPILL_THRESHOLD bytes, on disk
+beyond it, so memory per upload stays bounded whatever the file size.
+
+With ``track_digest()`` the SHA-256 of the content is computed from the
+chunks the provider reads while uploading, so content dedup does not need
+a separate read of the file.
+
+Usage:
+    stream = UploadStream(uploaded_file)
+    with open(target, "wb") as f:
+        for chunk in stream.chunks():
+            f.write(chunk)
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Iterator, Optional, Union
+
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Graph upload session chunks must be multiples of 320 KiB
+GRAPH_CHUNK_UNIT = 320 * 1024
+
+# Chunk size for reading and for upload session requests (override with UPLOAD_CHUNK_SIZE)
+DEFAULT_CHUNK_SIZE = 10 * GRAPH_CHUNK_UNIT
+
+# Non-seekable streams are spooled in memory up to this size, then on disk (override with UPLOAD_SPILL_THRESHOLD)
+DEFAULT_SPILL_THRESHOLD = 8 * 1024 * 1024
+
+
+class UploadStream:
+    """
+    Bounded-memory, re-readable view of an uploaded file.
+    
+    In-memory buffers (BytesIO and Streamlit's UploadedFile) are exposed
+    through ``getbuffer()`` without copying; other seekable streams are
+    read in chunks; non-seekable streams are spooled once.
+    """
+    
+    def __init__(self, source: BinaryIO, spill_threshold: int = DEFAULT_SPILL_THRESHOLD):
+        """
+        Wrap an uploaded file.
+        
+        Args:
+            source: Binary stream to upload.
+            spill_threshold: Bytes of a non-seekable stream kept in memory
+                before spooling to a temporary file.
+        """
+        self.spilled = False
+        if _seekable(source):
+            self._stream = source
+        else:
+            spool = tempfile.SpooledTemporaryFile(max_size=spill_threshold)
+            buffer = bytearray(DEFAULT_CHUNK_SIZE)
+            view = memoryview(buffer)
+            total = 0
+            while True:
+                count = _read_into(source, buffer)
+                if not count:
+                    break
+                spool.write(view[:count])
+                total += count
+            spool.seek(0)
+            self._stream = spool
+            self.spilled = total > spill_threshold
+            if self.spilled:
+                logger.debug("Spooled upload to disk (over %s bytes)", spill_threshold)
+        
+        self.size = self._stream.seek(0, os.SEEK_END)
+        self._stream.seek(0)
+        self.digest: Optional[str] = None
+        self._track_digest = False
+    
+    def track_digest(self) -> None:
+        """
+        Compute the SHA-256 digest while the content is read.
+        
+        ``digest`` is set once a ``view()`` or a complete ``chunks()`` pass
+        has been consumed (e.g. by a provider uploading the stream).
+        """
+        self._track_digest = True
+    
+    def sha256(self) -> str:
+        """
+        The SHA-256 hex digest, reading the content now if no pass computed it yet.
+        
+        Returns:
+            Hex digest.
+        """
+        if self.digest is None:
+            hasher = hashlib.sha256()
+            for chunk in self._chunks(DEFAULT_CHUNK_SIZE):
+                hasher.update(chunk)
+            self.digest = hasher.hexdigest()
+        return self.digest
+    
+    @property
+    def in_memory(self) -> bool:
+        """Whether the content can be viewed without reading from disk."""
+        return hasattr(self._stream, "getbuffer")
+    
+    def view(self) -> Union[memoryview, bytes]:
+        """
+        The whole content, as a zero-copy view when the stream is in memory.
+        
+        Meant for small files (simple uploads); use ``chunks`` otherwise.
+        """
+        if self.in_memory:
+            content = self._stream.getbuffer()
+        else:
+            self._stream.seek(0)
+            content = self._stream.read()
+        if self._track_digest and self.digest is None:
+            self.digest = hashlib.sha256(content).hexdigest()
+        return content
+    
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        """
+        Iterate over the content in chunks, from the start.
+        
+        Chunks of streams read from disk share one buffer: each chunk is
+        only valid until the next one is requested.
+        
+        Args:
+            chunk_size: Maximum chunk size in bytes.
+        
+        Yields:
+            memoryview of each chunk.
+        """
+        if not self._track_digest or self.digest is not None:
+            yield from self._chunks(chunk_size)
+            return
+        
+        # An abandoned pass (e.g. a failed upload) leaves the digest unset
+        hasher = hashlib.sha256()
+        for chunk in self._chunks(chunk_size):
+            hasher.update(chunk)
+            yield chunk
+        self.digest = hasher.hexdigest()
+    
+    def _chunks(self, chunk_size: int) -> Iterator[memoryview]:
+        """Iterate over the content in chunks, without hashing."""
+        if self.in_memory:
+            content = self._stream.getbuffer()
+            for offset in range(0, len(content), chunk_size):
+                yield content[offset:offset + chunk_size]
+            return
+        
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        self._stream.seek(0)
+        while True:
+            count = _read_into(self._stream, buffer)
+            if not count:
+                break
+            yield view[:count]
+
+
+def _seekable(stream: BinaryIO) -> bool:
+    """Whether a stream can be rewound and measured."""
+    try:
+        return stream.seekable()
+    except AttributeError:
+        return False
+
+
+def _read_into(stream: BinaryIO, buffer: bytearray) -> int:
+    """Fill a buffer from a stream (readinto when available)."""
+    if hasattr(stream, "readinto"):
+        return stream.readinto(buffer) or 0
+    data = stream.read(len(buffer))
+    buffer[:len(data)] = data
+    return len(data)
+
+
+def get_chunk_size() -> int:
+    """
+    Upload chunk size from UPLOAD_CHUNK_SIZE, rounded down to a multiple of
+    320 KiB as Graph upload sessions require.
+    """
+    size = int(os.getenv("UPLOAD_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+    return max(GRAPH_CHUNK_UNIT, size - size % GRAPH_CHUNK_UNIT)
+
+
+def open_upload_stream(source: BinaryIO) -> UploadStream:
+    """
+    Wrap an uploaded file, with the spill threshold from UPLOAD_SPILL_THRESHOLD.
+    
+    Args:
+        source: Binary stream to upload, or an UploadStream (returned as is,
+                so digest tracking set up by the caller is kept).
+    
+    Returns:
+        UploadStream instance.
+    """
+    if isinstance(source, UploadStream):
+        return source
+    return UploadStream(source, int(os.getenv("UPLOAD_SPILL_THRESHOLD", DEFAULT_SPILL_THRESHOLD)))